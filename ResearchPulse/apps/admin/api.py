@@ -35,7 +35,7 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 from core.database import get_session
-from core.dependencies import Superuser, require_permissions
+from core.dependencies import Superuser, invalidate_principal, require_permissions
 from core.models.user import User
 from core.models.permission import Role, Permission, RolePermission
 from core.models.user import User, UserRole
@@ -273,6 +273,8 @@ async def update_user_role(
     # 替换用户的所有角色为新指定的单一角色
     # 设计决策：当前采用"替换全部"策略，一个用户同一时间只有一个角色
     user.roles = [role]
+    # 使该用户缓存的认证主体（角色与权限集合）失效
+    invalidate_principal(user.id, session)
 
     return {"status": "ok", "message": f"Role updated to {update.role_name}"}
 
@@ -304,6 +306,7 @@ async def toggle_user_active(
 
     # 切换用户的激活状态：如果当前是活跃则禁用，反之则启用
     user.is_active = not user.is_active
+    invalidate_principal(user.id, session)
 
     return {"status": "ok", "is_active": user.is_active}
 
@@ -340,6 +343,7 @@ async def update_user(
     # 仅在明确传入 is_active 参数时更新，避免误操作
     if is_active is not None:
         user.is_active = is_active
+        invalidate_principal(user.id, session)
 
     return {"status": "ok"}
 
@@ -649,7 +653,7 @@ async def update_config(
 
     # 同步更新内存缓存，使配置变更立即生效
     # 避免等待下次缓存刷新周期，减少配置变更的延迟
-    feature_config._cache[key] = update.value
+    feature_config.update_cached(key, update.value)
 
     return {"status": "ok", "key": key}
 
@@ -1327,8 +1331,9 @@ async def create_backup(
 ) -> Dict[str, Any]:
     """Trigger a manual backup (admin only).
 
-    Executes the full backup pipeline: export archived articles to JSON,
-    persist backup metadata, and remove archived records.
+    Executes the full backup pipeline: stream expired articles into a
+    compressed segment archive, persist backup metadata, and remove the
+    archived records batch by batch.
 
     Returns:
         Dict[str, Any]: Backup execution result.
@@ -1448,6 +1453,17 @@ async def download_backup(
     if not backup_path.exists():
         raise HTTPException(status_code=404, detail="Backup file not found on disk")
 
+    # 流式归档（清单 + 压缩分段）打包为一个 tar 文件下载
+    from common.archive import is_archive, pack_archive
+    if is_archive(backup_path):
+        import asyncio
+        tar_path = await asyncio.to_thread(pack_archive, backup_path)
+        return FileResponse(
+            path=tar_path,
+            filename=tar_path.name,
+            media_type="application/x-tar",
+        )
+
     return FileResponse(
         path=backup_path,
         filename=backup_path.name,
@@ -1455,15 +1471,38 @@ async def download_backup(
     )
 
 
+# 备份恢复后台任务类型（TaskManager.task_type）
+RESTORE_TASK_TYPE = "backup_restore"
+
+
+def _restore_task_payload(task) -> Dict[str, Any]:
+    """Serialize a restore BackgroundTask for API responses."""
+    return {
+        "task_id": task.task_id,
+        "name": task.name,
+        "status": task.status,
+        "progress": task.progress,
+        "progress_message": task.progress_message,
+        "params": task.params,
+        "result": task.result,
+        "error_message": task.error_message,
+        "created_at": task.created_at.isoformat() if task.created_at else None,
+        "started_at": task.started_at.isoformat() if task.started_at else None,
+        "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+    }
+
+
 @router.post("/backups/{backup_id}/restore")
 async def restore_backup(
     backup_id: int,
     admin: Superuser = None,
     session: AsyncSession = Depends(get_session),
 ) -> Dict[str, Any]:
-    """Restore articles from a backup file.
+    """Start restoring articles from a backup as a background task.
 
-    Articles with existing ``external_id`` values are skipped.
+    The restore streams the backup in chunks, skips articles that already
+    exist (same source type, source ID and external ID) and bulk-inserts
+    the rest. Poll ``/backups/restore-tasks/{task_id}`` for progress.
 
     Args:
         backup_id: Backup record ID.
@@ -1471,14 +1510,17 @@ async def restore_backup(
         session: Async database session.
 
     Returns:
-        Dict[str, Any]: Restore statistics.
+        Dict[str, Any]: Task ID and initial task status.
 
     Raises:
         HTTPException: If the backup record or file does not exist.
     """
-    import json
+    import asyncio
     from pathlib import Path
 
+    from apps.scheduler.jobs.backup_job import restore_backup_file
+    from apps.task_manager import TaskManager
+
     result = await session.execute(
         select(BackupRecord).where(BackupRecord.id == backup_id)
     )
@@ -1492,56 +1534,65 @@ async def restore_backup(
     if not backup_path.exists():
         raise HTTPException(status_code=404, detail="Backup file not found on disk")
 
-    try:
-        with open(backup_path, "r", encoding="utf-8") as f:
-            backup_data = json.load(f)
+    task_manager = TaskManager()
 
-        articles_data = backup_data.get("articles", [])
-        restored_count = 0
-        skipped_count = 0
+    # 同一备份已有待处理/运行中的恢复任务时直接返回，防止重复点击
+    for existing in await task_manager.get_tasks_by_type(RESTORE_TASK_TYPE, limit=20):
+        if existing.status in ("pending", "running") and (existing.params or {}).get("backup_id") == backup_id:
+            return {
+                "status": "ok",
+                "message": f"Restore already in progress ({existing.status})",
+                "task_id": existing.task_id,
+                "task_status": existing.status,
+            }
 
-        for article_data in articles_data:
-            # 检查文章是否已存在（根据 external_id）
-            existing = await session.execute(
-                select(Article).where(Article.external_id == article_data.get("external_id"))
-            )
-            if existing.scalar_one_or_none():
-                skipped_count += 1
-                continue
-
-            # 创建新文章记录
-            from datetime import datetime
-            article = Article(
-                source_type=article_data.get("source_type"),
-                source_id=article_data.get("source_id"),
-                external_id=article_data.get("external_id"),
-                title=article_data.get("title"),
-                url=article_data.get("url"),
-                author=article_data.get("author"),
-                summary=article_data.get("summary"),
-                content=article_data.get("content"),
-                category=article_data.get("category"),
-                tags=article_data.get("tags"),
-                publish_time=datetime.fromisoformat(article_data["publish_time"]) if article_data.get("publish_time") else None,
-                crawl_time=datetime.fromisoformat(article_data["crawl_time"]) if article_data.get("crawl_time") else None,
-            )
-            session.add(article)
-            restored_count += 1
+    task = await task_manager.create_task(
+        task_type=RESTORE_TASK_TYPE,
+        name=f"恢复备份 #{backup_id}",
+        params={"backup_id": backup_id, "backup_file": str(backup_path)},
+        created_by=admin.id if admin is not None else None,
+    )
 
-        await session.commit()
+    async def run_restore():
+        async def update_progress(progress: int, message: str):
+            await task_manager.update_progress(task.task_id, progress, message)
 
-        return {
-            "status": "ok",
-            "message": f"Restore completed",
-            "restored_count": restored_count,
-            "skipped_count": skipped_count,
-            "total_in_backup": len(articles_data),
-        }
+        return await restore_backup_file(backup_path, progress_callback=update_progress)
 
-    except Exception as e:
-        await session.rollback()
-        logger.error(f"Restore failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Restore failed: {str(e)}")
+    asyncio.create_task(task_manager.run_in_background(task, run_restore))
+
+    return {
+        "status": "ok",
+        "message": "Restore started",
+        "task_id": task.task_id,
+        "task_status": "pending",
+    }
+
+
+@router.get("/backups/restore-tasks/{task_id}")
+async def get_restore_task(
+    task_id: str,
+    admin: Superuser = None,
+) -> Dict[str, Any]:
+    """Get the status and progress of a backup restore task.
+
+    Args:
+        task_id: Task ID returned by the restore endpoint.
+        admin: Superuser dependency.
+
+    Returns:
+        Dict[str, Any]: Task status, progress and result.
+
+    Raises:
+        HTTPException: If the task does not exist.
+    """
+    from apps.task_manager import TaskManager
+
+    task = await TaskManager().get_task(task_id)
+    if task is None or task.task_type != RESTORE_TASK_TYPE:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return {"status": "ok", "task": _restore_task_payload(task)}
 
 
 @router.delete("/backups/{backup_id}")
@@ -1585,7 +1636,15 @@ async def delete_backup(
     if delete_file:
         backup_path = Path(backup_file)
         if backup_path.exists():
-            backup_path.unlink()
+            from common.archive import is_archive
+            if is_archive(backup_path):
+                # 流式归档：删除整个归档目录及下载时生成的 tar 包
+                import shutil
+                archive_dir = backup_path.parent
+                shutil.rmtree(archive_dir)
+                archive_dir.with_name(archive_dir.name + ".tar").unlink(missing_ok=True)
+            else:
+                backup_path.unlink()
             return {
                 "status": "ok",
                 "message": "Backup record and file deleted",
@@ -2243,6 +2302,8 @@ class AIConfigUpdate(BaseModel):
     batch_concurrency: Optional[int] = None
     fallback_provider: Optional[str] = None
     translate_max_tokens: Optional[int] = None
+    adaptive_concurrency: Optional[bool] = None
+    adaptive_max_concurrency: Optional[int] = None
 
 
 @router.get("/ai/config")
@@ -2252,8 +2313,11 @@ async def get_ai_config(
     """Get AI configuration settings.
 
     Returns:
-        Dict[str, Any]: Current AI provider settings and runtime options.
+        Dict[str, Any]: Current AI provider settings and runtime options,
+        plus the adaptive concurrency state of provider limiters in this process.
     """
+    from apps.ai_processor.providers.limiter import limiter_stats
+
     return {
         "status": "ok",
         "config": {
@@ -2292,7 +2356,11 @@ async def get_ai_config(
             "batch_concurrency": feature_config.get_int("ai.batch_concurrency", 1),
             "fallback_provider": feature_config.get("ai.fallback_provider", ""),
             "translate_max_tokens": feature_config.get_int("ai.translate_max_tokens", 4096),
-        }
+            "adaptive_concurrency": feature_config.get_bool("ai.adaptive_concurrency", True),
+            "adaptive_max_concurrency": feature_config.get_int("ai.adaptive_max_concurrency", 16),
+        },
+        # 各推理后端的自适应限流状态：当前上限、在途/排队请求数、延迟分位数
+        "concurrency": limiter_stats(),
     }
 
 
@@ -2405,6 +2473,12 @@ async def update_ai_config(
     if update.translate_max_tokens is not None:
         await feature_config.async_set("ai.translate_max_tokens", str(update.translate_max_tokens), updated_by=admin.id)
         updates.append("translate_max_tokens")
+    if update.adaptive_concurrency is not None:
+        await feature_config.async_set("ai.adaptive_concurrency", "true" if update.adaptive_concurrency else "false", updated_by=admin.id)
+        updates.append("adaptive_concurrency")
+    if update.adaptive_max_concurrency is not None:
+        await feature_config.async_set("ai.adaptive_max_concurrency", str(update.adaptive_max_concurrency), updated_by=admin.id)
+        updates.append("adaptive_max_concurrency")
 
     return {"status": "ok", "message": f"AI configuration updated: {', '.join(updates)}"}
 
@@ -4996,6 +5070,8 @@ async def create_role(
         permissions = perm_result.scalars().all()
         role.permissions = list(permissions)
 
+    # 角色定义变更影响所有用户的权限集合
+    invalidate_principal(session=session)
     return {"status": "ok", "role_id": role.id, "message": f"Role '{data.name}' created"}
 
 
@@ -5031,6 +5107,7 @@ async def update_role(
         permissions = perm_result.scalars().all()
         role.permissions = list(permissions)
 
+    invalidate_principal(session=session)
     return {"status": "ok", "message": f"Role '{role.name}' updated"}
 
 
@@ -5062,6 +5139,7 @@ async def delete_role(
         )
 
     await session.delete(role)
+    invalidate_principal(session=session)
     return {"status": "ok", "message": f"Role '{role.name}' deleted"}
 
 
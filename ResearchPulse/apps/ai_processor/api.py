@@ -17,7 +17,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import Integer, func, select
+from sqlalchemy import Integer, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_session
@@ -137,7 +137,13 @@ async def get_token_stats(
             func.sum(AIProcessingLog.cached.cast(Integer)).label("cached_calls"),  # 缓存命中次数
             func.sum(AIProcessingLog.input_chars).label("total_input_chars"),    # 总输入字符数
             func.sum(AIProcessingLog.output_chars).label("total_output_chars"),  # 总输出字符数
-            func.avg(AIProcessingLog.duration_ms).label("avg_duration_ms"),      # 平均处理耗时（毫秒）
+            # 平均处理耗时（毫秒）只统计实际调用模型的记录
+            func.avg(case((AIProcessingLog.cached.is_(False), AIProcessingLog.duration_ms))).label("avg_duration_ms"),
+            # 缓存命中记录的 duration_ms 为原始调用耗时，求和即为节省的推理时间
+            func.sum(case((AIProcessingLog.cached.is_(True), AIProcessingLog.duration_ms), else_=0)).label("saved_duration_ms"),
+            # 流式调用的首 token 耗时与生成速度（非流式记录为 NULL，不参与平均）
+            func.avg(AIProcessingLog.ttft_ms).label("avg_ttft_ms"),
+            func.avg(AIProcessingLog.tokens_per_sec).label("avg_tokens_per_sec"),
             func.sum((~AIProcessingLog.success).cast(Integer)).label("failed_calls"),  # 失败次数（对 success 取反后求和）
         )
         .where(AIProcessingLog.created_at >= cutoff)
@@ -160,6 +166,9 @@ async def get_token_stats(
             total_input_chars=row.total_input_chars or 0,
             total_output_chars=row.total_output_chars or 0,
             avg_duration_ms=float(row.avg_duration_ms or 0),
+            saved_duration_ms=int(row.saved_duration_ms or 0),
+            avg_ttft_ms=float(row.avg_ttft_ms) if row.avg_ttft_ms is not None else None,
+            avg_tokens_per_sec=float(row.avg_tokens_per_sec) if row.avg_tokens_per_sec is not None else None,
             failed_calls=row.failed_calls or 0,
         )
         for row in rows
@@ -4,7 +4,7 @@
 # 架构角色: AI 处理器子系统的公共翻译函数
 # 设计理念:
 #   1. 单一职责：仅负责文章批量翻译，不含其他 AI 处理逻辑
-#   2. 批量并发：先收集所有待翻译文本，再通过 translate_batch 分批并发翻译
+#   2. 批量打包：先收集所有待翻译文本，再通过 translate_batch 分批翻译（多段文本打包进一次请求）
 #   3. 分批保护：batch_size 控制每批文本量，batch_delay 批间延迟，兼容限速 provider
 #   4. 乐观锁：使用 updated_at 作为版本号，避免多进程并发冲突
 #   5. 可复用：供 apps/crawler/translate_hook.py 和 scripts/ 共同调用
@@ -4,6 +4,7 @@
 # 本模块定义了 AI 处理操作相关的数据库 ORM 模型，包括：
 #   - AIProcessingLog: 每次 AI 处理调用的详细日志记录
 #   - TokenUsageStat: 按日期聚合的 token/字符使用统计
+#   - AIResultCacheEntry: 按内容哈希寻址的 AI 分析结果缓存
 # 这些模型用于追踪 AI 处理的成本、性能和可靠性指标，
 # 是系统可观测性的重要组成部分。
 # =============================================================================
@@ -14,7 +15,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from sqlalchemy import BigInteger, DateTime, Integer, String, Text, Float
+from sqlalchemy import BigInteger, DateTime, Integer, String, Text, Float, UniqueConstraint
 from sqlalchemy.dialects.mysql import JSON
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -75,10 +76,19 @@ class AIProcessingLog(Base, TimestampMixin):
     error_message: Mapped[str] = mapped_column(
         Text, nullable=True, comment="Error message if failed",
     )
-    # 是否命中缓存（已处理过的文章再次请求时返回缓存结果）
+    # 是否命中缓存（相同内容的分析结果直接复用，未调用模型）
+    # 命中缓存时 duration_ms 记录原始调用的耗时，即本次节省的推理时间
     cached: Mapped[bool] = mapped_column(
         default=False, comment="Whether result was from cache",
     )
+    # 流式调用的首 token 耗时（毫秒），非流式或缓存命中时为 None
+    ttft_ms: Mapped[int | None] = mapped_column(
+        Integer, nullable=True, comment="Time to first token in milliseconds (streaming)",
+    )
+    # 流式调用首 token 之后的生成速度（token/秒）
+    tokens_per_sec: Mapped[float | None] = mapped_column(
+        Float, nullable=True, comment="Generation speed after the first token (streaming)",
+    )
 
 
 # -----------------------------------------------------------------------------
@@ -118,3 +128,71 @@ class TokenUsageStat(Base, TimestampMixin):
     total_duration_ms: Mapped[int] = mapped_column(Integer, default=0)
     # 当日失败调用次数
     failed_calls: Mapped[int] = mapped_column(Integer, default=0)
+
+
+# -----------------------------------------------------------------------------
+# AI 结果缓存模型
+# 以 (内容哈希, 任务类型, 模型) 为键保存 AI 分析结果。
+# 同一篇新闻稿或论文摘要经由 arXiv / RSS / HN / Reddit 等多个来源重复到达时，
+# 直接复用已有结果，不再调用模型。
+# 设计决策：
+#   - 内容哈希由 providers.base.get_content_hash(标题, 正文) 计算，只要内容相同即命中，
+#     与文章 ID、来源无关
+#   - 键中包含模型名称，切换模型后自然失效，不会混用不同模型的输出
+#   - last_used_at 建立索引，容量超限时按最近使用时间淘汰（LRU）
+#   - duration_ms 保存原始调用耗时，命中时写入处理日志用于统计节省的推理时间
+# -----------------------------------------------------------------------------
+class AIResultCacheEntry(Base, TimestampMixin):
+    """Content-addressed cache of AI analysis results."""
+
+    __tablename__ = "ai_result_cache"
+
+    # 主键，自增 ID
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # 内容哈希（标题 + 正文）
+    content_hash: Mapped[str] = mapped_column(
+        String(64), nullable=False, comment="Hash of title + content",
+    )
+    # 任务类型（content_high / content_low / paper_full）
+    task_type: Mapped[str] = mapped_column(
+        String(50), nullable=False, comment="Task type",
+    )
+    # 生成结果的模型名称
+    model: Mapped[str] = mapped_column(
+        String(100), nullable=False, comment="Model name",
+    )
+    # 生成结果的 AI 服务提供商
+    provider: Mapped[str] = mapped_column(
+        String(50), nullable=False, default="", comment="AI provider",
+    )
+    # 结构化分析结果（摘要、分类、评分、要点等）
+    result: Mapped[dict] = mapped_column(
+        JSON, nullable=False, comment="Structured AI result",
+    )
+    # 原始调用的输入/输出字符数与耗时
+    input_chars: Mapped[int] = mapped_column(Integer, default=0)
+    output_chars: Mapped[int] = mapped_column(Integer, default=0)
+    duration_ms: Mapped[int] = mapped_column(
+        Integer, default=0, comment="Duration of the original call in milliseconds",
+    )
+    # 命中次数
+    hit_count: Mapped[int] = mapped_column(Integer, default=0)
+    # 最近一次写入或命中时间，用于 LRU 淘汰
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True,
+        comment="Last write or hit time (LRU eviction)",
+    )
+    # 结果写入时间，TTL 从此计算；命中不刷新，热点条目同样会过期
+    stored_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        comment="Time the result was stored (TTL base)",
+    )
+
+    __table_args__ = (
+        UniqueConstraint("content_hash", "task_type", "model", name="uq_ai_result_cache_key"),
+    )
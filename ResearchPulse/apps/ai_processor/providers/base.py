@@ -11,6 +11,7 @@
 #                  PAPER_PROMPT（学术论文分析）
 #   - 工具函数: normalize_category, smart_truncate, get_content_hash,
 #              parse_json_response, _parse_with_regex
+#   - 打包翻译: estimate_tokens, pack_texts, split_numbered_translations
 #   - BaseAIProvider: 抽象基类，定义 Provider 接口
 # =============================================================================
 
@@ -18,12 +19,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
+import logging
 import re
 from abc import ABC, abstractmethod
 from typing import Optional
 
+from common.feature_config import feature_config
+
+logger = logging.getLogger(__name__)
+
 
 # -----------------------------------------------------------------------------
 # 分类体系定义
@@ -156,6 +163,9 @@ BATCH_TRANSLATE_PROMPT = """将以下 {count} 段英文分别翻译成中文，
 待翻译内容：
 {items}"""
 
+# 打包翻译响应中的编号行，兼容全角括号：[1] 译文 / 【1】译文
+_NUMBERED_LINE_RE = re.compile(r"^\s*[\[【](\d+)[\]】]\s*(.*)$")
+
 
 def normalize_category(category: str) -> str:
     """Normalize category to a valid value.
@@ -251,6 +261,90 @@ def get_content_hash(title: str, content: str) -> str:
     return hashlib.sha256(combined.encode()).hexdigest()[:16]
 
 
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text.
+
+    粗略估算 token 数：CJK 字符按 1 字 1 token，其他字符按 4 字符 1 token。
+    仅用于打包翻译时控制单次请求规模，不要求精确。
+
+    Args:
+        text: Input text.
+
+    Returns:
+        int: Estimated token count.
+    """
+    cjk = sum(1 for ch in text if ch >= "\u2e80")
+    return cjk + (len(text) - cjk) // 4 + 1
+
+
+def pack_texts(texts: list[str], token_budget: int, max_items: int) -> list[list[int]]:
+    """Group text indices into packs under a token budget.
+
+    按原始顺序将文本下标分组，每组估算 token 总数不超过 token_budget，
+    条目数不超过 max_items。单条超出预算的文本独占一组（按单条翻译处理）。
+
+    Args:
+        texts: Texts to translate.
+        token_budget: Max estimated input tokens per pack.
+        max_items: Max texts per pack.
+
+    Returns:
+        list[list[int]]: Index groups in input order.
+    """
+    packs: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for idx, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_items):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(idx)
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+def split_numbered_translations(response: str, count: int) -> list[str | None]:
+    """Split a numbered batch translation response into items.
+
+    解析 "[编号] 译文" 格式的打包翻译响应。
+    校验规则：编号必须在 1..count 范围内；重复出现的编号视为不可信，
+    该条目记为 None；编号行之后的非编号行视为上一条译文的续行。
+
+    Args:
+        response: Raw model response.
+        count: Number of texts in the pack.
+
+    Returns:
+        list[str | None]: Translation per item (None when missing or invalid).
+    """
+    results: list[str | None] = [None] * count
+    duplicated: set[int] = set()
+    current: int | None = None
+    for line in response.splitlines():
+        match = _NUMBERED_LINE_RE.match(line)
+        if match:
+            idx = int(match.group(1)) - 1
+            current = None
+            if not 0 <= idx < count:
+                continue
+            if results[idx] is not None:
+                duplicated.add(idx)
+                continue
+            results[idx] = match.group(2).strip()
+            current = idx
+        elif current is not None and line.strip():
+            results[current] = f"{results[current]} {line.strip()}".strip()
+    return [None if idx in duplicated else (text or None) for idx, text in enumerate(results)]
+
+
+def _single_line(text: str) -> str:
+    """Collapse whitespace so a text fits on one numbered line."""
+    return " ".join(text.split())
+
+
 def parse_json_response(response: str) -> dict:
     """Parse JSON from AI response, handling markdown code blocks.
 
@@ -327,6 +421,11 @@ class BaseAIProvider(ABC):
     AI 服务提供商抽象基类。
     """
 
+    @property
+    def model_name(self) -> str:
+        """Name of the model used by ``process_content`` (keys the result cache)."""
+        return getattr(self, "_model", None) or "unknown"
+
     @abstractmethod
     async def process_content(self, title: str, content: str, task_type: str = "content_high") -> dict:
         """Process content and return structured result dict.
@@ -347,34 +446,112 @@ class BaseAIProvider(ABC):
         """Translate text to Chinese. Returns None if not implemented."""
         return None
 
+    async def _generate_text(self, prompt: str, max_tokens: int) -> str | None:
+        """Run a plain text completion. Returns None if not implemented.
+
+        执行一次纯文本生成（用于打包翻译）。子类按需覆写；
+        未实现时打包翻译自动回退为逐条 translate()。
+
+        Args:
+            prompt: Prompt text.
+            max_tokens: Max output tokens.
+
+        Returns:
+            str | None: Model output with think tags removed, or None.
+        """
+        return None
+
+    async def _translate_packed(self, texts: list[str]) -> list[str | None]:
+        """Translate several texts with one numbered prompt.
+
+        将多段文本编号后放入同一个 prompt 翻译，并按编号拆分校验结果。
+        与原文相同（未翻译）的条目视为失败。
+
+        Args:
+            texts: Texts in the pack.
+
+        Returns:
+            list[str | None]: Translation per text (None for failed items).
+        """
+        lines = [_single_line(text) for text in texts]
+        prompt = BATCH_TRANSLATE_PROMPT.format(
+            count=len(lines),
+            items="\n".join(f"[{n}] {line}" for n, line in enumerate(lines, 1)),
+        )
+        response = await self._generate_text(
+            prompt, feature_config.get_int("ai.translate_max_tokens", 4096)
+        )
+        if not response:
+            return [None] * len(texts)
+        parsed = split_numbered_translations(response, len(texts))
+        return [
+            translated if translated and translated != line else None
+            for translated, line in zip(parsed, lines)
+        ]
+
     async def translate_batch(self, texts: list[str], concurrency: int = 5) -> list[str | None]:
-        """Translate multiple texts to Chinese concurrently.
+        """Translate multiple texts to Chinese.
 
-        批量翻译（并发实现），提高翻译效率。
-        使用 asyncio.gather 并发调用 translate()，失败的项目返回 None。
+        批量翻译。启用 ai.translate_pack_enabled 时按 token 预算将多段文本打包进
+        同一个编号 prompt，一次调用翻译一组，减少每条文本的 prompt 开销和调用次数；
+        打包响应中缺失或无法解析的条目自动回退为逐条 translate()。
+        失败的项目返回 None。
 
         Args:
             texts: List of texts to translate.
-            concurrency: Maximum concurrent translations (default 5).
+            concurrency: Maximum concurrent requests (default 5).
 
         Returns:
             List of translated texts (None for failed items).
         """
-        import asyncio
-
+        results: list[str | None] = [None] * len(texts)
         semaphore = asyncio.Semaphore(concurrency)
 
-        async def translate_with_limit(text: str) -> str | None:
+        async def translate_single(idx: int) -> None:
             async with semaphore:
                 try:
-                    return await self.translate(text)
+                    results[idx] = await self.translate(texts[idx])
                 except Exception:
-                    return None
+                    results[idx] = None
 
-        # 并发执行所有翻译任务
-        tasks = [translate_with_limit(text) for text in texts]
-        results = await asyncio.gather(*tasks)
-        return list(results)
+        async def translate_pack(indices: list[int]) -> None:
+            async with semaphore:
+                try:
+                    packed = await self._translate_packed([texts[i] for i in indices])
+                except Exception as e:
+                    logger.debug(f"Packed translation failed ({len(indices)} texts): {e}")
+                    packed = [None] * len(indices)
+            retry = []
+            for idx, translated in zip(indices, packed):
+                if translated:
+                    results[idx] = translated
+                else:
+                    retry.append(idx)
+            if retry:
+                logger.debug(f"Packed translation fallback: {len(retry)}/{len(indices)} texts")
+                await asyncio.gather(*(translate_single(idx) for idx in retry))
+
+        pending = [idx for idx, text in enumerate(texts) if text and text.strip()]
+        if feature_config.get_bool("ai.translate_pack_enabled", True):
+            # 输出（中文）token 数通常不少于输入，预算不超过输出上限的一半，避免译文被截断
+            token_budget = min(
+                feature_config.get_int("ai.translate_pack_token_budget", 1500),
+                feature_config.get_int("ai.translate_max_tokens", 4096) // 2,
+            )
+            max_items = feature_config.get_int("ai.translate_pack_max_items", 20)
+            groups = [
+                [pending[i] for i in group]
+                for group in pack_texts([texts[i] for i in pending], token_budget, max_items)
+            ]
+        else:
+            groups = [[idx] for idx in pending]
+
+        tasks = [
+            translate_pack(group) if len(group) > 1 else translate_single(group[0])
+            for group in groups
+        ]
+        await asyncio.gather(*tasks)
+        return results
 
     async def close(self) -> None:
         """Release resources held by the provider.
@@ -0,0 +1,315 @@
+# =============================================================================
+# 模块: apps/ai_processor/providers/limiter.py
+# 功能: AI Provider 的自适应并发限流器
+# 架构角色: OllamaProvider / OpenAIProvider 共用的并发控制基础设施。
+#           每个推理后端（Provider 类型 + Base URL）对应一个进程内共享的限流器，
+#           并发批处理中各任务各自创建的 Provider 实例共享同一个限流器。
+# 设计理念:
+#   1. AIMD：p50 延迟保持平稳且并发已用满时，并发上限 +1（加性增）；
+#      超时或 429/503/504 时上限减半（乘性减）
+#   2. 延迟梯度：窗口 p50 超过基线 p50 的 latency_tolerance 倍，说明后端已开始排队，
+#      上限小幅下调；基线取观测到的最低 p50，并缓慢向当前值漂移以适应模型/负载变化
+#   3. 同一次拥塞只退避一次：退避前已发出的请求随后失败不再重复减半
+#   4. 重试也经过限流器，tenacity 重试不会在后端过载时放大请求量
+#   5. 等待队列使用按需创建的 Future，不绑定事件循环，可跨 asyncio.run 复用
+# =============================================================================
+
+"""Adaptive concurrency limiter shared by AI providers.
+
+Usage:
+    limiter = get_limiter(f"ollama:{base_url}")
+    async with limiter.slot():
+        response = await client.post(...)
+        response.raise_for_status()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+import httpx
+
+from common.feature_config import feature_config
+
+logger = logging.getLogger(__name__)
+
+# 视为后端过载的 HTTP 状态码
+OVERLOAD_STATUS_CODES = frozenset({429, 503, 504})
+
+# 用于统计延迟分位数的样本数
+_STATS_WINDOW = 200
+# 调整并发上限所需的最少样本数
+_MIN_ADJUST_SAMPLES = 8
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Return whether an exception signals backend overload.
+
+    超时与 429/503/504 视为过载信号；其他错误（如 400、解析失败）与并发无关。
+    """
+    if isinstance(error, httpx.TimeoutException):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in OVERLOAD_STATUS_CODES
+    return False
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter driven by latency and overload feedback.
+
+    根据延迟与过载反馈自动调整并发上限的限流器。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_tolerance: float = 1.5,
+        backoff_ratio: float = 0.5,
+        adaptive: bool = True,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            name: Limiter name (provider type + base URL).
+            initial_limit: Starting concurrency limit.
+            min_limit: Lower bound of the limit.
+            max_limit: Upper bound of the limit.
+            latency_tolerance: Max ratio of window p50 to baseline p50 before
+                the limit is reduced.
+            backoff_ratio: Multiplier applied to the limit on overload.
+            adaptive: When False the limit stays fixed at ``max_limit``.
+        """
+        self.name = name
+        self.backoff_ratio = backoff_ratio
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # 降低上限时递增；请求记录自己开始时的 epoch，用于同一次拥塞只退避一次
+        self._epoch = 0
+        self._recent: List[float] = []
+        self._latencies: Deque[float] = deque(maxlen=_STATS_WINDOW)
+        self._baseline: Optional[float] = None
+        self._successes = 0
+        self._overloads = 0
+        self.configure(min_limit, max_limit, latency_tolerance, adaptive)
+
+    def configure(
+        self,
+        min_limit: int,
+        max_limit: int,
+        latency_tolerance: float,
+        adaptive: bool,
+    ) -> None:
+        """Apply (possibly changed) bounds and mode.
+
+        更新上下限与模式，运行时修改配置后立即生效。
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_tolerance = max(1.0, latency_tolerance)
+        self.adaptive = adaptive
+        if adaptive:
+            self._limit = min(float(self.max_limit), max(float(self.min_limit), self._limit))
+        else:
+            self._limit = float(self.max_limit)
+        self._wake()
+
+    @property
+    def limit(self) -> int:
+        """Current integer concurrency limit."""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently holding a slot."""
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        while self._in_flight >= self.limit:
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                # 已被唤醒但随即取消：把名额让给下一个等待者
+                if fut.done() and not fut.cancelled():
+                    self._wake()
+                raise
+            finally:
+                try:
+                    self._waiters.remove(fut)
+                except ValueError:
+                    pass
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    def release(self) -> None:
+        """Return a slot and wake waiters."""
+        self._in_flight = max(0, self._in_flight - 1)
+        self._wake()
+
+    def _wake(self) -> None:
+        """Wake as many waiters as there are free slots."""
+        free = self.limit - self._in_flight
+        for fut in list(self._waiters):
+            if free <= 0:
+                break
+            if not fut.done():
+                fut.set_result(None)
+                free -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for one request and record its outcome.
+
+        占用一个并发名额执行一次请求：成功记录延迟，过载异常触发退避。
+        """
+        await self.acquire()
+        epoch = self._epoch
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            if is_overload_error(e):
+                self.record_overload(epoch)
+            raise
+        else:
+            self.record_success(time.monotonic() - start)
+        finally:
+            self.release()
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful request latency (seconds)."""
+        self._successes += 1
+        self._latencies.append(latency)
+        if not self.adaptive:
+            return
+        self._recent.append(latency)
+        if len(self._recent) < max(_MIN_ADJUST_SAMPLES, self.limit):
+            return
+
+        p50 = statistics.median(self._recent)
+        self._recent.clear()
+        baseline = self._baseline
+        if baseline is None or p50 < baseline:
+            self._baseline = p50
+        else:
+            # 基线缓慢向当前值漂移，适应模型或 prompt 长度的变化
+            self._baseline = baseline * 0.95 + p50 * 0.05
+
+        if baseline is not None and p50 > baseline * self.latency_tolerance:
+            # 延迟上升：后端已开始排队，小幅降低上限
+            self._set_limit(self._limit * 0.9)
+            self._epoch += 1
+        elif self._peak_in_flight >= self.limit:
+            # 延迟平稳且并发已用满：加性增长
+            self._set_limit(self._limit + 1)
+        self._peak_in_flight = self._in_flight
+
+    def record_overload(self, epoch: Optional[int] = None) -> None:
+        """Record a timeout or 429/503 and back off.
+
+        Args:
+            epoch: Limiter epoch when the failed request started. Failures of
+                requests issued before the last decrease are not counted again.
+        """
+        self._overloads += 1
+        if not self.adaptive:
+            return
+        if epoch is not None and epoch < self._epoch:
+            return
+        previous = self.limit
+        self._set_limit(self._limit * self.backoff_ratio)
+        self._epoch += 1
+        self._recent.clear()
+        logger.info(f"AI limiter {self.name}: overload, limit {previous} -> {self.limit}")
+
+    def _set_limit(self, value: float) -> None:
+        self._limit = min(float(self.max_limit), max(float(self.min_limit), value))
+        self._wake()
+
+    def snapshot(self) -> dict:
+        """Return current limit, load and latency percentiles.
+
+        返回当前并发上限、在途/排队请求数与延迟分位数（毫秒），供管理后台展示。
+        """
+        latencies = sorted(self._latencies)
+
+        def to_ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "name": self.name,
+            "adaptive": self.adaptive,
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_flight": self._in_flight,
+            "queued": sum(1 for fut in self._waiters if not fut.done()),
+            "p50_ms": to_ms(_percentile(latencies, 50)),
+            "p90_ms": to_ms(_percentile(latencies, 90)),
+            "p99_ms": to_ms(_percentile(latencies, 99)),
+            "baseline_p50_ms": to_ms(self._baseline),
+            "successes": self._successes,
+            "overloads": self._overloads,
+        }
+
+
+# 进程内限流器注册表：名称 -> 限流器
+_limiters: Dict[str, AdaptiveLimiter] = {}
+
+
+def get_limiter(name: str) -> AdaptiveLimiter:
+    """Return the shared limiter for a backend, applying current config.
+
+    获取（必要时创建）指定后端的共享限流器，并应用 ai.adaptive_* 配置。
+
+    Args:
+        name: Backend name, e.g. ``"ollama:http://localhost:11434"``.
+
+    Returns:
+        AdaptiveLimiter: Shared limiter.
+    """
+    adaptive = feature_config.get_bool("ai.adaptive_concurrency", True)
+    min_limit = feature_config.get_int("ai.adaptive_min_concurrency", 1)
+    max_limit = feature_config.get_int("ai.adaptive_max_concurrency", 16)
+    tolerance = feature_config.get_float("ai.adaptive_latency_tolerance", 1.5)
+
+    limiter = _limiters.get(name)
+    if limiter is None:
+        limiter = AdaptiveLimiter(
+            name,
+            initial_limit=feature_config.get_int("ai.adaptive_initial_concurrency", 4),
+            min_limit=min_limit,
+            max_limit=max_limit,
+            latency_tolerance=tolerance,
+            adaptive=adaptive,
+        )
+        _limiters[name] = limiter
+    else:
+        limiter.configure(min_limit, max_limit, tolerance, adaptive)
+    return limiter
+
+
+def limiter_stats() -> List[dict]:
+    """Return snapshots of all provider limiters in this process."""
+    return [limiter.snapshot() for limiter in _limiters.values()]
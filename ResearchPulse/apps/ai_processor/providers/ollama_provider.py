@@ -13,6 +13,7 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import time
 
@@ -24,6 +25,8 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 from settings import settings
 from common.feature_config import feature_config
 from .base import BaseAIProvider, parse_json_response
+from .limiter import get_limiter
+from .streaming import StreamingJSONCollector
 
 logger = logging.getLogger(__name__)
 
@@ -45,8 +48,10 @@ def _strip_think_tags(text: str) -> str:
 # 通过 HTTP 调用本地 Ollama 服务的 /api/generate 端点完成内容分析。
 # 设计决策：
 #   - 使用 httpx 异步客户端，与 FastAPI 的异步架构保持一致
-#   - stream=False：关闭流式输出，一次性获取完整响应，简化解析逻辑
+#   - 内容分析默认流式读取（ai.stream_enabled），解析出完整 JSON 即关闭请求；
+#     关闭后回退为 stream=False 一次性获取完整响应
 #   - keep_alive="300s"：保持模型在内存中 5 分钟，避免频繁加载卸载
+#   - 请求经过按 Base URL 共享的自适应限流器，并发随延迟与过载反馈调整
 # -----------------------------------------------------------------------------
 class OllamaProvider(BaseAIProvider):
     """Ollama HTTP API provider for local LLM processing.
@@ -79,6 +84,8 @@ class OllamaProvider(BaseAIProvider):
         self._api_key = api_key if api_key is not None else (feature_config.get("ai.ollama_api_key") or settings.ollama_api_key)
         # 持久化 HTTP 客户端，复用 TCP 连接，避免每次请求创建新连接
         self._client: httpx.AsyncClient | None = None
+        # 同一 Ollama 服务的所有 Provider 实例共享一个自适应并发限流器
+        self._limiter = get_limiter(f"ollama:{self._base_url}")
 
     def _get_client(self) -> httpx.AsyncClient:
         """Get or create the persistent HTTP client.
@@ -96,7 +103,11 @@ class OllamaProvider(BaseAIProvider):
                     write=30.0,             # 写入超时 30 秒
                     pool=10.0,              # 连接池等待超时 10 秒
                 ),
-                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                # 连接数不低于限流器上限，实际并发由限流器控制
+                limits=httpx.Limits(
+                    max_connections=max(10, self._limiter.max_limit),
+                    max_keepalive_connections=5,
+                ),
             )
         return self._client
 
@@ -180,6 +191,7 @@ class OllamaProvider(BaseAIProvider):
 
         带重试逻辑的 Ollama API 调用。
         使用 tenacity 实现指数退避重试，应对网络抖动、服务临时不可用等瞬时故障。
+        每次尝试都占用自适应限流器的一个并发名额。
 
         Args:
             payload: Ollama API request body.
@@ -192,30 +204,69 @@ class OllamaProvider(BaseAIProvider):
             httpx.RequestError: On non-retryable connection errors.
         """
         client = self._get_client()
-        response = await client.post(
-            f"{self._base_url}/api/generate",
-            headers=self._get_headers(),
-            json=payload,
-        )
-        response.raise_for_status()
-        return response.json()
+        async with self._limiter.slot():
+            response = await client.post(
+                f"{self._base_url}/api/generate",
+                headers=self._get_headers(),
+                json=payload,
+            )
+            response.raise_for_status()
+            return response.json()
 
-    async def translate(self, text: str) -> str | None:
-        """Translate English text to Chinese using Ollama.
+    async def _stream_api(self, payload: dict) -> StreamingJSONCollector:
+        """Stream an Ollama generation until a complete JSON object arrives.
 
-        复用 _call_api() 发送翻译请求。
-        对支持 thinking 的模型（如 qwen3）自动添加 /no_think 指令，
-        并清洗可能残留的 <think> 标签内容，避免思维链泄露到翻译结果中。
+        流式调用 /api/generate：思维链在到达时丢弃，解析出完整且合法的 JSON
+        对象后立即关闭连接（Ollama 随即停止生成），释放后端与限流器名额。
 
         Args:
-            text: English text to translate.
+            payload: Ollama API request body (``stream`` is forced on).
 
         Returns:
-            str | None: Translated Chinese text, or None on failure.
+            StreamingJSONCollector: Collected output, parsed result and timings.
+
+        Raises:
+            httpx.HTTPStatusError: On HTTP errors.
+            httpx.RequestError: On connection errors.
         """
-        from .base import TRANSLATE_PROMPT
-        prompt = TRANSLATE_PROMPT.format(text=text)
+        client = self._get_client()
+        async with self._limiter.slot():
+            # 拿到限流名额后再开始计时，排队时间不计入首 token 耗时
+            collector = StreamingJSONCollector()
+            async with client.stream(
+                "POST",
+                f"{self._base_url}/api/generate",
+                headers=self._get_headers(),
+                json={**payload, "stream": True},
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(f"Ollama stream error: {chunk['error']}")
+                    # 每个分块对应一个 token
+                    if collector.feed(chunk.get("response", "")) or chunk.get("done"):
+                        break
+        return collector
+
+    async def _generate_text(self, prompt: str, max_tokens: int) -> str | None:
+        """Run a plain text completion via /api/generate.
+
+        翻译类任务共用的纯文本生成。
+        对支持 thinking 的模型（如 qwen3）自动添加 /no_think 指令，
+        并清洗可能残留的 <think> 标签内容，避免思维链泄露到结果中。
+
+        Args:
+            prompt: Prompt text.
+            max_tokens: Max output tokens.
 
+        Returns:
+            str | None: Cleaned model output, or None if empty.
+        """
         # 翻译任务始终禁用模型思考模式，避免思维链污染翻译结果
         if feature_config.get_bool("ai.no_think", settings.ai_no_think):
             prompt = f"/no_think\n{prompt}"
@@ -224,14 +275,30 @@ class OllamaProvider(BaseAIProvider):
             "model": self._model,
             "prompt": prompt,
             "stream": False,
-            "options": {"temperature": 0.1, "num_predict": feature_config.get_int("ai.translate_max_tokens", 4096)},
+            "options": {"temperature": 0.1, "num_predict": max_tokens},
         }
+        result = await self._call_api(payload)
+        # 兜底清洗：移除模型可能输出的 <think>...</think> 思维链标签
+        text = _strip_think_tags(result.get("response", "").strip())
+        return text or None
+
+    async def translate(self, text: str) -> str | None:
+        """Translate English text to Chinese using Ollama.
+
+        复用 _generate_text() 发送翻译请求。
+
+        Args:
+            text: English text to translate.
+
+        Returns:
+            str | None: Translated Chinese text, or None on failure.
+        """
+        from .base import TRANSLATE_PROMPT
         try:
-            result = await self._call_api(payload)
-            translated = result.get("response", "").strip()
-            # 兜底清洗：移除模型可能输出的 <think>...</think> 思维链标签
-            translated = _strip_think_tags(translated)
-            return translated if translated else None
+            return await self._generate_text(
+                TRANSLATE_PROMPT.format(text=text),
+                feature_config.get_int("ai.translate_max_tokens", 4096),
+            )
         except Exception as e:
             logger.warning(f"Translation failed: {e}")
             return None
@@ -282,19 +349,27 @@ class OllamaProvider(BaseAIProvider):
         start_time = time.time()
         try:
             # 使用 tenacity 重试包装器调用 API，应对网络抖动和临时限流
-            retrying_call = retry(
+            retrying = retry(
                 stop=stop_after_attempt(feature_config.get_int("ai.max_retries", settings.ai_max_retries)),
                 wait=wait_exponential(multiplier=feature_config.get_float("ai.retry_base_delay", settings.ai_retry_base_delay), max=10),
                 retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
                 reraise=True,
-            )(self._call_api)
-            result = await retrying_call(payload)
-            response_text = result.get("response", "")
+            )
+            stream_stats: dict = {}
+            if feature_config.get_bool("ai.stream_enabled", True):
+                # 流式：拼出完整 JSON 即结束，未能提前结束时按完整输出解析
+                collector = await retrying(self._stream_api)(payload)
+                response_text = collector.text
+                data = collector.result or parse_json_response(response_text)
+                stream_stats = collector.stats()
+            else:
+                result = await retrying(self._call_api)(payload)
+                # 兜底清洗：移除模型可能输出的 <think>...</think> 思维链标签
+                response_text = _strip_think_tags(result.get("response", ""))
+                data = parse_json_response(response_text)
 
             # 计算处理耗时（毫秒）
             duration_ms = int((time.time() - start_time) * 1000)
-            # 解析 AI 返回的 JSON 文本
-            data = parse_json_response(response_text)
             # 从解析后的数据中提取标准化结果
             extracted = self.extract_result(data)
             # 补充元信息
@@ -303,6 +378,8 @@ class OllamaProvider(BaseAIProvider):
             extracted["duration_ms"] = duration_ms
             extracted["input_chars"] = len(prompt)
             extracted["output_chars"] = len(response_text)
+            extracted["ttft_ms"] = stream_stats.get("ttft_ms")
+            extracted["tokens_per_sec"] = stream_stats.get("tokens_per_sec")
             extracted["success"] = True
             return extracted
 
@@ -23,6 +23,8 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 from settings import settings
 from common.feature_config import feature_config
 from .base import BaseAIProvider, parse_json_response
+from .limiter import get_limiter
+from .streaming import StreamingJSONCollector
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,8 @@ def _strip_think_tags(text: str) -> str:
 #   - 使用 httpx 而非 openai 官方 SDK，保持依赖轻量
 #   - 默认使用 gpt-4o-mini 模型，平衡质量和成本
 #   - temperature=0.3：低温度确保输出稳定性
+#   - 请求经过按 Base URL 共享的自适应限流器，429/503 时自动降低并发
+#   - 内容分析默认以 SSE 流式读取（ai.stream_enabled），解析出完整 JSON 即关闭请求
 # -----------------------------------------------------------------------------
 class OpenAIProvider(BaseAIProvider):
     """OpenAI API provider.
@@ -73,6 +77,8 @@ class OpenAIProvider(BaseAIProvider):
         self._timeout = timeout or feature_config.get_int("ai.openai_timeout", settings.openai_timeout) or 60
         # 持久化 HTTP 客户端，复用 TCP 连接
         self._client: httpx.AsyncClient | None = None
+        # 同一 API 地址的所有 Provider 实例共享一个自适应并发限流器
+        self._limiter = get_limiter(f"openai:{self._base_url}")
 
     def _get_client(self) -> httpx.AsyncClient:
         """Get or create the persistent HTTP client.
@@ -85,7 +91,10 @@ class OpenAIProvider(BaseAIProvider):
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
                 timeout=self._timeout,
-                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                limits=httpx.Limits(
+                    max_connections=max(10, self._limiter.max_limit),
+                    max_keepalive_connections=5,
+                ),
             )
         return self._client
 
@@ -113,7 +122,7 @@ class OpenAIProvider(BaseAIProvider):
     async def _call_api(self, headers: dict, payload: dict) -> dict:
         """Execute the OpenAI API call with retry logic.
 
-        带重试逻辑的 OpenAI API 调用。
+        带重试逻辑的 OpenAI API 调用，每次尝试占用自适应限流器的一个并发名额。
 
         Args:
             headers: HTTP headers including auth.
@@ -123,42 +132,101 @@ class OpenAIProvider(BaseAIProvider):
             dict: Raw API response JSON.
         """
         client = self._get_client()
-        response = await client.post(
-            f"{self._base_url}/chat/completions",
-            headers=headers,
-            json=payload,
-        )
-        response.raise_for_status()
-        return response.json()
+        async with self._limiter.slot():
+            response = await client.post(
+                f"{self._base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+            )
+            response.raise_for_status()
+            return response.json()
 
-    async def translate(self, text: str) -> str | None:
-        """Translate English text to Chinese using OpenAI.
+    async def _stream_api(self, headers: dict, payload: dict) -> StreamingJSONCollector:
+        """Stream a chat completion until a complete JSON object arrives.
 
-        复用 _call_api() 发送翻译请求。
+        以 SSE 流式读取 Chat Completions：思维链在到达时丢弃，
+        解析出完整且合法的 JSON 对象后立即关闭连接，停止计费与占用名额。
 
         Args:
-            text: English text to translate.
+            headers: HTTP headers including auth.
+            payload: API request body (``stream`` is forced on).
 
         Returns:
-            str | None: Translated Chinese text, or None on failure.
+            StreamingJSONCollector: Collected output, parsed result and timings.
+        """
+        client = self._get_client()
+        async with self._limiter.slot():
+            # 拿到限流名额后再开始计时，排队时间不计入首 token 耗时
+            collector = StreamingJSONCollector()
+            async with client.stream(
+                "POST",
+                f"{self._base_url}/chat/completions",
+                headers=headers,
+                json={**payload, "stream": True},
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or []
+                    if not choices:
+                        continue
+                    delta = choices[0].get("delta") or {}
+                    # 每个 delta 约对应一个 token
+                    if collector.feed(delta.get("content") or ""):
+                        break
+                    if choices[0].get("finish_reason"):
+                        break
+        return collector
+
+    async def _generate_text(self, prompt: str, max_tokens: int) -> str | None:
+        """Run a plain text completion via Chat Completions.
+
+        翻译类任务共用的纯文本生成，清洗可能残留的思维链标签。
+
+        Args:
+            prompt: Prompt text.
+            max_tokens: Max output tokens.
+
+        Returns:
+            str | None: Cleaned model output, or None if empty.
         """
-        from .base import TRANSLATE_PROMPT
         headers = {
             "Authorization": f"Bearer {self._api_key}",
             "Content-Type": "application/json",
         }
         payload = {
             "model": self._model,
-            "messages": [{"role": "user", "content": TRANSLATE_PROMPT.format(text=text)}],
+            "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.1,
-            "max_tokens": feature_config.get_int("ai.translate_max_tokens", 4096),
+            "max_tokens": max_tokens,
         }
+        result = await self._call_api(headers, payload)
+        text = _strip_think_tags(result["choices"][0]["message"]["content"].strip())
+        return text or None
+
+    async def translate(self, text: str) -> str | None:
+        """Translate English text to Chinese using OpenAI.
+
+        复用 _generate_text() 发送翻译请求。
+
+        Args:
+            text: English text to translate.
+
+        Returns:
+            str | None: Translated Chinese text, or None on failure.
+        """
+        from .base import TRANSLATE_PROMPT
         try:
-            result = await self._call_api(headers, payload)
-            translated = result["choices"][0]["message"]["content"].strip()
-            # 清洗可能残留的思维链标签
-            translated = _strip_think_tags(translated)
-            return translated if translated else None
+            return await self._generate_text(
+                TRANSLATE_PROMPT.format(text=text),
+                feature_config.get_int("ai.translate_max_tokens", 4096),
+            )
         except Exception as e:
             logger.warning(f"Translation failed: {e}")
             return None
@@ -206,23 +274,30 @@ class OpenAIProvider(BaseAIProvider):
         start_time = time.time()
         try:
             # 使用 tenacity 重试包装器调用 API，应对网络抖动和临时限流
-            retrying_call = retry(
+            retrying = retry(
                 stop=stop_after_attempt(feature_config.get_int("ai.max_retries", settings.ai_max_retries)),
                 wait=wait_exponential(multiplier=feature_config.get_float("ai.retry_base_delay", settings.ai_retry_base_delay), max=10),
                 retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
                 reraise=True,
-            )(self._call_api)
-            result = await retrying_call(headers, payload)
-            # 从 Chat Completions 响应中提取助手回复内容
-            response_text = result["choices"][0]["message"]["content"]
-
-            # 清洗可能残留的思维链标签（部分模型如 qwen3 可能输出）
-            response_text = _strip_think_tags(response_text)
+            )
+            stream_stats: dict = {}
+            if feature_config.get_bool("ai.stream_enabled", True):
+                # 流式：拼出完整 JSON 即结束，未能提前结束时按完整输出解析
+                collector = await retrying(self._stream_api)(headers, payload)
+                response_text = collector.text
+                data = collector.result or parse_json_response(response_text)
+                stream_stats = collector.stats()
+            else:
+                result = await retrying(self._call_api)(headers, payload)
+                # 从 Chat Completions 响应中提取助手回复内容
+                response_text = result["choices"][0]["message"]["content"]
+                # 清洗可能残留的思维链标签（部分模型如 qwen3 可能输出）
+                response_text = _strip_think_tags(response_text)
+                data = parse_json_response(response_text)
 
             # 计算处理耗时（毫秒）
             duration_ms = int((time.time() - start_time) * 1000)
-            # 解析 JSON 响应并提取标准化结果
-            data = parse_json_response(response_text)
+            # 提取标准化结果
             extracted = self.extract_result(data)
             # 补充元信息
             extracted["provider"] = "openai"
@@ -230,6 +305,8 @@ class OpenAIProvider(BaseAIProvider):
             extracted["duration_ms"] = duration_ms
             extracted["input_chars"] = len(prompt)
             extracted["output_chars"] = len(response_text)
+            extracted["ttft_ms"] = stream_stats.get("ttft_ms")
+            extracted["tokens_per_sec"] = stream_stats.get("tokens_per_sec")
             extracted["success"] = True
             return extracted
 
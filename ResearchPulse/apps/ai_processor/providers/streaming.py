@@ -0,0 +1,179 @@
+# =============================================================================
+# 模块: apps/ai_processor/providers/streaming.py
+# 功能: 流式 LLM 响应的增量解析
+# 架构角色: OllamaProvider / OpenAIProvider 流式模式共用的解析器。
+#           Provider 逐块喂入模型输出，解析器丢弃 <think> 思维链，
+#           一旦拼出完整且合法的 JSON 对象即通知调用方提前关闭请求，
+#           不必等待模型输出结束（JSON 之后的多余文字、结束标记等）。
+# 设计理念:
+#   1. 思维链在到达时即丢弃，不进入可见文本与 JSON 扫描；标签可能被拆在两个分块之间
+#   2. JSON 扫描按字符跟踪括号深度与字符串/转义状态，顶层对象闭合时尝试 json.loads，
+#      解析失败则继续寻找下一个对象
+#   3. 同时记录首 token 时间与 token 数，用于计算 TTFT 与生成速度
+# =============================================================================
+
+"""Incremental parsing of streamed model output.
+
+Usage:
+    collector = StreamingJSONCollector(started_at=time.monotonic())
+    async for fragment in stream:
+        if collector.feed(fragment):
+            break  # collector.result holds the parsed object
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Optional
+
+_THINK_OPEN = "<think>"
+_THINK_CLOSE = "</think>"
+
+
+def _partial_tag_suffix(text: str, tag: str) -> int:
+    """Length of the longest suffix of ``text`` that is a proper prefix of ``tag``."""
+    for size in range(min(len(text), len(tag) - 1), 0, -1):
+        if tag.startswith(text[-size:]):
+            return size
+    return 0
+
+
+class StreamingJSONCollector:
+    """Accumulate streamed text and detect the first complete JSON object.
+
+    累积流式输出，过滤思维链并检测首个完整的 JSON 对象。
+    """
+
+    def __init__(self, started_at: Optional[float] = None):
+        """Initialize the collector.
+
+        Args:
+            started_at: ``time.monotonic()`` when the request was sent; used
+                for time-to-first-token. Defaults to now.
+        """
+        self.started_at = time.monotonic() if started_at is None else started_at
+        self.first_token_at: Optional[float] = None
+        self.last_token_at: Optional[float] = None
+        self.tokens = 0
+        self.result: Optional[dict] = None
+        self._pending = ""
+        self._in_think = False
+        self._visible: list[str] = []
+        self._scan = ""
+        # JSON 扫描状态
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def text(self) -> str:
+        """Visible output so far (think blocks removed)."""
+        return "".join(self._visible) + ("" if self._in_think else self._pending)
+
+    @property
+    def done(self) -> bool:
+        """Whether a complete JSON object has been parsed."""
+        return self.result is not None
+
+    def feed(self, fragment: str, tokens: int = 1) -> bool:
+        """Consume one streamed fragment.
+
+        Args:
+            fragment: Text delta from the stream.
+            tokens: Number of tokens the fragment represents.
+
+        Returns:
+            bool: True once a complete, valid JSON object has been parsed.
+        """
+        if not fragment or self.result is not None:
+            return self.result is not None
+        now = time.monotonic()
+        if self.first_token_at is None:
+            self.first_token_at = now
+        self.last_token_at = now
+        self.tokens += tokens
+
+        self._pending += fragment
+        while self._pending:
+            if self._in_think:
+                end = self._pending.find(_THINK_CLOSE)
+                if end == -1:
+                    # 保留可能被拆开的结束标签前缀，其余思维链内容直接丢弃
+                    keep = _partial_tag_suffix(self._pending, _THINK_CLOSE)
+                    self._pending = self._pending[-keep:] if keep else ""
+                    break
+                self._pending = self._pending[end + len(_THINK_CLOSE):].lstrip()
+                self._in_think = False
+                continue
+
+            start = self._pending.find(_THINK_OPEN)
+            if start != -1:
+                self._emit(self._pending[:start])
+                self._pending = self._pending[start + len(_THINK_OPEN):]
+                self._in_think = True
+                continue
+            keep = _partial_tag_suffix(self._pending, _THINK_OPEN)
+            self._emit(self._pending[:len(self._pending) - keep])
+            self._pending = self._pending[len(self._pending) - keep:]
+            break
+        return self.result is not None
+
+    def _emit(self, text: str) -> None:
+        """Append visible text and advance the JSON scanner."""
+        if not text or self.result is not None:
+            return
+        self._visible.append(text)
+        offset = len(self._scan)
+        self._scan += text
+        for i, ch in enumerate(text, offset):
+            if self._start is None:
+                if ch == "{":
+                    self._start, self._depth = i, 1
+                    self._in_string = self._escape = False
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    candidate = self._scan[self._start:i + 1]
+                    self._start = None
+                    try:
+                        obj = json.loads(candidate)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(obj, dict) and obj:
+                        self.result = obj
+                        return
+
+    def stats(self) -> dict:
+        """Return time-to-first-token and generation speed.
+
+        Returns:
+            dict: ``ttft_ms`` (None if no token arrived), ``output_tokens`` and
+            ``tokens_per_sec`` (None when fewer than two tokens arrived).
+        """
+        ttft_ms = None
+        tokens_per_sec = None
+        if self.first_token_at is not None:
+            ttft_ms = int((self.first_token_at - self.started_at) * 1000)
+            elapsed = (self.last_token_at or self.first_token_at) - self.first_token_at
+            if self.tokens > 1 and elapsed > 0:
+                # 首个 token 之后的生成速度，不含排队与 prompt 处理时间
+                tokens_per_sec = round((self.tokens - 1) / elapsed, 2)
+        return {
+            "ttft_ms": ttft_ms,
+            "output_tokens": self.tokens,
+            "tokens_per_sec": tokens_per_sec,
+        }
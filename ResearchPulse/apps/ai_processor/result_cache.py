@@ -0,0 +1,184 @@
+# =============================================================================
+# AI 结果缓存模块
+# =============================================================================
+# 按内容寻址的 AI 分析结果存储：
+#   键 = (providers.base.get_content_hash(标题, 正文), 任务类型, 模型名称)
+# 同一篇新闻稿或论文摘要经由 arXiv / RSS / HN / Reddit 多个来源到达时，
+# 后到的文章直接复用首篇的分析结果，不再调用模型。
+#
+# 设计决策：
+#   - 存储在业务数据库（ai_result_cache 表），Web 服务、调度器与批处理脚本共享
+#   - 只缓存模型成功生成的结果；规则分类结果本身没有推理成本，不入缓存
+#   - 条目写入（stored_at）超过 ai.cache_ttl 视为过期，重新调用模型并覆盖；
+#     命中只刷新 last_used_at，不延长有效期
+#   - 条目数量上限为 ai.cache_max_entries，由 prune_results 按 last_used_at 淘汰（LRU），
+#     批处理结束时调用一次，避免每次写入都做计数
+#   - 只负责读写语句，事务边界由调用方控制
+# =============================================================================
+
+"""Content-addressed store for AI analysis results."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.feature_config import feature_config
+from core.bulk import build_upsert, chunked, get_dialect_name
+from settings import settings
+
+from .models import AIResultCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# 缓存的结果字段（模型输出的结构化分析内容）
+CACHED_FIELDS = (
+    "summary",
+    "category",
+    "subcategory",
+    "importance_score",
+    "one_liner",
+    "key_points",
+    "impact_assessment",
+    "actionable_items",
+    "_translated_title",
+    "_translated_content",
+)
+
+
+def cache_enabled() -> bool:
+    """Return whether the AI result cache is enabled."""
+    return feature_config.get_bool("ai.cache_enabled", settings.ai_cache_enabled)
+
+
+def _as_aware(value: datetime) -> datetime:
+    """Treat naive datetimes read back from the database as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def lookup_result(
+    db: AsyncSession, content_hash: str, task_type: str, model: str
+) -> Optional[dict]:
+    """Return a cached result and record the hit.
+
+    查询缓存结果。命中时累加命中次数并刷新 last_used_at；
+    写入时间（stored_at）超过 ai.cache_ttl 的条目视为未命中，命中不延长有效期。
+
+    Args:
+        db: Async database session.
+        content_hash: Hash from ``get_content_hash``.
+        task_type: Task type.
+        model: Model name.
+
+    Returns:
+        Optional[dict]: Cached result fields plus ``provider``, ``model``,
+        ``input_chars``, ``output_chars`` and ``duration_ms`` of the original
+        call, or None on a miss.
+    """
+    result = await db.execute(
+        select(AIResultCacheEntry).where(
+            and_(
+                AIResultCacheEntry.content_hash == content_hash,
+                AIResultCacheEntry.task_type == task_type,
+                AIResultCacheEntry.model == model,
+            )
+        )
+    )
+    entry = result.scalar_one_or_none()
+    if entry is None:
+        return None
+
+    now = datetime.now(timezone.utc)
+    ttl = feature_config.get_int("ai.cache_ttl", settings.ai_cache_ttl)
+    if ttl > 0 and now - _as_aware(entry.stored_at) > timedelta(seconds=ttl):
+        return None
+
+    await db.execute(
+        update(AIResultCacheEntry)
+        .where(AIResultCacheEntry.id == entry.id)
+        .values(hit_count=AIResultCacheEntry.hit_count + 1, last_used_at=now)
+    )
+    return {
+        **(entry.result or {}),
+        "provider": entry.provider,
+        "model": entry.model,
+        "input_chars": entry.input_chars or 0,
+        "output_chars": entry.output_chars or 0,
+        "duration_ms": entry.duration_ms or 0,
+    }
+
+
+async def store_result(
+    db: AsyncSession, content_hash: str, task_type: str, model: str, result: dict
+) -> None:
+    """Insert or refresh the cached result for a key.
+
+    写入（或覆盖）缓存条目。并发写入同一键时以最后一次为准。
+
+    Args:
+        db: Async database session.
+        content_hash: Hash from ``get_content_hash``.
+        task_type: Task type.
+        model: Model name the result is keyed under.
+        result: Processing result from the provider.
+    """
+    now = datetime.now(timezone.utc)
+    row = {
+        "content_hash": content_hash,
+        "task_type": task_type,
+        "model": model,
+        "provider": result.get("provider", ""),
+        "result": {k: result[k] for k in CACHED_FIELDS if result.get(k) is not None},
+        "input_chars": result.get("input_chars", 0) or 0,
+        "output_chars": result.get("output_chars", 0) or 0,
+        "duration_ms": result.get("duration_ms", 0) or 0,
+        "hit_count": 0,
+        "last_used_at": now,
+        "stored_at": now,
+        "created_at": now,
+        "updated_at": now,
+    }
+    await db.execute(build_upsert(
+        get_dialect_name(db),
+        AIResultCacheEntry.__table__,
+        [row],
+        conflict_columns=("content_hash", "task_type", "model"),
+        update_columns=(
+            "provider", "result", "input_chars", "output_chars",
+            "duration_ms", "last_used_at", "stored_at", "updated_at",
+        ),
+    ))
+
+
+async def prune_results(db: AsyncSession, max_entries: int | None = None) -> int:
+    """Evict least-recently-used entries beyond the size limit.
+
+    按 last_used_at 淘汰最久未使用的条目，使缓存条目数不超过上限。
+
+    Args:
+        db: Async database session.
+        max_entries: Entry limit (defaults to ``ai.cache_max_entries``).
+
+    Returns:
+        int: Number of entries deleted.
+    """
+    if max_entries is None:
+        max_entries = feature_config.get_int("ai.cache_max_entries", settings.ai_cache_max_entries)
+    total = (await db.execute(select(func.count(AIResultCacheEntry.id)))).scalar() or 0
+    excess = total - max(0, max_entries)
+    if excess <= 0:
+        return 0
+    # 取出最久未使用的 excess 条记录的 ID，按主键删除
+    victims = (await db.execute(
+        select(AIResultCacheEntry.id)
+        .order_by(AIResultCacheEntry.last_used_at, AIResultCacheEntry.id)
+        .limit(excess)
+    )).scalars().all()
+    for chunk in chunked(victims):
+        await db.execute(delete(AIResultCacheEntry).where(AIResultCacheEntry.id.in_(list(chunk))))
+    logger.info(f"AI result cache pruned {len(victims)} entries (limit {max_entries})")
+    return len(victims)
@@ -141,5 +141,8 @@ class TokenStatsResponse(BaseModel):
     cached_calls: int = 0           # 缓存命中次数
     total_input_chars: int = 0      # 总输入字符数
     total_output_chars: int = 0     # 总输出字符数
-    avg_duration_ms: float = 0.0    # 平均处理耗时（毫秒）
+    avg_duration_ms: float = 0.0    # 平均处理耗时（毫秒，不含缓存命中）
+    saved_duration_ms: int = 0      # 缓存命中节省的推理耗时（毫秒）
+    avg_ttft_ms: Optional[float] = None         # 平均首 token 耗时（毫秒，仅流式调用）
+    avg_tokens_per_sec: Optional[float] = None  # 平均生成速度（token/秒，仅流式调用）
     failed_calls: int = 0           # 失败次数
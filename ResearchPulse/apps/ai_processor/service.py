@@ -6,7 +6,8 @@
 #   - 下层：调用 AI Provider（Ollama/OpenAI）和规则分类器
 # 核心职责：
 #   1. 单篇/批量文章的 AI 分析处理
-#   2. 缓存判断 —— 已处理过的文章直接返回缓存结果
+#   2. 缓存判断 —— 已处理过的文章直接返回缓存结果；
+#      内容相同的文章（同一新闻稿/论文经多个来源到达）复用 ai_result_cache 中的分析结果
 #   3. 规则预筛选 —— 通过规则分类器跳过低价值内容，节省 AI 调用成本
 #   4. 域名快速分类 —— 对已知域名的短内容直接用规则归类
 #   5. 处理结果持久化 —— 将 AI 输出写回文章记录并记录日志
@@ -26,12 +27,14 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.crawler.models.article import Article
+from apps.search.index import index_articles
 from core.database import get_session_factory
 from settings import settings
 from common.feature_config import feature_config
 
 from .models import AIProcessingLog
 from .providers.base import BaseAIProvider, get_content_hash
+from .result_cache import cache_enabled, lookup_result, prune_results, store_result
 from .processors.rule_classifier import (
     classify_by_domain,
     estimate_task_type,
@@ -211,23 +214,39 @@ class AIProcessorService:
             await self._save_result(article, processing_result, db)
             return {**processing_result, "article_id": article_id}
 
-        # 第六步：真正的 AI 处理 —— 调用配置的 AI Provider 进行内容分析
-        processing_result = await self.provider.process_content(title, content, task_type)
-
-        # 如果主 Provider 失败且配置了降级回退 Provider，尝试用备用 Provider 重新处理
-        if not processing_result.get("success"):
-            fallback = self._get_fallback_provider()
-            if fallback:
-                logger.warning(
-                    f"Primary provider failed for article {article_id}, "
-                    f"trying fallback: {feature_config.get('ai.fallback_provider') or settings.ai_fallback_provider}"
-                )
-                processing_result = await fallback.process_content(title, content, task_type)
+        # 第六步：内容寻址缓存 —— 相同内容 + 任务类型 + 模型的分析结果直接复用
+        # force 表示强制重新分析，跳过缓存查询（结果仍会写回缓存）
+        use_cache = cache_enabled()
+        content_hash = get_content_hash(title, content)
+        model_name = self.provider.model_name
+        cached_result = None
+        if use_cache and not force:
+            cached_result = await lookup_result(db, content_hash, task_type, model_name)
+
+        if cached_result is not None:
+            processing_result = {**cached_result, "success": True, "processing_method": "cached"}
+        else:
+            # 第七步：真正的 AI 处理 —— 调用配置的 AI Provider 进行内容分析
+            processing_result = await self.provider.process_content(title, content, task_type)
+
+            # 如果主 Provider 失败且配置了降级回退 Provider，尝试用备用 Provider 重新处理
+            if not processing_result.get("success"):
+                fallback = self._get_fallback_provider()
+                if fallback:
+                    logger.warning(
+                        f"Primary provider failed for article {article_id}, "
+                        f"trying fallback: {feature_config.get('ai.fallback_provider') or settings.ai_fallback_provider}"
+                    )
+                    processing_result = await fallback.process_content(title, content, task_type)
 
-        processing_result["processing_method"] = "ai" if processing_result.get("success") else "failed"
+            processing_result["processing_method"] = "ai" if processing_result.get("success") else "failed"
 
-        # 英文标题翻译：检测后请求 AI 翻译
-        if processing_result.get("success") and _is_english(article.title or ""):
+        # 英文标题翻译：检测后请求 AI 翻译（缓存命中时已带有译文则跳过）
+        if (
+            processing_result.get("success")
+            and not processing_result.get("_translated_title")
+            and _is_english(article.title or "")
+        ):
             try:
                 translated_title = await self.provider.translate(article.title)
                 if translated_title:
@@ -236,7 +255,11 @@ class AIProcessorService:
                 logger.debug(f"Title translation skipped for article {article_id}: {e}")
 
         # 英文 summary 翻译：检测后请求 AI 翻译，成功则存入 content
-        if processing_result.get("success") and _is_english(article.summary or ""):
+        if (
+            processing_result.get("success")
+            and not processing_result.get("_translated_content")
+            and _is_english(article.summary or "")
+        ):
             try:
                 translated = await self.provider.translate(article.summary)
                 if translated:
@@ -246,18 +269,34 @@ class AIProcessorService:
 
         await self._save_result(article, processing_result, db)
 
-        # 第七步：构建处理日志对象并返回（由调用方统一持久化）
+        # 模型成功生成的结果写入缓存，键使用主 Provider 的模型名称
+        # （降级 Provider 生成的结果按其自身模型名称入库，不冒充主模型的输出）
+        if use_cache and processing_result["processing_method"] == "ai":
+            cacheable = dict(processing_result)
+            # 摘要译文只有在 summary 即为哈希所用正文时才由缓存键决定
+            if article.content:
+                cacheable.pop("_translated_content", None)
+            await store_result(
+                db, content_hash, task_type,
+                processing_result.get("model") or model_name, cacheable,
+            )
+
+        # 第八步：构建处理日志对象并返回（由调用方统一持久化）
+        # 缓存命中时 cached=True，duration_ms 为原始调用耗时（即节省的推理时间），
+        # 输入/输出字符数记为 0（本次未消耗 token）
         log = AIProcessingLog(
             article_id=article_id,
             provider=processing_result.get("provider", "unknown"),
             model=processing_result.get("model", "unknown"),
             task_type=task_type,
-            input_chars=processing_result.get("input_chars", 0),
-            output_chars=processing_result.get("output_chars", 0),
+            input_chars=0 if cached_result is not None else processing_result.get("input_chars", 0),
+            output_chars=0 if cached_result is not None else processing_result.get("output_chars", 0),
             duration_ms=processing_result.get("duration_ms", 0),
             success=processing_result.get("success", False),
             error_message=processing_result.get("error_message"),
-            cached=False,
+            cached=cached_result is not None,
+            ttft_ms=processing_result.get("ttft_ms"),
+            tokens_per_sec=processing_result.get("tokens_per_sec"),
         )
         # 在非并发模式下（单篇处理 API 调用），直接写入 session
         # 并发模式下由 batch_process 统一写入
@@ -278,6 +317,8 @@ class AIProcessorService:
 
         根据 settings.ai_batch_concurrency 配置选择串行或并行处理路径。
         默认值为 1（串行），可通过 .env 中 AI_BATCH_CONCURRENCY 修改。
+        并行且启用 ai.adaptive_concurrency 时，实际模型调用并发由 Provider 的
+        自适应限流器决定（见 providers/limiter.py）。
 
         Args:
             article_ids: List of article IDs to process.
@@ -292,6 +333,10 @@ class AIProcessorService:
             return {"total": 0, "processed": 0, "cached": 0, "failed": 0, "results": []}
 
         concurrency = feature_config.get_int("ai.batch_concurrency", settings.ai_batch_concurrency)
+        if concurrency > 1 and feature_config.get_bool("ai.adaptive_concurrency", True):
+            # 模型调用并发由 Provider 共享的自适应限流器控制，
+            # 批处理并发放宽到限流器上限，避免固定值让后端空闲
+            concurrency = max(concurrency, feature_config.get_int("ai.adaptive_max_concurrency", 16))
         if concurrency > 1:
             logger.info(
                 f"Batch processing {len(article_ids)} articles "
@@ -304,8 +349,25 @@ class AIProcessorService:
             logger.info(f"Batch processing {len(article_ids)} articles serially")
             results = await self._batch_process_serial(article_ids, force=force, progress_callback=progress_callback)
 
+        # 批处理结束后统一检查结果缓存容量，避免每次写入都计数
+        if cache_enabled():
+            await self._prune_result_cache()
+
         return self._summarize_results(results)
 
+    async def _prune_result_cache(self) -> None:
+        """Evict least-recently-used AI result cache entries beyond the limit.
+
+        淘汰超出 ai.cache_max_entries 的最久未使用缓存条目。失败不影响批处理结果。
+        """
+        session_factory = get_session_factory()
+        try:
+            async with session_factory() as session:
+                await prune_results(session)
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"AI result cache prune failed: {e}")
+
     async def _batch_process_serial(
         self,
         article_ids: list[int],
@@ -356,7 +418,8 @@ class AIProcessorService:
 
         并行处理文章。每个并发任务创建独立的 AIProcessorService 实例
         （含独立的 Provider 和 httpx.AsyncClient），彻底避免共享状态。
-        使用 asyncio.Semaphore 控制并发上限。
+        使用 asyncio.Semaphore 控制并发任务上限；模型调用并发另由 Provider
+        共享的自适应限流器控制。
 
         Args:
             article_ids: List of article IDs to process.
@@ -439,7 +502,7 @@ class AIProcessorService:
     def _summarize_results(results: list[dict]) -> dict:
         """Aggregate per-article results into batch statistics.
 
-        统计批处理结果：成功、缓存、失败数量。
+        统计批处理结果：成功、缓存（已处理或内容缓存命中）、失败数量。
         """
         processed = 0
         cached = 0
@@ -466,6 +529,7 @@ class AIProcessorService:
         db: AsyncSession,
         limit: int = 50,
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        article_ids: Optional[list[int]] = None,
     ) -> dict:
         """Process articles that haven't been AI-processed yet.
 
@@ -473,20 +537,23 @@ class AIProcessorService:
             db: Async database session.
             limit: Max number of articles to process.
             progress_callback: Optional callback for progress updates.
+            article_ids: Only consider these articles (pipeline task scope).
 
         Returns:
             dict: Batch processing summary.
         """
         # 查询尚未经过 AI 处理的文章（未归档的），按爬取时间倒序排列
         # 此方法通常由定时调度任务调用
-        result = await db.execute(
+        query = (
             select(Article.id)
             .where(Article.ai_processed_at.is_(None))
             .where(Article.is_archived.is_(False))
             .where(Article.source_type != "aigc")
-            .order_by(Article.crawl_time.desc())
-            .limit(limit)
+            .where(Article.duplicate_of.is_(None))  # 跳过近似重复的转载
         )
+        if article_ids is not None:
+            query = query.where(Article.id.in_(article_ids))
+        result = await db.execute(query.order_by(Article.crawl_time.desc()).limit(limit))
         article_ids = [row[0] for row in result.all()]
         if not article_ids:
             return {"total": 0, "processed": 0, "cached": 0, "failed": 0, "results": []}
@@ -526,3 +593,5 @@ class AIProcessorService:
             .where(Article.id == article.id)
             .values(**values)
         )
+        # AI 摘要与译文标题参与全文检索，写回后重新索引该文章
+        await index_articles(db, [article.id])
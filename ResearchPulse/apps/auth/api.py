@@ -30,7 +30,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_session
-from core.dependencies import CurrentUser, get_current_user
+from core.dependencies import CurrentUser, get_current_user, invalidate_principal
 from core.security import create_access_token, create_refresh_token
 from core.models.user import User
 from settings import settings
@@ -516,6 +516,7 @@ async def reset_password(
 
     # 更新密码
     user.set_password(request.new_password)
+    invalidate_principal(user.id, session)
 
     # 清理重置数据
     VerificationService.cleanup_reset_data(request.email)
@@ -33,6 +33,7 @@ from datetime import datetime, timezone
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.dependencies import invalidate_principal
 from core.models.permission import Role
 from core.models.user import User
 from core.security import (
@@ -179,6 +180,8 @@ class AuthService:
 
         # 更新最后登录时间
         user.update_last_login()
+        # 缓存的认证主体包含 last_login_at，提交后失效
+        invalidate_principal(user.id, session)
 
         # 生成 JWT 令牌对
         # token_data 中的 "sub"（subject）字段存放用户 ID，是 JWT 标准声明
@@ -272,6 +275,7 @@ class AuthService:
 
         # 设置新密码（内部会进行哈希处理）
         user.set_password(new_password)
+        invalidate_principal(user.id, session)
         logger.info(f"Password changed for user: {user.username}")
 
     # ------------------------------------------------------------------
@@ -20,13 +20,12 @@ import logging
 import re
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List
-
-import feedparser
+from typing import Any, Dict, List, Mapping
 
 from apps.crawler.base import BaseCrawler
 from apps.crawler.registry import CrawlerRegistry
 from apps.crawler.models import ArxivCategory
+from apps.crawler.parsing import parse_feed
 from common.http import get_text_async
 
 # 模块级日志器
@@ -216,13 +215,13 @@ def _parse_datetime(value: str) -> str:
     return value
 
 
-def _parse_rss_entry(entry: feedparser.FeedParserDict) -> Paper:
+def _parse_rss_entry(entry: Mapping[str, Any]) -> Paper:
     """Parse a single RSS/Atom entry into a Paper object.
 
     处理来自 arXiv Atom API 与 RSS Feed 的条目，提取关键信息。
 
     Args:
-        entry: FeedParser entry dictionary.
+        entry: Feed entry dictionary.
 
     Returns:
         Paper: Parsed paper data object.
@@ -293,6 +292,21 @@ def _parse_rss_entry(entry: feedparser.FeedParserDict) -> Paper:
     )
 
 
+def _parse_feed_papers(feed_text: str) -> List[Paper]:
+    """Parse Atom/RSS XML into Paper objects.
+
+    解析 Atom/RSS 文本并转换为 Paper 列表，设计为在解析执行器中整体运行。
+
+    Args:
+        feed_text: Atom or RSS XML text.
+
+    Returns:
+        List[Paper]: Parsed papers.
+    """
+    feed = parse_feed(feed_text)
+    return [_parse_rss_entry(entry) for entry in feed["entries"]]
+
+
 def _extract_list_header_date(html_text: str) -> str:
     """Extract date from an arXiv HTML list page header.
 
@@ -576,9 +590,8 @@ class ArxivCrawler(BaseCrawler):
                 delay=self.delay_base,
                 jitter=self.delay_jitter,
             )
-            # 使用 feedparser 解析 Atom XML
-            feed = feedparser.parse(feed_text)
-            return [_parse_rss_entry(entry) for entry in feed.entries]
+            # 在解析执行器中解析 Atom XML
+            return await self.run_parser(_parse_feed_papers, feed_text)
         except Exception as e:
             # Atom API 失败不中断整个爬取流程，记录警告后返回空列表
             self.logger.warning(f"Atom API fetch failed (sortBy={sort_by}): {e}")
@@ -605,8 +618,7 @@ class ArxivCrawler(BaseCrawler):
                 delay=self.delay_base,
                 jitter=self.delay_jitter,
             )
-            feed = feedparser.parse(feed_text)
-            papers = [_parse_rss_entry(entry) for entry in feed.entries]
+            papers = await self.run_parser(_parse_feed_papers, feed_text)
             if papers:
                 return papers
             # 新域名返回空结果，尝试旧域名
@@ -625,8 +637,7 @@ class ArxivCrawler(BaseCrawler):
                 delay=self.delay_base,
                 jitter=self.delay_jitter,
             )
-            feed = feedparser.parse(feed_text)
-            return [_parse_rss_entry(entry) for entry in feed.entries]
+            return await self.run_parser(_parse_feed_papers, feed_text)
         except Exception as e:
             self.logger.warning(f"RSS fetch failed (legacy domain): {e}")
             return []
@@ -654,7 +665,7 @@ class ArxivCrawler(BaseCrawler):
                 delay=self.delay_base,
                 jitter=self.delay_jitter,
             )
-            return _parse_html_list(html_text, run_date=run_date)
+            return await self.run_parser(_parse_html_list, html_text, run_date=run_date)
         except Exception as e:
             self.logger.warning(f"HTML list fetch failed: {e}")
             return []
@@ -17,17 +17,56 @@ import asyncio
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar, Union
+from urllib.parse import urlparse
 
-from sqlalchemy import select
-from sqlalchemy.dialects.mysql import insert
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.crawler.models import Article
+from apps.crawler.parsing import parse_executor, parse_feed
+from common.http import NOT_MODIFIED, NotModified, commit_validators, discard_validators, get_text_async
+from core.bulk import build_upsert, chunked, get_dialect_name, supports_returning
 
 # 模块级日志器，用于记录爬虫基类的通用操作日志
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Article 模型的全部列名，用于过滤子类爬虫传入的非模型字段
+_ARTICLE_COLUMNS = frozenset(Article.__table__.columns.keys())
+
+# 已有文章合并时永不修改的列（去重键、主键与创建信息）
+_IMMUTABLE_COLUMNS = frozenset({
+    "id", "source_type", "source_id", "external_id", "crawl_time", "created_at",
+})
+
+# 版本敏感字段：仅在新数据的 arxiv_updated_time 更新时才覆盖
+VERSION_SENSITIVE_FIELDS = frozenset({"arxiv_id", "url", "cover_image_url"})
+
+
+def _as_utc(value: Any) -> Any:
+    """Normalize a datetime to aware UTC so naive DB values compare safely.
+
+    MySQL / SQLite 读回的时间不带时区，而爬虫产出的时间带时区，
+    直接比较会抛 TypeError，这里统一按 UTC 处理。
+    """
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _column_default(name: str) -> Any:
+    """Return the Python-side default of an Article column (None if absent)."""
+    default = Article.__table__.columns[name].default
+    if default is None:
+        return None
+    if default.is_callable:
+        return default.arg(None)
+    if default.is_scalar:
+        return default.arg
+    return None
+
 
 # =============================================================================
 # BaseCrawler 抽象基类
@@ -50,6 +89,9 @@ class BaseCrawler(ABC):
     source_type: str  # 'arxiv', 'rss', 'wechat'
     # source_id 标识具体的数据源（如 arXiv 分类代码、RSS Feed ID、微信公众号名称）
     source_id: str  # Category code, feed ID, or account name
+    # run() 期间为 True：通过 fetch_text() 获取的文档使用条件请求，
+    # 内容未变化时 fetch() 返回 NOT_MODIFIED，run() 跳过解析与入库
+    conditional_fetch: bool = False
 
     def __init__(self, source_id: str):
         """Initialize a crawler instance.
@@ -63,6 +105,24 @@ class BaseCrawler(ABC):
         # 创建带有来源类型和来源ID的日志器，方便在日志中快速定位问题
         self.logger = logging.getLogger(f"{__name__}.{self.source_type}.{source_id}")
 
+    @property
+    def target_host(self) -> str:
+        """Return the host this crawler mainly requests, used for rate budgets.
+
+        返回爬虫主要访问的目标主机，供并发调度按主机做礼貌限速。
+        默认取 feed_url（或 rss_url）的域名；两者都没有的爬虫回退为
+        source_type，即同类型爬虫共享同一个速率预算。
+
+        Returns:
+            str: Lower-cased host name or source type.
+        """
+        feed_url = getattr(self, "feed_url", "") or getattr(self, "rss_url", "") or ""
+        if feed_url:
+            host = urlparse(feed_url).netloc.lower()
+            if host:
+                return host
+        return self.source_type
+
     @abstractmethod
     async def fetch(self) -> Any:
         """Fetch raw data from the source.
@@ -92,13 +152,247 @@ class BaseCrawler(ABC):
         # 以便 save() 方法能直接创建或更新数据库记录
         pass
 
+    # ------------------------------------------------------------------
+    # 存储：批量 upsert
+    # ------------------------------------------------------------------
+
+    def _dedup_key(self, external_id: str) -> Tuple[str, Optional[str], str]:
+        """Return the deduplication key for an external_id.
+
+        ArXiv 论文按 external_id 全局去重（source_id 记为 None），
+        其他数据源按 (source_type, source_id, external_id) 三元组去重。
+        """
+        if self.source_type == "arxiv" and external_id:
+            return (self.source_type, None, external_id)
+        return (self.source_type, self.source_id, external_id)
+
+    @staticmethod
+    def merge_article_fields(
+        existing: Mapping[str, Any],
+        article_data: Mapping[str, Any],
+    ) -> Dict[str, Any]:
+        """Compute field updates for an existing article, preferring richer data.
+
+        已有文章的字段合并规则（不修改入参，只返回需要更新的字段）：
+            - 版本敏感字段（arxiv_id / url / cover_image_url）仅在新数据的
+              arxiv_updated_time 更新时覆盖
+            - 字符串字段：新值非空且不短于旧值时覆盖
+            - 其他类型：仅在旧值为空时填充
+            - 去重键与创建时间等不可变列永不修改
+
+        Args:
+            existing: Current column values of the stored article.
+            article_data: Newly crawled article dictionary.
+
+        Returns:
+            Dict[str, Any]: Columns whose values should change.
+        """
+        new_updated_time = _as_utc(article_data.get("arxiv_updated_time"))
+        existing_updated_time = _as_utc(existing.get("arxiv_updated_time"))
+        is_newer = (
+            new_updated_time is not None
+            and (
+                existing_updated_time is None
+                or new_updated_time > existing_updated_time
+            )
+        )
+
+        changes: Dict[str, Any] = {}
+        for key, value in article_data.items():
+            if value is None or key not in _ARTICLE_COLUMNS or key in _IMMUTABLE_COLUMNS:
+                continue
+            # 版本敏感字段：只有新数据更新时才更新
+            if key in VERSION_SENSITIVE_FIELDS:
+                if is_newer:
+                    changes[key] = value
+                continue
+            existing_value = existing.get(key)
+            if isinstance(value, str):
+                # 字符串：只有新值更长或旧值为空时才更新
+                if value and (not existing_value or len(value) >= len(str(existing_value))):
+                    changes[key] = value
+            elif existing_value is None:
+                # 非字符串：仅当旧值为空时更新
+                changes[key] = value
+        return changes
+
+    async def _load_existing(
+        self,
+        keys: List[Tuple[str, Optional[str], str]],
+        session: AsyncSession,
+    ) -> Dict[Tuple[str, Optional[str], str], Dict[str, Any]]:
+        """Load stored rows for a batch of dedup keys with keyed ``IN`` queries.
+
+        通过 ix_articles_source_external 索引一次性加载整批已存在的文章：
+        三元组键一条 IN 查询，arXiv 全局键一条 IN 查询。
+
+        Args:
+            keys: Dedup keys from :meth:`_dedup_key`.
+            session: Database session.
+
+        Returns:
+            Dict mapping dedup key to the stored row's column values.
+        """
+        table = Article.__table__
+        scoped_ids = [ext for _, source_id, ext in keys if source_id is not None]
+        global_ids = [ext for _, source_id, ext in keys if source_id is None]
+        existing: Dict[Tuple[str, Optional[str], str], Dict[str, Any]] = {}
+
+        if scoped_ids:
+            result = await session.execute(
+                select(table).where(
+                    table.c.source_type == self.source_type,
+                    table.c.source_id == self.source_id,
+                    table.c.external_id.in_(scoped_ids),
+                )
+            )
+            for row in result.mappings():
+                existing[(self.source_type, self.source_id, row["external_id"])] = dict(row)
+
+        if global_ids:
+            result = await session.execute(
+                select(table)
+                .where(
+                    table.c.source_type == self.source_type,
+                    table.c.external_id.in_(global_ids),
+                )
+                .order_by(table.c.id)
+            )
+            for row in result.mappings():
+                # 同一篇论文若历史上存在多条记录，取最早的一条
+                existing.setdefault((self.source_type, None, row["external_id"]), dict(row))
+
+        return existing
+
+    async def _bulk_save(
+        self,
+        articles: List[Dict[str, Any]],
+        session: AsyncSession,
+    ) -> tuple[int, List[int]]:
+        """Save a batch with O(1) round trips: one keyed load + multi-row upserts.
+
+        批量保存流程：
+            1. 批内按去重键合并重复条目
+            2. 一次 IN 查询加载已存在的文章
+            3. 在内存中应用字段合并规则
+            4. 已有文章按变化列分组批量 UPDATE，只写实际变化的列
+            5. 新文章方言感知的多行 upsert 写入（SQLite/PostgreSQL 直接 RETURNING id，
+               MySQL 写入后按键回查一次）
+        """
+        now = datetime.now(timezone.utc)
+
+        # 1. 过滤非模型字段，并按去重键合并批内重复条目
+        batch: Dict[Tuple[str, Optional[str], str], Dict[str, Any]] = {}
+        for article_data in articles:
+            data = {k: v for k, v in article_data.items() if k in _ARTICLE_COLUMNS}
+            key = self._dedup_key(data.get("external_id", "") or "")
+            data["external_id"] = key[2]
+            if key in batch:
+                batch[key].update(self.merge_article_fields(batch[key], data))
+            else:
+                batch[key] = data
+
+        # 2. 一次性加载已存在的文章
+        existing = await self._load_existing(list(batch), session)
+
+        # 3. 内存中合并：已有文章只记录实际变化的列，新文章构造完整行
+        updates: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        rows: List[Dict[str, Any]] = []
+        provided_columns = set()
+        new_keys = set()
+        for key, data in batch.items():
+            stored = existing.get(key)
+            if stored is not None:
+                changes = self.merge_article_fields(stored, data)
+                if changes:
+                    updates.setdefault(tuple(sorted(changes)), []).append(
+                        {"_article_id": stored["id"], **{f"_v_{k}": v for k, v in changes.items()}}
+                    )
+                continue
+            new_keys.add(key)
+            provided_columns.update(data)
+            rows.append({
+                **data,
+                "source_type": self.source_type,
+                "source_id": self.source_id,
+                "crawl_time": now,
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        table = Article.__table__
+
+        # 4. 已有文章按变化列集合分组，executemany UPDATE 只写这些列，
+        #    读取之后其他流程（如 AI 处理）提交的字段不会被旧快照覆盖
+        for changed, params in updates.items():
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("_article_id"))
+                .values({**{col: bindparam(f"_v_{col}") for col in changed}, "updated_at": now})
+            )
+            for chunk in chunked(params):
+                await session.execute(stmt, list(chunk))
+
+        # 5. 新文章方言感知的批量 upsert（多行 VALUES 需要统一的列集合，缺失的列用模型默认值补齐）；
+        #    并发插入冲突时只更新爬虫提供的列
+        columns = sorted({col for row in rows for col in row})
+        for row in rows:
+            for col in columns:
+                if col not in row:
+                    row[col] = _column_default(col)
+        update_columns = sorted((provided_columns - _IMMUTABLE_COLUMNS) | {"updated_at"})
+        dialect_name = get_dialect_name(session)
+        ids_by_key: Dict[Tuple[str, str, str], int] = {}
+        for chunk in chunked(rows):
+            stmt = build_upsert(
+                dialect_name,
+                table,
+                list(chunk),
+                conflict_columns=("source_type", "source_id", "external_id"),
+                update_columns=update_columns,
+            )
+            if supports_returning(dialect_name):
+                result = await session.execute(
+                    stmt.returning(table.c.id, table.c.source_id, table.c.external_id)
+                )
+                for article_id, source_id, external_id in result.all():
+                    ids_by_key[(self.source_type, source_id, external_id)] = article_id
+            else:
+                await session.execute(stmt)
+
+        if rows and not supports_returning(dialect_name):
+            for key, row in (await self._load_existing(list(new_keys), session)).items():
+                ids_by_key[(self.source_type, row["source_id"], row["external_id"])] = row["id"]
+
+        # 按批内顺序返回文章 ID（已存在的直接使用其 ID）
+        saved_ids: List[int] = []
+        for key in batch:
+            stored = existing.get(key)
+            if stored is not None:
+                article_id = stored["id"]
+            else:
+                article_id = ids_by_key.get((self.source_type, self.source_id, key[2]))
+                if article_id is None and key[1] is None:
+                    # arXiv 全局键：MySQL 回查结果中 source_id 可能来自并发写入的记录
+                    article_id = next(
+                        (v for k, v in ids_by_key.items() if k[2] == key[2]), None
+                    )
+            if article_id and article_id not in saved_ids:
+                saved_ids.append(article_id)
+
+        return len(new_keys), saved_ids
+
     async def save(self, articles: List[Dict[str, Any]], session: AsyncSession) -> tuple[int, List[int]]:
         """将文章列表保存到数据库，带有去重逻辑。
 
         去重策略:
             - ArXiv: 通过规范化的 external_id 全局去重（不含版本号，不使用 source_id）
             - 其他源: 通过 (source_type, source_id, external_id) 三元组唯一标识
-        如果文章已存在则更新非空字段，否则创建新记录。
+        如果文章已存在则按 merge_article_fields 规则更新字段，否则创建新记录。
+        保存后增量更新全文检索索引，并检测跨来源的近似重复文章（写入 duplicate_of）。
+
+        默认走批量路径（每批固定次数的数据库往返）；批量写入失败时
+        回滚到保存点并退回逐篇保存，保证单篇坏数据不影响整批。
 
         Args:
             articles: List of article dictionaries
@@ -111,82 +405,65 @@ class BaseCrawler(ABC):
         if not articles:
             return 0, []
 
+        try:
+            async with session.begin_nested():
+                saved_count, saved_ids = await self._bulk_save(articles, session)
+        except Exception as e:
+            self.logger.warning(
+                f"Bulk save failed for {len(articles)} articles, falling back to per-article save: {e}"
+            )
+            saved_count, saved_ids = await self._save_rowwise(articles, session)
+
+        # 增量更新全文检索索引（新增与更新的文章）
+        from apps.search.index import index_articles
+        await index_articles(session, saved_ids)
+        # 跨来源近似重复检测：转载链接到规范文章，下游阶段跳过
+        from apps.crawler.near_dup import detect_near_duplicates
+        await detect_near_duplicates(session, saved_ids)
+        return saved_count, saved_ids
+
+    async def _save_rowwise(
+        self,
+        articles: List[Dict[str, Any]],
+        session: AsyncSession,
+    ) -> tuple[int, List[int]]:
+        """Save articles one by one (fallback path).
+
+        逐篇保存：每篇文章单独查询和写入，单篇失败不影响其他文章。
+        仅在批量路径失败时使用。
+        """
         saved_count = 0
         saved_ids: List[int] = []
         for article_data in articles:
             try:
                 # 提取文章的外部唯一标识，用于去重判断
-                # external_id 来自数据源本身的ID（如 arXiv ID、文章 GUID 等）
                 external_id = article_data.get("external_id", "")
+                _, source_id, _ = self._dedup_key(external_id)
 
-                # 根据数据源类型选择不同的去重策略
-                existing = None
-
-                if self.source_type == "arxiv" and external_id:
-                    # ArXiv 论文使用规范化的 external_id 全局去重（不含版本号后缀）
-                    # 这样同一篇论文不会因为属于多个分类或版本号不同而重复
-                    stmt = select(Article).where(
-                        Article.source_type == self.source_type,
-                        Article.external_id == external_id,
-                    )
-                    result = await session.execute(stmt)
-                    existing = result.scalar_one_or_none()
-                else:
-                    # 其他数据源使用三元组去重
-                    # 通过 (source_type, source_id, external_id) 查询是否已存在
-                    stmt = select(Article).where(
-                        Article.source_type == self.source_type,
-                        Article.source_id == self.source_id,
-                        Article.external_id == external_id,
-                    )
-                    result = await session.execute(stmt)
-                    existing = result.scalar_one_or_none()
+                conditions = [
+                    Article.source_type == self.source_type,
+                    Article.external_id == external_id,
+                ]
+                if source_id is not None:
+                    conditions.append(Article.source_id == source_id)
+                result = await session.execute(
+                    select(Article).where(*conditions).order_by(Article.id).limit(1)
+                )
+                existing = result.scalar_one_or_none()
 
                 if existing:
-                    # 文章已存在：更新已有记录，优先使用更完整的数据
-                    # 仅在新值非空且比旧值更完整时才更新
-
-                    # 对于 arxiv 来源，判断新抓取的论文是否比已有记录更新
-                    # arxiv_id / url / cover_image_url 只在新数据更新时才覆盖
-                    new_updated_time = article_data.get("arxiv_updated_time")
-                    existing_updated_time = existing.arxiv_updated_time
-                    is_newer = (
-                        new_updated_time is not None
-                        and (
-                            existing_updated_time is None
-                            or new_updated_time > existing_updated_time
-                        )
-                    )
-                    # 这些字段仅在新数据更新时才覆盖，否则保留已有值
-                    version_sensitive_fields = {"arxiv_id", "url", "cover_image_url"}
-
-                    for key, value in article_data.items():
-                        if hasattr(existing, key) and value is not None:
-                            # 版本敏感字段：只有新数据更新时才更新
-                            if key in version_sensitive_fields:
-                                if is_newer:
-                                    setattr(existing, key, value)
-                                continue
-                            existing_value = getattr(existing, key, None)
-                            # 对于字符串类型，只有新值更长或旧值为空时才更新
-                            if isinstance(value, str):
-                                if value and (not existing_value or len(value) >= len(str(existing_value))):
-                                    setattr(existing, key, value)
-                            else:
-                                # 非字符串类型，仅当旧值为空时更新
-                                if value is not None and existing_value is None:
-                                    setattr(existing, key, value)
+                    # 文章已存在：按合并规则更新已有记录
+                    stored = {col: getattr(existing, col) for col in _ARTICLE_COLUMNS}
+                    for key, value in self.merge_article_fields(stored, article_data).items():
+                        setattr(existing, key, value)
                     # 更新修改时间，用于追踪数据变化
                     existing.updated_at = datetime.now(timezone.utc)
-                    # 记录已存在文章的 ID（用于翻译钩子）
                     if existing.id:
                         saved_ids.append(existing.id)
                 else:
                     # 文章不存在：创建新记录
-                    # 自动填入 source_type、source_id 和 crawl_time
                     # 过滤掉非 Article 模型字段，避免子类爬虫传入额外字段导致 TypeError
-                    valid_columns = {c.key for c in Article.__table__.columns}
-                    filtered_data = {k: v for k, v in article_data.items() if k in valid_columns}
+                    filtered_data = {k: v for k, v in article_data.items() if k in _ARTICLE_COLUMNS}
                     article = Article(
                         source_type=self.source_type,
                         source_id=self.source_id,
@@ -194,6 +471,9 @@ class BaseCrawler(ABC):
                         **filtered_data,
                     )
                     session.add(article)
+                    # flush 以获取新文章 ID，同时让后续重复条目能查到它
+                    await session.flush()
+                    saved_ids.append(article.id)
                     saved_count += 1
 
             except Exception as e:
@@ -208,35 +488,6 @@ class BaseCrawler(ABC):
                 )
                 continue
 
-        # flush() 将挂起的操作发送到数据库，但不提交事务
-        # 这样可以获取新创建文章的 ID
-        await session.flush()
-
-        # 收集新创建文章的 ID
-        for article_data in articles:
-            # 新创建的文章没有 ID，需要从 session 中获取
-            # 通过 external_id 查询刚保存的文章 ID
-            external_id = article_data.get("external_id", "")
-            if external_id and self.source_type == "arxiv":
-                stmt = select(Article.id).where(
-                    Article.source_type == self.source_type,
-                    Article.external_id == external_id,
-                )
-                result = await session.execute(stmt)
-                article_id = result.scalar_one_or_none()
-                if article_id and article_id not in saved_ids:
-                    saved_ids.append(article_id)
-            elif external_id:
-                stmt = select(Article.id).where(
-                    Article.source_type == self.source_type,
-                    Article.source_id == self.source_id,
-                    Article.external_id == external_id,
-                )
-                result = await session.execute(stmt)
-                article_id = result.scalar_one_or_none()
-                if article_id and article_id not in saved_ids:
-                    saved_ids.append(article_id)
-
         return saved_count, saved_ids
 
     async def run(self) -> Dict[str, Any]:
@@ -255,11 +506,32 @@ class BaseCrawler(ABC):
         start_time = datetime.now(timezone.utc)
         self.logger.info(f"Starting crawl for {self.source_type}:{self.source_id}")
 
+        # 开启条件请求，记录本次 fetch 涉及的 URL，处理成功后再提交校验信息
+        self.conditional_fetch = True
+        self._validator_requests = []
+
         try:
             # 第一步：从数据源获取原始数据
             # Fetch raw data
             raw_data = await self.fetch()
 
+            # 内容自上次成功抓取后未变化（304 或内容哈希一致），跳过解析与入库
+            if raw_data is NOT_MODIFIED:
+                self._settle_validators(commit=True)
+                end_time = datetime.now(timezone.utc)
+                self.logger.info("Feed not modified since last crawl, skipping parse and save")
+                return {
+                    "source_type": self.source_type,
+                    "source_id": self.source_id,
+                    "fetched_count": 0,
+                    "saved_count": 0,
+                    "saved_ids": [],
+                    "duration_seconds": (end_time - start_time).total_seconds(),
+                    "status": "success",
+                    "not_modified": True,
+                    "timestamp": end_time.isoformat(),
+                }
+
             # 第二步：将原始数据解析为标准化的文章字典列表
             # Parse into articles
             articles = await self.parse(raw_data)
@@ -274,6 +546,9 @@ class BaseCrawler(ABC):
                 # 提交事务，确保所有数据持久化
                 await session.commit()
 
+            # 数据已落库，提交本次条件请求的校验信息
+            self._settle_validators(commit=True)
+
             # 计算爬取耗时
             end_time = datetime.now(timezone.utc)
             duration = (end_time - start_time).total_seconds()
@@ -297,6 +572,8 @@ class BaseCrawler(ABC):
             # 捕获所有异常，记录完整的堆栈信息（exception 会自动附带 traceback）
             # 返回错误结果字典而非抛出异常，确保调用者能正常处理失败情况
             self.logger.exception(f"Crawl failed: {e}")
+            # 处理失败，丢弃暂存的校验信息，下次仍完整抓取
+            self._settle_validators(commit=False)
             return {
                 "source_type": self.source_type,
                 "source_id": self.source_id,
@@ -304,6 +581,8 @@ class BaseCrawler(ABC):
                 "error": str(e),
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
+        finally:
+            self.conditional_fetch = False
 
     async def delay(self, base: float = 3.0, jitter: float = 1.0) -> None:
         """添加带随机抖动的延迟，用于规避目标站点的速率限制。
@@ -320,3 +599,65 @@ class BaseCrawler(ABC):
         # 实际延迟 = 基础延迟 + 随机抖动值
         delay_time = base + random.uniform(0, jitter)
         await asyncio.sleep(delay_time)
+
+    async def run_parser(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a CPU-bound parsing function off the event loop.
+
+        在共享解析执行器（进程池，降级为线程池）中运行解析函数，
+        避免 feedparser / BeautifulSoup 阻塞事件循环。
+        ``func`` 必须是模块级函数，参数与返回值必须可 pickle。
+
+        Args:
+            func: Module-level parsing function.
+            *args: Positional arguments.
+            **kwargs: Keyword arguments.
+
+        Returns:
+            The return value of ``func``.
+        """
+        return await parse_executor.run(func, *args, **kwargs)
+
+    async def parse_feed(self, raw_data: str) -> Dict[str, Any]:
+        """Parse RSS/Atom XML off the event loop.
+
+        Args:
+            raw_data: Feed XML text.
+
+        Returns:
+            Dict[str, Any]: Plain feed dict with ``bozo``, ``bozo_exception``
+            and ``entries`` (list of plain entry dicts).
+        """
+        return await self.run_parser(parse_feed, raw_data)
+
+    async def fetch_text(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Union[str, NotModified]:
+        """Fetch a document, using a conditional GET while run() is active.
+
+        获取 Feed 文档。run() 期间自动附带上次的 ETag / Last-Modified，
+        内容未变化时返回 NOT_MODIFIED；单独调用 fetch()（如 dry-run）时为普通请求。
+
+        Args:
+            url: Document URL.
+            params: Query parameters.
+            **kwargs: Extra arguments for ``get_text_async``.
+
+        Returns:
+            Union[str, NotModified]: Document text, or ``NOT_MODIFIED``.
+        """
+        if not self.conditional_fetch:
+            return await get_text_async(url, params=params, **kwargs)
+        self._validator_requests.append((url, params))
+        return await get_text_async(url, params=params, conditional=True, **kwargs)
+
+    def _settle_validators(self, commit: bool) -> None:
+        """Commit or discard validators staged by fetch_text() during run()."""
+        for url, params in getattr(self, "_validator_requests", []):
+            if commit:
+                commit_validators(url, params)
+            else:
+                discard_validators(url, params)
+        self._validator_requests = []
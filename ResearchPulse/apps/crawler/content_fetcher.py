@@ -0,0 +1,166 @@
+# =============================================================================
+# 模块: apps/crawler/content_fetcher.py
+# 功能: 原文正文的并发抓取与跨爬取结果缓存
+# 架构角色: 爬虫子系统的共享基础设施。RSS 爬虫补全摘要型条目的正文、
+#   HackerNews / Reddit 爬虫抓取外链正文时都通过本模块调度。
+# 设计理念:
+#   1. 有界并发：全局并发上限 + 按域名的并发上限（复用 HostRateLimiter），
+#      既能并行下载，又不会对单个站点造成压力
+#   2. 跨爬取缓存：以 normalize_url_for_dedup 规范化后的 URL 为键，
+#      同一篇文章被 HN、Reddit、RSS 同时引用时，TTL 内只下载、提取一次
+#   3. 单飞（single-flight）：同一 URL 的并发请求共享同一个下载任务
+#   4. 实际下载与提取由调用方传入的 loader 完成，本模块只负责调度与缓存
+# =============================================================================
+
+"""Bounded concurrent full-content fetching with a cross-crawl cache.
+
+Usage:
+    text = await content_fetcher.fetch(url, loader=crawler._fetch_full_content)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from apps.crawler.rate_limit import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# 缓存的最大条目数（超出后淘汰最久未使用的条目）
+MAX_CACHE_ENTRIES = 2000
+# 提取结果为空（页面无正文、下载失败）时的缓存时间，避免短时间内反复请求
+NEGATIVE_CACHE_TTL = 300
+
+
+class ContentFetcher:
+    """Schedule full-content downloads with global/per-domain caps and caching.
+
+    原文正文抓取调度器：全局并发上限、按域名并发上限、TTL 结果缓存与单飞。
+
+    Args:
+        max_concurrency: Max downloads in flight across all domains.
+        per_domain: Max downloads in flight per domain.
+        cache_ttl: Seconds a non-empty extraction result is reused.
+    """
+
+    def __init__(self, max_concurrency: int = 8, per_domain: int = 2, cache_ttl: float = 3600.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_domain = max(1, per_domain)
+        self.cache_ttl = max(0.0, cache_ttl)
+        self._cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # 以下并发原语绑定事件循环，事件循环变化时重建
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._limiter: Optional[HostRateLimiter] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def cache_key(url: str) -> str:
+        """Return the cache key for ``url`` (normalized for dedup)."""
+        # 延迟导入，避免与 rss.crawler 循环导入
+        from apps.crawler.rss.crawler import normalize_url_for_dedup
+
+        return normalize_url_for_dedup(url)
+
+    def _bind_loop(self) -> None:
+        """(Re)create loop-bound primitives for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._limiter = HostRateLimiter(default_concurrency=self.per_domain)
+            self._inflight = {}
+
+    def get_cached(self, url: str) -> Optional[str]:
+        """Return a cached extraction result for ``url``, if still fresh."""
+        key = self.cache_key(url)
+        item = self._cache.get(key)
+        if item is None:
+            return None
+        expires_at, text = item
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return text
+
+    def _store(self, key: str, text: str) -> None:
+        """Store a result, evicting least-recently-used entries when full."""
+        ttl = self.cache_ttl if text else min(self.cache_ttl, NEGATIVE_CACHE_TTL)
+        if ttl <= 0:
+            return
+        self._cache[key] = (time.monotonic() + ttl, text)
+        self._cache.move_to_end(key)
+        while len(self._cache) > MAX_CACHE_ENTRIES:
+            self._cache.popitem(last=False)
+
+    async def fetch(self, url: str, loader: Callable[[str], Awaitable[str]]) -> str:
+        """Fetch and extract ``url`` through the shared caps and cache.
+
+        命中缓存直接返回；同一 URL 正在下载时等待同一个任务；
+        否则占用全局与域名并发名额后调用 loader 下载并提取正文。
+
+        Args:
+            url: Page URL.
+            loader: Coroutine function performing the download and extraction.
+
+        Returns:
+            str: Extracted text ("" when nothing could be extracted).
+
+        Raises:
+            Exception: Propagates loader exceptions (not cached).
+        """
+        cached = self.get_cached(url)
+        if cached is not None:
+            return cached
+
+        self._bind_loop()
+        key = self.cache_key(url)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.ensure_future(self._load(key, url, loader))
+        self._inflight[key] = future
+        # shield：单个调用方被取消时不影响其他等待同一 URL 的调用方
+        return await asyncio.shield(future)
+
+    async def _load(self, key: str, url: str, loader: Callable[[str], Awaitable[str]]) -> str:
+        """Run ``loader`` under the global and per-domain caps, then cache."""
+        host = urlparse(url).netloc.lower() or url
+        try:
+            async with self._semaphore:
+                async with self._limiter.slot(host):
+                    text = await loader(url) or ""
+            self._store(key, text)
+            return text
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._cache.clear()
+
+    def cache_size(self) -> int:
+        """Return the number of cached results."""
+        return len(self._cache)
+
+
+def _create_content_fetcher() -> ContentFetcher:
+    """Build the shared fetcher from settings."""
+    from settings import settings
+
+    return ContentFetcher(
+        max_concurrency=settings.crawler_content_fetch_concurrency,
+        per_domain=settings.crawler_content_fetch_per_domain,
+        cache_ttl=settings.crawler_content_cache_ttl,
+    )
+
+
+# 模块级单例，所有爬虫共享并发预算与结果缓存
+content_fetcher = _create_content_fetcher()
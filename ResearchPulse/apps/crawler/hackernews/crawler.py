@@ -14,19 +14,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import html
 import logging
 import re
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
-from typing import Any, Dict, List, Optional
-
-import feedparser
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 from apps.crawler.base import BaseCrawler
 from apps.crawler.registry import CrawlerRegistry
+from apps.crawler.content_fetcher import content_fetcher
 from apps.crawler.models import HackerNewsSource
-from common.http import get_text_async
+from apps.crawler.parsing import extract_main_text
+from common.http import NotModified, get_text_async
 
 # 模块级日志器
 logger = logging.getLogger(__name__)
@@ -95,19 +96,20 @@ class HackerNewsCrawler(BaseCrawler):
         self.fetch_external_content = fetch_external_content
         self.feed_url = HN_FEEDS.get(feed_type, HN_FEEDS["front"])
 
-    async def fetch(self) -> str:
+    async def fetch(self) -> Union[str, NotModified]:
         """Fetch HackerNews RSS feed content.
 
         使用 HTTP 工具函数请求 Feed URL，带重试和指数退避。
+        run() 期间使用条件请求，Feed 未变化时返回 NOT_MODIFIED。
 
         Returns:
-            str: RSS XML text.
+            Union[str, NotModified]: RSS XML text, or ``NOT_MODIFIED``.
 
         Raises:
             Exception: Propagates fetch failures.
         """
         try:
-            feed_text = await get_text_async(
+            feed_text = await self.fetch_text(
                 self.feed_url,
                 timeout=self.timeout,
                 retries=3,
@@ -121,7 +123,7 @@ class HackerNewsCrawler(BaseCrawler):
     async def parse(self, raw_data: str) -> List[Dict[str, Any]]:
         """Parse RSS XML into article dictionaries.
 
-        使用 feedparser 解析 XML 并逐条处理条目。
+        在解析执行器中使用 feedparser 解析 XML，再逐条处理条目。
         对于链接类帖子，尝试访问原文 URL 提取完整正文。
 
         Args:
@@ -130,46 +132,59 @@ class HackerNewsCrawler(BaseCrawler):
         Returns:
             List[Dict[str, Any]]: Article dictionaries.
         """
-        feed = feedparser.parse(raw_data)
+        feed = await self.parse_feed(raw_data)
 
         # 检查解析错误
-        if feed.bozo and not feed.entries:
-            self.logger.warning(f"RSS parse error: {feed.bozo_exception}")
+        if feed["bozo"] and not feed["entries"]:
+            self.logger.warning(f"RSS parse error: {feed['bozo_exception']}")
             return []
 
         articles = []
-        for entry in feed.entries:
+        for entry in feed["entries"]:
             article = self._parse_entry(entry)
             if article:
                 articles.append(article)
 
-        # 对于链接类帖子，尝试抓取外部链接的内容
+        # 对于链接类帖子，并发抓取外部链接的内容（共享全局/域名并发上限与结果缓存）
         if self.fetch_external_content:
-            for article in articles:
-                external_url = article.get("external_link")
-                if external_url and self._should_fetch_content(article):
-                    try:
-                        content = await self._fetch_external_content(external_url)
-                        if content and len(content) > len(article.get("content", "")):
-                            # 将外部链接信息添加到内容中
-                            article["content"] = (
-                                f"[外部链接] {external_url}\n\n"
-                                f"{content}"
-                            )
-                    except Exception as e:
-                        self.logger.debug(
-                            f"Failed to fetch external content for {external_url}: {e}"
-                        )
+            targets = [
+                article for article in articles
+                if article.get("external_link") and self._should_fetch_content(article)
+            ]
+            if targets:
+                await asyncio.gather(*(self._enrich_content(article) for article in targets))
 
         return articles
 
-    def _parse_entry(self, entry: feedparser.FeedParserDict) -> Optional[Dict[str, Any]]:
+    async def _enrich_content(self, article: Dict[str, Any]) -> None:
+        """Fill a link post's content from its external URL.
+
+        通过共享的 content_fetcher 抓取外链正文，结果更长时替换 content。
+
+        Args:
+            article: Article dictionary from _parse_entry (modified in place).
+        """
+        external_url = article["external_link"]
+        try:
+            content = await content_fetcher.fetch(external_url, self._fetch_external_content)
+            if content and len(content) > len(article.get("content", "")):
+                # 将外部链接信息添加到内容中
+                article["content"] = (
+                    f"[外部链接] {external_url}\n\n"
+                    f"{content}"
+                )
+        except Exception as e:
+            self.logger.debug(
+                f"Failed to fetch external content for {external_url}: {e}"
+            )
+
+    def _parse_entry(self, entry: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
         """Parse a single RSS entry into an article dictionary.
 
         对字段采用多重降级策略兼容不同 Feed 格式。
 
         Args:
-            entry: FeedParser entry.
+            entry: Feed entry dict.
 
         Returns:
             Dict[str, Any] | None: Article dict or None when missing title.
@@ -301,51 +316,8 @@ class HackerNewsCrawler(BaseCrawler):
             if not html_content:
                 return ""
 
-            # 使用 BeautifulSoup 提取正文
-            from bs4 import BeautifulSoup
-
-            soup = BeautifulSoup(html_content, "html.parser")
-
-            # 移除干扰元素
-            for tag in soup.find_all(
-                ["script", "style", "nav", "header", "footer", "aside", "iframe", "noscript"]
-            ):
-                tag.decompose()
-
-            # 策略 1: 查找 <article> 标签
-            article_tag = soup.find("article")
-            if article_tag:
-                text = article_tag.get_text(separator="\n", strip=True)
-                if len(text) >= 100:
-                    return text
-
-            # 策略 2: 查找常见正文容器
-            content_selectors = [
-                {"class_": re.compile(r"article[_-]?(body|content|text)", re.I)},
-                {"class_": re.compile(r"post[_-]?(body|content|text)", re.I)},
-                {"class_": re.compile(r"(main[_-]?content|content[_-]?area)", re.I)},
-            ]
-            for selector in content_selectors:
-                container = soup.find("div", **selector)
-                if container:
-                    text = container.get_text(separator="\n", strip=True)
-                    if len(text) >= 100:
-                        return text
-
-            # 策略 3: 查找 body 中最长的文本段落
-            body = soup.find("body")
-            if body:
-                paragraphs = body.find_all("p")
-                if paragraphs:
-                    full_text = "\n".join(
-                        p.get_text(strip=True)
-                        for p in paragraphs
-                        if p.get_text(strip=True)
-                    )
-                    if len(full_text) >= 100:
-                        return full_text
-
-            return ""
+            # BeautifulSoup 提取正文在解析执行器中完成，避免阻塞事件循环
+            return await self.run_parser(extract_main_text, html_content)
 
         except Exception:
             return ""
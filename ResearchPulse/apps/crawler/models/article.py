@@ -154,6 +154,26 @@ class Article(Base, TimestampMixin):
         nullable=True,
     )
 
+    # ---- 去重相关字段 ----
+    # 规范化去重键，由去重任务（dedup_job）增量写入：arXiv 为 "arxiv:<arxiv_id>"，
+    # RSS 为 "rss:<sha1(来源 ID + 规范化标题)>"；无法去重的文章为 NULL
+    dedup_key: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="Normalized duplicate-detection key",
+        # NOTE: index defined in __table_args__ as ix_articles_dedup_key
+    )
+    # 近似重复文章指向的规范文章 ID，由爬虫保存时的近似重复检测（apps/crawler/near_dup.py）
+    # 写入：同一事件经不同来源（RSS、HackerNews、Reddit 等）抓取的转载；
+    # 非 NULL 的文章不再进入 AI 处理、向量化与聚类等下游阶段
+    duplicate_of: Mapped[int | None] = mapped_column(
+        BigInteger,
+        ForeignKey("articles.id", ondelete="SET NULL"),
+        nullable=True,
+        comment="Canonical article ID if this is a near-duplicate",
+        # NOTE: index defined in __table_args__ as ix_articles_duplicate_of
+    )
+
     # ---- arXiv 专用字段 ----
     # 这些字段仅在 source_type='arxiv' 时有值
     # Additional fields for specific sources
@@ -317,6 +337,10 @@ class Article(Base, TimestampMixin):
         # 复合索引：优化 AI 处理和 Embedding 任务的未处理文章查询
         # 覆盖 WHERE ai_processed_at IS NULL AND is_archived = FALSE ORDER BY crawl_time DESC
         Index("ix_articles_ai_unprocessed", "ai_processed_at", "is_archived", "crawl_time"),
+        # 去重键索引：去重任务按键查找最早的同键文章
+        Index("ix_articles_dedup_key", "dedup_key"),
+        # 近似重复索引：按规范文章查找其转载
+        Index("ix_articles_duplicate_of", "duplicate_of"),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,550 @@
+# =============================================================================
+# 模块: apps/crawler/near_dup.py
+# 功能: 跨来源近似重复文章检测（SimHash + LSH 分段索引）
+# 架构角色: 爬虫保存流程（BaseCrawler.save）的后置步骤。同一事件常经 RSS、HackerNews、
+#           Reddit、Twitter、微信公众号等多个来源抓取，URL 与标题略有差异，
+#           (source_type, source_id, external_id) 精确去重无法识别。
+#           本模块为新保存的文章计算标题 + 正文的 64 位 SimHash 指纹，
+#           在滚动时间窗口内查找汉明距离不超过阈值的已有文章，
+#           命中时写入 articles.duplicate_of 指向规范文章（最早保存的一篇），
+#           AI 处理、向量化、事件聚类等下游阶段据此跳过转载。
+# 设计理念:
+#   1. 分词复用全文检索的分词器（中日韩二元组 + 英文单词），中英文混排统一处理
+#   2. LSH 分段：64 位指纹按阈值 d 切为 d + 1 段，每段作为倒排键；汉明距离 ≤ d 的两篇文章
+#      至少有一段完全相同（抽屉原理），只需比较共享分段的候选，不随窗口内文章数线性增长
+#   3. 索引常驻内存，只保留窗口内（dedup.near_dup_window_hours）的文章；
+#      按间隔（dedup.near_dup_persist_seconds）原子写入 data_dir 下的 JSON 文件，
+#      进程重启后加载，窗口内的近似重复检测不中断。Web 服务、调度器与爬虫脚本共享该文件：
+#      写入前在文件锁内并入磁盘上其他进程写入的条目，不会互相覆盖；
+#      加锁、合并与 fsync 在线程中对快照执行，不阻塞事件循环
+#   4. 规范文章始终是 ID 更小的文章，转载链在写入时压平（A ← B ← C 记为 C → A）
+#   5. 索引仅为加速结构，检测失败只记录日志，不影响文章保存
+#   6. SimHash 为纯 Python 计算（每篇约数毫秒），按批交给共享的 parse_executor 执行，
+#      不阻塞事件循环
+#   7. 多个爬虫并发保存：本会话新增的条目先记在会话内（session.info），事务提交后才并入
+#      共享索引，其他会话不会链接到尚未提交（可能回滚）的文章；规范文章在本会话不可见时
+#      只放弃这条链接，不从索引中移除条目
+# =============================================================================
+
+"""Cross-source near-duplicate detection with SimHash and LSH banding.
+
+Usage:
+    await detect_near_duplicates(session, saved_ids)   # after saving articles
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import bindparam, event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from apps.crawler.models import Article
+from apps.crawler.parsing import parse_executor
+from apps.search.index import tokenize
+from common.feature_config import feature_config
+from core.bulk import chunked
+
+logger = logging.getLogger(__name__)
+
+# 索引持久化文件名（位于 settings.data_dir 下）
+NEAR_DUP_INDEX_FILENAME = "near_dup_index.json"
+
+# SimHash 指纹位数
+SIMHASH_BITS = 64
+
+# 阈值上限：再大则分段过短，候选过多且误判增多
+MAX_DISTANCE_LIMIT = 15
+
+# 参与指纹计算的正文前缀长度：转载通常保留开头，尾部的版权声明、推荐阅读差异较大
+_BODY_CHARS = 2000
+
+# 分词数过少的文章指纹不稳定（如只有短标题），不参与检测
+_MIN_TOKENS = 8
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+_DETECT_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.summary,
+    Article.content,
+    Article.crawl_time,
+    Article.duplicate_of,
+)
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: Optional[str]) -> Optional[int]:
+    """Return the 64-bit SimHash fingerprint of *text*, or None if it is too short.
+
+    每个词的 64 位哈希按词频加权投票，每位取票数符号。
+    """
+    counts = Counter(tokenize(_TAG_RE.sub(" ", text or "")))
+    if sum(counts.values()) < _MIN_TOKENS:
+        return None
+    votes = [0] * SIMHASH_BITS
+    for token, weight in counts.items():
+        h = _token_hash(token)
+        for bit in range(SIMHASH_BITS):
+            votes[bit] += weight if (h >> bit) & 1 else -weight
+    fingerprint = 0
+    for bit, vote in enumerate(votes):
+        if vote > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def fingerprint_texts(texts: Sequence[str]) -> List[Optional[int]]:
+    """SimHash a batch of texts (module-level so it can run in ``parse_executor``)."""
+    return [simhash(text) for text in texts]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+def article_text(title: Optional[str], summary: Optional[str], content: Optional[str]) -> str:
+    """Build the text fingerprinted for an article: title plus the leading body text."""
+    body = content or summary or ""
+    return f"{title or ''}\n{body[:_BODY_CHARS]}"
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive inter-process lock on *path* (no-op where fcntl is unavailable)."""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(path, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def band_layout(max_distance: int) -> List[Tuple[int, int]]:
+    """Split the fingerprint into ``max_distance + 1`` bands as ``(shift, mask)`` pairs.
+
+    汉明距离 ≤ max_distance 的两个指纹至少有一段完全相同。
+    """
+    bands = max(0, min(max_distance, MAX_DISTANCE_LIMIT)) + 1
+    layout = []
+    shift = 0
+    for i in range(bands):
+        width = SIMHASH_BITS // bands + (1 if i < SIMHASH_BITS % bands else 0)
+        layout.append((shift, (1 << width) - 1))
+        shift += width
+    return layout
+
+
+class NearDupIndex:
+    """In-memory LSH band index over recent article fingerprints.
+
+    条目为 (文章 ID, 指纹, 时间戳, 规范文章 ID)；每个分段值映射到含该分段的文章 ID 集合。
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_distance: int = 6):
+        self.path = path
+        self.max_distance = max(0, min(max_distance, MAX_DISTANCE_LIMIT))
+        self._layout = band_layout(self.max_distance)
+        self._entries: Dict[int, Tuple[int, float, int]] = {}
+        self._bands: List[Dict[int, Set[int]]] = [{} for _ in self._layout]
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        # 上次保存后主动移除的条目与过期时间线，合并磁盘文件时不再并入
+        self._removed: Set[int] = set()
+        self._horizon = 0.0
+        self._saving = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, article_id: int) -> bool:
+        return article_id in self._entries
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        return [(fingerprint >> shift) & mask for shift, mask in self._layout]
+
+    def set_max_distance(self, max_distance: int) -> None:
+        """Change the distance threshold, re-bucketing entries if the band layout changes."""
+        max_distance = max(0, min(max_distance, MAX_DISTANCE_LIMIT))
+        if max_distance == self.max_distance:
+            return
+        entries = self._entries
+        self.max_distance = max_distance
+        self._layout = band_layout(max_distance)
+        self._entries = {}
+        self._bands = [{} for _ in self._layout]
+        for article_id, entry in entries.items():
+            self.add(article_id, *entry)
+
+    def add(self, article_id: int, fingerprint: int, timestamp: float, canonical_id: int) -> None:
+        """Add (or replace) an article entry."""
+        self._remove(article_id)
+        self._removed.discard(article_id)
+        self._entries[article_id] = (fingerprint, timestamp, canonical_id)
+        for band, value in zip(self._bands, self._band_values(fingerprint)):
+            band.setdefault(value, set()).add(article_id)
+        self._dirty = True
+
+    def set_canonical(self, article_id: int, canonical_id: int) -> None:
+        """Point an indexed article at another canonical article."""
+        entry = self._entries.get(article_id)
+        if entry is not None:
+            self._entries[article_id] = (entry[0], entry[1], canonical_id)
+            self._dirty = True
+
+    def _remove(self, article_id: int) -> bool:
+        """Remove one entry from the entries and bands; returns whether it existed."""
+        entry = self._entries.pop(article_id, None)
+        if entry is None:
+            return False
+        for band, value in zip(self._bands, self._band_values(entry[0])):
+            members = band.get(value)
+            if members is not None:
+                members.discard(article_id)
+                if not members:
+                    del band[value]
+        self._dirty = True
+        return True
+
+    def discard(self, article_ids: Iterable[int]) -> None:
+        """Remove entries (unknown IDs are ignored)."""
+        for article_id in article_ids:
+            self._remove(article_id)
+            self._removed.add(article_id)
+
+    def find(
+        self,
+        fingerprint: int,
+        since: float = 0.0,
+        before_id: Optional[int] = None,
+    ) -> Optional[int]:
+        """Return the canonical ID of the closest indexed article, if any is near enough.
+
+        Args:
+            fingerprint: SimHash of the article being checked.
+            since: Ignore entries older than this timestamp.
+            before_id: Only match articles with a smaller ID (saved earlier).
+
+        Returns:
+            Optional[int]: Canonical article ID of the best match, or None.
+        """
+        best = self.nearest(fingerprint, since, before_id)
+        return best[1] if best is not None else None
+
+    def nearest(
+        self,
+        fingerprint: int,
+        since: float = 0.0,
+        before_id: Optional[int] = None,
+    ) -> Optional[Tuple[int, int]]:
+        """Like :meth:`find`, returning ``(distance, canonical ID)`` of the best match."""
+        candidates: Set[int] = set()
+        for band, value in zip(self._bands, self._band_values(fingerprint)):
+            candidates.update(band.get(value, ()))
+        best: Optional[Tuple[int, int]] = None
+        for article_id in candidates:
+            if before_id is not None and article_id >= before_id:
+                continue
+            other, timestamp, canonical_id = self._entries[article_id]
+            if timestamp < since:
+                continue
+            distance = hamming_distance(fingerprint, other)
+            if distance <= self.max_distance and (best is None or (distance, canonical_id) < best):
+                best = (distance, canonical_id)
+        return best
+
+    def expire(self, since: float) -> int:
+        """Drop entries older than *since*; returns the number removed."""
+        self._horizon = max(self._horizon, since)
+        stale = [i for i, (_, timestamp, _) in self._entries.items() if timestamp < since]
+        for article_id in stale:
+            self._remove(article_id)
+        return len(stale)
+
+    def _read_file(self) -> Dict[int, Tuple[int, float, int]]:
+        """Read persisted entries (a missing or unreadable file yields none)."""
+        if self.path is None or not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            return {
+                int(article_id): (int(fingerprint), float(timestamp), int(canonical_id))
+                for article_id, fingerprint, timestamp, canonical_id in data.get("entries", [])
+            }
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Failed to load near-duplicate index {self.path}: {e}")
+            return {}
+
+    def load(self) -> None:
+        """Load persisted entries (a missing or unreadable file leaves the index empty)."""
+        for article_id, entry in self._read_file().items():
+            self.add(article_id, *entry)
+        self._dirty = False
+
+    def _write_merged(
+        self,
+        entries: Dict[int, Tuple[int, float, int]],
+        removed: Set[int],
+        horizon: float,
+    ) -> Dict[int, Tuple[int, float, int]]:
+        """Merge a snapshot with the file on disk and write it atomically (blocking).
+
+        持有文件锁读取磁盘上的条目，并入快照中没有的条目（已移除或已过期的除外），
+        再写入临时文件并原子替换，多个进程共享同一文件时不会互相覆盖。
+
+        Returns:
+            Dict: Entries merged in from the file (written by other processes).
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self.path.with_name(self.path.name + ".lock")):
+            merged = {
+                article_id: entry for article_id, entry in self._read_file().items()
+                if article_id not in entries and article_id not in removed and entry[1] >= horizon
+            }
+            rows = [
+                [article_id, fingerprint, timestamp, canonical_id]
+                for source in (entries, merged)
+                for article_id, (fingerprint, timestamp, canonical_id) in source.items()
+            ]
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"entries": rows}, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        return merged
+
+    def _begin_save(self) -> Tuple[Dict[int, Tuple[int, float, int]], Set[int], float]:
+        """Snapshot the state to persist and reset the change tracking."""
+        snapshot = (dict(self._entries), self._removed, self._horizon)
+        self._removed = set()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        return snapshot
+
+    def _finish_save(self, merged: Dict[int, Tuple[int, float, int]]) -> None:
+        """Add entries merged from the file, unless removed or expired meanwhile."""
+        dirty = self._dirty
+        for article_id, entry in merged.items():
+            if article_id in self._entries or article_id in self._removed or entry[1] < self._horizon:
+                continue
+            self.add(article_id, *entry)
+        self._dirty = dirty
+
+    def save(self) -> None:
+        """Merge with the file on disk and write all entries atomically."""
+        if self.path is None:
+            return
+        snapshot = self._begin_save()
+        self._finish_save(self._write_merged(*snapshot))
+
+    async def maybe_save(self, interval_seconds: float) -> bool:
+        """Save if there are unsaved changes and *interval_seconds* passed since the last save.
+
+        文件锁、读取合并与 fsync 在线程中对快照执行，不阻塞事件循环；
+        同一时间只有一次保存，写入失败时保留变更等待下次重试。
+        """
+        if self._saving or not self._dirty or time.monotonic() - self._saved_at < interval_seconds:
+            return False
+        if self.path is None:
+            return False
+        entries, removed, horizon = self._begin_save()
+        self._saving = True
+        try:
+            merged = await asyncio.to_thread(self._write_merged, entries, removed, horizon)
+        except Exception:
+            self._removed |= removed
+            self._dirty = True
+            raise
+        finally:
+            self._saving = False
+        self._finish_save(merged)
+        return True
+
+
+# 进程内共享的索引实例，首次使用时按 settings.data_dir 创建并加载
+_index: Optional[NearDupIndex] = None
+
+# session.info 中保存本事务新增条目（未提交）的键
+_SESSION_PENDING_KEY = "near_dup_pending"
+
+
+def _on_max_distance_change(key: str, value: Optional[str]) -> None:
+    """Re-bucket the shared index when ``dedup.near_dup_max_distance`` changes."""
+    if _index is None:
+        return
+    try:
+        max_distance = int(value) if value is not None else 6
+    except (ValueError, TypeError):
+        logger.warning(f"Ignoring invalid {key}: {value!r}")
+        return
+    _index.set_max_distance(max_distance)
+
+
+def get_near_dup_index() -> NearDupIndex:
+    """Return the process-wide near-duplicate index (loaded on first use).
+
+    首次创建时读取距离阈值并订阅其变化，只有阈值真正改变时才重建分段。
+    """
+    global _index
+    if _index is None:
+        from settings import settings
+
+        _index = NearDupIndex(
+            Path(settings.data_dir) / NEAR_DUP_INDEX_FILENAME,
+            max_distance=feature_config.get_int("dedup.near_dup_max_distance", 6),
+        )
+        _index.load()
+        feature_config.subscribe("dedup.near_dup_max_distance", _on_max_distance_change)
+    return _index
+
+
+def near_dup_enabled() -> bool:
+    """Whether near-duplicate detection runs on save."""
+    return feature_config.get_bool("dedup.near_dup_enabled", True)
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    if value is None:
+        return time.time()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+async def detect_near_duplicates(session: AsyncSession, article_ids: Sequence[int]) -> int:
+    """Link newly saved articles to an earlier near-duplicate in the rolling window.
+
+    已在索引中的文章（更新而非新增）跳过；按 ID 升序处理，同批内的转载也能互相识别。
+    命中的文章写入 duplicate_of（规范文章 ID）。新条目先记在会话内，
+    事务提交后才加入共享索引（见 ``_publish_pending``）。失败只记录日志。
+
+    Args:
+        session: Session that has just written the articles.
+        article_ids: Articles saved by the crawler.
+
+    Returns:
+        int: Number of articles linked to a canonical article.
+    """
+    if not article_ids or not near_dup_enabled():
+        return 0
+    try:
+        index = get_near_dup_index()
+        window_hours = feature_config.get_int("dedup.near_dup_window_hours", 72)
+        since = time.time() - window_hours * 3600
+        index.expire(since)
+
+        pending = _pending_entries(session, index.max_distance)
+
+        links: Dict[int, int] = {}
+        new_ids = sorted(i for i in set(article_ids) if i not in index and i not in pending)
+        for chunk in chunked(new_ids):
+            rows = (await session.execute(
+                select(*_DETECT_COLUMNS).where(Article.id.in_(chunk)).order_by(Article.id)
+            )).all()
+            fingerprints = await parse_executor.run(
+                fingerprint_texts, [article_text(row.title, row.summary, row.content) for row in rows],
+            )
+            for row, fingerprint in zip(rows, fingerprints):
+                if fingerprint is None:
+                    continue
+                canonical_id = row.duplicate_of
+                if canonical_id is None:
+                    # 已提交的共享索引与本会话未提交的条目中取最近的一篇
+                    matches = [
+                        match for match in (
+                            index.nearest(fingerprint, since=since, before_id=row.id),
+                            pending.nearest(fingerprint, since=since, before_id=row.id),
+                        ) if match is not None
+                    ]
+                    canonical_id = min(matches)[1] if matches else None
+                if canonical_id is not None and canonical_id != row.duplicate_of:
+                    links[row.id] = canonical_id
+                pending.add(row.id, fingerprint, _timestamp(row.crawl_time), canonical_id or row.id)
+
+        links = await _drop_missing_canonicals(session, pending, links)
+        if links:
+            await session.execute(
+                update(Article.__table__)
+                .where(Article.__table__.c.id == bindparam("article_id"))
+                .values(duplicate_of=bindparam("canonical")),
+                [{"article_id": i, "canonical": c} for i, c in links.items()],
+            )
+            logger.info(f"Linked {len(links)} near-duplicate articles to canonical articles")
+
+        await index.maybe_save(feature_config.get_int("dedup.near_dup_persist_seconds", 300))
+        return len(links)
+    except Exception as e:
+        logger.warning(f"Near-duplicate detection failed for {len(article_ids)} articles: {e}")
+        return 0
+
+
+async def _drop_missing_canonicals(
+    session: AsyncSession, pending: NearDupIndex, links: Dict[int, int],
+) -> Dict[int, int]:
+    """Drop links to canonical articles this session cannot see.
+
+    规范文章可能已被删除，也可能由其他会话在本事务快照之后提交：只放弃链接，
+    本会话的文章改为自身规范，共享索引中的条目保留（随时间窗口过期）。
+    """
+    canonical_ids = sorted(set(links.values()))
+    existing: Set[int] = set()
+    for chunk in chunked(canonical_ids):
+        existing.update((await session.execute(
+            select(Article.id).where(Article.id.in_(chunk))
+        )).scalars().all())
+    missing = set(canonical_ids) - existing
+    if not missing:
+        return links
+    kept: Dict[int, int] = {}
+    for article_id, canonical_id in links.items():
+        if canonical_id in missing:
+            pending.set_canonical(article_id, article_id)
+        else:
+            kept[article_id] = canonical_id
+    return kept
+
+
+def _pending_entries(session: AsyncSession, max_distance: int) -> NearDupIndex:
+    """Return the session's uncommitted entries (created on first use)."""
+    info = session.sync_session.info
+    pending = info.get(_SESSION_PENDING_KEY)
+    if pending is None:
+        pending = info[_SESSION_PENDING_KEY] = NearDupIndex(max_distance=max_distance)
+    return pending
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    pending = session.info.pop(_SESSION_PENDING_KEY, None)
+    if pending is None or _index is None:
+        return
+    for article_id, entry in pending._entries.items():
+        _index.add(article_id, *entry)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_SESSION_PENDING_KEY, None)
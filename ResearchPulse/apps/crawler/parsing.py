@@ -0,0 +1,250 @@
+# =============================================================================
+# 模块: apps/crawler/parsing.py
+# 功能: 爬虫的 CPU 密集型解析（feedparser / BeautifulSoup）离线执行
+# 架构角色: 爬虫子系统的解析基础设施，被 BaseCrawler.run_parser / parse_feed 使用。
+#   feedparser 解析大型 Feed、BeautifulSoup 解析原文网页都是纯 CPU 计算，
+#   直接在 async 方法中调用会阻塞事件循环，连带阻塞 FastAPI 请求处理
+#   （管理后台手动触发爬取时尤为明显）。
+# 设计理念:
+#   1. 默认使用进程池，多核并行解析；进程池不可用（受限环境、池崩溃）时
+#      自动降级为线程池，保证功能可用
+#   2. 提交到执行器的函数均为模块级纯函数，参数和返回值只包含
+#      str / dict / list / tuple 等基础类型，序列化开销小
+#   3. 执行器为惰性创建的模块级单例，应用关闭时统一释放
+# =============================================================================
+
+"""Off-loop parsing helpers for crawlers.
+
+Usage:
+    feed = await parse_executor.run(parse_feed, xml_text)
+    for entry in feed["entries"]:
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 进程池默认最大进程数（自动模式下取 CPU 核数与该值的较小者）
+DEFAULT_MAX_WORKERS = 4
+
+
+# =============================================================================
+# 可在子进程中执行的纯函数
+# =============================================================================
+
+def _to_plain(value: Any) -> Any:
+    """Recursively convert feedparser structures into plain Python types.
+
+    将 FeedParserDict / struct_time 等转换为 dict / list / tuple，
+    便于跨进程传输，也避免调用方依赖 feedparser 的属性访问语法。
+    """
+    if isinstance(value, dict):
+        return {str(k): _to_plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)) and not isinstance(value, time.struct_time):
+        return [_to_plain(v) for v in value]
+    if isinstance(value, time.struct_time):
+        return tuple(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def parse_feed(raw_data: str) -> Dict[str, Any]:
+    """Parse RSS/Atom XML into a plain dictionary.
+
+    使用 feedparser 解析 XML，返回可序列化的普通字典。
+
+    Args:
+        raw_data: Feed XML text.
+
+    Returns:
+        Dict[str, Any]: ``{"bozo": bool, "bozo_exception": str, "feed": dict,
+        "entries": list[dict]}``. ``*_parsed`` time fields become 9-tuples.
+    """
+    import feedparser
+
+    feed = feedparser.parse(raw_data)
+    return {
+        "bozo": bool(feed.get("bozo")),
+        "bozo_exception": str(feed.get("bozo_exception", "")),
+        "feed": _to_plain(feed.get("feed", {})),
+        "entries": [_to_plain(entry) for entry in feed.get("entries", [])],
+    }
+
+
+# 正文容器选择器：基础集合被所有爬虫使用，扩展集合额外覆盖博客类页面
+_BASIC_CONTENT_SELECTORS = [
+    {"class_": re.compile(r"article[_-]?(body|content|text)", re.I)},
+    {"class_": re.compile(r"post[_-]?(body|content|text)", re.I)},
+    {"class_": re.compile(r"(main[_-]?content|content[_-]?area)", re.I)},
+]
+_EXTENDED_CONTENT_SELECTORS = [
+    {"class_": re.compile(r"article[_-]?(body|content|text)", re.I)},
+    {"class_": re.compile(r"post[_-]?(body|content|text)", re.I)},
+    {"class_": re.compile(r"entry[_-]?(body|content|text)", re.I)},
+    {"class_": re.compile(r"(main[_-]?content|content[_-]?area)", re.I)},
+    {"id": re.compile(r"article[_-]?(body|content|text)", re.I)},
+    {"id": re.compile(r"(main[_-]?content|content[_-]?body)", re.I)},
+]
+
+
+def extract_main_text(html: str, extended: bool = True, min_length: int = 100) -> str:
+    """Extract the main article text from an HTML page.
+
+    使用 BeautifulSoup 提取网页正文，采用多重策略识别正文区域：
+      1. 优先查找 <article> 标签
+      2. 降级查找常见正文容器的 class/id（如 article-body, post-content 等）
+      3. 最终降级拼接 <body> 中所有 <p> 段落
+
+    Args:
+        html: Raw HTML text.
+        extended: Use the extended selector set (entry-* classes and ids).
+        min_length: Minimum text length for a strategy to be accepted.
+
+    Returns:
+        str: Extracted text, or empty string when nothing qualifies.
+    """
+    from bs4 import BeautifulSoup
+
+    if not html:
+        return ""
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 移除干扰元素（脚本、样式、导航、侧边栏、页脚等）
+    for tag in soup.find_all(["script", "style", "nav", "header", "footer",
+                               "aside", "iframe", "noscript"]):
+        tag.decompose()
+
+    # 策略 1: 查找 <article> 标签
+    article_tag = soup.find("article")
+    if article_tag:
+        text = article_tag.get_text(separator="\n", strip=True)
+        if len(text) >= min_length:
+            return text
+
+    # 策略 2: 查找常见正文容器的 class 或 id
+    selectors = _EXTENDED_CONTENT_SELECTORS if extended else _BASIC_CONTENT_SELECTORS
+    for selector in selectors:
+        container = soup.find("div", **selector)
+        if container:
+            text = container.get_text(separator="\n", strip=True)
+            if len(text) >= min_length:
+                return text
+
+    # 策略 3: 查找 body 中的段落集合
+    body = soup.find("body")
+    if body:
+        paragraphs = body.find_all("p")
+        if paragraphs:
+            full_text = "\n".join(
+                p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)
+            )
+            if len(full_text) >= min_length:
+                return full_text
+
+    return ""
+
+
+# =============================================================================
+# ParseExecutor 解析执行器
+# =============================================================================
+
+class ParseExecutor:
+    """Shared executor for CPU-bound parsing with a thread-pool fallback.
+
+    解析执行器：优先使用进程池，不可用时降级为线程池。
+
+    Args:
+        mode: ``"process"`` (default) or ``"thread"``.
+        max_workers: Pool size; ``0`` picks ``min(cpu_count, 4)``.
+    """
+
+    def __init__(self, mode: str = "process", max_workers: int = 0):
+        self.mode = mode if mode in ("process", "thread") else "process"
+        self.max_workers = max_workers if max_workers > 0 else min(
+            os.cpu_count() or 1, DEFAULT_MAX_WORKERS
+        )
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        """Return the pool, creating it lazily (falls back to threads)."""
+        if self._executor is None:
+            if self.mode == "process":
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except (OSError, NotImplementedError, PermissionError) as e:
+                    # 受限环境（如无 /dev/shm、禁止 fork）无法创建进程池
+                    logger.warning(f"Process pool unavailable, using threads for parsing: {e}")
+                    self.mode = "thread"
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="crawler-parse",
+                )
+        return self._executor
+
+    def _fallback_to_threads(self, reason: Exception) -> None:
+        """Replace a broken process pool with a thread pool."""
+        logger.warning(f"Process pool broken, switching parsing to threads: {reason}")
+        broken = self._executor
+        self._executor = None
+        self.mode = "thread"
+        if broken is not None:
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``func(*args, **kwargs)`` in the pool and await the result.
+
+        在执行器中运行解析函数。``func`` 在进程模式下必须是模块级函数，
+        参数与返回值必须可 pickle。
+
+        Args:
+            func: Module-level callable.
+            *args: Positional arguments.
+            **kwargs: Keyword arguments.
+
+        Returns:
+            The return value of ``func``.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        try:
+            return await loop.run_in_executor(self._get_executor(), call)
+        except BrokenProcessPool as e:
+            # 子进程异常退出（如被 OOM Killer 杀死）后进程池不可再用
+            self._fallback_to_threads(e)
+            return await loop.run_in_executor(self._get_executor(), call)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying pool (it is recreated on next use)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+def _create_parse_executor() -> ParseExecutor:
+    """Build the shared executor from settings."""
+    from settings import settings
+
+    return ParseExecutor(
+        mode=settings.crawler_parse_executor,
+        max_workers=settings.crawler_parse_workers,
+    )
+
+
+# 模块级单例，所有爬虫共享同一个解析执行器
+parse_executor = _create_parse_executor()
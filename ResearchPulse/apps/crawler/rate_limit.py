@@ -0,0 +1,111 @@
+# =============================================================================
+# 模块: apps/crawler/rate_limit.py
+# 功能: 按目标主机（或任意键）划分的请求速率预算
+# 架构角色: 爬虫子系统的并发控制基础设施，被 CrawlerRunner 的并发爬取模式使用。
+# 设计理念:
+#   1. 礼貌性按主机计算：不同域名之间可并行，同一域名之间保持最小请求间隔
+#   2. 每个键拥有独立的并发上限（信号量）和最小间隔（下一次允许的时间点）
+#   3. 惰性创建键状态，无需预先声明主机列表
+# =============================================================================
+
+"""Per-host rate budgets for concurrent crawling.
+
+Usage:
+    limiter = HostRateLimiter(default_interval=1.0)
+    async with limiter.slot("export.arxiv.org", interval=3.0):
+        await fetch(...)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Optional
+
+
+@dataclass
+class _KeyBudget:
+    """Runtime state for a single rate-limited key.
+
+    单个键（主机）的速率状态：并发信号量 + 下一次允许开始的时间点。
+    """
+    semaphore: asyncio.Semaphore
+    interval: float
+    next_allowed: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class HostRateLimiter:
+    """Keyed concurrency + minimum-interval limiter.
+
+    按键（通常为目标主机）限制并发数和相邻请求的最小间隔。
+
+    Each key gets its own semaphore (``concurrency``) and a minimum spacing
+    (``interval``) between the *start* of consecutive slots. Different keys
+    never block each other.
+    """
+
+    def __init__(self, default_interval: float = 0.0, default_concurrency: int = 1):
+        """Initialize the limiter.
+
+        Args:
+            default_interval: Minimum seconds between slot starts for a key.
+            default_concurrency: Max concurrent slots per key.
+        """
+        self.default_interval = max(0.0, default_interval)
+        self.default_concurrency = max(1, default_concurrency)
+        self._budgets: Dict[str, _KeyBudget] = {}
+
+    def _get_budget(
+        self,
+        key: str,
+        interval: Optional[float],
+        concurrency: Optional[int],
+    ) -> _KeyBudget:
+        """Return (and lazily create) the budget for ``key``."""
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = _KeyBudget(
+                semaphore=asyncio.Semaphore(max(1, concurrency or self.default_concurrency)),
+                interval=self.default_interval if interval is None else max(0.0, interval),
+            )
+            self._budgets[key] = budget
+        elif interval is not None and interval > budget.interval:
+            # 同一主机被多种源类型共享时，取更保守（更长）的间隔
+            budget.interval = interval
+        return budget
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        key: str,
+        interval: Optional[float] = None,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[None]:
+        """Acquire a rate-limited slot for ``key``.
+
+        获取指定键的执行槽位：先占用并发名额，再等待最小间隔到期。
+        间隔同时作用于相邻两次开始之间和上一次结束之后，
+        并发为 1 时等价于原先“每个源跑完后 sleep(delay)”的礼貌策略。
+
+        Args:
+            key: Budget key, e.g. target host.
+            interval: Minimum spacing for this key (first call wins, longer
+                values later tighten the budget).
+            concurrency: Max concurrent slots for this key (first call wins).
+        """
+        budget = self._get_budget(key, interval, concurrency)
+        async with budget.semaphore:
+            async with budget.lock:
+                wait = budget.next_allowed - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                budget.next_allowed = time.monotonic() + budget.interval
+            try:
+                yield
+            finally:
+                budget.next_allowed = max(
+                    budget.next_allowed, time.monotonic() + budget.interval
+                )
@@ -13,19 +13,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping, Union
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
-import feedparser
-from bs4 import BeautifulSoup
-
 from apps.crawler.base import BaseCrawler
 from apps.crawler.registry import CrawlerRegistry
+from apps.crawler.content_fetcher import content_fetcher
 from apps.crawler.models import RssFeed
-from common.http import get_text_async
+from apps.crawler.parsing import extract_main_text
+from common.http import NotModified, get_text_async
 
 # 模块级日志器
 logger = logging.getLogger(__name__)
@@ -82,13 +82,13 @@ def normalize_url_for_dedup(url: str) -> str:
         return url
 
 
-def generate_stable_external_id(entry: feedparser.FeedParserDict, url: str) -> str:
+def generate_stable_external_id(entry: Mapping[str, Any], url: str) -> str:
     """Generate a stable external identifier for a feed entry.
 
     优先使用条目 id 或 guid，否则使用规范化 URL，最后回退到标题哈希。
 
     Args:
-        entry: FeedParser entry.
+        entry: Feed entry dict (see ``apps.crawler.parsing.parse_feed``).
         url: Extracted URL.
 
     Returns:
@@ -96,11 +96,11 @@ def generate_stable_external_id(entry: feedparser.FeedParserDict, url: str) -> s
     """
     # 优先级 1: 使用条目的 id
     if entry.get("id"):
-        return entry.id
+        return entry["id"]
 
     # 优先级 2: 使用 guid
     if entry.get("guid"):
-        return entry.guid
+        return entry["guid"]
 
     # 优先级 3: 使用规范化后的 URL
     if url:
@@ -153,19 +153,20 @@ class RssCrawler(BaseCrawler):
         self.feed_url = feed_url
         self.timeout = timeout
 
-    async def fetch(self) -> str:
+    async def fetch(self) -> Union[str, NotModified]:
         """Fetch RSS feed XML content.
 
         使用 HTTP 工具函数请求 Feed URL，带重试和指数退避。
+        run() 期间使用条件请求，Feed 未变化时返回 NOT_MODIFIED。
 
         Returns:
-            str: RSS/Atom XML text.
+            Union[str, NotModified]: RSS/Atom XML text, or ``NOT_MODIFIED``.
 
         Raises:
             Exception: Propagates fetch failures.
         """
         try:
-            feed_text = await get_text_async(
+            feed_text = await self.fetch_text(
                 self.feed_url,
                 timeout=self.timeout,
                 retries=3,       # 最多重试 3 次
@@ -179,7 +180,7 @@ class RssCrawler(BaseCrawler):
     async def parse(self, raw_data: str) -> List[Dict[str, Any]]:
         """Parse RSS XML into article dictionaries.
 
-        使用 feedparser 解析 XML 并逐条处理条目。
+        在解析执行器中使用 feedparser 解析 XML，再逐条处理条目。
         对于仅提供摘要的 Feed 条目，尝试访问原文 URL 提取完整正文。
 
         Args:
@@ -188,17 +189,18 @@ class RssCrawler(BaseCrawler):
         Returns:
             List[Dict[str, Any]]: Article dictionaries.
         """
-        feed = feedparser.parse(raw_data)
+        feed = await self.parse_feed(raw_data)
 
         articles = []
-        for entry in feed.entries:
+        for entry in feed["entries"]:
             # 逐条解析，跳过无法解析的条目
             article = self._parse_entry(entry)
             if article:
                 articles.append(article)
 
         # 对于 content 与 summary 相同（即 RSS 未提供完整正文）的文章，
-        # 尝试访问原文 URL 提取完整内容
+        # 并发访问原文 URL 提取完整内容（共享全局/域名并发上限与结果缓存）
+        targets = []
         for article in articles:
             if article.get("url") and self._content_needs_fetch(article):
                 # 跳过已知会导致正文提取错误的页面类型
@@ -208,37 +210,49 @@ class RssCrawler(BaseCrawler):
                         f"Skipping content fetch for {url}: known problematic page type"
                     )
                     continue
-                try:
-                    full_content = await self._fetch_full_content(
-                        article["url"], article.get("title", "")
+                targets.append(article)
+
+        if targets:
+            await asyncio.gather(*(self._enrich_content(article) for article in targets))
+
+        return articles
+
+    async def _enrich_content(self, article: Dict[str, Any]) -> None:
+        """Replace a summary-only article's content with the extracted full text.
+
+        通过共享的 content_fetcher 抓取原文（同一 URL 在缓存期内只下载一次），
+        提取结果更长且与标题一致时替换 content。失败时保留原内容。
+
+        Args:
+            article: Article dictionary from _parse_entry (modified in place).
+        """
+        try:
+            full_content = await content_fetcher.fetch(article["url"], self._fetch_full_content)
+            if full_content and len(full_content) > len(article.get("content", "")):
+                # 检查内容是否包含标题关键词（一致性检查）
+                if self._content_matches_title(full_content, article.get("title", "")):
+                    self.logger.info(
+                        f"Content extracted for {article.get('url')}: "
+                        f"{len(full_content)} chars"
                     )
-                    if full_content and len(full_content) > len(article.get("content", "")):
-                        # 检查内容是否包含标题关键词（一致性检查）
-                        if self._content_matches_title(full_content, article.get("title", "")):
-                            self.logger.info(
-                                f"Content extracted for {article.get('url')}: "
-                                f"{len(full_content)} chars"
-                            )
-                            article["content"] = full_content
-                        else:
-                            self.logger.warning(
-                                f"Content mismatch for {article.get('url')}: "
-                                f"extracted content does not match title '{article.get('title', '')[:30]}...'"
-                            )
-                except Exception as e:
+                    article["content"] = full_content
+                else:
                     self.logger.warning(
-                        f"Failed to fetch full content for {article.get('url')}: {e}"
+                        f"Content mismatch for {article.get('url')}: "
+                        f"extracted content does not match title '{article.get('title', '')[:30]}...'"
                     )
+        except Exception as e:
+            self.logger.warning(
+                f"Failed to fetch full content for {article.get('url')}: {e}"
+            )
 
-        return articles
-
-    def _parse_entry(self, entry: feedparser.FeedParserDict) -> Dict[str, Any] | None:
+    def _parse_entry(self, entry: Mapping[str, Any]) -> Dict[str, Any] | None:
         """Parse a single feed entry into an article dictionary.
 
         对字段采用多重降级策略兼容不同 Feed 格式。
 
         Args:
-            entry: FeedParser entry.
+            entry: Feed entry dict.
 
         Returns:
             Dict[str, Any] | None: Article dict or ``None`` when missing title.
@@ -254,26 +268,26 @@ class RssCrawler(BaseCrawler):
         # Extract URL
         url = ""
         if entry.get("link"):
-            url = entry.link
+            url = entry["link"]
         elif entry.get("links"):
             # 优先选择 HTML 类型的链接
-            for link in entry.links:
+            for link in entry["links"]:
                 if link.get("type", "").startswith("text/html"):
                     url = link.get("href", "")
                     break
             # 没有 HTML 链接时，使用第一个链接
-            if not url and entry.links:
-                url = entry.links[0].get("href", "")
+            if not url and entry["links"]:
+                url = entry["links"][0].get("href", "")
 
         # ---- 提取作者 ----
         # 支持单作者字符串和多作者列表两种格式
         # Extract author
         author = ""
         if entry.get("author"):
-            author = entry.author
+            author = entry["author"]
         elif entry.get("authors"):
             # 多作者列表用逗号连接
-            author = ", ".join(a.get("name", "") for a in entry.authors)
+            author = ", ".join(a.get("name", "") for a in entry["authors"])
 
         # ---- 提取摘要和正文 ----
         # summary 通常是摘要/描述，content 是完整正文
@@ -283,21 +297,21 @@ class RssCrawler(BaseCrawler):
         content = entry.get("content", [{}])[0].get("value", "") if entry.get("content") else summary
 
         # ---- 提取发布时间 ----
-        # 优先使用 feedparser 已解析的 published_parsed（time.struct_time）
+        # 优先使用 feedparser 已解析的 published_parsed（时间元组）
         # 降级使用 published 字符串（RFC 2822 格式）手动解析
         # Extract publish time
         publish_time = None
         if entry.get("published_parsed"):
             try:
-                # published_parsed 是 time.struct_time，取前 6 个元素构造 datetime
-                publish_time = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+                # published_parsed 是时间元组，取前 6 个元素构造 datetime
+                publish_time = datetime(*entry["published_parsed"][:6], tzinfo=timezone.utc)
             except (ValueError, TypeError):
                 pass
         elif entry.get("published"):
             try:
                 # 使用 email.utils 解析 RFC 2822 格式的日期字符串
                 from email.utils import parsedate_to_datetime
-                publish_time = parsedate_to_datetime(entry.published)
+                publish_time = parsedate_to_datetime(entry["published"])
             except (ValueError, TypeError):
                 pass
 
@@ -307,12 +321,12 @@ class RssCrawler(BaseCrawler):
         # Extract cover image
         cover_image_url = ""
         if entry.get("media_content"):
-            for media in entry.media_content:
+            for media in entry["media_content"]:
                 if media.get("type", "").startswith("image/"):
                     cover_image_url = media.get("url", "")
                     break
         elif entry.get("enclosures"):
-            for enc in entry.enclosures:
+            for enc in entry["enclosures"]:
                 if enc.get("type", "").startswith("image/"):
                     cover_image_url = enc.get("href", "")
                     break
@@ -321,7 +335,7 @@ class RssCrawler(BaseCrawler):
         # Extract tags
         tags = []
         if entry.get("tags"):
-            tags = [tag.get("term", "") for tag in entry.tags if tag.get("term")]
+            tags = [tag.get("term", "") for tag in entry["tags"] if tag.get("term")]
 
         # ---- 生成外部唯一标识 ----
         # 使用规范化处理生成稳定的标识符，避免追踪参数导致的重复
@@ -470,46 +484,5 @@ class RssCrawler(BaseCrawler):
         if not html:
             return ""
 
-        soup = BeautifulSoup(html, "html.parser")
-
-        # 移除干扰元素（脚本、样式、导航、侧边栏、页脚等）
-        for tag in soup.find_all(["script", "style", "nav", "header", "footer",
-                                   "aside", "iframe", "noscript"]):
-            tag.decompose()
-
-        # 策略 1: 查找 <article> 标签
-        article_tag = soup.find("article")
-        if article_tag:
-            text = article_tag.get_text(separator="\n", strip=True)
-            if len(text) >= 100:
-                return text
-
-        # 策略 2: 查找常见正文容器的 class 或 id
-        content_selectors = [
-            {"class_": re.compile(r"article[_-]?(body|content|text)", re.I)},
-            {"class_": re.compile(r"post[_-]?(body|content|text)", re.I)},
-            {"class_": re.compile(r"entry[_-]?(body|content|text)", re.I)},
-            {"class_": re.compile(r"(main[_-]?content|content[_-]?area)", re.I)},
-            {"id": re.compile(r"article[_-]?(body|content|text)", re.I)},
-            {"id": re.compile(r"(main[_-]?content|content[_-]?body)", re.I)},
-        ]
-        for selector in content_selectors:
-            container = soup.find("div", **selector)
-            if container:
-                text = container.get_text(separator="\n", strip=True)
-                if len(text) >= 100:
-                    return text
-
-        # 策略 3: 查找 body 中最长的文本段落集合
-        body = soup.find("body")
-        if body:
-            # 收集所有 <p> 标签的文本
-            paragraphs = body.find_all("p")
-            if paragraphs:
-                full_text = "\n".join(
-                    p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)
-                )
-                if len(full_text) >= 100:
-                    return full_text
-
-        return ""
+        # BeautifulSoup 解析在解析执行器中完成，避免阻塞事件循环
+        return await self.run_parser(extract_main_text, html)
@@ -7,6 +7,7 @@
 #   2. 支持单源爬取、多源爬取、全量爬取
 #   3. 统一的结果汇总和错误处理
 #   4. 支持模拟运行（dry-run）模式
+#   5. 全量爬取使用有界并发池，按目标主机和源类型分别限速
 # =============================================================================
 
 """Unified crawler runner for ResearchPulse v2.
@@ -30,6 +31,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
@@ -38,6 +40,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.crawler.factory import CrawlerFactory
+from apps.crawler.rate_limit import HostRateLimiter
 from apps.crawler.registry import CrawlerRegistry
 from core.database import get_session_factory
 from settings import settings
@@ -75,6 +78,37 @@ class CrawlResult:
         }
 
 
+@dataclass
+class HostTiming:
+    """Queue wait and fetch timings aggregated per target host.
+
+    按目标主机汇总的排队等待与抓取耗时。
+    """
+    sources: int = 0
+    queue_wait_seconds: float = 0.0
+    fetch_seconds: float = 0.0
+    max_queue_wait_seconds: float = 0.0
+    max_fetch_seconds: float = 0.0
+
+    def add(self, queue_wait: float, fetch: float) -> None:
+        """Record one crawled source for this host."""
+        self.sources += 1
+        self.queue_wait_seconds += queue_wait
+        self.fetch_seconds += fetch
+        self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, queue_wait)
+        self.max_fetch_seconds = max(self.max_fetch_seconds, fetch)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "sources": self.sources,
+            "queue_wait_seconds": round(self.queue_wait_seconds, 3),
+            "fetch_seconds": round(self.fetch_seconds, 3),
+            "max_queue_wait_seconds": round(self.max_queue_wait_seconds, 3),
+            "max_fetch_seconds": round(self.max_fetch_seconds, 3),
+        }
+
+
 @dataclass
 class CrawlSummary:
     """Summary of multiple crawl operations.
@@ -88,6 +122,7 @@ class CrawlSummary:
     errors: List[str] = field(default_factory=list)
     timestamp: str = ""
     saved_ids: List[int] = field(default_factory=list)  # 所有保存的文章 ID 列表
+    hosts: Dict[str, HostTiming] = field(default_factory=dict)  # 按目标主机的耗时统计
 
     def __post_init__(self):
         # 初始化各源类型的结果列表
@@ -116,6 +151,12 @@ class CrawlSummary:
         """Add an error to the summary."""
         self.errors.append(error)
 
+    def add_host_timing(self, host: str, queue_wait: float, fetch: float) -> None:
+        """Record queue wait and fetch time for a target host."""
+        if host not in self.hosts:
+            self.hosts[host] = HostTiming()
+        self.hosts[host].add(queue_wait, fetch)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return {
@@ -129,6 +170,7 @@ class CrawlSummary:
             },
             "error_count": len(self.errors),
             "timestamp": self.timestamp,
+            "hosts": {host: timing.to_dict() for host, timing in self.hosts.items()},
         }
 
 
@@ -143,9 +185,10 @@ class CrawlerRunner:
         - 全量爬取：run_all()
         - 模拟运行：dry_run 模式
         - 详细输出：verbose 模式
+        - 并发爬取：run_all() 使用有界工作池，按主机/源类型限速
     """
 
-    # 各源类型之间的延迟时间（秒）
+    # 同一目标主机上相邻两次爬取的最小间隔（秒），按源类型取值
     SOURCE_DELAYS = {
         "arxiv": 2.0,
         "rss": 1.0,
@@ -155,22 +198,41 @@ class CrawlerRunner:
         "twitter": 2.0,
     }
 
+    # 各源类型同时运行的爬虫数上限（未列出的类型只受 max_workers 约束）
+    # arXiv / 微博对频率敏感，保持串行
+    SOURCE_CONCURRENCY = {
+        "arxiv": 1,
+        "weibo": 1,
+        "hackernews": 2,
+        "reddit": 2,
+        "twitter": 2,
+    }
+
     def __init__(
         self,
         dry_run: bool = False,
         verbose: bool = False,
         delays: Optional[Dict[str, float]] = None,
+        max_workers: Optional[int] = None,
+        concurrency: Optional[Dict[str, int]] = None,
     ):
         """Initialize the runner.
 
         Args:
             dry_run: If True, don't write to database
             verbose: If True, show verbose output
-            delays: Custom delays between sources
+            delays: Custom per-host delays by source type
+            max_workers: Max crawlers running at once in run_all()
+                (defaults to settings.crawler_max_workers)
+            concurrency: Custom per-source-type concurrency caps
         """
         self.dry_run = dry_run
         self.verbose = verbose
         self.delays = {**self.SOURCE_DELAYS, **(delays or {})}
+        self.concurrency = {**self.SOURCE_CONCURRENCY, **(concurrency or {})}
+        self.max_workers = max(
+            1, max_workers if max_workers is not None else settings.crawler_max_workers
+        )
 
         if verbose:
             logging.getLogger("apps.crawler").setLevel(logging.DEBUG)
@@ -377,33 +439,21 @@ class CrawlerRunner:
 
         try:
             async with session_factory() as session:
-                async for crawler, source in CrawlerFactory.create_for_active_sources(
-                    source_types=types_to_run, session=session
-                ):
-                    source_type = crawler.source_type
-                    try:
-                        result = await self._run_crawler(crawler, dry_run=dry_run)
-                        summary.add_result(result)
-
-                        if self.verbose:
-                            self._print(
-                                f"  {source_type}:{crawler.source_id}: "
-                                f"fetched={result.fetched_count}, saved={result.saved_count}",
-                                "success"
-                            )
-
-                        # 更新源的 last_fetched_at
-                        if hasattr(source, "last_fetched_at") and result.status == "success":
-                            source.last_fetched_at = datetime.now(timezone.utc)
-
-                        # 源之间的延迟
-                        delay = self.delays.get(source_type, 2.0)
-                        await asyncio.sleep(delay)
-
-                    except Exception as e:
-                        error_msg = f"{source_type}:{crawler.source_id}: {str(e)}"
-                        summary.add_error(error_msg)
-                        self._print(f"  Error: {error_msg}", "error")
+                # 先收集所有待爬取的源，再交给并发池调度
+                items = [
+                    item
+                    async for item in CrawlerFactory.create_for_active_sources(
+                        source_types=types_to_run, session=session
+                    )
+                ]
+
+                if self.verbose:
+                    self._print(
+                        f"Crawling {len(items)} sources with {self.max_workers} workers",
+                        "info",
+                    )
+
+                await self._run_pool(items, summary, dry_run=dry_run)
 
                 if dry_run is None or not dry_run:
                     await session.commit()
@@ -428,6 +478,78 @@ class CrawlerRunner:
 
         return summary
 
+    async def _run_pool(
+        self,
+        items: List[Any],
+        summary: CrawlSummary,
+        dry_run: Optional[bool] = None,
+    ) -> None:
+        """Run (crawler, source) pairs through a bounded, host-aware pool.
+
+        使用有界并发池执行爬虫：
+          1. 全局并发不超过 max_workers
+          2. 每种源类型的并发不超过 concurrency[source_type]
+          3. 同一目标主机串行执行，相邻两次之间间隔 delays[source_type]
+
+        排队等待时间（从入池到真正开始）和抓取耗时按主机记入 summary。
+
+        Args:
+            items: List of (crawler, source) tuples
+            summary: Summary to record results into
+            dry_run: Override instance dry_run setting
+        """
+        if not items:
+            return
+
+        limiter = HostRateLimiter()
+        workers = asyncio.Semaphore(self.max_workers)
+        type_limits: Dict[str, asyncio.Semaphore] = {}
+        enqueued_at = time.monotonic()
+
+        async def crawl_one(crawler: Any, source: Any) -> None:
+            source_type = crawler.source_type
+            host = crawler.target_host
+            if source_type not in type_limits:
+                type_limits[source_type] = asyncio.Semaphore(
+                    max(1, self.concurrency.get(source_type, self.max_workers))
+                )
+
+            try:
+                # 先取主机与源类型名额，再占用全局工作位，
+                # 避免等待同一主机的任务长期霸占工作位
+                async with type_limits[source_type]:
+                    # 无 feed_url 的爬虫以源类型作为预算键，按该类型的并发上限放行
+                    async with limiter.slot(
+                        host,
+                        interval=self.delays.get(source_type, 2.0),
+                        concurrency=self.concurrency.get(source_type),
+                    ):
+                        async with workers:
+                            started_at = time.monotonic()
+                            result = await self._run_crawler(crawler, dry_run=dry_run)
+                            fetch_time = time.monotonic() - started_at
+
+                summary.add_result(result)
+                summary.add_host_timing(host, started_at - enqueued_at, fetch_time)
+
+                if self.verbose:
+                    self._print(
+                        f"  {source_type}:{crawler.source_id}: "
+                        f"fetched={result.fetched_count}, saved={result.saved_count}",
+                        "success"
+                    )
+
+                # 更新源的 last_fetched_at
+                if hasattr(source, "last_fetched_at") and result.status == "success":
+                    source.last_fetched_at = datetime.now(timezone.utc)
+
+            except Exception as e:
+                error_msg = f"{source_type}:{crawler.source_id}: {str(e)}"
+                summary.add_error(error_msg)
+                self._print(f"  Error: {error_msg}", "error")
+
+        await asyncio.gather(*(crawl_one(crawler, source) for crawler, source in items))
+
     async def _run_crawler(
         self,
         crawler: Any,
@@ -558,6 +680,21 @@ class CrawlerRunner:
                 print(f"    ... 还有 {len(summary.errors) - 5} 个错误")
                 log_lines.append(f"  ... 还有 {len(summary.errors) - 5} 个错误")
 
+        if summary.hosts:
+            # 排队最久的主机通常是限速瓶颈
+            slowest = sorted(
+                summary.hosts.items(),
+                key=lambda item: item[1].max_queue_wait_seconds,
+                reverse=True,
+            )[:3]
+            for host, timing in slowest:
+                line = (
+                    f"  {host[:30]:30} 排队 {timing.max_queue_wait_seconds:.1f}s, "
+                    f"抓取 {timing.fetch_seconds:.1f}s ({timing.sources} 个源)"
+                )
+                print(line)
+                log_lines.append(line.strip())
+
         self._print(f"  总计保存:    {summary.total_articles} 篇文章", "success")
         print(f"  耗时:        {summary.duration_seconds:.2f} 秒")
         log_lines.append(f"总计保存: {summary.total_articles} 篇文章")
@@ -30,11 +30,9 @@ from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 from html import unescape
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 from urllib.parse import urlparse
 
-import feedparser
-
 from apps.crawler.base import BaseCrawler
 from common.http import get_text_async, _get_user_agent, _build_headers
 
@@ -167,13 +165,13 @@ def _download_image(url: str, referer: str = "", timeout: float = 15.0) -> Optio
 # 将 RSSHub 返回的微信公众号文章条目解析为标准化的文章字典
 # =============================================================================
 
-def _parse_wechat_rss_entry(entry: feedparser.FeedParserDict, account_name: str) -> Dict[str, Any]:
+def _parse_wechat_rss_entry(entry: Mapping[str, Any], account_name: str) -> Dict[str, Any]:
     """Parse a WeChat RSS entry into an article dictionary.
 
     从 RSS 条目中提取标题、URL、封面图、摘要、作者与发布时间等信息。
 
     Args:
-        entry: FeedParser entry.
+        entry: Feed entry dict (see ``apps.crawler.parsing.parse_feed``).
         account_name: WeChat account name for metadata.
 
     Returns:
@@ -243,7 +241,7 @@ def _parse_wechat_rss_entry(entry: feedparser.FeedParserDict, account_name: str)
                     # 字符串格式使用 RFC 2822 解析
                     publish_time = parsedate_to_datetime(entry[time_field])
                 else:
-                    # struct_time 格式转换为 datetime
+                    # 时间元组格式转换为 datetime
                     publish_time = datetime.fromtimestamp(
                         time.mktime(entry[time_field]),
                         tz=timezone.utc
@@ -371,7 +369,7 @@ class WechatCrawler(BaseCrawler):
     async def parse(self, raw_data: str) -> List[Dict[str, Any]]:
         """Parse WeChat RSS XML into article dictionaries.
 
-        使用 feedparser 解析 XML，过滤无标题与重复条目。
+        在解析执行器中使用 feedparser 解析 XML，过滤无标题与重复条目。
 
         Args:
             raw_data: RSS XML text from fetch().
@@ -379,19 +377,19 @@ class WechatCrawler(BaseCrawler):
         Returns:
             List[Dict[str, Any]]: WeChat article dictionaries.
         """
-        feed = feedparser.parse(raw_data)
+        feed = await self.parse_feed(raw_data)
 
         # feedparser 的 bozo 标志表示 XML 解析遇到错误
         # 如果有错误且没有条目，则视为解析失败
-        if feed.bozo and not feed.entries:
-            self.logger.warning(f"RSS parse error: {feed.bozo_exception}")
+        if feed["bozo"] and not feed["entries"]:
+            self.logger.warning(f"RSS parse error: {feed['bozo_exception']}")
             return []
 
         articles = []
         seen_ids = set()  # 用于在单次解析中去重
 
         # 限制解析条目数量，避免处理过多历史文章
-        for entry in feed.entries[:self.max_articles]:
+        for entry in feed["entries"][:self.max_articles]:
             article = _parse_wechat_rss_entry(entry, self.account_name)
             if not article or not article.get("title"):
                 continue
@@ -6,7 +6,7 @@
 #   1. 单篇/批量文章的向量嵌入计算
 #   2. 基于向量相似度的相似文章查询
 #   3. 嵌入统计信息查询
-#   4. Milvus 向量索引重建
+#   4. 向量索引重建（Milvus 或本地向量存储）
 # 所有端点均需启用 "feature.embedding" 功能开关才可访问。
 # =============================================================================
 
@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -22,7 +23,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_session
 from core.dependencies import get_current_user, require_permissions
 
-from common.feature_config import require_feature
+from common.feature_config import feature_config, require_feature
+from settings import settings
 
 from .schemas import (
     BatchComputeRequest,
@@ -33,7 +35,7 @@ from .schemas import (
     SimilarArticlesResponse,
     SimilarArticleSchema,
 )
-from .service import EmbeddingService
+from .service import EmbeddingService, get_vector_store
 
 logger = logging.getLogger(__name__)
 
@@ -165,17 +167,18 @@ async def get_stats(
 
 
 # -----------------------------------------------------------------------------
-# Milvus 向量索引重建接口
-# 删除并重新创建 Milvus 集合索引，用于索引损坏或参数变更后的修复
+# 向量索引重建接口
+# Milvus：删除并重新创建集合索引；本地存储：压缩已删除的向量并重建 HNSW 图。
+# 用于索引损坏或参数变更后的修复
 # 注意：这是一个重量级操作，会导致搜索短暂不可用
 # -----------------------------------------------------------------------------
 @router.post("/rebuild")
 async def rebuild_index(
     user=Depends(require_permissions("embedding:rebuild")),
 ):
-    """Rebuild Milvus index.
+    """Rebuild the vector index.
 
-    重建 Milvus 向量索引。
+    重建向量索引（按 embedding.vector_store 选择的后端）。
 
     Args:
         user: Authenticated user.
@@ -184,15 +187,14 @@ async def rebuild_index(
         dict: Status message.
 
     Raises:
-        HTTPException: If Milvus is unavailable or rebuild fails.
+        HTTPException: If the vector store is unavailable or rebuild fails.
     """
-    from .milvus_client import MilvusClient
-    client = MilvusClient()
-    # 尝试连接 Milvus，连接失败返回 503
-    if not client.connect():
-        raise HTTPException(status_code=503, detail="Cannot connect to Milvus")
-    # 执行索引重建，维度默认 384（对应 all-MiniLM-L6-v2 模型）
-    success = client.rebuild_index(dimension=384)
+    store = get_vector_store()
+    # 向量库不可用返回 503
+    if store is None:
+        raise HTTPException(status_code=503, detail="Cannot connect to vector store")
+    dimension = feature_config.get_int("embedding.dimension", settings.embedding_dimension)
+    success = await asyncio.to_thread(store.rebuild_index, dimension=dimension)
     if not success:
         raise HTTPException(status_code=500, detail="Failed to rebuild index")
-    return {"status": "ok", "message": "Milvus index rebuilt successfully"}
+    return {"status": "ok", "message": "Vector index rebuilt successfully"}
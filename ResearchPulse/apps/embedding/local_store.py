@@ -0,0 +1,541 @@
+# =============================================================================
+# 本地嵌入式向量存储模块
+# =============================================================================
+# 本模块提供进程内的向量存储，与 MilvusClient 接口一致，作为中小规模部署的
+# Milvus 替代方案（embedding.vector_store = local），或 Milvus 不可达时的后备
+# （embedding.vector_store = auto），避免向量丢失。
+# 在架构中的角色：
+#   - 向量存储层：文章嵌入向量保存在 data_dir/vector_store/ 下
+#   - 相似度搜索引擎：余弦相似度（写入时归一化，检索为内积）
+#
+# 存储格式：
+#   - meta.json:   向量维度与存储精度（float32 / float16）
+#   - vectors.bin: 内存映射的向量矩阵（行号即内部 ID，按容量倍增扩展）
+#   - ids.npy:     每行对应的文章 ID（-1 表示已删除），原子替换写入
+#   - hnsw.bin:    可选的 HNSW 图索引（标签为行号）
+#
+# 设计决策：
+#   - 向量先写入并落盘，再原子替换 ID 表：进程中断时最多丢失未确认的一批，不会出现错位
+#   - 行数少于 embedding.local_hnsw_threshold 时用 NumPy 分块暴力检索（精确结果）；
+#     超过阈值且安装了 hnswlib 时使用 HNSW 图检索，未安装时退回暴力检索
+#   - HNSW 图新建时立即落盘，之后按新增行数间隔落盘；加载时只补入落盘后新增的行
+#   - 懒加载：首次使用时才打开文件；删除为墓碑标记，rebuild_index 时压缩
+#   - 多进程共享（Web 调度器与 AI 流水线脚本都会写入）：每次操作持有目录下
+#     store.lock 的文件锁，加锁后若 ids.npy 已被其他进程替换，则重新加载 ID 表与矩阵再操作
+# =============================================================================
+
+"""In-process vector store with the same interface as ``MilvusClient``."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+from settings import settings
+from common.feature_config import feature_config
+
+logger = logging.getLogger(__name__)
+
+# 存储目录名（位于 settings.data_dir 下）
+LOCAL_STORE_DIRNAME = "vector_store"
+
+_META_FILE = "meta.json"
+_VECTORS_FILE = "vectors.bin"
+_IDS_FILE = "ids.npy"
+_HNSW_FILE = "hnsw.bin"
+_LOCK_FILE = "store.lock"
+
+# 已删除行的文章 ID 标记
+_DELETED = -1
+
+# 向量矩阵的初始容量（行），之后按倍增扩展
+_INITIAL_CAPACITY = 1024
+
+# 暴力检索每块计算的行数，限制 float16 转换时的临时内存
+_SCAN_CHUNK = 65536
+
+# HNSW 参数（与 Milvus 集合索引一致）
+_HNSW_M = 16
+_HNSW_EF_CONSTRUCTION = 256
+_HNSW_EF_SEARCH = 64
+
+# HNSW 图新增多少行后落盘一次
+_HNSW_SAVE_EVERY = 10000
+
+_SUPPORTED_DTYPES = {"float32": np.float32, "float16": np.float16}
+
+
+def _hnswlib():
+    """Import hnswlib lazily (optional dependency)."""
+    try:
+        import hnswlib
+    except ImportError:
+        return None
+    return hnswlib
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive inter-process lock on *path* (no-op where fcntl is unavailable)."""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(path, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _replace_file(path: Path, write) -> None:
+    """Write a file atomically via a temporary file and rename."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# -----------------------------------------------------------------------------
+# 本地向量存储类
+# 方法与 MilvusClient 一一对应，EmbeddingService 无需区分后端。
+# 所有方法在线程锁与目录文件锁内执行，可从线程池和多个进程并发调用。
+# -----------------------------------------------------------------------------
+class LocalVectorStore:
+    """Memory-mapped vector store with brute-force and HNSW search.
+
+    本地向量存储：内存映射矩阵 + 文章 ID 表，小规模暴力检索、大规模 HNSW 检索。
+    """
+
+    def __init__(self, path: Path | None = None, dtype: str | None = None):
+        """Initialize store settings (files are opened lazily).
+
+        Args:
+            path: Store directory (default ``data_dir/vector_store``).
+            dtype: Storage precision for a new store (``float32`` / ``float16``).
+        """
+        self._path = Path(path) if path else Path(settings.data_dir) / LOCAL_STORE_DIRNAME
+        self._dtype_name = dtype or feature_config.get("embedding.local_dtype", "float32")
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dimension: int | None = None
+        self._matrix: np.memmap | None = None
+        self._ids = np.empty(0, dtype=np.int64)
+        self._rows: dict[int, int] = {}     # 文章 ID -> 行号（仅未删除的行）
+        self._hnsw = None
+        self._hnsw_saved_rows = 0
+        self._ids_stat: tuple | None = None  # 最近一次读写的 ids.npy 文件状态
+
+    # ---- 连接管理（与 MilvusClient 一致）----
+
+    def connect(self) -> bool:
+        """Open the store files (creating the directory if needed).
+
+        Returns:
+            bool: ``True`` if the store is usable.
+        """
+        try:
+            with self._locked():
+                pass
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to open local vector store at {self._path}: {e}")
+            return False
+
+    def disconnect(self) -> None:
+        """Flush pending data and close the memory map."""
+        with self._lock:
+            if not self._loaded:
+                return
+            if self._matrix is not None:
+                self._matrix.flush()
+            with _file_lock(self._path / _LOCK_FILE):
+                # 其他进程改动过存储时，本进程的 HNSW 图已过期，不再落盘
+                if self._stat_ids() == self._ids_stat:
+                    self._save_hnsw()
+            self._matrix = None
+            self._hnsw = None
+            self._loaded = False
+
+    @property
+    def is_connected(self) -> bool:
+        """Return whether the store files are open."""
+        return self._loaded
+
+    @property
+    def dimension(self) -> int | None:
+        """Vector dimension (``None`` until the first insert)."""
+        return self._dimension
+
+    # ---- 文件读写 ----
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the thread and file locks with the store loaded and up to date."""
+        with self._lock:
+            self._path.mkdir(parents=True, exist_ok=True)
+            with _file_lock(self._path / _LOCK_FILE):
+                self._load()
+                if self._stat_ids() != self._ids_stat:
+                    self._reload()
+                yield
+
+    def _stat_ids(self) -> tuple | None:
+        """Identify the current ``ids.npy`` (replaced atomically on every write)."""
+        try:
+            st = (self._path / _IDS_FILE).stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _reload(self) -> None:
+        """Re-open the files after another process changed them."""
+        logger.debug(f"Local vector store {self._path} changed on disk, reloading")
+        self._matrix = None
+        self._hnsw = None
+        self._hnsw_saved_rows = 0
+        self._loaded = False
+        self._load()
+
+    def _dtype(self):
+        dtype = _SUPPORTED_DTYPES.get(self._dtype_name)
+        if dtype is None:
+            raise ValueError(f"Unsupported local vector dtype: {self._dtype_name}")
+        return dtype
+
+    def _capacity(self) -> int:
+        return 0 if self._matrix is None else self._matrix.shape[0]
+
+    def _open_matrix(self, capacity: int) -> None:
+        path = self._path / _VECTORS_FILE
+        size = capacity * self._dimension * np.dtype(self._dtype()).itemsize
+        with open(path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self._matrix = np.memmap(path, dtype=self._dtype(), mode="r+", shape=(capacity, self._dimension))
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._path.mkdir(parents=True, exist_ok=True)
+        meta_path = self._path / _META_FILE
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            self._dimension = int(meta["dimension"])
+            self._dtype_name = meta["dtype"]
+            itemsize = np.dtype(self._dtype()).itemsize
+            capacity = (self._path / _VECTORS_FILE).stat().st_size // (self._dimension * itemsize)
+            self._open_matrix(capacity)
+            ids_path = self._path / _IDS_FILE
+            self._ids = np.load(ids_path) if ids_path.exists() else np.empty(0, dtype=np.int64)
+            self._ids = self._ids[:capacity]
+            self._rows = {int(aid): row for row, aid in enumerate(self._ids.tolist()) if aid != _DELETED}
+            logger.info(f"Loaded local vector store: {len(self._rows)} vectors (dim={self._dimension})")
+        self._ids_stat = self._stat_ids()
+        self._loaded = True
+
+    def _create(self, dimension: int) -> None:
+        self._dimension = dimension
+        meta = {"dimension": dimension, "dtype": self._dtype_name}
+        _replace_file(self._path / _META_FILE, lambda f: f.write(json.dumps(meta).encode("utf-8")))
+        self._open_matrix(_INITIAL_CAPACITY)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._rows = {}
+        logger.info(f"Created local vector store at {self._path} (dim={dimension}, {self._dtype_name})")
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = self._capacity()
+        if rows <= capacity:
+            return
+        self._matrix.flush()
+        self._matrix = None
+        self._open_matrix(max(rows, capacity * 2))
+
+    def _save_ids(self) -> None:
+        _replace_file(self._path / _IDS_FILE, lambda f: np.save(f, self._ids))
+        self._ids_stat = self._stat_ids()
+
+    # ---- HNSW 图索引 ----
+
+    def _hnsw_enabled(self) -> bool:
+        threshold = feature_config.get_int("embedding.local_hnsw_threshold", 50000)
+        return len(self._ids) >= threshold and _hnswlib() is not None
+
+    def _hnsw_index(self):
+        """Return the HNSW graph covering all rows, loading or building it as needed."""
+        if self._hnsw is not None:
+            return self._hnsw
+        hnswlib = _hnswlib()
+        index = hnswlib.Index(space="ip", dim=self._dimension)
+        path = self._path / _HNSW_FILE
+        covered = 0
+        if path.exists():
+            try:
+                index.load_index(str(path), max_elements=self._capacity())
+                covered = index.get_current_count()
+            except Exception as e:
+                logger.warning(f"Discarding unreadable HNSW index {path}: {e}")
+                index = hnswlib.Index(space="ip", dim=self._dimension)
+                covered = 0
+        if covered == 0:
+            index.init_index(max_elements=self._capacity(), ef_construction=_HNSW_EF_CONSTRUCTION, M=_HNSW_M)
+        self._hnsw = index
+        self._hnsw_saved_rows = covered
+        # 补入落盘后新增的行，并同步删除标记
+        self._hnsw_add(covered, len(self._ids))
+        for row in np.flatnonzero(self._ids[:covered] == _DELETED).tolist():
+            try:
+                index.mark_deleted(row)
+            except RuntimeError:
+                pass  # 已标记
+        # 全量构建代价高，新建的图立即落盘，下次启动直接加载
+        if covered == 0:
+            self._save_hnsw()
+        return index
+
+    def _hnsw_add(self, start: int, stop: int) -> None:
+        if self._hnsw is None or start >= stop:
+            return
+        if self._hnsw.get_max_elements() < self._capacity():
+            self._hnsw.resize_index(self._capacity())
+        self._hnsw.add_items(np.asarray(self._matrix[start:stop], dtype=np.float32), np.arange(start, stop))
+        for row in np.flatnonzero(self._ids[start:stop] == _DELETED).tolist():
+            self._hnsw.mark_deleted(start + row)
+
+    def _save_hnsw(self) -> None:
+        if self._hnsw is None:
+            return
+        self._hnsw.save_index(str(self._path / _HNSW_FILE))
+        self._hnsw_saved_rows = self._hnsw.get_current_count()
+
+    # ---- 与 MilvusClient 一致的数据接口 ----
+
+    def insert_vectors(
+        self, article_ids: list[int], embeddings: list[list[float]]
+    ) -> list[int]:
+        """Insert (or replace) vectors for articles.
+
+        写入向量；同一文章再次写入时旧行标记删除。
+
+        Args:
+            article_ids: Article ID list.
+            embeddings: Embedding vectors.
+
+        Returns:
+            list[int]: Row numbers of the inserted vectors.
+        """
+        if not article_ids:
+            return []
+        # 同一批内重复的文章只保留最后一个向量
+        latest = {int(aid): i for i, aid in enumerate(article_ids)}
+        if len(latest) < len(article_ids):
+            article_ids = list(latest)
+            embeddings = [embeddings[i] for i in latest.values()]
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        with self._locked():
+            if self._dimension is None:
+                self._create(vectors.shape[1])
+            if vectors.shape[1] != self._dimension:
+                raise ValueError(
+                    f"Vector dimension {vectors.shape[1]} does not match store dimension {self._dimension}"
+                )
+            start = len(self._ids)
+            stop = start + len(article_ids)
+            self._ensure_capacity(stop)
+            # 先写向量并落盘，再替换 ID 表（确认写入）
+            self._matrix[start:stop] = vectors
+            self._matrix.flush()
+            new_ids = np.asarray(article_ids, dtype=np.int64)
+            replaced = [self._rows[aid] for aid in article_ids if aid in self._rows]
+            ids = np.concatenate([self._ids, new_ids])
+            ids[replaced] = _DELETED
+            self._ids = ids
+            self._save_ids()
+
+            for row in replaced:
+                if self._hnsw is not None:
+                    self._hnsw.mark_deleted(row)
+            for offset, aid in enumerate(article_ids):
+                self._rows[int(aid)] = start + offset
+            self._hnsw_add(start, stop)
+            if self._hnsw is not None and stop - self._hnsw_saved_rows >= _HNSW_SAVE_EVERY:
+                self._save_hnsw()
+            return list(range(start, stop))
+
+    def search_similar(
+        self,
+        query_vector: list[float],
+        top_k: int = 10,
+        exclude_article_id: int | None = None,
+    ) -> list[tuple[int, float]]:
+        """Search for similar vectors.
+
+        余弦相似度检索：小规模精确暴力检索，大规模 HNSW 近似检索。
+
+        Args:
+            query_vector: Query embedding vector.
+            top_k: Number of results to return.
+            exclude_article_id: Optional article ID to exclude.
+
+        Returns:
+            list[tuple[int, float]]: (article_id, similarity score) list.
+        """
+        query = _normalize(np.asarray([query_vector], dtype=np.float32))[0]
+        with self._locked():
+            if not self._rows or top_k <= 0 or len(query) != self._dimension:
+                return []
+            if self._hnsw_enabled():
+                return self._search_hnsw(query, top_k, exclude_article_id)
+            return self._search_brute_force(query, top_k, exclude_article_id)
+
+    def _search_brute_force(
+        self, query: np.ndarray, top_k: int, exclude_article_id: int | None,
+    ) -> list[tuple[int, float]]:
+        count = len(self._ids)
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, _SCAN_CHUNK):
+            stop = min(start + _SCAN_CHUNK, count)
+            scores[start:stop] = np.asarray(self._matrix[start:stop], dtype=np.float32) @ query
+        scores[self._ids == _DELETED] = -np.inf
+        if exclude_article_id is not None and exclude_article_id in self._rows:
+            scores[self._rows[exclude_article_id]] = -np.inf
+        k = min(top_k, len(self._rows) - (exclude_article_id in self._rows))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[row]), float(scores[row])) for row in top]
+
+    def _search_hnsw(
+        self, query: np.ndarray, top_k: int, exclude_article_id: int | None,
+    ) -> list[tuple[int, float]]:
+        index = self._hnsw_index()
+        k = min(top_k + 1, len(self._rows))
+        index.set_ef(max(_HNSW_EF_SEARCH, k))
+        labels, distances = index.knn_query(query, k=k)
+        matches = []
+        for row, distance in zip(labels[0].tolist(), distances[0].tolist()):
+            article_id = int(self._ids[row])
+            if article_id == _DELETED or article_id == exclude_article_id:
+                continue
+            matches.append((article_id, 1.0 - float(distance)))  # ip 距离 = 1 - 内积
+        return matches[:top_k]
+
+    def get_vectors(self, article_ids: list[int]) -> dict[int, list[float]]:
+        """Fetch stored (normalized) vectors by article IDs.
+
+        Args:
+            article_ids: Article IDs to fetch.
+
+        Returns:
+            dict[int, list[float]]: Mapping of article ID to vector (missing IDs omitted).
+        """
+        with self._locked():
+            rows = {aid: self._rows[aid] for aid in article_ids if aid in self._rows}
+            return {
+                aid: np.asarray(self._matrix[row], dtype=np.float32).tolist()
+                for aid, row in rows.items()
+            }
+
+    def delete_by_article_ids(self, article_ids: list[int]) -> None:
+        """Delete vectors by article IDs (tombstoned until ``rebuild_index``).
+
+        Args:
+            article_ids: Article IDs to delete.
+        """
+        with self._locked():
+            rows = [self._rows.pop(aid) for aid in article_ids if aid in self._rows]
+            if not rows:
+                return
+            self._ids[rows] = _DELETED
+            self._save_ids()
+            if self._hnsw is not None:
+                for row in rows:
+                    self._hnsw.mark_deleted(row)
+
+    def get_collection_stats(self) -> dict:
+        """Get store statistics.
+
+        Returns:
+            dict: Store stats (name, num_entities).
+        """
+        try:
+            with self._locked():
+                return {"name": str(self._path), "num_entities": len(self._rows)}
+        except Exception:
+            return {"name": str(self._path), "num_entities": len(self._rows)}
+
+    def rebuild_index(self, dimension: int = 384) -> bool:
+        """Compact deleted rows and rebuild the HNSW graph.
+
+        压缩已删除的行并重建 HNSW 图（行数未达阈值或未安装 hnswlib 时只压缩）。
+
+        Args:
+            dimension: Vector dimension (unused; the store keeps its own dimension).
+
+        Returns:
+            bool: ``True`` if rebuild succeeds.
+        """
+        try:
+            with self._locked():
+                if self._dimension is None:
+                    return False
+                live = np.flatnonzero(self._ids != _DELETED)
+                ids = self._ids[live]
+                # 压缩后的矩阵写入临时文件，再替换
+                tmp_path = self._path / (_VECTORS_FILE + ".tmp")
+                capacity = max(_INITIAL_CAPACITY, len(ids))
+                compacted = np.memmap(tmp_path, dtype=self._dtype(), mode="w+", shape=(capacity, self._dimension))
+                for start in range(0, len(live), _SCAN_CHUNK):
+                    chunk = live[start:start + _SCAN_CHUNK]
+                    compacted[start:start + len(chunk)] = self._matrix[chunk]
+                compacted.flush()
+                del compacted
+                self._matrix.flush()
+                self._matrix = None
+                os.replace(tmp_path, self._path / _VECTORS_FILE)
+                self._open_matrix(capacity)
+                self._ids = ids
+                self._save_ids()
+                self._rows = {int(aid): row for row, aid in enumerate(ids.tolist())}
+
+                self._hnsw = None
+                hnsw_path = self._path / _HNSW_FILE
+                if hnsw_path.exists():
+                    hnsw_path.unlink()
+                if self._hnsw_enabled():
+                    self._hnsw_index()
+                logger.info(f"Local vector store rebuilt: {len(ids)} vectors")
+                return True
+        except Exception as e:
+            logger.error(f"Failed to rebuild local vector store: {e}")
+            return False
+
+
+# 进程内共享的存储实例（多个 EmbeddingService 共用同一内存映射）
+_store: Optional[LocalVectorStore] = None
+
+
+def get_local_vector_store() -> LocalVectorStore:
+    """Return the process-wide local vector store."""
+    global _store
+    if _store is None:
+        _store = LocalVectorStore()
+    return _store
@@ -10,7 +10,7 @@
 # 主要功能：
 #   - 连接管理（connect/disconnect）
 #   - 集合创建与管理（get_or_create_collection）
-#   - 向量插入（insert_vectors）
+#   - 向量插入（insert_vectors）与按文章 ID 读取（get_vectors）
 #   - 相似度搜索（search_similar）
 #   - 向量删除（delete_by_article_ids）
 #   - 索引重建（rebuild_index）
@@ -255,6 +255,26 @@ class MilvusClient:
             matches.append((article_id, score))
         return matches
 
+    def get_vectors(self, article_ids: list[int]) -> dict[int, list[float]]:
+        """Fetch stored vectors by article IDs.
+
+        按文章 ID 读取已存储的向量（标量过滤查询，不做相似度搜索）。
+
+        Args:
+            article_ids: Article IDs to fetch.
+
+        Returns:
+            dict[int, list[float]]: Mapping of article ID to vector (missing IDs omitted).
+        """
+        if not article_ids:
+            return {}
+        collection = self.get_or_create_collection()
+        rows = collection.query(
+            expr=f"article_id in {list(article_ids)}",
+            output_fields=["article_id", "embedding"],
+        )
+        return {int(row["article_id"]): list(row["embedding"]) for row in rows}
+
     def delete_by_article_ids(self, article_ids: list[int]) -> None:
         """Delete vectors by article IDs.
 
@@ -153,13 +153,15 @@ class EmbeddingStatsResponse(BaseModel):
         provider: Current provider.
         model: Current model.
         dimension: Vector dimension.
-        milvus_connected: Milvus connection status.
-        collection_count: Vector count in Milvus collection.
+        milvus_connected: Vector store connection status (Milvus or local).
+        vector_store: Active vector store backend (``milvus`` / ``local``).
+        collection_count: Vector count in the vector store.
     """
 
     total_embeddings: int = 0     # 已计算的嵌入总数
     provider: str = ""            # 当前配置的嵌入提供商
     model: str = ""               # 当前配置的嵌入模型
     dimension: int = 0            # 当前向量维度
-    milvus_connected: bool = False  # Milvus 是否已连接
-    collection_count: int = 0     # Milvus 集合中的向量数量
+    milvus_connected: bool = False  # 向量库是否已连接（字段名沿用 Milvus）
+    vector_store: Optional[str] = None  # 当前向量库后端：milvus / local
+    collection_count: int = 0     # 向量库中的向量数量
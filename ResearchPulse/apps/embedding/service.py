@@ -3,18 +3,20 @@
 # =============================================================================
 # 本模块是 Embedding 子系统的核心业务逻辑层，负责：
 #   1. 为文章生成向量嵌入（通过 Embedding Provider）
-#   2. 将向量存储到 Milvus 向量数据库
+#   2. 将向量存储到向量库（Milvus 或本地嵌入式向量存储）
 #   3. 将元数据存储到 MySQL
 #   4. 基于向量相似度查找相似文章
 #   5. 查询嵌入统计信息
 #
 # 数据流：
-#   文章 -> 拼接标题+摘要 -> Embedding Provider 编码 -> Milvus 存储 -> MySQL 元数据
+#   文章 -> 拼接标题+摘要 -> Embedding Provider 编码 -> 向量库存储 -> MySQL 元数据
 #
 # 设计决策：
 #   - 嵌入计算是 CPU 密集型操作，使用 asyncio.to_thread 放到线程池中执行
-#   - Milvus 客户端采用懒连接模式，首次使用时才建立连接
-#   - 支持在无 Milvus 的环境下运行（仅生成元数据，不存储向量）
+#   - 向量库后端由 embedding.vector_store 选择：milvus（默认）、local（进程内
+#     内存映射存储，见 local_store.py）或 auto（优先 Milvus，不可达时使用本地存储）
+#   - 向量库采用懒连接模式，首次使用时才建立连接
+#   - 向量库不可用时仍可运行（仅生成元数据，不存储向量）
 # =============================================================================
 
 """Embedding service layer."""
@@ -24,7 +26,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Callable, Optional
+from typing import Callable, Optional, Union
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -34,11 +36,19 @@ from settings import settings
 from common.feature_config import feature_config
 
 from .models import ArticleEmbedding
+from .local_store import LocalVectorStore, get_local_vector_store
 from .milvus_client import MilvusClient
 from .providers.base import BaseEmbeddingProvider
 
 logger = logging.getLogger(__name__)
 
+# 向量库后端：MilvusClient 与 LocalVectorStore 接口一致
+VectorStore = Union[MilvusClient, LocalVectorStore]
+
+VECTOR_STORE_MILVUS = "milvus"
+VECTOR_STORE_LOCAL = "local"
+VECTOR_STORE_AUTO = "auto"
+
 
 def get_embedding_provider() -> BaseEmbeddingProvider:
     """Get the configured embedding provider.
@@ -59,12 +69,35 @@ def get_embedding_provider() -> BaseEmbeddingProvider:
         return SentenceTransformerProvider(model_name=feature_config.get("embedding.model", settings.embedding_model))
 
 
+def get_vector_store() -> VectorStore | None:
+    """Connect to the configured vector store backend.
+
+    按 embedding.vector_store 选择并连接向量库：milvus、local，
+    或 auto（Milvus 不可达时使用本地存储）。
+
+    Returns:
+        VectorStore | None: Connected store, or ``None`` if unavailable.
+    """
+    backend = feature_config.get("embedding.vector_store", VECTOR_STORE_MILVUS)
+    if backend in (VECTOR_STORE_MILVUS, VECTOR_STORE_AUTO):
+        milvus = MilvusClient()
+        if milvus.connect():
+            return milvus
+        if backend == VECTOR_STORE_MILVUS:
+            return None
+        logger.info("Milvus unavailable, using the local vector store")
+    elif backend != VECTOR_STORE_LOCAL:
+        logger.warning(f"Unknown embedding.vector_store {backend!r}, using the local vector store")
+    store = get_local_vector_store()
+    return store if store.connect() else None
+
+
 # -----------------------------------------------------------------------------
 # Embedding 服务类
 # 封装所有向量嵌入相关的业务逻辑。
 # 设计决策：
-#   - 支持依赖注入（provider 和 milvus 都可通过构造函数传入），方便单元测试
-#   - Milvus 采用懒初始化，避免启动时的连接开销
+#   - 支持依赖注入（provider 和向量库都可通过构造函数传入），方便单元测试
+#   - 向量库采用懒初始化，避免启动时的连接开销
 # -----------------------------------------------------------------------------
 class EmbeddingService:
     """Service for computing and managing article embeddings.
@@ -75,44 +108,43 @@ class EmbeddingService:
     def __init__(
         self,
         provider: BaseEmbeddingProvider | None = None,
-        milvus: MilvusClient | None = None,
+        vector_store: VectorStore | None = None,
     ):
         """Initialize embedding service.
 
-        初始化嵌入服务，支持注入 provider 与 Milvus 客户端。
+        初始化嵌入服务，支持注入 provider 与向量库。
 
         Args:
             provider: Embedding provider override.
-            milvus: Milvus client override.
+            vector_store: Vector store override (Milvus client or local store).
         """
         # 嵌入提供商，未传入则根据配置自动创建
         self.provider = provider or get_embedding_provider()
-        # Milvus 客户端实例，支持外部注入
-        self._milvus = milvus
-        # Milvus 连接状态标记，避免重复连接
-        self._milvus_initialized = False
+        # 向量库实例，支持外部注入
+        self._store = vector_store
+        # 向量库连接状态标记，避免重复连接
+        self._store_initialized = False
 
-    def _get_milvus(self) -> MilvusClient | None:
-        """Get Milvus client, connecting lazily.
+    def _get_vector_store(self) -> VectorStore | None:
+        """Get the vector store, connecting lazily.
 
-        懒初始化 Milvus 客户端。
+        懒初始化向量库。
 
         Returns:
-            MilvusClient | None: Connected client or ``None`` if disabled/unavailable.
+            VectorStore | None: Connected store or ``None`` if disabled/unavailable.
         """
-        # 懒初始化 Milvus 客户端：首次调用时创建并连接
         # 如果 embedding 功能未启用，直接返回 None
         if not settings.embedding_enabled:
             return None
-        if self._milvus is None:
-            self._milvus = MilvusClient()
-        # 尝试建立连接（仅在未初始化时执行）
-        if not self._milvus_initialized:
-            if self._milvus.connect():
-                self._milvus_initialized = True
-            else:
+        if not self._store_initialized:
+            if self._store is None:
+                self._store = get_vector_store()
+            elif not self._store.connect():
                 return None  # 连接失败返回 None，上层会优雅降级
-        return self._milvus
+            if self._store is None:
+                return None
+            self._store_initialized = True
+        return self._store
 
     async def compute_embedding(
         self, article_id: int, db: AsyncSession
@@ -154,16 +186,16 @@ class EmbeddingService:
         embedding = await asyncio.to_thread(self.provider.encode, text)
         dimension = len(embedding)
 
-        # 第五步：存储向量到 Milvus
-        milvus = self._get_milvus()
+        # 第五步：存储向量到向量库
+        store = self._get_vector_store()
         milvus_id = None
-        if milvus:
+        if store:
             try:
-                ids = milvus.insert_vectors([article_id], [embedding])
+                ids = await asyncio.to_thread(store.insert_vectors, [article_id], [embedding])
                 milvus_id = str(ids[0]) if ids else None
             except Exception as e:
-                # Milvus 写入失败不阻断整个流程，仅记录警告
-                logger.warning(f"Milvus insert failed for article {article_id}: {e}")
+                # 向量库写入失败不阻断整个流程，仅记录警告
+                logger.warning(f"Vector store insert failed for article {article_id}: {e}")
 
         # 第六步：存储元数据到 MySQL
         meta = ArticleEmbedding(
@@ -193,7 +225,7 @@ class EmbeddingService:
         """Batch compute embeddings using bulk encoding.
 
         批量计算文章嵌入，使用 encode_batch 一次性编码所有文本，
-        并批量写入 Milvus 和 MySQL，显著提升吞吐量。
+        并批量写入向量库和 MySQL，显著提升吞吐量。
 
         Args:
             article_ids: Article ID list.
@@ -263,20 +295,20 @@ class EmbeddingService:
             logger.error(f"Batch encoding failed: {e}")
             return {"total": len(article_ids), "computed": 0, "skipped": skipped, "failed": failed + len(to_encode_texts)}
 
-        # 第五步：批量写入 Milvus
+        # 第五步：批量写入向量库
         if progress_callback:
-            progress_callback(len(to_encode_texts), total, "Writing to Milvus")
-        milvus = self._get_milvus()
+            progress_callback(len(to_encode_texts), total, "Writing to vector store")
+        store = self._get_vector_store()
         milvus_ids_map: dict[int, str] = {}
-        if milvus:
+        if store:
             try:
-                ids = milvus.insert_vectors(to_encode_ids, embeddings)
+                ids = await asyncio.to_thread(store.insert_vectors, to_encode_ids, embeddings)
                 if ids:
                     for i, aid in enumerate(to_encode_ids):
                         if i < len(ids):
                             milvus_ids_map[aid] = str(ids[i])
             except Exception as e:
-                logger.warning(f"Milvus batch insert failed: {e}")
+                logger.warning(f"Vector store batch insert failed: {e}")
 
         # 第六步：批量创建 MySQL 元数据记录
         if progress_callback:
@@ -311,6 +343,7 @@ class EmbeddingService:
         db: AsyncSession,
         limit: int = 100,
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        article_ids: Optional[list[int]] = None,
     ) -> dict:
         """Compute embeddings for articles missing them.
 
@@ -320,6 +353,7 @@ class EmbeddingService:
             db: Async database session.
             limit: Max number of articles to process.
             progress_callback: Optional callback for progress updates.
+            article_ids: Only consider these articles (pipeline task scope).
 
         Returns:
             dict: Batch computation summary.
@@ -329,7 +363,7 @@ class EmbeddingService:
         # 此方法通常由定时调度任务调用
         from sqlalchemy import and_
 
-        result = await db.execute(
+        query = (
             select(Article.id)
             .outerjoin(ArticleEmbedding, Article.id == ArticleEmbedding.article_id)
             .where(
@@ -338,20 +372,43 @@ class EmbeddingService:
                     Article.is_archived.is_(False),       # 未归档
                     Article.ai_processed_at.isnot(None),  # 已经过 AI 处理（确保有摘要可用）
                     Article.source_type != "aigc",        # 排除 AIGC 生成的文章
+                    Article.duplicate_of.is_(None),       # 跳过近似重复的转载
                 )
             )
-            .order_by(Article.crawl_time.desc())
-            .limit(limit)
         )
+        if article_ids is not None:
+            query = query.where(Article.id.in_(article_ids))
+        result = await db.execute(query.order_by(Article.crawl_time.desc()).limit(limit))
         article_ids = [row[0] for row in result.all()]
         if not article_ids:
             return {"total": 0, "computed": 0, "skipped": 0, "failed": 0}
         return await self.batch_compute(article_ids, db, progress_callback=progress_callback)
 
+    async def get_vectors(self, article_ids: list[int]) -> dict[int, list[float]]:
+        """Fetch previously computed vectors for articles.
+
+        读取已计算的文章向量（供事件向量聚类等批量场景复用，不重新编码）。
+
+        Args:
+            article_ids: Article IDs.
+
+        Returns:
+            dict[int, list[float]]: Article ID to vector; empty when the
+            vector store is unavailable.
+        """
+        store = self._get_vector_store()
+        if not store or not article_ids:
+            return {}
+        try:
+            return await asyncio.to_thread(store.get_vectors, list(article_ids))
+        except Exception as e:
+            logger.warning(f"Failed to fetch vectors for {len(article_ids)} articles: {e}")
+            return {}
+
     async def find_similar(
         self, article_id: int, db: AsyncSession, top_k: int = 10
     ) -> list[dict]:
-        """Find similar articles using Milvus vector search.
+        """Find similar articles using vector search.
 
         基于向量相似度检索相似文章。
 
@@ -377,18 +434,18 @@ class EmbeddingService:
         # 在线程池中计算查询向量
         embedding = await asyncio.to_thread(self.provider.encode, text)
 
-        # 第三步：在 Milvus 中搜索相似向量
-        milvus = self._get_milvus()
-        if not milvus:
-            return []  # Milvus 不可用时返回空列表
+        # 第三步：在向量库中搜索相似向量
+        store = self._get_vector_store()
+        if not store:
+            return []  # 向量库不可用时返回空列表
 
         try:
             # 排除自身文章，避免搜索结果包含查询文章本身
-            matches = milvus.search_similar(
-                embedding, top_k=top_k, exclude_article_id=article_id
+            matches = await asyncio.to_thread(
+                store.search_similar, embedding, top_k=top_k, exclude_article_id=article_id
             )
         except Exception as e:
-            logger.warning(f"Milvus search failed: {e}")
+            logger.warning(f"Vector store search failed: {e}")
             return []
 
         # 第四步：批量查询匹配文章的标题信息
@@ -437,12 +494,12 @@ class EmbeddingService:
         result = await db.execute(select(func.count()).select_from(ArticleEmbedding))
         total = result.scalar() or 0
 
-        # 检查 Milvus 连接状态和集合中的向量数量
-        milvus = self._get_milvus()
-        milvus_connected = milvus is not None and milvus.is_connected
+        # 检查向量库连接状态和其中的向量数量
+        store = self._get_vector_store()
+        milvus_connected = store is not None and store.is_connected
         collection_count = 0
-        if milvus and milvus_connected:
-            stats = milvus.get_collection_stats()
+        if store and milvus_connected:
+            stats = store.get_collection_stats()
             collection_count = stats.get("num_entities", 0)
 
         return {
@@ -451,5 +508,9 @@ class EmbeddingService:
             "model": feature_config.get("embedding.model", settings.embedding_model),
             "dimension": feature_config.get_int("embedding.dimension", settings.embedding_dimension),
             "milvus_connected": milvus_connected,
+            "vector_store": (
+                VECTOR_STORE_LOCAL if isinstance(store, LocalVectorStore)
+                else VECTOR_STORE_MILVUS if store is not None else None
+            ),
             "collection_count": collection_count,
         }
@@ -17,17 +17,33 @@
 # 性能优化：
 #   - 使用 @lru_cache 缓存实体提取、关键词提取和标题规范化结果
 #   - 避免对相同文本重复计算
+#   - TextFeatures 预先计算一段文本的全部特征集合，聚类特征每次运行只计算一次
+#   - ClusterIndex 倒排索引（模型名 / 实体 / 关键词 / 规范化标题 -> 聚类），
+#     只对与文章至少共享一个特征词的聚类打分
+#
+# 向量聚类模式（CentroidIndex）：
+#   - 每个聚类维护成员文章嵌入向量的滑动均值（质心）
+#   - 整批文章与全部活跃质心的余弦相似度由一次 NumPy 矩阵乘法得到，
+#     批内质心变化或新建聚类时只重算受影响的列
+#   - 余弦相似度接近的候选之间，用上面的词法分数决胜
 # =============================================================================
 
 """Event clustering algorithm."""
 from __future__ import annotations
 import logging
 import re
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import lru_cache
+from typing import Any, Dict, Generic, Hashable, List, Optional, Set, Tuple, TypeVar
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # -----------------------------------------------------------------------------
 # 命名实体识别正则模式
 # 覆盖主要的科技公司、AI 实验室、AI 产品/模型、中国科技公司、
@@ -152,49 +168,98 @@ def _normalize_title(text: str) -> str:
     return " ".join(text.split()).strip().lower()
 
 
-def compute_cluster_score(
-    item_title: str,
-    item_content: str,
-    cluster_title: str,
-    item_category: str = "",
-    cluster_category: str = "",
-) -> tuple[float, str]:
-    """Compute matching score between an article and a cluster.
-    Returns (score, method).
+@dataclass(frozen=True)
+class TextFeatures:
+    """Precomputed matching features of an article or a cluster.
+
+    一段标题/正文的全部匹配特征，计算一次后可与任意数量的对象比较。
+
+    Attributes:
+        title: Raw title.
+        normalized_title: Output of ``_normalize_title(title)``.
+        title_keywords: Keywords of the normalized title (title similarity).
+        models: AI model names in the title.
+        entities: Named entities in the title and content.
+        keywords: Keywords of the raw title.
+        category: Category label.
     """
-    # 计算文章与事件聚类之间的匹配分数
-    # 参数：
-    #   item_title: 文章标题
-    #   item_content: 文章内容
-    #   cluster_title: 事件聚类标题
-    #   item_category: 文章分类
-    #   cluster_category: 聚类分类
-    # 返回值：(总分, 主要匹配方法)
-    #
-    # 评分维度及权重：
-    #   1. AI 模型名匹配: 0.40-0.50（最强信号，如两篇文章都提到 "GPT-5"）
-    #   2. 标题相似度: 0.35 * Jaccard（标题关键词重叠）
-    #   3. 实体重叠: 最高 0.40（公司/产品名等命名实体）
-    #   4. 关键词重叠: 最高 0.10（通用关键词）
-    #   5. 分类一致性: 0.05（同分类加分）
+    title: str
+    normalized_title: str
+    title_keywords: frozenset[str]
+    models: frozenset[str]
+    entities: frozenset[str]
+    keywords: frozenset[str]
+    category: str = ""
+
+    def tokens(self) -> Set[Tuple[str, str]]:
+        """Return the inverted-index tokens of these features.
+
+        只有共享至少一个特征词的文章与聚类才可能获得分类加分以外的分数。
+        """
+        tokens: Set[Tuple[str, str]] = {("model", m) for m in self.models}
+        tokens.update(("entity", e) for e in self.entities)
+        tokens.update(("keyword", k) for k in self.keywords | self.title_keywords)
+        if self.normalized_title:
+            tokens.add(("title", self.normalized_title))
+        return tokens
+
+
+def build_features(title: str, content: Optional[str] = None, category: str = "") -> TextFeatures:
+    """Extract matching features from a title and optional content.
+
+    Args:
+        title: Article or cluster title.
+        content: Article content; when given, entities are extracted from
+            ``"{title} {content}"``, otherwise from the title only (clusters).
+        category: Category label.
+
+    Returns:
+        TextFeatures: Precomputed features.
+    """
+    normalized = _normalize_title(title) if title else ""
+    entity_text = f"{title} {content}" if content is not None else title
+    return TextFeatures(
+        title=title,
+        normalized_title=normalized,
+        title_keywords=extract_keywords(normalized) if normalized else frozenset(),
+        models=extract_model_names(title),
+        entities=extract_entities(entity_text),
+        keywords=extract_keywords(title),
+        category=category,
+    )
+
+
+def score_features(item: TextFeatures, cluster: TextFeatures) -> tuple[float, str]:
+    """Compute the matching score between precomputed article and cluster features.
+
+    与 compute_cluster_score 的评分规则完全一致，但不重复提取特征。
 
+    Args:
+        item: Article features.
+        cluster: Cluster features.
+
+    Returns:
+        tuple[float, str]: (score, method).
+    """
     score = 0.0
     method = "keyword"  # 默认匹配方法
 
-    # 合并标题和内容用于实体提取
-    item_text = f"{item_title} {item_content or ''}"
-
     # ---- 维度 1：AI 模型名称匹配 ----
     # 如果文章和聚类都提到相同的 AI 模型名，这是很强的关联信号
-    item_models = extract_model_names(item_title)
-    cluster_models = extract_model_names(cluster_title)
-    model_overlap = item_models & cluster_models
+    model_overlap = item.models & cluster.models
     if model_overlap:
         score += 0.40 if len(model_overlap) == 1 else 0.50  # 多个模型匹配给更高分
         method = "model"
 
     # ---- 维度 2：标题相似度 ----
-    title_sim = calculate_title_similarity(item_title, cluster_title)
+    title_sim = 0.0
+    if item.title and cluster.title:
+        if item.normalized_title == cluster.normalized_title:
+            # 完全相同的标题直接视为 1.0
+            title_sim = 1.0
+        elif item.title_keywords and cluster.title_keywords:
+            union = len(item.title_keywords | cluster.title_keywords)
+            title_sim = len(item.title_keywords & cluster.title_keywords) / union
     if title_sim > 0:
         score += 0.35 * title_sim
         # 标题高度相似（>= 0.8）时标记匹配方法为 title
@@ -202,9 +267,7 @@ def compute_cluster_score(
             method = "title"
 
     # ---- 维度 3：命名实体重叠 ----
-    item_entities = extract_entities(item_text)
-    cluster_entities = extract_entities(cluster_title)
-    entity_overlap = item_entities & cluster_entities
+    entity_overlap = item.entities & cluster.entities
     if entity_overlap:
         # 实体重叠分数随重叠数量增长，最多 3 个
         entity_score = 0.25 * min(len(entity_overlap), 3) / 3
@@ -216,16 +279,257 @@ def compute_cluster_score(
             method = "entity"
 
     # ---- 维度 4：关键词重叠 ----
-    item_keywords = extract_keywords(item_title)
-    cluster_keywords = extract_keywords(cluster_title)
-    keyword_overlap = item_keywords & cluster_keywords
+    keyword_overlap = item.keywords & cluster.keywords
     if keyword_overlap:
         # 关键词重叠分数，最多计 5 个关键词
         score += 0.10 * min(len(keyword_overlap), 5) / 5
 
     # ---- 维度 5：分类一致性 ----
     # 文章和聚类属于同一分类时给予小幅加分
-    if item_category and cluster_category == item_category:
+    if item.category and cluster.category == item.category:
         score += 0.05
 
     return score, method
+
+
+def compute_cluster_score(
+    item_title: str,
+    item_content: str,
+    cluster_title: str,
+    item_category: str = "",
+    cluster_category: str = "",
+) -> tuple[float, str]:
+    """Compute matching score between an article and a cluster.
+    Returns (score, method).
+    """
+    # 计算文章与事件聚类之间的匹配分数
+    # 参数：
+    #   item_title: 文章标题
+    #   item_content: 文章内容
+    #   cluster_title: 事件聚类标题
+    #   item_category: 文章分类
+    #   cluster_category: 聚类分类
+    # 返回值：(总分, 主要匹配方法)
+    #
+    # 评分维度及权重：
+    #   1. AI 模型名匹配: 0.40-0.50（最强信号，如两篇文章都提到 "GPT-5"）
+    #   2. 标题相似度: 0.35 * Jaccard（标题关键词重叠）
+    #   3. 实体重叠: 最高 0.40（公司/产品名等命名实体）
+    #   4. 关键词重叠: 最高 0.10（通用关键词）
+    #   5. 分类一致性: 0.05（同分类加分）
+    # 批量场景请预先调用 build_features 并使用 score_features / ClusterIndex
+    return score_features(
+        build_features(item_title, item_content or "", item_category),
+        build_features(cluster_title, None, cluster_category),
+    )
+
+
+class ClusterIndex(Generic[T]):
+    """Inverted index from feature tokens to clusters.
+
+    聚类倒排索引：模型名、实体、关键词、规范化标题 -> 聚类位置。
+    聚类特征在加入索引时计算一次；查询时只返回与文章共享特征词的聚类，
+    并保持加入顺序（与原先逐个遍历的顺序一致）。
+    """
+
+    def __init__(self) -> None:
+        self._clusters: List[T] = []
+        self._features: List[TextFeatures] = []
+        self._postings: Dict[Hashable, List[int]] = defaultdict(list)
+        self._positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def add(self, cluster: T, title: str, category: str = "") -> TextFeatures:
+        """Index ``cluster`` under the features of its title.
+
+        Args:
+            cluster: Cluster object (returned by :meth:`candidates`).
+            title: Cluster title.
+            category: Cluster category.
+
+        Returns:
+            TextFeatures: The precomputed cluster features.
+        """
+        features = build_features(title, None, category)
+        position = len(self._clusters)
+        self._clusters.append(cluster)
+        self._features.append(features)
+        self._positions[id(cluster)] = position
+        for token in features.tokens():
+            self._postings[token].append(position)
+        return features
+
+    def features(self, cluster: T) -> TextFeatures | None:
+        """Return the precomputed features of an indexed ``cluster``."""
+        position = self._positions.get(id(cluster))
+        return self._features[position] if position is not None else None
+
+    def candidates(self, item: TextFeatures) -> List[Tuple[T, TextFeatures]]:
+        """Return clusters sharing at least one token with ``item``, in insertion order."""
+        positions: Set[int] = set()
+        for token in item.tokens():
+            postings = self._postings.get(token)
+            if postings:
+                positions.update(postings)
+        return [(self._clusters[i], self._features[i]) for i in sorted(positions)]
+
+    def score(self, item: TextFeatures) -> List[Tuple[T, TextFeatures, float, str]]:
+        """Score ``item`` against its candidate clusters.
+
+        Returns:
+            List of ``(cluster, features, score, method)`` in insertion order.
+        """
+        results: List[Tuple[Any, TextFeatures, float, str]] = []
+        for cluster, features in self.candidates(item):
+            score, method = score_features(item, features)
+            results.append((cluster, features, score, method))
+        return results
+
+
+def encode_vector(vector: np.ndarray) -> bytes:
+    """Serialize a vector as little-endian float32 bytes (EventCluster.centroid)."""
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def decode_vector(data: bytes | None) -> np.ndarray | None:
+    """Deserialize bytes produced by :func:`encode_vector`."""
+    if not data:
+        return None
+    return np.frombuffer(data, dtype="<f4").astype(np.float32)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return ``matrix`` with L2-normalized rows (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class CentroidIndex(Generic[T]):
+    """Running cluster centroids with batched cosine similarity.
+
+    聚类质心矩阵：每个聚类保存成员向量的均值与归一化副本。
+    ``begin_batch`` 用一次矩阵乘法计算整批文章与全部质心的相似度，
+    之后 ``similarities`` 只对批内更新过的质心和新增聚类重新计算。
+
+    Args:
+        dimension: Vector dimension.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 64):
+        self.dimension = dimension
+        capacity = max(1, capacity)
+        self._means = np.zeros((capacity, dimension), dtype=np.float32)
+        self._normed = np.zeros((capacity, dimension), dtype=np.float32)
+        self._counts = np.zeros(capacity, dtype=np.int64)
+        self._clusters: List[T] = []
+        self._positions: Dict[int, int] = {}
+        # 批量相似度缓存
+        self._queries: np.ndarray = np.zeros((0, dimension), dtype=np.float32)
+        self._base: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        self._base_size = 0
+        self._dirty: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    def __contains__(self, cluster: T) -> bool:
+        return id(cluster) in self._positions
+
+    def _grow(self) -> None:
+        """Double the matrix capacity."""
+        capacity = self._means.shape[0] * 2
+        for name in ("_means", "_normed"):
+            grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+            grown[: len(self)] = getattr(self, name)[: len(self)]
+            setattr(self, name, grown)
+        counts = np.zeros(capacity, dtype=np.int64)
+        counts[: len(self)] = self._counts[: len(self)]
+        self._counts = counts
+
+    def _check_dimension(self, vector: np.ndarray) -> None:
+        """Raise ValueError when ``vector`` does not match the index dimension."""
+        size = np.shape(vector)[-1] if np.ndim(vector) else 0
+        if size != self.dimension:
+            raise ValueError(
+                f"Vector dimension {size} does not match centroid index dimension {self.dimension}"
+            )
+
+    def add(self, cluster: T, centroid: np.ndarray, count: int = 1) -> None:
+        """Add ``cluster`` with an existing centroid built from ``count`` vectors.
+
+        Raises:
+            ValueError: If the centroid dimension differs from the index.
+        """
+        self._check_dimension(centroid)
+        if len(self) == self._means.shape[0]:
+            self._grow()
+        position = len(self)
+        self._clusters.append(cluster)
+        self._positions[id(cluster)] = position
+        self._means[position] = centroid
+        self._normed[position] = _normalize_rows(self._means[position])
+        self._counts[position] = max(1, count)
+
+    def update(self, cluster: T, vector: np.ndarray) -> None:
+        """Fold a new member ``vector`` into the running mean of ``cluster``.
+
+        Raises:
+            ValueError: If the vector dimension differs from the index.
+        """
+        self._check_dimension(vector)
+        position = self._positions.get(id(cluster))
+        if position is None:
+            self.add(cluster, vector, 1)
+            return
+        n = self._counts[position]
+        self._means[position] = (self._means[position] * n + vector) / (n + 1)
+        self._normed[position] = _normalize_rows(self._means[position])
+        self._counts[position] = n + 1
+        self._dirty.add(position)
+
+    def centroid(self, cluster: T) -> Tuple[np.ndarray, int] | None:
+        """Return ``(mean, count)`` for ``cluster``, or None when not indexed."""
+        position = self._positions.get(id(cluster))
+        if position is None:
+            return None
+        return self._means[position].copy(), int(self._counts[position])
+
+    def begin_batch(self, vectors: np.ndarray) -> None:
+        """Compute cosine similarity of every query vector against every centroid.
+
+        一次矩阵乘法：(文章数 × 维度) @ (维度 × 质心数)。
+
+        Args:
+            vectors: Query matrix of shape ``(n, dimension)``.
+
+        Raises:
+            ValueError: If the query dimension differs from the index.
+        """
+        queries = np.asarray(vectors, dtype=np.float32)
+        self._check_dimension(queries)
+        self._queries = _normalize_rows(queries.reshape(-1, self.dimension))
+        self._base_size = len(self)
+        self._base = self._queries @ self._normed[: self._base_size].T
+        self._dirty = set()
+
+    def similarities(self, row: int) -> np.ndarray:
+        """Return current cosine similarities of query ``row`` against all centroids.
+
+        批内更新过的质心与新增聚类按当前值重新计算，其余列直接取批量结果。
+        """
+        size = len(self)
+        sims = np.empty(size, dtype=np.float32)
+        sims[: self._base_size] = self._base[row]
+        stale = sorted(p for p in self._dirty if p < self._base_size)
+        stale.extend(range(self._base_size, size))
+        if stale:
+            positions = np.asarray(stale, dtype=np.int64)
+            sims[positions] = self._normed[positions] @ self._queries[row]
+        return sims
+
+    def cluster_at(self, position: int) -> T:
+        """Return the cluster stored at ``position``."""
+        return self._clusters[position]
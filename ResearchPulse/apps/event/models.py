@@ -20,7 +20,7 @@
 from __future__ import annotations
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
-from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Text
 from sqlalchemy.dialects.mysql import JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from core.models.base import Base, TimestampMixin
@@ -52,6 +52,10 @@ class EventCluster(Base, TimestampMixin):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
     # 聚类中的文章数量（冗余计数，避免每次都 COUNT 查询）
     article_count: Mapped[int] = mapped_column(Integer, default=0, comment="Number of articles in cluster")
+    # 向量聚类模式下的质心：成员文章嵌入向量的均值（float32 小端字节序列）
+    centroid: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, comment="Mean member embedding (float32 bytes)")
+    # 参与质心计算的向量数量，用于滑动均值更新
+    centroid_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="Vectors folded into centroid")
     # 关联的成员列表，使用 selectin 加载策略（查询事件时自动加载成员）
     members: Mapped[list["EventMember"]] = relationship("EventMember", back_populates="event", lazy="selectin")
     # 复合索引：优化"获取活跃事件并按更新时间排序"的常用查询
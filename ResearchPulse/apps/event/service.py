@@ -8,13 +8,18 @@
 #   4. 新事件聚类的自动创建
 #
 # 聚类算法概述：
-#   对每篇未聚类的文章，与所有活跃的事件聚类计算匹配分数：
+#   对每篇未聚类的文章，通过倒排索引找出共享模型名 / 实体 / 关键词的
+#   活跃事件聚类，并计算匹配分数：
 #   - 分数超过阈值 -> 加入该聚类
 #   - 分数未超过阈值但文章重要性 >= 6 -> 创建新聚类
 #   - 否则 -> 不聚类
 #
-# 匹配分数由 clustering.compute_cluster_score 计算，综合考虑：
+# 匹配分数由 clustering.score_features 计算，综合考虑：
 #   模型名称匹配、标题相似度、实体重叠、关键词重叠、分类一致性
+#
+# 向量模式（event.clustering_mode = vector）：
+#   使用文章已计算的嵌入向量与聚类质心的余弦相似度匹配，
+#   词法分数仅用于相近候选之间的决胜；没有向量的文章仍走词法匹配
 # =============================================================================
 
 """Event clustering service."""
@@ -22,13 +27,23 @@ from __future__ import annotations
 import logging
 import re
 from datetime import datetime, timedelta, timezone
+import numpy as np
 from sqlalchemy import and_, select, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload
 from apps.crawler.models.article import Article
 from settings import settings
 from common.feature_config import feature_config
 from .models import EventCluster, EventMember
-from .clustering import compute_cluster_score
+from .clustering import (
+    CentroidIndex,
+    ClusterIndex,
+    TextFeatures,
+    build_features,
+    decode_vector,
+    encode_vector,
+    score_features,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +55,15 @@ class EventService:
     """Service class for event clustering operations.
 
     事件聚类业务逻辑服务类，提供事件查询、时间线构建与聚类处理能力。
+
+    Args:
+        embedding_service: Optional vector source for vector clustering mode
+            (created lazily when needed).
     """
 
+    def __init__(self, embedding_service=None):
+        self._embedding_service = embedding_service
+
     async def get_events(self, db: AsyncSession, active_only: bool = True, limit: int = 50, offset: int = 0) -> tuple[list[EventCluster], int]:
         """List event clusters.
 
@@ -162,7 +184,14 @@ class EventService:
             })
         return timeline
 
-    async def cluster_articles(self, db: AsyncSession, limit: int = 100, min_importance: int = 5) -> dict:
+    async def cluster_articles(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        min_importance: int = 5,
+        mode: str | None = None,
+        article_ids: list[int] | None = None,
+    ) -> dict:
         """Cluster unprocessed articles into events.
 
         对未聚类文章进行匹配与聚类，必要时创建新事件簇。
@@ -171,6 +200,8 @@ class EventService:
             db: Async database session.
             limit: Max number of articles to process.
             min_importance: Minimum importance threshold for clustering.
+            mode: ``"lexical"`` or ``"vector"``; defaults to ``event.clustering_mode``.
+            article_ids: Only consider these articles (pipeline task scope).
 
         Returns:
             dict: Processing summary with total, clustered, and new cluster counts.
@@ -182,8 +213,8 @@ class EventService:
         # 返回值：处理结果统计（总处理数、已聚类数、新聚类数）
 
         # 第一步：查询尚未聚类的文章
-        # 条件：不在 EventMember 中 + 已 AI 处理 + 重要性达标 + 未归档
-        result = await db.execute(
+        # 条件：不在 EventMember 中 + 已 AI 处理 + 重要性达标 + 未归档 + 非近似重复
+        query = (
             select(Article)
             .outerjoin(EventMember, Article.id == EventMember.article_id)
             .where(
@@ -192,78 +223,75 @@ class EventService:
                     Article.ai_processed_at.isnot(None),               # 已经过 AI 处理
                     Article.importance_score >= min_importance,         # 重要性达标
                     Article.is_archived.is_(False),                    # 未归档
+                    Article.duplicate_of.is_(None),                    # 跳过近似重复的转载
                 )
             )
-            .order_by(Article.crawl_time.desc())
-            .limit(limit)
         )
+        if article_ids is not None:
+            query = query.where(Article.id.in_(article_ids))
+        result = await db.execute(query.order_by(Article.crawl_time.desc()).limit(limit))
         articles = list(result.scalars().all())
         if not articles:
             return {"total_processed": 0, "clustered": 0, "new_clusters": 0}
 
         # 第二步：获取最近的活跃事件聚类
         # 只匹配最近 3 天内更新过的活跃聚类，过旧的事件不再接受新文章
+        # 聚类阶段不访问成员列表，关闭 selectin 预加载
         cutoff = datetime.now(timezone.utc) - timedelta(days=3)
+        max_clusters = feature_config.get_int("event.max_active_clusters", 100)
         cluster_result = await db.execute(
             select(EventCluster)
+            .options(lazyload(EventCluster.members))
             .where(and_(EventCluster.is_active.is_(True), EventCluster.last_updated_at >= cutoff))
             .order_by(EventCluster.last_updated_at.desc())
-            .limit(100)  # 最多匹配 100 个活跃聚类
+            .limit(max_clusters)
         )
         clusters = list(cluster_result.scalars().all())
 
-        # 构建按 category 分组的聚类索引，用于快速预过滤
-        # 这样对每篇文章只需先在同 category 的聚类子集中匹配，
-        # 减少 O(n*m) 的无效比较
-        from collections import defaultdict
-        category_to_clusters: dict[str, list[EventCluster]] = defaultdict(list)
+        # 构建倒排索引：每个聚类的特征只计算一次，
+        # 每篇文章只与共享模型名 / 实体 / 关键词 / 标题的聚类比较，
+        # 避免 O(文章数 × 聚类数) 的逐对打分
+        index: ClusterIndex[EventCluster] = ClusterIndex()
         for cluster in clusters:
-            cat = cluster.category or "其他"
-            category_to_clusters[cat].append(cluster)
+            index.add(cluster, cluster.title, cluster.category or "")
+
+        # 向量模式：读取文章已计算的嵌入向量，构建聚类质心矩阵
+        mode = mode or feature_config.get("event.clustering_mode", "lexical")
+        vectors: dict[int, np.ndarray] = {}
+        centroids: CentroidIndex[EventCluster] | None = None
+        if mode == "vector":
+            vectors, centroids = await self._prepare_vectors(articles, clusters)
 
         clustered = 0
         new_clusters = 0
+        # 相似度阈值在整批处理中保持不变，循环外读取一次
+        min_similarity = feature_config.get_float("event.min_similarity", 0.7)
+        vector_threshold = feature_config.get_float("event.vector_min_similarity", 0.75)
+        tie_margin = feature_config.get_float("event.vector_tie_margin", 0.02)
 
         # 第三步：逐篇文章进行匹配
-        for article in articles:
-            best_match = None      # 最佳匹配的事件聚类
-            best_score = 0.0       # 最佳匹配分数
-            best_method = "keyword"  # 最佳匹配的检测方法
-
+        for row, article in enumerate(articles):
             article_category = article.ai_category or "其他"
+            features = build_features(article.title or "", article.content or "", article_category)
+            vector = vectors.get(article.id)
+
+            best_match = None
+            if centroids is not None and vector is not None and len(centroids):
+                best_match, best_score, best_method = self._select_vector_match(
+                    centroids.similarities(row), centroids, index, features,
+                    vector_threshold, tie_margin,
+                )
+                # 向量匹配不受词法阈值约束
+                threshold = 0.0
+            if best_match is None:
+                best_match, best_score, best_method = self._select_best_match(
+                    index.score(features), article_category, min_similarity
+                )
+                # 根据匹配方法使用不同的阈值
+                # model 和 entity 匹配的置信度更高，使用较低阈值
+                # keyword 和 title 匹配使用较高阈值
+                threshold = min_similarity * 0.5 if best_method in ("model", "entity") else min_similarity * 0.71
 
-            # 预过滤优化：优先在同 category 的聚类中匹配
-            # 如果同 category 未找到，再扩展到全量聚类
-            candidate_groups = [category_to_clusters.get(article_category, [])]
-            if len(candidate_groups[0]) < len(clusters):
-                candidate_groups.append(clusters)  # 全量聚类作为 fallback
-
-            for candidates in candidate_groups:
-                for cluster in candidates:
-                    score, method = compute_cluster_score(
-                        article.title or "",
-                        article.content or "",
-                        cluster.title,
-                        article_category,
-                        cluster.category or "",
-                    )
-                    # 保留最高分的匹配
-                    if score > best_score:
-                        best_score = score
-                        best_match = cluster
-                        best_method = method
-
-                # 如果在同 category 中已找到高分匹配，无需搜索全量
-                min_similarity = feature_config.get_float("event.min_similarity", 0.7)
-                threshold_check = min_similarity * 0.5 if best_method in ("model", "entity") else min_similarity * 0.71
-                if best_match and best_score >= threshold_check:
-                    break
-
-            # 根据匹配方法使用不同的阈值
-            # model 和 entity 匹配的置信度更高，使用较低阈值
-            # keyword 和 title 匹配使用较高阈值
-            min_similarity = feature_config.get_float("event.min_similarity", 0.7)
-            threshold = min_similarity * 0.5 if best_method in ("model", "entity") else min_similarity * 0.71
             if best_match and best_score >= threshold:
                 # 匹配成功：加入已有聚类
                 member = EventMember(
@@ -282,6 +310,8 @@ class EventService:
                         last_updated_at=datetime.now(timezone.utc),
                     )
                 )
+                if centroids is not None and vector is not None:
+                    centroids.update(best_match, vector)
                 clustered += 1
             elif (article.importance_score or 0) >= 6:
                 # 未匹配到已有聚类，但文章重要性 >= 6：创建新聚类
@@ -303,15 +333,155 @@ class EventService:
                     detection_method="initial",    # 标记为初始成员
                 )
                 db.add(member)
-                clusters.append(new_cluster)  # 加入当前批次的聚类列表，后续文章可以匹配到它
-                # 同时更新 category 索引
-                cat = new_cluster.category or "其他"
-                category_to_clusters[cat].append(new_cluster)
+                # 加入倒排索引与质心矩阵，后续文章可以匹配到它
+                index.add(new_cluster, new_cluster.title, new_cluster.category or "")
+                if centroids is not None and vector is not None:
+                    centroids.add(new_cluster, vector, 1)
+                clusters.append(new_cluster)
                 clustered += 1
                 new_clusters += 1
 
+        # 第四步：持久化本批次变化的质心
+        if centroids is not None:
+            for cluster in clusters:
+                state = centroids.centroid(cluster)
+                if state is not None and state[1] != (cluster.centroid_count or 0):
+                    cluster.centroid = encode_vector(state[0])
+                    cluster.centroid_count = state[1]
+
         return {"total_processed": len(articles), "clustered": clustered, "new_clusters": new_clusters}
 
+    async def _prepare_vectors(
+        self,
+        articles: list[Article],
+        clusters: list[EventCluster],
+    ) -> tuple[dict[int, np.ndarray], CentroidIndex[EventCluster] | None]:
+        """Load article vectors and build the centroid index for vector mode.
+
+        读取文章已计算的嵌入向量，并用已保存的聚类质心构建质心矩阵，
+        随后一次矩阵乘法算出整批文章与全部质心的余弦相似度。
+        向量不可用（向量库不可达、文章尚未计算嵌入）时返回空结果，调用方退回词法匹配。
+
+        Args:
+            articles: Articles to cluster (batch order defines query rows).
+            clusters: Active clusters.
+
+        Returns:
+            tuple: (article ID -> vector, centroid index or None).
+        """
+        if self._embedding_service is None:
+            from apps.embedding.service import EmbeddingService
+            self._embedding_service = EmbeddingService()
+        raw = await self._embedding_service.get_vectors([a.id for a in articles])
+        if not raw:
+            logger.info("No article vectors available, falling back to lexical clustering")
+            return {}, None
+
+        vectors = {aid: np.asarray(v, dtype=np.float32) for aid, v in raw.items()}
+        dimension = len(next(iter(vectors.values())))
+        # 维度与首个向量不一致的向量（嵌入模型切换中途）跳过，这些文章退回词法匹配
+        mismatched = [aid for aid, v in vectors.items() if v.shape != (dimension,)]
+        if mismatched:
+            logger.warning(
+                "Skipping %d article vectors whose dimension differs from %d: %s",
+                len(mismatched), dimension, mismatched[:10],
+            )
+            for aid in mismatched:
+                del vectors[aid]
+        centroids: CentroidIndex[EventCluster] = CentroidIndex(dimension, capacity=len(clusters) + len(articles))
+        for cluster in clusters:
+            centroid = decode_vector(cluster.centroid)
+            # 嵌入模型变更后维度不一致的旧质心忽略，成员加入时重新累计
+            if centroid is not None and centroid.shape[0] == dimension:
+                centroids.add(cluster, centroid, cluster.centroid_count or 1)
+
+        zeros = np.zeros(dimension, dtype=np.float32)
+        batch = np.stack([
+            vectors.get(a.id, zeros)
+            for a in articles
+        ])
+        centroids.begin_batch(batch)
+        return vectors, centroids
+
+    @staticmethod
+    def _select_vector_match(
+        sims: np.ndarray,
+        centroids: CentroidIndex[EventCluster],
+        index: ClusterIndex[EventCluster],
+        features: TextFeatures,
+        threshold: float,
+        tie_margin: float,
+    ) -> tuple[EventCluster | None, float, str]:
+        """Pick the closest centroid, breaking near-ties with the lexical score.
+
+        选择余弦相似度最高的聚类；与最高分差距在 tie_margin 以内的候选
+        按词法分数决胜。
+
+        Args:
+            sims: Cosine similarity against every centroid.
+            centroids: Centroid index (maps positions to clusters).
+            index: Lexical cluster index (precomputed features).
+            features: Article features.
+            threshold: Minimum cosine similarity.
+            tie_margin: Cosine margin treated as a tie.
+
+        Returns:
+            tuple: (cluster or None, cosine similarity, "semantic").
+        """
+        if sims.size == 0:
+            return None, 0.0, "semantic"
+        top = float(sims.max())
+        if top < threshold:
+            return None, 0.0, "semantic"
+        near = np.flatnonzero(sims >= top - tie_margin)
+        best_position = int(near[0]) if len(near) == 1 else None
+        if best_position is None:
+            best_lexical = -1.0
+            for position in near[np.argsort(-sims[near], kind="stable")]:
+                cluster_features = index.features(centroids.cluster_at(int(position)))
+                lexical = score_features(features, cluster_features)[0] if cluster_features else 0.0
+                if lexical > best_lexical:
+                    best_position, best_lexical = int(position), lexical
+        return centroids.cluster_at(best_position), float(sims[best_position]), "semantic"
+
+    @staticmethod
+    def _select_best_match(
+        scored: list[tuple[EventCluster, TextFeatures, float, str]],
+        article_category: str,
+        min_similarity: float,
+    ) -> tuple[EventCluster | None, float, str]:
+        """Pick the best cluster from scored candidates.
+
+        选择最佳匹配：优先在同 category 的聚类中选择最高分，
+        若其分数已达到阈值则直接采用；否则在全部候选中选择更高分者。
+
+        Args:
+            scored: ``(cluster, features, score, method)`` in index order.
+            article_category: Article category.
+            min_similarity: Configured ``event.min_similarity``.
+
+        Returns:
+            tuple: (best cluster or None, best score, detection method).
+        """
+        best_match = None      # 最佳匹配的事件聚类
+        best_score = 0.0       # 最佳匹配分数
+        best_method = "keyword"  # 最佳匹配的检测方法
+
+        # 预过滤：优先在同 category 的聚类中匹配
+        for cluster, features, score, method in scored:
+            if (features.category or "其他") == article_category and score > best_score:
+                best_match, best_score, best_method = cluster, score, method
+
+        # 如果在同 category 中已找到高分匹配，无需搜索全量
+        threshold = min_similarity * 0.5 if best_method in ("model", "entity") else min_similarity * 0.71
+        if best_match and best_score >= threshold:
+            return best_match, best_score, best_method
+
+        for cluster, _, score, method in scored:
+            if score > best_score:
+                best_match, best_score, best_method = cluster, score, method
+        return best_match, best_score, best_method
+
     def _generate_title(self, article: Article) -> str:
         """Generate an event title from an article.
 
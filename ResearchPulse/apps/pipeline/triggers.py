@@ -2,6 +2,9 @@
 
 Functions for enqueuing downstream pipeline tasks.  The caller is responsible
 for committing the session after calling these helpers.
+
+Downstream payloads may carry ``article_ids``; the worker then runs the stage
+only for those articles instead of scanning the whole table.
 """
 from __future__ import annotations
 
@@ -48,24 +51,30 @@ async def enqueue_downstream_after_ai(
     db: AsyncSession,
     ai_result: dict[str, Any],
     trigger_source: str = "ai_process_job",
+    article_ids: list[int] | None = None,
 ) -> list[PipelineTask]:
     """Enqueue embedding and action tasks after AI processing completes.
 
-    Only enqueues when there were actually processed articles (processed > 0).
+    Only enqueues when there were actually processed articles (processed > 0
+    or a non-empty ``article_ids``).
 
     Args:
         db: Async database session (caller must commit).
         ai_result: Result dict from the AI processing job.
         trigger_source: Identifier for the trigger origin.
+        article_ids: Articles written by the AI run; scopes the downstream
+            tasks to these articles.  None means an unscoped (full) run.
 
     Returns:
         List of created PipelineTask instances (may be empty).
     """
     processed = ai_result.get("processed", 0)
-    if processed <= 0:
+    if processed <= 0 and not article_ids:
         return []
 
     payload = {"trigger_source": trigger_source, "ai_processed_count": processed}
+    if article_ids is not None:
+        payload["article_ids"] = sorted(set(article_ids))
     tasks = []
     tasks.append(await enqueue_task(db, "embedding", payload=payload, priority=1))
     tasks.append(await enqueue_task(db, "action", payload=payload, priority=0))
@@ -76,6 +85,7 @@ async def enqueue_downstream_after_embedding(
     db: AsyncSession,
     embedding_result: dict[str, Any],
     trigger_source: str = "embedding_job",
+    article_ids: list[int] | None = None,
 ) -> list[PipelineTask]:
     """Enqueue event clustering task after embedding computation completes.
 
@@ -85,6 +95,8 @@ async def enqueue_downstream_after_embedding(
         db: Async database session (caller must commit).
         embedding_result: Result dict from the embedding job.
         trigger_source: Identifier for the trigger origin.
+        article_ids: Scope of the embedding run, passed on to the event task.
+            None means an unscoped (full) run.
 
     Returns:
         List of created PipelineTask instances (may be empty).
@@ -94,6 +106,8 @@ async def enqueue_downstream_after_embedding(
         return []
 
     payload = {"trigger_source": trigger_source, "embedding_computed_count": computed}
+    if article_ids is not None:
+        payload["article_ids"] = sorted(set(article_ids))
     tasks = []
     tasks.append(await enqueue_task(db, "event", payload=payload, priority=1))
     return tasks
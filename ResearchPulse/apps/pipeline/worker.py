@@ -3,14 +3,28 @@
 Polls the ``pipeline_tasks`` table and executes pending tasks by delegating
 to the existing scheduler job functions.  Registered as an APScheduler
 interval job in ``apps/scheduler/tasks.py``.
+
+One worker run is a dispatcher: it claims pending tasks in batches
+(``SELECT ... FOR UPDATE SKIP LOCKED``), coalesces the claimed tasks of each
+stage into a single stage run scoped to the union of their payload
+``article_ids``, and keeps up to ``pipeline.worker_concurrency`` stage runs
+in flight, with at most ``pipeline.<stage>_concurrency`` runs per stage.
+Whenever a run finishes the dispatcher claims again, so downstream tasks
+enqueued by that run start immediately instead of at the next poll.
 """
 from __future__ import annotations
 
+import asyncio
+import importlib
+import json
 import logging
-from datetime import datetime, timezone
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import text
+from sqlalchemy import func, select, update
 
+from common.feature_config import feature_config
 from core.database import get_session_factory
 from apps.pipeline.models import PipelineTask
 
@@ -25,13 +39,36 @@ _STAGE_JOB_MAP = {
     "topic": "apps.scheduler.jobs.topic_match_job:run_topic_match_job",
 }
 
+# Default per-stage concurrency (overridable via ``pipeline.<stage>_concurrency``).
+# AI and event clustering write shared state and stay serial by default.
+_STAGE_CONCURRENCY_DEFAULTS = {
+    "ai": 1,
+    "embedding": 2,
+    "event": 1,
+    "action": 1,
+    "topic": 2,
+}
+
+# Number of dispatchers currently running in this process
+_active_dispatchers = 0
+
 
-async def _execute_stage(stage: str, payload: dict | None) -> dict:
+@dataclass(frozen=True)
+class _ClaimedTask:
+    """Detached snapshot of a claimed pipeline task."""
+
+    id: int
+    stage: str
+    payload: dict | None
+
+
+async def _execute_stage(stage: str, article_ids: list[int] | None = None) -> dict:
     """Execute a pipeline stage by delegating to its job function.
 
     Args:
         stage: The pipeline stage name.
-        payload: Optional payload (currently unused by job functions).
+        article_ids: Articles the run is scoped to; None runs the stage over
+            all pending articles.
 
     Returns:
         Result dict from the job function.
@@ -44,145 +81,326 @@ async def _execute_stage(stage: str, payload: dict | None) -> dict:
         raise ValueError(f"Unknown pipeline stage: {stage}")
 
     module_path, func_name = entry.rsplit(":", 1)
-    import importlib
     module = importlib.import_module(module_path)
     job_func = getattr(module, func_name)
-    return await job_func()
+    if article_ids is None:
+        return await job_func()
+    return await job_func(article_ids=article_ids)
 
 
-async def run_pipeline_worker() -> dict:
-    """Poll and execute pending pipeline tasks.
+def _merge_article_ids(payloads: list[dict | None]) -> list[int] | None:
+    """Union the ``article_ids`` scopes of coalesced task payloads.
+
+    Returns None (an unscoped run) if any payload has no ``article_ids``,
+    since that task asked for the whole stage anyway.
+    """
+    merged: set[int] = set()
+    for payload in payloads:
+        ids = (payload or {}).get("article_ids")
+        if ids is None:
+            return None
+        merged.update(int(i) for i in ids)
+    return sorted(merged)
+
+
+def _stage_concurrency(stage: str) -> int:
+    """Return the max number of concurrent runs for a stage."""
+    default = _STAGE_CONCURRENCY_DEFAULTS.get(stage, 1)
+    return max(1, feature_config.get_int(f"pipeline.{stage}_concurrency", default))
 
-    This function is designed to be called by APScheduler on an interval.
-    It loops through pending tasks one at a time using SELECT ... FOR UPDATE
-    SKIP LOCKED to allow safe concurrent execution.
+
+async def _claim_tasks(
+    session_factory,
+    free_workers: int,
+    stage_running: dict[str, int],
+    batch_size: int,
+) -> dict[str, list[_ClaimedTask]]:
+    """Claim a batch of pending tasks and mark them running.
+
+    Only stages with spare per-stage capacity are considered, at most
+    ``free_workers`` of them, highest pending priority first.
 
     Returns:
-        dict with counts of completed, failed, and total tasks processed.
+        Claimed tasks grouped by stage (one group per stage run).
     """
-    session_factory = get_session_factory()
-    completed_count = 0
-    failed_count = 0
+    async with session_factory() as session:
+        pending = await session.execute(
+            select(PipelineTask.stage, func.max(PipelineTask.priority))
+            .where(PipelineTask.status == "pending")
+            .group_by(PipelineTask.stage)
+        )
+        candidates = sorted(pending.all(), key=lambda row: row[1], reverse=True)
+        stages = [
+            stage for stage, _ in candidates
+            if stage_running.get(stage, 0) < _stage_concurrency(stage)
+        ][:free_workers]
+        if not stages:
+            return {}
+
+        result = await session.execute(
+            select(PipelineTask)
+            .where(PipelineTask.status == "pending", PipelineTask.stage.in_(stages))
+            .order_by(
+                PipelineTask.priority.desc(),
+                PipelineTask.created_at.asc(),
+                PipelineTask.id.asc(),
+            )
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        tasks = list(result.scalars().all())
+        if not tasks:
+            return {}
+
+        await session.execute(
+            update(PipelineTask)
+            .where(PipelineTask.id.in_([t.id for t in tasks]))
+            .values(status="running", started_at=datetime.now(timezone.utc))
+        )
+        await session.commit()
+
+    groups: dict[str, list[_ClaimedTask]] = defaultdict(list)
+    for task in tasks:
+        groups[task.stage].append(_ClaimedTask(task.id, task.stage, task.payload))
+    return dict(groups)
 
-    while True:
-        # --- Claim one pending task ---
-        async with session_factory() as session:
-            # Use raw SQL for FOR UPDATE SKIP LOCKED (not all SQLAlchemy
-            # dialects expose SKIP LOCKED via the ORM).
-            row = (
-                await session.execute(
-                    text(
-                        "SELECT id FROM pipeline_tasks "
-                        "WHERE status = 'pending' "
-                        "ORDER BY priority DESC, created_at ASC "
-                        "LIMIT 1 "
-                        "FOR UPDATE SKIP LOCKED"
-                    )
-                )
-            ).first()
-
-            if row is None:
-                break
 
-            task_id = row[0]
+async def _run_group(session_factory, stage: str, tasks: list[_ClaimedTask]) -> tuple[int, int]:
+    """Run one coalesced stage execution and record its outcome on all tasks.
 
-            # Mark as running
-            await session.execute(
-                text(
-                    "UPDATE pipeline_tasks "
-                    "SET status = 'running', started_at = :now "
-                    "WHERE id = :id"
-                ),
-                {"id": task_id, "now": datetime.now(timezone.utc)},
+    Returns:
+        (completed, failed) task counts.
+    """
+    task_ids = [t.id for t in tasks]
+    article_ids = _merge_article_ids([t.payload for t in tasks])
+
+    try:
+        result = await _execute_stage(stage, article_ids)
+    except Exception as exc:
+        logger.error(
+            "Pipeline tasks %s stage=%s failed: %s",
+            task_ids,
+            stage,
+            exc,
+            exc_info=True,
+        )
+        await _mark_failed_safely(session_factory, task_ids, exc)
+        return 0, len(tasks)
+
+    # Check for "skipped" results (feature disabled) – treat as success
+    if result.get("skipped"):
+        logger.info(
+            "Pipeline tasks %s stage=%s skipped (feature disabled)",
+            task_ids,
+            stage,
+        )
+    if len(tasks) > 1:
+        result = {**result, "coalesced_tasks": len(tasks)}
+
+    try:
+        await _mark_completed(session_factory, task_ids, result)
+    except Exception as exc:
+        # The stage ran but its outcome could not be written; re-queue the
+        # tasks (stages only pick up unprocessed articles, so a rerun is
+        # cheap) rather than leaving them ``running`` forever.
+        logger.error(
+            "Failed to record completion of pipeline tasks %s stage=%s: %s",
+            task_ids,
+            stage,
+            exc,
+            exc_info=True,
+        )
+        await _mark_failed_safely(session_factory, task_ids, exc)
+        return 0, len(tasks)
+
+    # NOTE: downstream enqueue is handled inside each job function
+    # (ai_process_job, embedding_job), so we do NOT enqueue again here
+    # to avoid duplicate tasks.
+    return len(tasks), 0
+
+
+async def _mark_completed(session_factory, task_ids: list[int], result: dict) -> None:
+    """Mark tasks completed with the stage run result."""
+    async with session_factory() as session:
+        await session.execute(
+            update(PipelineTask)
+            .where(PipelineTask.id.in_(task_ids))
+            .values(
+                status="completed",
+                result=_json_safe(result),
+                completed_at=datetime.now(timezone.utc),
             )
-            await session.commit()
-
-        # --- Load task details and execute ---
-        async with session_factory() as session:
-            task = await session.get(PipelineTask, task_id)
-            if task is None:
-                continue
-
-            stage = task.stage
-            payload = task.payload
-
-        try:
-            result = await _execute_stage(stage, payload)
-
-            # Check for "skipped" results (feature disabled) – treat as success
-            if result.get("skipped"):
-                logger.info(
-                    "Pipeline task %s stage=%s skipped (feature disabled)",
-                    task_id,
-                    stage,
-                )
-
-            # Mark completed
-            async with session_factory() as session:
-                await session.execute(
-                    text(
-                        "UPDATE pipeline_tasks "
-                        "SET status = 'completed', result = :result, "
-                        "    completed_at = :now "
-                        "WHERE id = :id"
-                    ),
-                    {
-                        "id": task_id,
-                        "result": _json_dumps(result),
-                        "now": datetime.now(timezone.utc),
-                    },
-                )
-                await session.commit()
-
-            completed_count += 1
-
-            # NOTE: downstream enqueue is handled inside each job function
-            # (ai_process_job, embedding_job), so we do NOT enqueue again here
-            # to avoid duplicate tasks.
-
-        except Exception as exc:
-            logger.error(
-                "Pipeline task %s stage=%s failed: %s",
-                task_id,
-                stage,
-                exc,
-                exc_info=True,
+        )
+        await session.commit()
+
+
+async def _mark_failed(session_factory, task_ids: list[int], exc: Exception) -> None:
+    """Return failed tasks to the queue, or fail them once retries run out."""
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        result = await session.execute(
+            select(PipelineTask).where(PipelineTask.id.in_(task_ids))
+        )
+        for task in result.scalars().all():
+            task.retry_count += 1
+            task.error_message = str(exc)[:2000]
+            if task.retry_count < task.max_retries:
+                task.status = "pending"
+                task.started_at = None
+            else:
+                task.status = "failed"
+                task.completed_at = now
+        await session.commit()
+
+
+async def _mark_failed_safely(session_factory, task_ids: list[int], exc: Exception) -> None:
+    """:func:`_mark_failed` that never raises.
+
+    If the database is unreachable the tasks stay ``running`` and are
+    reclaimed by :func:`_reclaim_stale_tasks` on a later worker run.
+    """
+    try:
+        await _mark_failed(session_factory, task_ids, exc)
+    except Exception as write_exc:
+        logger.error(
+            "Failed to record failure of pipeline tasks %s: %s",
+            task_ids,
+            write_exc,
+            exc_info=True,
+        )
+
+
+async def _reclaim_stale_tasks(session_factory) -> int:
+    """Re-queue tasks stuck in ``running`` past ``pipeline.task_timeout_minutes``.
+
+    Covers workers that crashed, or could not write a task outcome, after
+    claiming.  A reclaim counts as a retry, so tasks that keep getting
+    stranded eventually fail.
+
+    Returns:
+        Number of tasks reclaimed.
+    """
+    timeout = feature_config.get_int("pipeline.task_timeout_minutes", 60)
+    if timeout <= 0:
+        return 0
+    now = datetime.now(timezone.utc)
+    stale = (
+        PipelineTask.status == "running",
+        PipelineTask.started_at < now - timedelta(minutes=timeout),
+    )
+    message = f"Reclaimed after running for more than {timeout} minutes"
+    async with session_factory() as session:
+        failed = await session.execute(
+            update(PipelineTask)
+            .where(*stale, PipelineTask.retry_count + 1 >= PipelineTask.max_retries)
+            .values(
+                status="failed",
+                retry_count=PipelineTask.retry_count + 1,
+                error_message=message,
+                completed_at=now,
             )
-            failed_count += 1
+        )
+        requeued = await session.execute(
+            update(PipelineTask)
+            .where(*stale)
+            .values(
+                status="pending",
+                retry_count=PipelineTask.retry_count + 1,
+                error_message=message,
+                started_at=None,
+            )
+        )
+        await session.commit()
+    reclaimed = (failed.rowcount or 0) + (requeued.rowcount or 0)
+    if reclaimed:
+        logger.warning("Reclaimed %d stale running pipeline tasks", reclaimed)
+    return reclaimed
 
-            async with session_factory() as session:
-                task = await session.get(PipelineTask, task_id)
-                if task is None:
-                    continue
 
-                task.retry_count += 1
-                task.error_message = str(exc)[:2000]
+async def run_pipeline_worker() -> dict:
+    """Claim and execute pending pipeline tasks until the queue is drained.
+
+    This function is designed to be called by APScheduler on an interval
+    (and is woken early by :func:`wake_pipeline_worker`).  Tasks are claimed
+    with ``SELECT ... FOR UPDATE SKIP LOCKED``, so several processes can run
+    workers against the same table safely.
 
-                if task.retry_count < task.max_retries:
-                    task.status = "pending"
-                    task.started_at = None
-                else:
-                    task.status = "failed"
-                    task.completed_at = datetime.now(timezone.utc)
+    Returns:
+        dict with counts of completed, failed and total tasks processed, and
+        the number of stage runs they were coalesced into.
+    """
+    global _active_dispatchers
+    session_factory = get_session_factory()
+    workers = max(1, feature_config.get_int("pipeline.worker_concurrency", 4))
+    batch_size = max(1, feature_config.get_int("pipeline.claim_batch_size", 50))
+
+    completed_count = 0
+    failed_count = 0
+    runs = 0
+    stage_running: dict[str, int] = defaultdict(int)
+    running: dict[asyncio.Task, str] = {}
+
+    _active_dispatchers += 1
+    try:
+        await _reclaim_stale_tasks(session_factory)
+        while True:
+            free = workers - len(running)
+            if free > 0:
+                groups = await _claim_tasks(session_factory, free, stage_running, batch_size)
+                for stage, tasks in groups.items():
+                    stage_running[stage] += 1
+                    runs += 1
+                    run = asyncio.create_task(_run_group(session_factory, stage, tasks))
+                    running[run] = stage
+
+            if not running:
+                break
 
-                await session.commit()
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for run in done:
+                stage_running[running.pop(run)] -= 1
+                completed, failed = run.result()
+                completed_count += completed
+                failed_count += failed
+    finally:
+        _active_dispatchers -= 1
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
 
     total = completed_count + failed_count
     if total > 0:
         logger.info(
-            "Pipeline worker finished: %d completed, %d failed out of %d",
+            "Pipeline worker finished: %d completed, %d failed out of %d (%d runs)",
             completed_count,
             failed_count,
             total,
+            runs,
         )
     return {
         "completed": completed_count,
         "failed": failed_count,
         "total": total,
+        "runs": runs,
     }
 
 
-def _json_dumps(obj: dict) -> str:
-    """Serialize a dict to a JSON string for storage."""
-    import json
-    return json.dumps(obj, ensure_ascii=False, default=str)
+def wake_pipeline_worker() -> None:
+    """Start the pipeline worker now instead of at its next interval.
+
+    Called after a job commits newly enqueued downstream tasks.  If a
+    dispatcher is already running in this process it will claim the new
+    tasks itself, so nothing is rescheduled.
+    """
+    if _active_dispatchers > 0:
+        return
+    from apps.scheduler.tasks import run_job_soon
+
+    try:
+        run_job_soon("pipeline_worker")
+    except Exception as exc:
+        logger.warning("Failed to wake pipeline worker: %s", exc)
+
+
+def _json_safe(obj: dict) -> dict:
+    """Round-trip a result dict through JSON so the JSON column accepts it."""
+    return json.loads(json.dumps(obj, ensure_ascii=False, default=str))
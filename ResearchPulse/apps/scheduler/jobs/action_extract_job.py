@@ -22,12 +22,16 @@ from core.database import get_session_factory
 logger = logging.getLogger(__name__)
 
 
-async def run_action_extract_job() -> dict:
+async def run_action_extract_job(article_ids: list[int] | None = None) -> dict:
     """Extract action items from AI-processed articles.
 
     扫描已 AI 处理且重要性 >= 6 的文章，从中提取行动项。
     行动项归属于第一个超级管理员用户（系统级行动项）。
 
+    Args:
+        article_ids: Only scan these articles (pipeline task scope).
+            None scans all candidate articles.
+
     Returns:
         dict: Extraction statistics.
     """
@@ -64,10 +68,11 @@ async def run_action_extract_job() -> dict:
             from apps.action.extractor import extract_actions_from_article
 
             batch_limit = feature_config.get_int("pipeline.action_batch_limit", 200)
+            remaining = list(article_ids) if article_ids is not None else None
 
             # 循环处理：每次取 batch_limit 篇文章，直到没有待处理文章为止
             while True:
-                result = await session.execute(
+                query = (
                     select(Article.id)
                     .outerjoin(ActionItem, Article.id == ActionItem.article_id)
                     .where(
@@ -77,18 +82,23 @@ async def run_action_extract_job() -> dict:
                             Article.is_archived.is_(False),
                             Article.importance_score >= 6,
                             Article.actionable_items.isnot(None),
+                            Article.duplicate_of.is_(None),
                         )
                     )
-                    .order_by(Article.crawl_time.desc())
-                    .limit(batch_limit)
                 )
-                article_ids = [row[0] for row in result.all()]
+                if remaining is not None:
+                    scope, remaining = remaining[:batch_limit], remaining[batch_limit:]
+                    query = query.where(Article.id.in_(scope))
+                result = await session.execute(
+                    query.order_by(Article.crawl_time.desc()).limit(batch_limit)
+                )
+                batch_ids = [row[0] for row in result.all()]
 
-                if not article_ids:
+                if not batch_ids and not remaining:
                     break
 
                 # 逐篇提取行动项
-                for article_id in article_ids:
+                for article_id in batch_ids:
                     try:
                         actions = await extract_actions_from_article(
                             article_id, system_user_id, session
@@ -103,11 +113,15 @@ async def run_action_extract_job() -> dict:
                 # 每批次提交一次，避免长事务
                 await session.commit()
 
-                if len(article_ids) < batch_limit:
+                # 限定范围时逐块处理完即结束，不再全表扫描
+                if remaining is not None:
+                    if not remaining:
+                        break
+                elif len(batch_ids) < batch_limit:
                     break
 
                 logger.info(
-                    f"Action extraction batch done ({len(article_ids)} articles), "
+                    f"Action extraction batch done ({len(batch_ids)} articles), "
                     f"continuing next batch..."
                 )
 
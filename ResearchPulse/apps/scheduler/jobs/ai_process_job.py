@@ -19,16 +19,20 @@ from core.database import get_session_factory
 logger = logging.getLogger(__name__)
 
 
-async def run_ai_process_job() -> dict:
+async def run_ai_process_job(article_ids: list[int] | None = None) -> dict:
     """Process new articles with AI.
 
     批量处理尚未经过 AI 分析的文章，生成摘要与结构化字段。
 
+    Args:
+        article_ids: Only process these articles (pipeline task scope).
+            None scans all unprocessed articles.
+
     Returns:
         dict: Processing statistics or a skipped status when disabled.
     """
     # 功能: 批量处理尚未经过 AI 分析的新文章
-    # 参数: 无（批处理数量等配置在内部硬编码或由服务层管理）
+    # 参数: article_ids - 流水线任务限定的文章范围，None 表示全表扫描
     # 返回值: dict - 包含处理统计信息:
     #   - processed: 成功处理的文章数
     #   - cached: 命中缓存的文章数（已有相同内容的 AI 处理结果）
@@ -59,6 +63,9 @@ async def run_ai_process_job() -> dict:
         service = AIProcessorService()
         # 累计统计
         accumulated = {"processed": 0, "cached": 0, "failed": 0, "total": 0}
+        # 本次成功写入结果的文章，下游任务只处理这些文章
+        succeeded_ids: list[int] = []
+        remaining = list(article_ids) if article_ids is not None else None
 
         try:
             # 预热模型：向 Ollama 发送空请求触发模型加载到内存，
@@ -70,7 +77,12 @@ async def run_ai_process_job() -> dict:
             # 循环处理：每次取 batch_limit 篇文章，直到没有待处理文章为止
             batch_limit = feature_config.get_int("pipeline.ai_batch_limit", 200)
             while True:
-                result = await service.process_unprocessed(session, limit=batch_limit)
+                scope = None
+                if remaining is not None:
+                    scope, remaining = remaining[:batch_limit], remaining[batch_limit:]
+                result = await service.process_unprocessed(
+                    session, limit=batch_limit, article_ids=scope
+                )
                 await session.commit()
 
                 batch_total = result.get("total", 0)
@@ -78,8 +90,16 @@ async def run_ai_process_job() -> dict:
                 accumulated["cached"] += result.get("cached", 0)
                 accumulated["failed"] += result.get("failed", 0)
                 accumulated["total"] += batch_total
+                succeeded_ids.extend(
+                    r["article_id"] for r in result.get("results", [])
+                    if r.get("success") and r.get("article_id") is not None
+                )
 
-                if batch_total < batch_limit:
+                # 限定范围时逐块处理完即结束，不再全表扫描
+                if remaining is not None:
+                    if not remaining:
+                        break
+                elif batch_total < batch_limit:
                     break
 
                 logger.info(
@@ -90,9 +110,15 @@ async def run_ai_process_job() -> dict:
             # 入队下游任务（使用独立 session，与主事务隔离）
             try:
                 from apps.pipeline.triggers import enqueue_downstream_after_ai
+                from apps.pipeline.worker import wake_pipeline_worker
                 async with session_factory() as enqueue_session:
-                    await enqueue_downstream_after_ai(enqueue_session, accumulated, trigger_source="ai_process_job")
+                    tasks = await enqueue_downstream_after_ai(
+                        enqueue_session, accumulated,
+                        trigger_source="ai_process_job", article_ids=succeeded_ids,
+                    )
                     await enqueue_session.commit()
+                if tasks:
+                    wake_pipeline_worker()
             except Exception as trigger_err:
                 logger.warning(f"Failed to enqueue downstream tasks: {trigger_err}")
 
@@ -1,12 +1,18 @@
 # ==============================================================================
 # 模块: ResearchPulse 数据备份定时任务
-# 作用: 本模块负责在物理删除过期文章之前，将其导出为 JSON 备份文件，
+# 作用: 本模块负责在物理删除过期文章之前，将其导出为归档备份，
 #       随后记录备份信息并执行物理删除，确保数据不会因清理而永久丢失。
 # 架构角色: 数据生命周期管理的第二环（承接 cleanup_job 的归档操作）。
 #           cleanup_job 负责归档标记 -> backup_job 负责备份并物理删除。
-# 设计思路: 遵循"先备份后删除"原则，备份文件以 JSON 格式存储，包含完整的文章元数据和内容，
-#           便于后续需要时进行数据恢复。同时在数据库中记录备份元信息（BackupRecord），
-#           形成可追溯的备份历史。
+# 设计思路: 遵循"先备份后删除"原则，且全程流式处理、内存占用恒定：
+#           1. 按 ID 键集分批（WHERE id > :last_id ORDER BY id LIMIT :batch），
+#              每批以服务端游标流式读取，逐行写入压缩 NDJSON 分段文件（common.archive）
+#           2. 每批分段 fsync 并写入清单后，才用一条 DELETE ... WHERE id IN (...) 删除这批文章
+#              （关联表依靠外键 ON DELETE CASCADE 级联清理）并提交，每批一个短事务
+#           3. 备份记录（BackupRecord）在开始时以 pending 状态创建，指向归档清单；
+#              任务中断后下次运行会找到未完成的归档，补删已落盘的批次并继续追加
+#           恢复（restore_backup_file）同样流式进行：按块读取归档记录，每块按来源类型
+#           各一条 IN 查询判断已存在的文章，其余用多行 INSERT IGNORE 批量写入并提交。
 # 执行方式: 由 APScheduler 的 CronTrigger 每天定时触发，通常安排在清理任务之后。
 # ==============================================================================
 
@@ -14,13 +20,25 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
+from itertools import islice
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import DateTime, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.archive import (
+    ArchiveManifest,
+    ArchiveWriter,
+    is_archive,
+    iter_backup_records,
+    manifest_path,
+)
+from core.bulk import build_insert_ignore, get_dialect_name
 from core.database import get_session_factory
 # Article: 文章数据模型; BackupRecord: 备份记录模型，用于追踪备份历史
 from apps.crawler.models import Article, BackupRecord
@@ -28,6 +46,75 @@ from settings import settings
 
 logger = logging.getLogger(__name__)
 
+# 归档的记录类型（写入清单的 kind 字段）
+ARCHIVE_KIND = "articles"
+
+
+def _resolve_backup_dir() -> Path:
+    """Return the backup directory (relative paths live under ``data_dir``)."""
+    backup_dir = settings.backup_dir
+    if not backup_dir.is_absolute():
+        backup_dir = settings.data_dir / backup_dir
+    # 递归创建目录，exist_ok=True 避免目录已存在时抛出异常
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    return backup_dir
+
+
+async def _find_unfinished_backup(session: AsyncSession) -> Optional[BackupRecord]:
+    """Return the latest pending backup whose archive can be resumed."""
+    result = await session.execute(
+        select(BackupRecord)
+        .where(BackupRecord.status.in_(("pending", "failed")))
+        .order_by(BackupRecord.id.desc())
+        .limit(1)
+    )
+    record = result.scalar_one_or_none()
+    if record is None or not is_archive(Path(record.backup_file)):
+        return None
+    if not manifest_path(Path(record.backup_file)).exists():
+        return None
+    return record
+
+
+async def _delete_articles(session: AsyncSession, article_ids: List[Any]) -> int:
+    """Delete one archived batch with a single keyed DELETE and commit."""
+    if not article_ids:
+        return 0
+    from apps.search.index import unindex_articles
+
+    result = await session.execute(delete(Article).where(Article.id.in_(article_ids)))
+    await session.commit()
+    await unindex_articles(article_ids)
+    return result.rowcount or 0
+
+
+async def _archive_batch(
+    session: AsyncSession,
+    writer: ArchiveWriter,
+    delete_threshold: datetime,
+    last_id: int,
+    batch_size: int,
+) -> List[Any]:
+    """Stream one keyset batch of expired articles into the archive.
+
+    Returns:
+        List[Any]: IDs written (and fsynced) in this batch.
+    """
+    stmt = (
+        select(*Article.__table__.columns)
+        .where(Article.crawl_time < delete_threshold, Article.id > last_id)
+        .order_by(Article.id)
+        .limit(batch_size)
+        .execution_options(yield_per=min(batch_size, 500))
+    )
+    # 服务端游标：逐行读取并写入压缩流，不在内存中构建整批对象
+    result = await session.stream(stmt)
+    async for row in result.mappings():
+        writer.write(dict(row))
+    await result.close()
+    # 分段落盘（fsync）并写入清单后才返回，调用方随后删除这批文章
+    return await asyncio.to_thread(writer.flush)
+
 
 async def run_backup_job() -> dict:
     """Back up and delete expired articles.
@@ -37,13 +124,14 @@ async def run_backup_job() -> dict:
     Returns:
         dict: Backup summary including counts, file path, and status.
     """
-    # 功能: 查找超过归档期限的文章，导出为 JSON 备份文件，记录备份信息，然后物理删除这些文章
-    # 参数: 无（归档天数、备份目录等配置从 settings 中读取）
-    # 返回值: dict - 包含备份任务的执行统计（备份文章数、删除数、备份文件路径、文件大小等）
+    # 功能: 流式导出超过归档期限的文章到压缩分段归档，逐批删除已备份的文章
+    # 参数: 无（归档天数、备份目录等配置从 settings 中读取，批大小等从 feature_config 读取）
+    # 返回值: dict - 包含备份任务的执行统计（备份文章数、删除数、清单路径、归档大小等）
     # 副作用:
-    #   1. 文件系统: 创建 JSON 备份文件到指定目录
-    #   2. 数据库写入: 新增 BackupRecord 记录
-    #   3. 数据库删除: 物理删除已备份的文章记录
+    #   1. 文件系统: 创建/追加归档目录（manifest.json + segment-*.ndjson.zst|gz）
+    #   2. 数据库写入: 新增或更新 BackupRecord 记录
+    #   3. 数据库删除: 按批物理删除已备份的文章记录
+    from common.feature_config import feature_config
 
     # 前置检查: 如果备份功能在配置中被禁用，则直接跳过
     if not settings.backup_enabled:
@@ -57,110 +145,101 @@ async def run_backup_job() -> dict:
     # data_archive_days 定义了文章在数据库中的最长保留天数
     delete_threshold = datetime.now(timezone.utc) - timedelta(days=settings.data_archive_days)
 
-    # 初始化结果统计
+    batch_size = max(1, feature_config.get_int("backup.batch_size", 1000))
+    segment_bytes = max(1, feature_config.get_int("backup.segment_max_mb", 64)) * 1024 * 1024
+    codec = feature_config.get("backup.compression", "auto") or "auto"
+
     results = {
-        "backed_up": 0,      # 备份的文章数量
-        "deleted": 0,        # 删除的文章数量
-        "backup_file": None, # 备份文件的路径
-        "errors": [],        # 备份过程中的错误列表
+        "backed_up": 0,      # 本次运行写入归档的文章数量
+        "deleted": 0,        # 本次运行删除的文章数量
+        "resumed": False,    # 是否续写了上次中断的归档
     }
 
     session_factory = get_session_factory()
     async with session_factory() as session:
-        # ---- 第一步: 查询待删除的文章 ----
-        # 筛选条件: 爬取时间早于删除阈值的所有文章
-        # Find articles to delete
-        result = await session.execute(
-            select(Article).where(Article.crawl_time < delete_threshold)
-        )
-        articles = result.scalars().all()
-
-        # 如果没有需要备份的文章，提前返回
-        if not articles:
-            logger.info("No articles to backup")
-            return {
-                "status": "completed",
-                "backed_up": 0,
-                "deleted": 0,
-            }
-
-        # ---- 第二步: 准备备份目录 ----
-        # 如果配置的备份目录是相对路径，则将其转换为基于 data_dir 的绝对路径
-        # Create backup directory
-        backup_dir = settings.backup_dir
-        if not backup_dir.is_absolute():
-            backup_dir = settings.data_dir / backup_dir
-        # 递归创建目录，exist_ok=True 避免目录已存在时抛出异常
-        backup_dir.mkdir(parents=True, exist_ok=True)
-
-        # ---- 第三步: 创建备份文件 ----
-        # 使用时间戳作为文件名的一部分，确保每次备份生成唯一的文件名
-        # Create backup file
-        backup_date = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        backup_file = backup_dir / f"articles_{backup_date}.json"
-
-        # ---- 第四步: 将文章数据序列化为字典列表 ----
-        # 提取文章的所有关键字段，时间字段转换为 ISO 格式字符串以保证可序列化
-        # Export articles
-        articles_data = []
-        for article in articles:
-            articles_data.append({
-                "id": article.id,
-                "source_type": article.source_type,       # 数据来源类型（arxiv/rss/wechat）
-                "source_id": article.source_id,           # 数据源 ID
-                "external_id": article.external_id,       # 外部系统中的唯一标识
-                "title": article.title,
-                "url": article.url,
-                "author": article.author,
-                "summary": article.summary,
-                "content": article.content,
-                "category": article.category,
-                "tags": article.tags,
-                # 时间字段使用 ISO 格式序列化，None 值保持为 None
-                "publish_time": article.publish_time.isoformat() if article.publish_time else None,
-                "crawl_time": article.crawl_time.isoformat() if article.crawl_time else None,
-            })
-
-        # ---- 第五步: 写入 JSON 备份文件 ----
-        # ensure_ascii=False: 保留中文等非 ASCII 字符的原始形式，提高可读性
-        # indent=2: 格式化输出，便于人工查阅和排查问题
-        with open(backup_file, "w", encoding="utf-8") as f:
-            json.dump({
-                "backup_date": backup_date,
-                "article_count": len(articles_data),
-                "articles": articles_data,
-            }, f, ensure_ascii=False, indent=2)
-
-        results["backed_up"] = len(articles_data)
-        results["backup_file"] = str(backup_file)
-        # 获取备份文件大小（字节），用于备份记录和监控
-        backup_size = backup_file.stat().st_size
-
-        # ---- 第六步: 在数据库中记录备份信息 ----
-        # BackupRecord 提供备份历史的可追溯性，便于后续查询和数据恢复
-        # Record backup
-        backup_record = BackupRecord(
-            backup_date=datetime.now(timezone.utc),
-            backup_file=str(backup_file),
-            backup_size=backup_size,
-            article_count=len(articles_data),
-            status="completed",
-            completed_at=datetime.now(timezone.utc),
-        )
-        session.add(backup_record)
+        # ---- 第一步: 续写未完成的归档，或在确有过期文章时创建新归档 ----
+        record = await _find_unfinished_backup(session)
+        if record is None:
+            has_expired = await session.scalar(
+                select(Article.id).where(Article.crawl_time < delete_threshold).limit(1)
+            )
+            if has_expired is None:
+                logger.info("No articles to backup")
+                return {
+                    "status": "completed",
+                    "backed_up": 0,
+                    "deleted": 0,
+                }
+            backup_date = datetime.now(timezone.utc)
+            archive_dir = _resolve_backup_dir() / f"articles_{backup_date.strftime('%Y%m%d_%H%M%S')}"
+            writer = ArchiveWriter.open(
+                archive_dir, kind=ARCHIVE_KIND, codec=codec, segment_bytes=segment_bytes,
+            )
+            record = BackupRecord(
+                backup_date=backup_date,
+                backup_file=str(writer.manifest.path),
+                backup_size=0,
+                article_count=0,
+                status="pending",
+            )
+            session.add(record)
+            await session.commit()
+        else:
+            results["resumed"] = True
+            writer = ArchiveWriter.open(
+                manifest_path(Path(record.backup_file)).parent,
+                kind=ARCHIVE_KIND, codec=codec, segment_bytes=segment_bytes,
+            )
+            logger.info(
+                f"Resuming backup {record.id} at {writer.manifest.total_count} archived articles"
+            )
+            # 上次中断时已落盘但未删除的批次：先补做删除
+            pending = writer.pending
+            if pending:
+                results["deleted"] += await _delete_articles(session, pending)
+                writer.commit()
+
+        # ---- 第二步: 键集分批 归档 -> fsync -> 删除 -> 提交 ----
+        last_id = 0
+        try:
+            while True:
+                batch_ids = await _archive_batch(
+                    session, writer, delete_threshold, last_id, batch_size,
+                )
+                if not batch_ids:
+                    break
+                results["backed_up"] += len(batch_ids)
+                results["deleted"] += await _delete_articles(session, batch_ids)
+                writer.commit()
 
-        # ---- 第七步: 物理删除已备份的文章 ----
-        # 逐条删除文章记录（而非批量 DELETE 语句），
-        # 这样做可以触发 ORM 级别的级联删除和事件钩子
-        # Delete articles
-        for article in articles:
-            await session.delete(article)
+                record.article_count = writer.manifest.total_count
+                record.backup_size = writer.manifest.total_bytes
+                await session.commit()
 
-        results["deleted"] = len(articles)
+                last_id = batch_ids[-1]
+                if len(batch_ids) < batch_size:
+                    break
+        except Exception as e:
+            # 已删除的批次都已完整落盘；归档保持可续写，下次运行继续
+            await session.rollback()
+            writer.abort()
+            record.status = "failed"
+            record.error_message = str(e)[:2000]
+            record.article_count = writer.manifest.total_count
+            record.backup_size = writer.manifest.total_bytes
+            await session.commit()
+            logger.error(f"Backup job failed after {results['backed_up']} articles: {e}")
+            raise
 
-        # 提交事务: 备份记录的写入和文章的删除在同一个事务中完成，
-        # 确保原子性 —— 要么全部成功，要么全部回滚
+        # ---- 第三步: 结束归档并完成备份记录 ----
+        manifest = writer.close()
+        record.status = "completed"
+        record.error_message = None
+        record.article_count = manifest.total_count
+        record.backup_size = manifest.total_bytes
+        record.completed_at = datetime.now(timezone.utc)
         await session.commit()
+        backup_file = record.backup_file
 
     # 生成任务执行摘要
     end_time = datetime.now(timezone.utc)
@@ -171,10 +250,199 @@ async def run_backup_job() -> dict:
         "duration_seconds": duration,
         "articles_backed_up": results["backed_up"],
         "articles_deleted": results["deleted"],
-        "backup_file": results["backup_file"],
-        "backup_size_bytes": backup_size,
+        "articles_in_archive": manifest.total_count,
+        "resumed": results["resumed"],
+        "backup_file": backup_file,
+        "backup_size_bytes": manifest.total_bytes,
+        "segments": len(manifest.segments),
         "timestamp": end_time.isoformat(),
     }
 
     logger.info(f"Backup job completed: {summary}")
     return summary
+
+
+# =============================================================================
+# 备份恢复
+# =============================================================================
+
+# 文章唯一键（ix_articles_source_external），用于判断已存在与 INSERT IGNORE 冲突
+_ARTICLE_KEY = ("source_type", "source_id", "external_id")
+# 可恢复的列：不恢复主键，由数据库重新分配，避免与现有文章的 ID 冲突
+# 恢复时重新分配 ID，指向旧 ID 的近似重复关联不再有效
+_RESTORE_COLUMNS = {
+    c.name: c for c in Article.__table__.columns if c.name not in ("id", "duplicate_of")
+}
+_DATETIME_COLUMNS = {
+    name for name, column in _RESTORE_COLUMNS.items() if isinstance(column.type, DateTime)
+}
+
+ProgressCallback = Callable[[int, str], Awaitable[None]]
+
+
+def backup_record_total(backup_path: Path) -> Optional[int]:
+    """Return the number of records in a backup, if known without reading it."""
+    if is_archive(backup_path):
+        return ArchiveManifest.load(manifest_path(backup_path)).total_count
+    return None
+
+
+def _article_row(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Convert one backup record into an insertable ``articles`` row."""
+    row = {}
+    for name, value in record.items():
+        if name not in _RESTORE_COLUMNS:
+            continue
+        if name in _DATETIME_COLUMNS and isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        row[name] = value
+    if not row.get("external_id") or not row.get("source_type"):
+        return None
+    row["source_id"] = row.get("source_id") or ""
+    return row
+
+
+def _article_key(row: Dict[str, Any]) -> Tuple[str, Optional[str], str]:
+    """Deduplication key of a row, matching ``BaseCrawler._dedup_key``.
+
+    ArXiv 论文按 external_id 全局去重（同一论文可能以不同分类的 source_id 出现），
+    其他来源按 (source_type, source_id, external_id) 判断。
+    """
+    if row["source_type"] == "arxiv":
+        return row["source_type"], None, row["external_id"]
+    return row["source_type"], row["source_id"], row["external_id"]
+
+
+async def _existing_keys(
+    session: AsyncSession, rows: List[Dict[str, Any]],
+) -> set:
+    """Return dedup keys of *rows* already in the database (one query per source type)."""
+    by_type: Dict[str, set] = defaultdict(set)
+    for row in rows:
+        by_type[row["source_type"]].add(row["external_id"])
+    existing = set()
+    for source_type, external_ids in by_type.items():
+        result = await session.execute(
+            select(Article.source_id, Article.external_id).where(
+                Article.source_type == source_type,
+                Article.external_id.in_(external_ids),
+            )
+        )
+        existing.update(
+            _article_key({"source_type": source_type, "source_id": source_id, "external_id": external_id})
+            for source_id, external_id in result
+        )
+    return existing
+
+
+async def _restore_chunk(
+    session: AsyncSession, records: List[Dict[str, Any]],
+) -> Tuple[int, List[Tuple[str, Optional[str], str]]]:
+    """Insert one chunk of backup records, skipping articles that already exist.
+
+    Returns:
+        Tuple[int, List[Tuple[str, Optional[str], str]]]: Inserted row count and
+        the dedup keys attempted.
+    """
+    rows: Dict[Tuple[str, Optional[str], str], Dict[str, Any]] = {}
+    for record in records:
+        row = _article_row(record)
+        if row is not None:
+            rows.setdefault(_article_key(row), row)
+    if not rows:
+        return 0, []
+
+    existing = await _existing_keys(session, list(rows.values()))
+    new_rows = [row for key, row in rows.items() if key not in existing]
+    # 多行 VALUES 要求各行列相同：按列集合分组（旧版 JSON 备份只含部分列）
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+    for row in new_rows:
+        groups[tuple(sorted(row))].append(row)
+
+    dialect_name = get_dialect_name(session)
+    inserted = 0
+    for group in groups.values():
+        # 并发写入的同键文章由 INSERT IGNORE / ON CONFLICT DO NOTHING 跳过
+        result = await session.execute(build_insert_ignore(
+            dialect_name, Article.__table__, group, conflict_columns=_ARTICLE_KEY,
+        ))
+        inserted += max(result.rowcount or 0, 0)
+    await session.commit()
+    return inserted, [_article_key(row) for row in new_rows]
+
+
+async def _index_restored(session: AsyncSession, keys: List[Tuple[str, Optional[str], str]]) -> None:
+    """Add restored articles back to the full-text index (best effort)."""
+    from apps.search.index import index_articles, search_enabled
+
+    if not keys or not search_enabled():
+        return
+    by_type: Dict[str, set] = defaultdict(set)
+    for source_type, _, external_id in keys:
+        by_type[source_type].add(external_id)
+    article_ids: List[int] = []
+    for source_type, external_ids in by_type.items():
+        result = await session.execute(
+            select(Article.id).where(
+                Article.source_type == source_type,
+                Article.external_id.in_(external_ids),
+            )
+        )
+        article_ids.extend(result.scalars())
+    await index_articles(session, article_ids)
+
+
+async def restore_backup_file(
+    backup_path: Path,
+    progress_callback: Optional[ProgressCallback] = None,
+    chunk_size: Optional[int] = None,
+) -> dict:
+    """Restore articles from a backup archive (or legacy JSON backup).
+
+    流式读取备份，按块批量判断已存在并批量写入；已存在的文章（与爬虫去重规则一致：
+    arXiv 按外部 ID，其他来源按来源类型 + 来源 ID + 外部 ID 判断）被跳过，每块一个短事务。
+
+    Args:
+        backup_path: Manifest / archive directory, or legacy JSON file.
+        progress_callback: Optional ``await callback(percent, message)``.
+        chunk_size: Records per chunk (defaults to ``backup.restore_chunk_size``).
+
+    Returns:
+        dict: Restore statistics (restored / skipped / total).
+    """
+    from common.feature_config import feature_config
+
+    if chunk_size is None:
+        chunk_size = feature_config.get_int("backup.restore_chunk_size", 500)
+    chunk_size = max(1, chunk_size)
+    total = backup_record_total(backup_path)
+    records = iter_backup_records(backup_path)
+
+    processed = 0
+    restored = 0
+    session_factory = get_session_factory()
+    async with session_factory() as session:
+        while True:
+            # 解压与 JSON 解析在线程中进行，不阻塞事件循环
+            chunk = await asyncio.to_thread(lambda: list(islice(records, chunk_size)))
+            if not chunk:
+                break
+            inserted, keys = await _restore_chunk(session, chunk)
+            await _index_restored(session, keys)
+            processed += len(chunk)
+            restored += inserted
+
+            if progress_callback is not None:
+                percent = min(99, processed * 100 // total) if total else 0
+                await progress_callback(
+                    percent, f"已处理 {processed}{f'/{total}' if total else ''} 条，恢复 {restored} 条",
+                )
+
+    summary = {
+        "backup_file": str(backup_path),
+        "restored_count": restored,
+        "skipped_count": processed - restored,
+        "total_in_backup": processed,
+    }
+    logger.info(f"Backup restore completed: {summary}")
+    return summary
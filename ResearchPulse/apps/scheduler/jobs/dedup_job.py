@@ -6,110 +6,259 @@
 #   1. ArXiv 论文可能因为属于多个分类而被多次保存
 #   2. RSS 文章可能因为 URL 追踪参数变化而被多次保存
 #   3. 定期清理重复记录，保持数据质量
+#   4. 增量处理：只扫描水位线（上次处理到的文章 ID）之后的新文章，
+#      为其计算规范化去重键（articles.dedup_key，带索引），按键一次 IN 查询
+#      找到更早的同键文章，重复项按小批删除；每批一个短事务并推进水位线。
+#      单次运行的代价与新增数据量成正比，与表大小无关。
+#   5. 自增 ID 的分配顺序不等于提交顺序：并发事务可能在水位线越过之后才提交更小的 ID。
+#      水位线不越过 crawl_time 仍在安全窗口（dedup.watermark_lag_seconds）内的文章，
+#      最近的文章照常去重，下次运行再从它们开始重扫，迟到提交的文章不会被跳过。
 # =============================================================================
 
 """Deduplication cleanup job for ResearchPulse v2."""
 
 from __future__ import annotations
 
+import hashlib
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import delete, select, text
+from sqlalchemy import bindparam, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.crawler.models import Article
+from apps.crawler.models.config import SystemConfig
+from core.bulk import build_upsert, chunked, get_dialect_name
+
 logger = logging.getLogger(__name__)
 
+# 水位线保存在 system_config 中；改为 0 即从头重新扫描（同时回填旧文章的去重键）
+WATERMARK_KEY = "dedup.watermark_id"
 
-async def deduplicate_arxiv_articles(session: AsyncSession) -> int:
-    """Remove duplicate ArXiv articles.
+# RSS 标题去重的最小长度，过短的标题（如 "Update"）不参与去重
+_MIN_TITLE_LENGTH = 10
 
-    当同一篇论文因多个分类被重复保存时，保留最早记录并删除其余重复项。
+_KEY_COLUMNS = (
+    Article.id,
+    Article.source_type,
+    Article.source_id,
+    Article.arxiv_id,
+    Article.title,
+    Article.dedup_key,
+)
 
-    Args:
-        session: Async database session.
 
-    Returns:
-        int: Number of deleted duplicate rows.
+def normalize_title(title: Optional[str]) -> str:
+    """Normalize a title for duplicate detection (whitespace and case folded)."""
+    return " ".join((title or "").split()).casefold()
+
+
+def compute_dedup_key(
+    source_type: Optional[str],
+    source_id: Optional[str],
+    arxiv_id: Optional[str],
+    title: Optional[str],
+) -> Optional[str]:
+    """Return the normalized dedup key of an article, or None if it is not deduplicated.
+
+    - ArXiv: 同一 arxiv_id 视为同一篇论文（跨分类全局去重）
+    - RSS: 同一 RSS 源内规范化标题相同视为同一篇文章
     """
-    # 使用 SQL 删除重复的 ArXiv 论文
-    # 保留每组中 id 最小的记录（最早爬取的）
-    result = await session.execute(
-        text("""
-            DELETE a1 FROM articles a1
-            INNER JOIN articles a2
-            ON a1.arxiv_id = a2.arxiv_id
-               AND a1.source_type = 'arxiv'
-               AND a2.source_type = 'arxiv'
-               AND a1.id > a2.id
-        """)
+    if source_type == "arxiv":
+        return f"arxiv:{arxiv_id}" if arxiv_id else None
+    if source_type == "rss":
+        normalized = normalize_title(title)
+        if len(normalized) <= _MIN_TITLE_LENGTH:
+            return None
+        digest = hashlib.sha1(f"{source_id or ''}\x00{normalized}".encode("utf-8")).hexdigest()
+        return f"rss:{digest}"
+    return None
+
+
+async def _load_watermark(session: AsyncSession) -> int:
+    value = await session.scalar(
+        select(SystemConfig.config_value).where(SystemConfig.config_key == WATERMARK_KEY)
     )
-    deleted_count = result.rowcount
-    return deleted_count
+    try:
+        return int(value) if value else 0
+    except ValueError:
+        return 0
+
+
+async def _save_watermark(session: AsyncSession, article_id: int) -> None:
+    now = datetime.now(timezone.utc)
+    await session.execute(build_upsert(
+        get_dialect_name(session),
+        SystemConfig.__table__,
+        [{
+            "config_key": WATERMARK_KEY,
+            "config_value": str(article_id),
+            "description": "Last article ID processed by the dedup job (0 rescans)",
+            "is_sensitive": False,
+            "created_at": now,
+            "updated_at": now,
+        }],
+        conflict_columns=("config_key",),
+        update_columns=("config_value", "updated_at"),
+    ))
 
 
-async def deduplicate_rss_articles(session: AsyncSession) -> int:
-    """Remove duplicate RSS articles.
+async def _dedup_batch(
+    session: AsyncSession,
+    rows: List[Any],
+    delete_batch_size: int,
+) -> List[Tuple[int, str]]:
+    """Key one batch of new articles and delete those that duplicate an earlier one.
+
+    Returns:
+        List[Tuple[int, str]]: ``(id, source_type)`` of the deleted articles.
+    """
+    keyed: List[Tuple[Any, str]] = []
+    for row in rows:
+        key = compute_dedup_key(row.source_type, row.source_id, row.arxiv_id, row.title)
+        if key is not None:
+            keyed.append((row, key))
+    if not keyed:
+        return []
+
+    # 每个键最早的已有文章（走 ix_articles_dedup_key 索引）
+    holders: Dict[str, int] = {}
+    for chunk in chunked(sorted({key for _, key in keyed})):
+        result = await session.execute(
+            select(Article.dedup_key, func.min(Article.id))
+            .where(Article.dedup_key.in_(chunk))
+            .group_by(Article.dedup_key)
+        )
+        holders.update(result.all())
 
-    当同一篇文章因 URL 追踪参数变化而多次保存时，按标题与来源去重。
+    duplicates: List[Tuple[int, str]] = []
+    new_keys: List[Dict[str, Any]] = []
+    for row, key in keyed:  # rows 按 ID 升序
+        holder = holders.get(key)
+        if holder is not None and holder < row.id:
+            duplicates.append((row.id, row.source_type))
+            continue
+        holders[key] = row.id
+        if row.dedup_key != key:
+            new_keys.append({"article_id": row.id, "key": key})
+
+    if new_keys:
+        await session.execute(
+            update(Article.__table__)
+            .where(Article.__table__.c.id == bindparam("article_id"))
+            .values(dedup_key=bindparam("key")),
+            new_keys,
+        )
+
+    for chunk in chunked(duplicates, delete_batch_size):
+        await session.execute(delete(Article).where(Article.id.in_([i for i, _ in chunk])))
+    return duplicates
+
+
+async def deduplicate_new_articles(
+    session: AsyncSession,
+    batch_size: int = 1000,
+    delete_batch_size: int = 200,
+    max_rows: Optional[int] = None,
+    lag_seconds: int = 0,
+) -> Dict[str, Any]:
+    """Deduplicate articles added since the last watermark.
+
+    按 ID 升序分批扫描水位线之后的文章：计算去重键、删除与更早文章同键的重复项，
+    每批提交一次并推进水位线。重复项中保留 ID 最小（最早爬取）的记录。
+    水位线停在第一篇 crawl_time 处于安全窗口内的文章之前，下次运行从那里重扫，
+    覆盖其间尚未提交、之后才出现的 ID。
 
     Args:
         session: Async database session.
+        batch_size: Articles scanned per batch (one transaction each).
+        delete_batch_size: Max IDs per ``DELETE ... WHERE id IN (...)``.
+        max_rows: Max articles scanned in this run (None = until caught up).
+        lag_seconds: Safety window; articles crawled more recently than this
+            are deduplicated but the watermark does not pass them (0 disables).
 
     Returns:
-        int: Number of deleted duplicate rows.
+        Dict[str, Any]: Scanned count, deleted counts per source type and the new watermark.
     """
-    # 删除同一 RSS 源中标题相同的重复文章
-    # 保留每组中 id 最小的记录
-    result = await session.execute(
-        text("""
-            DELETE a1 FROM articles a1
-            INNER JOIN articles a2
-            ON a1.source_type = a2.source_type
-               AND a1.source_id = a2.source_id
-               AND a1.title = a2.title
-               AND a1.source_type = 'rss'
-               AND a1.id > a2.id
-               AND LENGTH(a1.title) > 10
-        """)
-    )
-    deleted_count = result.rowcount
-    return deleted_count
+    from apps.search.index import unindex_articles
+
+    watermark = await _load_watermark(session)
+    position = watermark
+    # 遇到第一篇仍在安全窗口内的文章后，水位线停在它之前最后一篇已扫描文章的 ID，
+    # 两者之间的 ID 空洞可能属于尚未提交的事务
+    held = False
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=max(0, lag_seconds))
+    recent = (Article.crawl_time >= cutoff).label("recent")
+    scanned = 0
+    deleted: Dict[str, int] = {}
+
+    while max_rows is None or scanned < max_rows:
+        limit = batch_size if max_rows is None else min(batch_size, max_rows - scanned)
+        rows = (await session.execute(
+            select(*_KEY_COLUMNS, recent).where(Article.id > position).order_by(Article.id).limit(limit)
+        )).all()
+        if not rows:
+            break
+
+        batch_deleted = await _dedup_batch(session, rows, delete_batch_size)
+        new_watermark = watermark
+        for row in rows:
+            if held or (lag_seconds > 0 and row.recent):
+                held = True
+                break
+            new_watermark = row.id
+        position = rows[-1].id
+        if new_watermark != watermark:
+            watermark = new_watermark
+            await _save_watermark(session, watermark)
+        await session.commit()
+        await unindex_articles([article_id for article_id, _ in batch_deleted])
+
+        scanned += len(rows)
+        for _, source_type in batch_deleted:
+            deleted[source_type] = deleted.get(source_type, 0) + 1
+        if len(rows) < limit:
+            break
+
+    return {"scanned": scanned, "deleted": deleted, "watermark": watermark}
 
 
 async def run_dedup_job() -> dict:
     """Run the deduplication cleanup job.
 
-    调度器入口函数，清理 ArXiv 与 RSS 的重复文章记录。
+    调度器入口函数，增量清理 ArXiv 与 RSS 的重复文章记录。
 
     Returns:
         dict: Deduplication summary with counts and status.
     """
+    from common.feature_config import feature_config
+
     start_time = datetime.now(timezone.utc)
     logger.info("Starting deduplication cleanup job")
 
-    total_deleted = 0
-    results = {}
-
     try:
         from core.database import get_session_factory
         factory = get_session_factory()
 
         async with factory() as session:
-            # 清理 ArXiv 重复
-            arxiv_deleted = await deduplicate_arxiv_articles(session)
-            results["arxiv_deleted"] = arxiv_deleted
-            total_deleted += arxiv_deleted
-            logger.info(f"Deleted {arxiv_deleted} duplicate arXiv articles")
-
-            # 清理 RSS 重复
-            rss_deleted = await deduplicate_rss_articles(session)
-            results["rss_deleted"] = rss_deleted
-            total_deleted += rss_deleted
-            logger.info(f"Deleted {rss_deleted} duplicate RSS articles")
-
-            # 提交事务
-            await session.commit()
+            outcome = await deduplicate_new_articles(
+                session,
+                batch_size=max(1, feature_config.get_int("dedup.batch_size", 1000)),
+                delete_batch_size=max(1, feature_config.get_int("dedup.delete_batch_size", 200)),
+                max_rows=max(1, feature_config.get_int("dedup.max_rows_per_run", 50000)),
+                lag_seconds=feature_config.get_int("dedup.watermark_lag_seconds", 600),
+            )
+
+        results = {
+            "arxiv_deleted": outcome["deleted"].get("arxiv", 0),
+            "rss_deleted": outcome["deleted"].get("rss", 0),
+            "scanned": outcome["scanned"],
+            "watermark": outcome["watermark"],
+        }
+        total_deleted = results["arxiv_deleted"] + results["rss_deleted"]
+        logger.info(f"Deleted {results['arxiv_deleted']} duplicate arXiv articles")
+        logger.info(f"Deleted {results['rss_deleted']} duplicate RSS articles")
 
         end_time = datetime.now(timezone.utc)
         duration = (end_time - start_time).total_seconds()
@@ -21,16 +21,20 @@ from core.database import get_session_factory
 logger = logging.getLogger(__name__)
 
 
-async def run_embedding_job() -> dict:
+async def run_embedding_job(article_ids: list[int] | None = None) -> dict:
     """Compute embeddings for unprocessed articles.
 
     批量为尚未生成向量的文章计算嵌入表示，用于语义检索与聚类。
 
+    Args:
+        article_ids: Only embed these articles (pipeline task scope).
+            None scans all articles missing embeddings.
+
     Returns:
         dict: Embedding computation summary or skipped status.
     """
     # 功能: 批量为尚未生成嵌入向量的文章计算向量表示
-    # 参数: 无（批处理数量在内部配置）
+    # 参数: article_ids - 流水线任务限定的文章范围，None 表示全表扫描
     # 返回值: dict - 包含嵌入计算统计信息:
     #   - computed: 成功计算嵌入的文章数
     #   - skipped: 跳过的文章数（如内容为空、已有嵌入等）
@@ -64,8 +68,14 @@ async def run_embedding_job() -> dict:
 
         # 循环处理：每次取 batch_limit 篇文章，直到没有待处理文章为止
         batch_limit = feature_config.get_int("pipeline.embedding_batch_limit", 500)
+        remaining = list(article_ids) if article_ids is not None else None
         while True:
-            result = await service.compute_uncomputed(session, limit=batch_limit)
+            scope = None
+            if remaining is not None:
+                scope, remaining = remaining[:batch_limit], remaining[batch_limit:]
+            result = await service.compute_uncomputed(
+                session, limit=batch_limit, article_ids=scope
+            )
             await session.commit()
 
             batch_total = result.get("total", 0)
@@ -74,7 +84,11 @@ async def run_embedding_job() -> dict:
             accumulated["failed"] += result.get("failed", 0)
             accumulated["total"] += batch_total
 
-            if batch_total < batch_limit:
+            # 限定范围时逐块处理完即结束，不再全表扫描
+            if remaining is not None:
+                if not remaining:
+                    break
+            elif batch_total < batch_limit:
                 break
 
             logger.info(
@@ -85,9 +99,15 @@ async def run_embedding_job() -> dict:
     # 入队下游任务（使用独立 session，与主事务隔离）
     try:
         from apps.pipeline.triggers import enqueue_downstream_after_embedding
+        from apps.pipeline.worker import wake_pipeline_worker
         async with session_factory() as enqueue_session:
-            await enqueue_downstream_after_embedding(enqueue_session, accumulated, trigger_source="embedding_job")
+            tasks = await enqueue_downstream_after_embedding(
+                enqueue_session, accumulated,
+                trigger_source="embedding_job", article_ids=article_ids,
+            )
             await enqueue_session.commit()
+        if tasks:
+            wake_pipeline_worker()
     except Exception as trigger_err:
         logger.warning(f"Failed to enqueue downstream tasks: {trigger_err}")
 
@@ -22,16 +22,21 @@ from core.database import get_session_factory
 logger = logging.getLogger(__name__)
 
 
-async def run_event_cluster_job() -> dict:
+async def run_event_cluster_job(article_ids: list[int] | None = None) -> dict:
     """Cluster articles into events.
 
     对未聚类文章执行事件聚类，将语义相似文章归入同一事件簇。
 
+    Args:
+        article_ids: Only cluster these articles (pipeline task scope).
+            None scans all unclustered articles.
+
     Returns:
         dict: Clustering summary or skipped status when disabled.
     """
     # 功能: 对未聚类的文章执行事件聚类分析，将语义相似的文章归入同一事件簇
-    # 参数: 无（聚类参数由 EventService 内部管理）
+    # 参数: article_ids - 流水线任务限定的文章范围，None 表示全表扫描
+    #       （聚类参数由 EventService 内部管理）
     # 返回值: dict - 包含聚类统计信息:
     #   - clustered: 成功归入事件簇的文章数
     #   - new_clusters: 新创建的事件簇数量
@@ -63,15 +68,25 @@ async def run_event_cluster_job() -> dict:
 
         # 循环处理：每次取 batch_limit 篇文章，直到没有待处理文章为止
         batch_limit = feature_config.get_int("pipeline.event_batch_limit", 500)
+        remaining = list(article_ids) if article_ids is not None else None
         while True:
-            result = await service.cluster_articles(session, limit=batch_limit)
+            scope = None
+            if remaining is not None:
+                scope, remaining = remaining[:batch_limit], remaining[batch_limit:]
+            result = await service.cluster_articles(
+                session, limit=batch_limit, article_ids=scope
+            )
 
             batch_total = result.get("total_processed", 0)
             accumulated["total_processed"] += batch_total
             accumulated["clustered"] += result.get("clustered", 0)
             accumulated["new_clusters"] += result.get("new_clusters", 0)
 
-            if batch_total < batch_limit:
+            # 限定范围时逐块处理完即结束，不再全表扫描
+            if remaining is not None:
+                if not remaining:
+                    break
+            elif batch_total < batch_limit:
                 break
 
             # 每批次提交一次，避免长事务
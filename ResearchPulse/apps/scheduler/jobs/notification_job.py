@@ -7,6 +7,9 @@
 #           连接了用户订阅系统（UserSubscription）和邮件发送基础设施（email 模块），
 #           实现了从数据采集到用户触达的完整闭环。
 # 核心流程: 查询用户订阅 -> 匹配文章 -> 渲染邮件内容 -> 发送邮件
+# 批量投递: send_all_user_notifications 一次性预取用户、订阅与候选文章（固定次数查询，
+#           不随用户数增长），在共享执行器中渲染摘要，并通过 EmailDelivery 复用
+#           已认证的 SMTP 会话与 keep-alive HTTP 连接发送
 # 注意事项: 超级管理员默认排除在用户通知之外（他们会收到单独的管理员报告），
 #           用户可通过个人设置控制通知频率（每日/每周/关闭）。
 # ==============================================================================
@@ -19,20 +22,26 @@ This module handles sending email notifications to users after crawling.
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Set
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_
 from sqlalchemy.orm import selectinload
 
 # Article: 文章数据模型
 # UserSubscription: 用户订阅关系模型，记录用户订阅了哪些数据源
 # UserArticleState: 用户文章阅读状态模型（如已读/未读/收藏等）
 from apps.crawler.models import Article, UserSubscription, UserArticleState
+# parse_executor: 共享的 CPU 密集型任务执行器（进程池，不可用时降级为线程池）
+from apps.crawler.parsing import parse_executor
 from core.database import get_session_factory
 # send_email: 基础邮件发送函数; send_email_with_priority: 基于数据库配置的优先级发送
-from common.email import send_email, send_email_with_priority
+# EmailDelivery: 批量发送器（复用邮件配置、SMTP 会话与 HTTP 连接）
+from common.email import EmailDelivery, send_email, send_email_with_priority
 # render_articles_by_source: 按数据源分组渲染文章为 Markdown 格式
 from common.markdown import render_articles_by_source
 # Jinja2 邮件模板渲染（美化 HTML 邮件）
@@ -151,113 +160,300 @@ async def get_user_subscribed_articles(
         # 此处采用应用层过滤而非数据库层 JOIN，是因为订阅关系涉及多种数据源类型，
         # 统一的数据库查询会过于复杂
         # Filter by subscriptions
+        subscription = _SubscriptionFilter(
+            arxiv_codes=arxiv_category_codes,
+            rss_feeds=rss_feeds,
+            wechat_names=wechat_account_names,
+        )
         matched_articles = []
         for article in all_articles:
             # Check if article matches any subscription
-            # ArXiv 文章匹配: 检查文章的分类代码是否在用户订阅的分类集合中
-            if article.source_type == "arxiv" and arxiv_category_codes:
-                # 优先使用 arxiv_primary_category，其次使用 source_id（分类代码）
-                article_cat = article.arxiv_primary_category or article.source_id or ""
-                if article_cat in arxiv_category_codes:
-                    matched_articles.append(article)
-                    continue
-            # RSS 文章匹配: 检查文章的源 ID 是否在用户订阅的 RSS 源集合中
-            elif article.source_type == "rss" and rss_feeds:
-                # For RSS, source_id should match feed_id
-                try:
-                    if int(article.source_id) in rss_feeds:
-                        matched_articles.append(article)
-                        continue
-                except (ValueError, TypeError):
-                    # source_id 转换失败时跳过该文章（防御性处理）
-                    pass
-            # 微信文章匹配: 检查文章的公众号名称是否在用户订阅的公众号集合中
-            elif article.source_type == "wechat" and wechat_account_names:
-                if article.wechat_account_name and article.wechat_account_name in wechat_account_names:
-                    matched_articles.append(article)
-                    continue
-
-            # 已收集到足够数量的匹配文章时提前退出循环，避免不必要的遍历
-            if len(matched_articles) >= limit:
-                break
+            if subscription.matches(article):
+                matched_articles.append(article)
+                # 已收集到足够数量的匹配文章时提前退出循环，避免不必要的遍历
+                if len(matched_articles) >= limit:
+                    break
 
         # ---- 第五步: 将匹配的文章 ORM 对象转换为字典格式 ----
         # 转换为 dict 后可以脱离数据库 session 使用，并方便后续的 JSON 序列化
         # Convert to dict
-        return [
-            {
-                "id": a.id,
-                "title": a.title,
-                "url": a.url,
-                "author": a.author,
-                "summary": a.summary,
-                "source_type": a.source_type,
-                "category": a.category,
-                "publish_time": a.publish_time.isoformat() if a.publish_time else None,
-                "crawl_time": a.crawl_time.isoformat() if a.crawl_time else None,
-                "arxiv_id": a.arxiv_id,
-                "arxiv_primary_category": a.arxiv_primary_category,
-                "arxiv_updated_time": a.arxiv_updated_time.isoformat() if a.arxiv_updated_time else None,
-                "wechat_account_name": a.wechat_account_name,
-                "tags": a.tags or [],
-            }
-            for a in matched_articles[:limit]  # 截取前 limit 条结果
-        ]
+        return [_article_payload(a) for a in matched_articles[:limit]]
+
+
+# ---- 订阅匹配与批量预取 ----
+
+# 批量预取时构造文章字典所需的列（不加载正文等大字段）
+_PAYLOAD_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.url,
+    Article.author,
+    Article.summary,
+    Article.source_type,
+    Article.source_id,
+    Article.category,
+    Article.publish_time,
+    Article.crawl_time,
+    Article.arxiv_id,
+    Article.arxiv_primary_category,
+    Article.arxiv_updated_time,
+    Article.wechat_account_name,
+    Article.tags,
+)
+
+# IN 查询每批的最大参数个数
+_IN_CHUNK_SIZE = 500
+
+
+def _chunks(values: List[Any], size: int = _IN_CHUNK_SIZE) -> Iterable[List[Any]]:
+    """Yield ``values`` in slices of ``size``."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _article_payload(a: Any) -> Dict[str, Any]:
+    """Convert an article (ORM object or row) into the digest payload dict."""
+    return {
+        "id": a.id,
+        "title": a.title,
+        "url": a.url,
+        "author": a.author,
+        "summary": a.summary,
+        "source_type": a.source_type,
+        "category": a.category,
+        "publish_time": a.publish_time.isoformat() if a.publish_time else None,
+        "crawl_time": a.crawl_time.isoformat() if a.crawl_time else None,
+        "arxiv_id": a.arxiv_id,
+        "arxiv_primary_category": a.arxiv_primary_category,
+        "arxiv_updated_time": a.arxiv_updated_time.isoformat() if a.arxiv_updated_time else None,
+        "wechat_account_name": a.wechat_account_name,
+        "tags": a.tags or [],
+    }
 
 
-async def send_user_notification_email(
-    user_email: str,
-    user_id: int,
-    articles: List[Dict[str, Any]],
-    session: Any = None,
-    date: Optional[str] = None,
-) -> bool:
-    """Send a subscription digest email to a user.
+def _subscription_key(article: Any) -> Optional[Tuple[str, Any]]:
+    """Return the value an article is matched on, tagged by source type.
 
-    向用户发送订阅文章摘要邮件，包含按数据源分组的内容。
+    ArXiv 文章按分类代码（优先 arxiv_primary_category，其次 source_id）、
+    RSS 文章按订阅源 ID、微信文章按公众号名称匹配。
+    """
+    if article.source_type == "arxiv":
+        return ("arxiv", article.arxiv_primary_category or article.source_id or "")
+    if article.source_type == "rss":
+        # For RSS, source_id should match feed_id
+        try:
+            return ("rss", int(article.source_id))
+        except (ValueError, TypeError):
+            # source_id 转换失败时跳过该文章（防御性处理）
+            return None
+    if article.source_type == "wechat" and article.wechat_account_name:
+        return ("wechat", article.wechat_account_name)
+    return None
+
+
+@dataclass
+class _SubscriptionFilter:
+    """A user's subscriptions resolved to comparable article values."""
+
+    arxiv_codes: Set[str] = field(default_factory=set)
+    rss_feeds: Set[int] = field(default_factory=set)
+    wechat_names: Set[str] = field(default_factory=set)
+
+    def keys(self) -> List[Tuple[str, Any]]:
+        """Matching keys in the form returned by ``_subscription_key``."""
+        return (
+            [("arxiv", code) for code in self.arxiv_codes]
+            + [("rss", feed_id) for feed_id in self.rss_feeds]
+            + [("wechat", name) for name in self.wechat_names]
+        )
+
+    def matches(self, article: Any) -> bool:
+        """Whether the article belongs to one of the subscribed sources."""
+        key = _subscription_key(article)
+        if key is None:
+            return False
+        source_type, value = key
+        if source_type == "arxiv":
+            return value in self.arxiv_codes
+        if source_type == "rss":
+            return value in self.rss_feeds
+        return value in self.wechat_names
+
+
+async def _load_subscription_filters(
+    session: Any, user_ids: List[int]
+) -> Dict[int, _SubscriptionFilter]:
+    """Load active subscriptions of many users, resolved to codes/names.
+
+    订阅表存的是 source_id（数据库主键），批量查询一次把分类 ID / 公众号 ID
+    映射为文章表中可比较的分类代码 / 公众号名称。
+    """
+    from apps.crawler.models.source import ArxivCategory, WechatAccount
+
+    rows = []
+    for chunk in _chunks(user_ids):
+        result = await session.execute(
+            select(
+                UserSubscription.user_id,
+                UserSubscription.source_type,
+                UserSubscription.source_id,
+            ).where(
+                UserSubscription.user_id.in_(chunk),
+                UserSubscription.is_active == True,
+            )
+        )
+        rows.extend(result.all())
+
+    category_ids = {sid for _, stype, sid in rows if stype == "arxiv_category"}
+    account_ids = {sid for _, stype, sid in rows if stype == "wechat_account"}
+    category_codes: Dict[int, str] = {}
+    if category_ids:
+        result = await session.execute(
+            select(ArxivCategory.id, ArxivCategory.code).where(ArxivCategory.id.in_(category_ids))
+        )
+        category_codes = dict(result.all())
+    account_names: Dict[int, str] = {}
+    if account_ids:
+        result = await session.execute(
+            select(WechatAccount.id, WechatAccount.account_name).where(
+                WechatAccount.id.in_(account_ids)
+            )
+        )
+        account_names = dict(result.all())
+
+    filters: Dict[int, _SubscriptionFilter] = {}
+    for user_id, source_type, source_id in rows:
+        sub = filters.setdefault(user_id, _SubscriptionFilter())
+        if source_type == "arxiv_category" and source_id in category_codes:
+            sub.arxiv_codes.add(category_codes[source_id])
+        elif source_type == "rss_feed":
+            sub.rss_feeds.add(source_id)
+        elif source_type == "wechat_account" and source_id in account_names:
+            sub.wechat_names.add(account_names[source_id])
+    return filters
+
+
+async def prefetch_subscribed_articles(
+    session: Any,
+    user_ids: List[int],
+    since: Optional[datetime] = None,
+    limit: int = 20,
+) -> Dict[int, List[Dict[str, Any]]]:
+    """Match articles to many users' subscriptions with a fixed number of queries.
+
+    批量版本的 get_user_subscribed_articles：一次查询所有用户的订阅，
+    一次查询覆盖全部订阅源的候选文章（只取摘要所需的列），
+    再在内存中按 (来源类型, 匹配值) 建立倒排表，为每个用户归并出最新的 limit 篇。
 
     Args:
-        user_email: Recipient email address.
-        user_id: User ID for logging.
-        articles: Article payloads to include in the email.
-        date: Optional date string used in subject/content.
+        session: Async database session.
+        user_ids: Users to prepare digests for.
+        since: Optional crawl time lower bound.
+        limit: Max articles per user.
 
     Returns:
-        bool: ``True`` if sent successfully, otherwise ``False``.
+        Dict[int, List[Dict[str, Any]]]: Matched articles per user (users
+        without matches are omitted), newest first.
     """
-    # 功能: 向指定用户发送包含订阅文章摘要的通知邮件
-    # 参数:
-    #   user_email: 收件人邮箱地址
-    #   user_id: 用户 ID（用于日志记录）
-    #   articles: 待推送的文章字典列表
-    #   date: 可选的日期字符串，用于邮件标题和内容，默认为当天日期
-    # 返回值: bool - True 表示发送成功，False 表示发送失败或无文章可发
-    # 副作用: 发送邮件（SMTP 网络请求）
+    filters = await _load_subscription_filters(session, user_ids)
+    arxiv_codes: Set[str] = set()
+    rss_feeds: Set[int] = set()
+    wechat_names: Set[str] = set()
+    for sub in filters.values():
+        arxiv_codes |= sub.arxiv_codes
+        rss_feeds |= sub.rss_feeds
+        wechat_names |= sub.wechat_names
+
+    conditions = []
+    if arxiv_codes:
+        conditions.append(and_(
+            Article.source_type == "arxiv",
+            or_(
+                Article.arxiv_primary_category.in_(arxiv_codes),
+                Article.source_id.in_(arxiv_codes),
+            ),
+        ))
+    if rss_feeds:
+        conditions.append(and_(
+            Article.source_type == "rss",
+            Article.source_id.in_([str(feed_id) for feed_id in rss_feeds]),
+        ))
+    if wechat_names:
+        conditions.append(and_(
+            Article.source_type == "wechat",
+            Article.wechat_account_name.in_(wechat_names),
+        ))
+    if not conditions:
+        return {}
+
+    query = select(*_PAYLOAD_COLUMNS).where(
+        Article.is_archived == False,
+        or_(*conditions),
+    )
+    if since:
+        query = query.where(Article.crawl_time >= since)
+    from common.feature_config import feature_config
 
-    # 如果没有文章可发送，直接返回
-    if not articles:
-        logger.debug(f"No articles to send to user {user_id}")
-        return False
+    candidate_limit = feature_config.get_int("email.digest_candidate_limit", 20000)
+    result = await session.execute(
+        query.order_by(Article.crawl_time.desc(), Article.id.desc()).limit(candidate_limit)
+    )
+    candidates = result.all()
+
+    # 倒排表: (来源类型, 匹配值) -> 候选文章下标列表（下标越小越新）
+    postings: Dict[Tuple[str, Any], List[int]] = {}
+    for index, article in enumerate(candidates):
+        key = _subscription_key(article)
+        if key is not None:
+            postings.setdefault(key, []).append(index)
+
+    payloads: Dict[int, Dict[str, Any]] = {}
+    matched: Dict[int, List[Dict[str, Any]]] = {}
+    for user_id, sub in filters.items():
+        lists = [postings[key] for key in sub.keys() if key in postings]
+        if not lists:
+            continue
+        picked = []
+        for index in islice(heapq.merge(*lists), limit):
+            if index not in payloads:
+                payloads[index] = _article_payload(candidates[index])
+            picked.append(payloads[index])
+        matched[user_id] = picked
+    return matched
+
+
+def render_digest(
+    articles: List[Dict[str, Any]],
+    date: str,
+    url_prefix: str,
+    template_engine: str,
+) -> Tuple[str, str, str]:
+    """Render a subscription digest (subject, text body, HTML body).
 
-    # 如果未指定日期，使用当前 UTC 日期
-    if not date:
-        date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    纯函数，参数与返回值均为基础类型，可在进程池中执行。
 
-    # ---- 生成邮件内容 ----
+    Args:
+        articles: Article payloads.
+        date: Digest date string.
+        url_prefix: Site URL prefix for links.
+        template_engine: ``legacy`` or a Jinja2 engine name.
 
+    Returns:
+        Tuple[str, str, str]: ``(subject, text_body, html_body)``.
+    """
     # 邮件标题: 包含日期和文章数量，使用中文
     # Generate email content
     subject = f"ResearchPulse - {date} 订阅文章 ({len(articles)} 篇)"
 
     # ---- 生成 HTML 邮件正文 ----
-    use_jinja2 = settings.email_template_engine.lower() != "legacy"
+    use_jinja2 = template_engine.lower() != "legacy"
 
     if use_jinja2:
         # Jinja2 模板：直接从文章数据渲染美化 HTML，完整显示摘要不截断
         html_body = render_user_digest(
             articles=articles,
             date=date,
-            url_prefix=settings.url_prefix,
+            url_prefix=url_prefix,
         )
     else:
         # Legacy: 先生成 Markdown 再逐行转换为简易 HTML
@@ -307,7 +503,7 @@ async def send_user_notification_email(
             <hr>
             <p style="color: #888; font-size: 12px;">
                 此邮件由 ResearchPulse v2 自动发送。<br>
-                访问 <a href="{settings.url_prefix}">ResearchPulse</a> 管理您的订阅。
+                访问 <a href="{url_prefix}">ResearchPulse</a> 管理您的订阅。
             </p>
         </body>
         </html>
@@ -329,6 +525,60 @@ async def send_user_notification_email(
 ---
 此邮件由 ResearchPulse v2 自动发送。
 """
+    return subject, text_body, html_body
+
+
+async def send_user_notification_email(
+    user_email: str,
+    user_id: int,
+    articles: List[Dict[str, Any]],
+    session: Any = None,
+    date: Optional[str] = None,
+    delivery: Optional[EmailDelivery] = None,
+    rendered: Optional[Tuple[str, str, str]] = None,
+) -> bool:
+    """Send a subscription digest email to a user.
+
+    向用户发送订阅文章摘要邮件，包含按数据源分组的内容。
+
+    Args:
+        user_email: Recipient email address.
+        user_id: User ID for logging.
+        articles: Article payloads to include in the email.
+        session: Optional session used to load database email configs.
+        date: Optional date string used in subject/content.
+        delivery: Optional batch sender (pooled connections, preloaded configs).
+        rendered: Optional pre-rendered ``(subject, text, html)`` from ``render_digest``.
+
+    Returns:
+        bool: ``True`` if sent successfully, otherwise ``False``.
+    """
+    # 功能: 向指定用户发送包含订阅文章摘要的通知邮件
+    # 参数:
+    #   user_email: 收件人邮箱地址
+    #   user_id: 用户 ID（用于日志记录）
+    #   articles: 待推送的文章字典列表
+    #   date: 可选的日期字符串，用于邮件标题和内容，默认为当天日期
+    #   delivery: 批量发送时传入，复用邮件配置与连接
+    #   rendered: 批量发送时在执行器中预先渲染好的邮件内容
+    # 返回值: bool - True 表示发送成功，False 表示发送失败或无文章可发
+    # 副作用: 发送邮件（SMTP 网络请求）
+
+    # 如果没有文章可发送，直接返回
+    if not articles:
+        logger.debug(f"No articles to send to user {user_id}")
+        return False
+
+    # 如果未指定日期，使用当前 UTC 日期
+    if not date:
+        date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    # ---- 生成邮件内容（标题、纯文本与 HTML 正文） ----
+    if rendered is None:
+        rendered = render_digest(
+            articles, date, settings.url_prefix, settings.email_template_engine
+        )
+    subject, text_body, html_body = rendered
 
     # ---- 发送邮件 ----
     # Send email
@@ -337,7 +587,12 @@ async def send_user_notification_email(
         error = ""
 
         # 优先使用数据库配置的优先级发送（与 verification_service 保持一致）
-        if session is not None:
+        if delivery is not None:
+            if delivery.configs:
+                ok, error = await delivery.send(
+                    [user_email], subject, text_body, html_body=html_body
+                )
+        elif session is not None:
             ok, error = await send_email_with_priority(
                 to_addrs=[user_email],
                 subject=subject,
@@ -346,15 +601,17 @@ async def send_user_notification_email(
                 html_body=html_body,
             )
 
-        # 数据库配置不可用时，回退到环境变量配置的 SMTP 发送
+        # 数据库配置不可用时，回退到环境变量配置的 SMTP 发送（在线程池中执行，不阻塞事件循环）
         if not ok:
-            ok, error = send_email(
+            ok, error = await asyncio.to_thread(
+                send_email,
                 subject=subject,
                 body=text_body,
                 to_addrs=[user_email],
                 html_body=html_body,
                 backend=settings.email_backend.split(",")[0].strip() or "smtp",
                 from_addr=settings.email_from,
+                **(delivery.send_kwargs if delivery is not None else {}),
             )
 
         if ok:
@@ -449,15 +706,18 @@ ResearchPulse v2
 
 async def send_all_user_notifications(
     since: Optional[datetime] = None,
-    max_users: int = 100,
+    max_users: Optional[int] = None,
 ) -> Dict[str, Any]:
     """Send notifications to subscribed users.
 
     遍历订阅用户并发送个性化邮件，默认排除超级管理员。
+    用户、订阅与文章批量预取，摘要在共享执行器中渲染，
+    邮件通过 EmailDelivery 复用连接并发发送。
 
     Args:
         since: Optional lower bound for article crawl time.
-        max_users: Max number of users to process in one run.
+        max_users: Max number of users to process in one run
+            (default: ``email.notification_max_users``).
 
     Returns:
         Dict[str, Any]: Delivery summary including sent/failed counts.
@@ -465,7 +725,7 @@ async def send_all_user_notifications(
     # 功能: 遍历所有有活跃订阅的用户，为每个用户生成个性化的文章推送并发送邮件
     # 参数:
     #   since: 可选的时间过滤器，只推送此时间之后的文章，默认为当天零时
-    #   max_users: 单次执行最多处理的用户数量，防止在用户量大时任务执行过久
+    #   max_users: 单次执行最多处理的用户数量，防止在用户量大时任务执行过久（None 时读取配置）
     # 返回值: Dict - 包含通知发送统计:
     #   - sent: 成功发送的邮件数
     #   - failed: 发送失败的邮件数
@@ -498,6 +758,11 @@ async def send_all_user_notifications(
             hour=0, minute=0, second=0, microsecond=0
         )
 
+    if max_users is None:
+        max_users = feature_config.get_int("email.notification_max_users", 5000)
+    # 并发发送数，同时也是 SMTP 会话池与 HTTP keep-alive 连接数
+    concurrency = max(feature_config.get_int("email.delivery_concurrency", 5), 1)
+
     session_factory = get_session_factory()
     # 初始化通知发送结果统计
     results = {"sent": 0, "failed": 0, "total": 0, "skipped": 0, "errors": []}
@@ -519,107 +784,120 @@ async def send_all_user_notifications(
 
         results["total"] = len(user_ids)
 
-        # ---- 第二步: 逐用户收集待发送通知 ----
-        # 先顺序完成数据库查询（AsyncSession 不支持并发），
-        # 再并发发送所有邮件
-        pending_notifications = []  # [(user_email, user_id, articles, date_str)]
-
-        for i, user_id in enumerate(user_ids[:max_users]):
-            try:
-                # 查询用户详细信息
-                # Get user info
-                user_result = await session.execute(
-                    select(User).where(User.id == user_id)
-                )
-                user = user_result.scalar_one_or_none()
-
-                # 用户不存在或没有设置邮箱地址，跳过
-                if not user or not user.email:
-                    continue
-
-                # 跳过超级管理员: 他们会收到单独的管理员爬取报告，无需重复接收用户通知
-                # Skip superusers (they get admin notification separately)
-                if user.is_superuser:
-                    logger.debug(f"Skipping superuser {user_id} for user notifications")
-                    results["skipped"] += 1
-                    continue
-
-                # 检查用户的邮件通知偏好设置
-                # 使用 getattr 带默认值，兼容旧版本用户模型中可能不存在此字段的情况
-                # Check user's notification preference
-                # Default to True if field doesn't exist (for backwards compatibility)
-                notifications_enabled = getattr(user, 'email_notifications_enabled', True)
-                if not notifications_enabled:
-                    logger.debug(f"User {user_id} has disabled email notifications")
-                    results["skipped"] += 1
-                    continue
-
-                # 检查用户设置的推送频率（daily=每日 / weekly=每周 / none=关闭）
-                # Check digest frequency
-                frequency = getattr(user, 'email_digest_frequency', 'daily')
-                if frequency == 'none':
-                    logger.debug(f"User {user_id} has set frequency to 'none'")
-                    results["skipped"] += 1
-                    continue
-
-                # 周报用户只在周一发送: weekday() == 0 表示周一
-                # 其他日期跳过周报用户，避免重复发送
-                # For weekly digest, only send on Mondays
-                if frequency == 'weekly' and datetime.now(timezone.utc).weekday() != 0:
-                    logger.debug(f"Skipping user {user_id} - weekly digest not due today")
-                    results["skipped"] += 1
-                    continue
-
-                # ---- 第三步: 获取该用户的订阅匹配文章 ----
-                # Get user's subscribed articles
-                articles = await get_user_subscribed_articles(
-                    user_id=user_id,
-                    since=since,
-                    limit=settings.email_max_articles,
-                )
+        # ---- 第二步: 批量查询用户并按通知偏好筛选 ----
+        # 只取通知所需的列，避免加载角色等关联数据
+        users = []
+        for chunk in _chunks(user_ids[:max_users]):
+            user_result = await session.execute(
+                select(
+                    User.id,
+                    User.email,
+                    User.is_superuser,
+                    User.email_notifications_enabled,
+                    User.email_digest_frequency,
+                ).where(User.id.in_(chunk))
+            )
+            users.extend(user_result.all())
+
+        # 周报用户只在周一发送: weekday() == 0 表示周一
+        is_monday = datetime.now(timezone.utc).weekday() == 0
+        recipients: Dict[int, str] = {}
+        for user in users:
+            # 用户没有设置邮箱地址，跳过
+            if not user.email:
+                continue
 
-                # 该用户没有匹配的新文章，跳过发送
-                if not articles:
-                    logger.debug(f"No new articles for user {user_id}")
-                    continue
+            # 跳过超级管理员: 他们会收到单独的管理员爬取报告，无需重复接收用户通知
+            # Skip superusers (they get admin notification separately)
+            if user.is_superuser:
+                logger.debug(f"Skipping superuser {user.id} for user notifications")
+                results["skipped"] += 1
+                continue
 
-                pending_notifications.append(
-                    (user.email, user_id, articles, since.strftime("%Y-%m-%d"))
-                )
+            # 检查用户的邮件通知偏好设置（关闭通知 / 频率为 none / 非周一的周报用户）
+            # Check user's notification preference and digest frequency
+            frequency = user.email_digest_frequency or "daily"
+            if (
+                user.email_notifications_enabled is False
+                or frequency == "none"
+                or (frequency == "weekly" and not is_monday)
+            ):
+                logger.debug(f"Skipping user {user.id} (notifications off or digest not due)")
+                results["skipped"] += 1
+                continue
 
-            except Exception as e:
-                # 单个用户的通知发送失败不影响其他用户，记录错误后继续处理
-                logger.error(f"Error preparing notification for user {user_id}: {e}")
-                results["failed"] += 1
-                results["errors"].append(f"User {user_id}: {str(e)}")
+            recipients[user.id] = user.email
 
-        # ---- 第四步: 并发发送所有通知邮件 ----
-        # 使用信号量限制并发数，避免同时打开过多 SMTP 连接
-        semaphore = asyncio.Semaphore(5)
+        # ---- 第三步: 批量匹配订阅文章 ----
+        # 查询次数固定，不随用户数增长
+        try:
+            articles_by_user = await prefetch_subscribed_articles(
+                session,
+                list(recipients),
+                since=since,
+                limit=settings.email_max_articles,
+            )
+        except Exception as e:
+            logger.error(f"Error preparing notifications: {e}")
+            results["failed"] += len(recipients)
+            results["errors"].append(str(e))
+            articles_by_user = {}
+
+        date_str = since.strftime("%Y-%m-%d")
+        pending_notifications = [
+            (recipients[user_id], user_id, articles)
+            for user_id, articles in articles_by_user.items()
+        ]
 
-        async def _send_one(user_email: str, user_id: int, articles: list, date_str: str) -> bool:
+        # ---- 第四步: 渲染并并发发送所有通知邮件 ----
+        # 使用信号量限制并发数；SMTP 会话与 HTTP 连接在邮件间复用，
+        # 摘要渲染（CPU 密集）在共享执行器中进行，不阻塞事件循环
+        semaphore = asyncio.Semaphore(concurrency)
+        delivery = await EmailDelivery.create(
+            session,
+            pool_size=concurrency,
+            max_messages=feature_config.get_int("email.smtp_max_messages_per_connection", 100),
+        )
+
+        async def _send_one(user_email: str, user_id: int, articles: list) -> bool:
             async with semaphore:
                 try:
+                    rendered = await parse_executor.run(
+                        render_digest,
+                        articles,
+                        date_str,
+                        settings.url_prefix,
+                        settings.email_template_engine,
+                    )
                     return await send_user_notification_email(
                         user_email=user_email,
                         user_id=user_id,
                         articles=articles,
-                        session=session,
                         date=date_str,
+                        delivery=delivery,
+                        rendered=rendered,
                     )
                 except Exception as e:
                     logger.error(f"Error sending notification to user {user_id}: {e}")
                     return False
 
-        if pending_notifications:
-            send_results = await asyncio.gather(
-                *[_send_one(email, uid, arts, d) for email, uid, arts, d in pending_notifications]
-            )
-            for ok in send_results:
-                if ok:
-                    results["sent"] += 1
-                else:
-                    results["failed"] += 1
+        try:
+            if pending_notifications:
+                send_results = await asyncio.gather(
+                    *[_send_one(email, uid, arts) for email, uid, arts in pending_notifications]
+                )
+                for ok in send_results:
+                    if ok:
+                        results["sent"] += 1
+                    else:
+                        results["failed"] += 1
+        finally:
+            delivery.close()
+
+        logger.info(
+            f"Notification delivery used {delivery.smtp_pool.opened} SMTP session(s) "
+            f"for {len(pending_notifications)} digest(s)"
+        )
 
     logger.info(f"Notifications sent: {results['sent']}/{results['total']}")
     return results
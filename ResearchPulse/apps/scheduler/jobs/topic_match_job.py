@@ -22,21 +22,27 @@ from common.feature_config import feature_config
 
 logger = logging.getLogger(__name__)
 
+# 每批匹配的文章数（每批一次批量写入关联记录）
+MATCH_BATCH_SIZE = 200
+
 
 async def run_topic_match_job(
     days: int | None = None,
     limit: int | None = None,
+    article_ids: list[int] | None = None,
 ) -> dict:
     """Match articles to existing topics.
 
     批量将文章匹配到已有话题，建立文章-话题关联关系。
 
     策略：查找最近 N 天内爬取且尚未关联任何话题的文章，
-    调用 match_article_to_topics 进行匹配，创建 ArticleTopic 关联记录。
+    活跃话题只加载并编译一次，分批调用 match_articles_to_topics 进行匹配，
+    以批量"插入或忽略"方式创建 ArticleTopic 关联记录。
 
     Args:
         days: 回溯天数，从配置读取，默认 7 天
         limit: 单次处理文章数量上限，从配置读取，默认 500
+        article_ids: 仅匹配这些文章（流水线任务范围），None 表示按时间范围扫描
 
     Returns:
         dict: 匹配结果统计:
@@ -79,16 +85,17 @@ async def run_topic_match_job(
         ).distinct()
 
         # 主查询：未关联话题的文章
-        result = await session.execute(
-            select(Article)
-            .where(
-                and_(
-                    Article.crawl_time >= cutoff_time,
-                    Article.id.notin_(subquery),
-                )
+        query = select(Article).where(
+            and_(
+                Article.crawl_time >= cutoff_time,
+                Article.id.notin_(subquery),
+                Article.duplicate_of.is_(None),
             )
-            .order_by(Article.crawl_time.desc())
-            .limit(limit)
+        )
+        if article_ids is not None:
+            query = query.where(Article.id.in_(article_ids))
+        result = await session.execute(
+            query.order_by(Article.crawl_time.desc()).limit(limit)
         )
         articles = list(result.scalars().all())
 
@@ -103,23 +110,29 @@ async def run_topic_match_job(
 
         logger.info(f"Found {len(articles)} articles to process")
 
-        # 导入匹配函数
-        from apps.topic.radar import match_article_to_topics
+        # 话题只加载、编译一次，整个任务共享同一个匹配器
+        from apps.topic.radar import load_topic_matcher, match_articles_to_topics
+
+        matcher = await load_topic_matcher(session)
 
-        # 逐篇匹配
-        for article in articles:
-            total_processed += 1
+        # 分批匹配，每批关联记录一次性批量写入
+        for start in range(0, len(articles), MATCH_BATCH_SIZE):
+            batch = articles[start:start + MATCH_BATCH_SIZE]
+            total_processed += len(batch)
             try:
-                matches = await match_article_to_topics(article.id, session)
+                results = await match_articles_to_topics(batch, session, matcher)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to match articles {batch[0].id}..{batch[-1].id}: {e}"
+                )
+                continue
+            for article_id, matches in results.items():
                 if matches:
                     matched_count += 1
                     associations_created += len(matches)
                     logger.debug(
-                        f"Article {article.id} matched to {len(matches)} topics"
+                        f"Article {article_id} matched to {len(matches)} topics"
                     )
-            except Exception as e:
-                logger.warning(f"Failed to match article {article.id}: {e}")
-                continue
 
         # 提交所有关联
         await session.commit()
@@ -424,3 +424,24 @@ async def stop_scheduler() -> None:
         # 优雅关闭调度器，等待当前正在执行的任务完成后停止
         _scheduler.shutdown()
         logger.info("Scheduler stopped")
+
+
+def run_job_soon(job_id: str) -> bool:
+    """Move a registered job's next run to now.
+
+    将已注册任务的下次执行时间提前到当前时刻，由调度器在自己的事件循环中执行，
+    仍受 max_instances 约束；调度器未运行或任务不存在时不做任何事。
+
+    Args:
+        job_id: Scheduler job identifier.
+
+    Returns:
+        bool: True if the job was rescheduled.
+    """
+    if _scheduler is None or not _scheduler.running:
+        return False
+    job = _scheduler.get_job(job_id)
+    if job is None:
+        return False
+    job.modify(next_run_time=datetime.now(_scheduler.timezone))
+    return True
@@ -0,0 +1,4 @@
+"""Full-text article search module for ResearchPulse.
+
+文章全文检索模块包入口。
+"""
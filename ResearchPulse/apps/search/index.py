@@ -0,0 +1,414 @@
+# =============================================================================
+# 模块: apps/search/index.py
+# 功能: 文章全文检索：倒排索引 + BM25 排序
+# 架构角色: 文章列表关键词搜索（/api/articles?keyword=）的检索后端。
+#           索引为 data_dir 下的 SQLite FTS5 旁路库，与业务数据库（MySQL）解耦；
+#           爬虫保存文章（BaseCrawler.save）与 AI 处理写回结果
+#           （AIProcessorService._save_result）时增量更新，检索返回按 BM25 排序的文章 ID，
+#           再由业务数据库按其他筛选条件过滤。
+# 设计理念:
+#   1. 分词在 Python 侧完成：中日韩文字按相邻二元组（bigram）切分，其他文字按词切分并转小写，
+#      FTS5 只负责按空格切分存储，检索词使用同一分词器，中英文混排统一处理
+#   2. 索引字段：标题（原标题 + 译文标题，权重较高）与正文（摘要 + AI 摘要 + 标签）
+#   3. 检索延迟取决于命中词的倒排列表长度而非文章总数；返回全部命中，
+#      文章列表按批交给业务数据库过滤，筛选、排序与总数不受命中数限制
+#   4. 首次启用时后台全量构建，构建完成前关键词搜索退回 LIKE 模糊匹配，结果不缺失
+#   5. 索引仅为加速结构，读写失败只记录日志，不影响文章保存与 AI 处理
+#   6. 标准库 sqlite3（WAL 模式），每个线程一个连接；Web 服务与爬虫脚本等同机进程共享同一索引文件
+# =============================================================================
+
+"""Full-text article search backed by an SQLite FTS5 sidecar index.
+
+Usage:
+    await index_articles(session, saved_ids)      # after saving articles
+    ids = await search_article_ids("大模型 agent")  # BM25-ranked, None if unavailable
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.crawler.models import Article
+from common.feature_config import feature_config
+
+logger = logging.getLogger(__name__)
+
+# 索引文件名（位于 settings.data_dir 下）
+SEARCH_INDEX_FILENAME = "search_index.sqlite3"
+
+# BM25 字段权重：标题命中比正文命中更相关
+_TITLE_WEIGHT = 3.0
+_BODY_WEIGHT = 1.0
+
+# 增量索引与全量构建时每批处理的文章数
+_INDEX_CHUNK = 500
+
+# 中日韩文字（汉字、假名、谚文）连续片段
+_CJK = r"\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+_TOKEN_RE = re.compile(rf"[{_CJK}]+|[^\W_{_CJK}]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+
+
+def _split(text: str) -> List[Tuple[str, bool]]:
+    """Split text into ``(run, is_cjk)`` runs of word characters."""
+    return [(m.group(), bool(_CJK_RE.match(m.group()))) for m in _TOKEN_RE.finditer(text.lower())]
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Tokenize text for indexing.
+
+    中日韩文字切分为相邻二元组（单字保留原字），其他文字按词切分并转小写。
+
+    Args:
+        text: Input text.
+
+    Returns:
+        List[str]: Tokens.
+    """
+    tokens: List[str] = []
+    for run, cjk in _split(text or ""):
+        if cjk and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def build_match_query(keyword: str) -> Optional[str]:
+    """Build an FTS5 MATCH expression (all terms required) for a keyword.
+
+    单个汉字与拉丁词使用前缀匹配，贴近原 LIKE 子串匹配的行为。
+
+    Returns:
+        Optional[str]: MATCH expression, or None if the keyword has no terms.
+    """
+    terms: List[str] = []
+    for run, cjk in _split(keyword):
+        if cjk and len(run) > 1:
+            terms.extend(f'"{run[i:i + 2]}"' for i in range(len(run) - 1))
+        else:
+            terms.append(f'"{run}"*')
+    return " ".join(terms) if terms else None
+
+
+def _flatten_tags(tags: Any) -> str:
+    """Join tag values (list or dict of strings) into text."""
+    if not tags:
+        return ""
+    if isinstance(tags, dict):
+        tags = list(tags.values())
+    if isinstance(tags, (list, tuple)):
+        return " ".join(str(t) for t in tags if isinstance(t, (str, int, float)))
+    return str(tags)
+
+
+def build_document(row: Any) -> Tuple[int, str, str]:
+    """Build ``(id, title_tokens, body_tokens)`` from an article row."""
+    title = " ".join(filter(None, [row.title, row.translated_title]))
+    body = " ".join(filter(None, [row.summary, row.ai_summary, _flatten_tags(row.tags)]))
+    return row.id, " ".join(tokenize(title)), " ".join(tokenize(body))
+
+
+class ArticleSearchIndex:
+    """SQLite FTS5 inverted index over article text.
+
+    文章全文倒排索引（SQLite FTS5），rowid 即文章 ID。
+    每个线程使用各自的连接：WAL 模式下读不阻塞读写，写入之间由 SQLite 文件锁排队
+    （busy timeout），进程内不再有全局锁。
+
+    Args:
+        path: SQLite file path.
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._local = threading.local()
+        # 打开失败后不再重试（None 表示尚未尝试）
+        self._available: Optional[bool] = None
+        # 全部线程的连接，供 close() 关闭；仅在打开/关闭连接时加锁
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Return this thread's connection, opening it lazily (None when unavailable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        if self._available is False:
+            return None
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._path), timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # 文本已由 tokenize 预先切分为空格分隔的词，unicode61 只按空格拆分
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS article_fts"
+                " USING fts5(title, body, tokenize='unicode61 remove_diacritics 2')"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Search index unavailable at {self._path}: {e}")
+            self._available = False
+            return None
+        self._available = True
+        with self._conns_lock:
+            self._conns.append(conn)
+            self._local.conn = conn
+        return conn
+
+    @property
+    def ready(self) -> bool:
+        """Whether a full build has completed (searches may use the index)."""
+        conn = self._connect()
+        if conn is None:
+            return False
+        try:
+            row = conn.execute("SELECT value FROM search_meta WHERE key = 'ready'").fetchone()
+        except sqlite3.Error:
+            return False
+        return bool(row and row[0] == "1")
+
+    def set_ready(self, ready: bool) -> None:
+        """Mark whether the index covers all articles."""
+        conn = self._connect()
+        if conn is None:
+            return
+        conn.execute(
+            "INSERT OR REPLACE INTO search_meta (key, value) VALUES ('ready', ?)",
+            ("1" if ready else "0",),
+        )
+        conn.commit()
+
+    def upsert(self, documents: Sequence[Tuple[int, str, str]]) -> int:
+        """Insert or replace documents.
+
+        Args:
+            documents: ``(article_id, title_tokens, body_tokens)`` tuples.
+
+        Returns:
+            int: Number of documents written.
+        """
+        if not documents:
+            return 0
+        conn = self._connect()
+        if conn is None:
+            return 0
+        try:
+            conn.executemany(
+                "DELETE FROM article_fts WHERE rowid = ?", [(doc[0],) for doc in documents]
+            )
+            conn.executemany(
+                "INSERT INTO article_fts (rowid, title, body) VALUES (?, ?, ?)", documents
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.warning(f"Search index write failed: {e}")
+            return 0
+        return len(documents)
+
+    def delete(self, article_ids: Iterable[int]) -> None:
+        """Remove documents by article ID."""
+        conn = self._connect()
+        if conn is None:
+            return
+        conn.executemany("DELETE FROM article_fts WHERE rowid = ?", [(i,) for i in article_ids])
+        conn.commit()
+
+    def search(self, keyword: str, limit: Optional[int] = None) -> Optional[List[int]]:
+        """Return article IDs matching all terms, best BM25 score first.
+
+        Args:
+            keyword: User keyword.
+            limit: Max hits; None returns every match.
+
+        Returns:
+            Optional[List[int]]: Article IDs, or None if the index cannot answer
+            (unavailable, or the keyword has no searchable terms).
+        """
+        match = build_match_query(keyword)
+        if match is None:
+            return None
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            rows = conn.execute(
+                "SELECT rowid FROM article_fts WHERE article_fts MATCH ?"
+                " ORDER BY bm25(article_fts, ?, ?) LIMIT ?",
+                (match, _TITLE_WEIGHT, _BODY_WEIGHT, -1 if limit is None else limit),
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Search index query failed for {keyword!r}: {e}")
+            return None
+        return [row[0] for row in rows]
+
+    def clear(self) -> None:
+        """Drop all documents and the ready flag."""
+        conn = self._connect()
+        if conn is None:
+            return
+        conn.execute("DELETE FROM article_fts")
+        conn.execute("DELETE FROM search_meta WHERE key = 'ready'")
+        conn.commit()
+
+    def close(self) -> None:
+        """Close the SQLite connections of all threads."""
+        with self._conns_lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns = []
+            # 丢弃各线程的连接引用，下次使用时重新打开
+            self._local = threading.local()
+            self._available = None
+
+
+# 进程内共享的索引实例，首次使用时按 settings.data_dir 创建
+_index: Optional[ArticleSearchIndex] = None
+
+
+def get_search_index() -> ArticleSearchIndex:
+    """Return the shared search index."""
+    global _index
+    if _index is None:
+        from settings import settings
+
+        _index = ArticleSearchIndex(Path(settings.data_dir) / SEARCH_INDEX_FILENAME)
+    return _index
+
+
+def search_enabled() -> bool:
+    """Whether keyword search should use the full-text index."""
+    return feature_config.get_bool("search.fts_enabled", True)
+
+
+_DOCUMENT_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.translated_title,
+    Article.summary,
+    Article.ai_summary,
+    Article.tags,
+)
+
+
+async def index_articles(session: AsyncSession, article_ids: Sequence[int]) -> int:
+    """Index (or re-index) articles from the current transaction.
+
+    读取文章当前的标题、摘要、AI 摘要与标签写入索引；失败只记录日志。
+
+    Args:
+        session: Session that has just written the articles.
+        article_ids: Articles to index.
+
+    Returns:
+        int: Number of documents written.
+    """
+    if not article_ids or not search_enabled():
+        return 0
+    written = 0
+    try:
+        index = get_search_index()
+        ids = list(article_ids)
+        for start in range(0, len(ids), _INDEX_CHUNK):
+            rows = (await session.execute(
+                select(*_DOCUMENT_COLUMNS).where(Article.id.in_(ids[start:start + _INDEX_CHUNK]))
+            )).all()
+            documents = [build_document(row) for row in rows]
+            written += await asyncio.to_thread(index.upsert, documents)
+    except Exception as e:
+        logger.warning(f"Failed to index {len(article_ids)} articles: {e}")
+    return written
+
+
+async def unindex_articles(article_ids: Sequence[int]) -> None:
+    """Remove deleted articles from the index; failures are only logged."""
+    if not article_ids or not search_enabled():
+        return
+    try:
+        await asyncio.to_thread(get_search_index().delete, list(article_ids))
+    except Exception as e:
+        logger.warning(f"Failed to remove {len(article_ids)} articles from the index: {e}")
+
+
+async def search_article_ids(keyword: str, limit: Optional[int] = None) -> Optional[List[int]]:
+    """Search articles by keyword.
+
+    Args:
+        keyword: User keyword (any language).
+        limit: Max hits; None returns every match.
+
+    Returns:
+        Optional[List[int]]: BM25-ranked article IDs, or None when the index is
+        disabled, not yet built or unavailable (callers fall back to LIKE).
+    """
+    if not search_enabled():
+        return None
+    index = get_search_index()
+    if not await asyncio.to_thread(lambda: index.ready):
+        return None
+    return await asyncio.to_thread(index.search, keyword, limit)
+
+
+async def rebuild_search_index(session_factory=None) -> int:
+    """Rebuild the whole index from the articles table.
+
+    按文章 ID 分批读取全表重建索引，完成后标记索引可用。
+
+    Args:
+        session_factory: Async session factory; defaults to the app's.
+
+    Returns:
+        int: Number of indexed articles.
+    """
+    if session_factory is None:
+        from core.database import get_session_factory
+
+        session_factory = get_session_factory()
+    index = get_search_index()
+    await asyncio.to_thread(index.clear)
+
+    total = 0
+    last_id = 0
+    async with session_factory() as session:
+        while True:
+            rows = (await session.execute(
+                select(*_DOCUMENT_COLUMNS)
+                .where(Article.id > last_id)
+                .order_by(Article.id)
+                .limit(_INDEX_CHUNK)
+            )).all()
+            if not rows:
+                break
+            total += await asyncio.to_thread(index.upsert, [build_document(row) for row in rows])
+            last_id = rows[-1].id
+
+    await asyncio.to_thread(index.set_ready, True)
+    logger.info(f"Search index rebuilt: {total} articles")
+    return total
+
+
+async def ensure_search_index() -> None:
+    """Build the index in the background on first use (no-op once built)."""
+    if not search_enabled():
+        return
+    index = get_search_index()
+    if await asyncio.to_thread(lambda: index.ready):
+        return
+    try:
+        await rebuild_search_index()
+    except Exception as e:
+        logger.warning(f"Search index build failed, keyword search keeps using LIKE: {e}")
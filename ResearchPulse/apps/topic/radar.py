@@ -2,24 +2,197 @@
 # 模块: topic/radar.py
 # 功能: 话题雷达 - 话题追踪与分析引擎
 # 架构角色: 提供两个核心功能:
-#   1. match_article_to_topics - 将新文章匹配到已有话题, 建立关联关系
+#   1. match_article_to_topics / match_articles_to_topics - 将新文章匹配到已有话题, 建立关联关系
 #   2. detect_trend - 检测话题在特定时间段内的热度变化趋势
 # 设计说明:
 #   - 文章匹配采用基于关键词的加权评分算法, 关键词列表中靠前的词权重更高
+#   - 批量匹配时所有话题关键词编译为一个多模式正则 (TopicMatcher),
+#     每篇文章只扫描一遍文本, 关联记录以 "插入或忽略" 语义批量写入
 #   - 趋势检测通过对比当前周期与上一周期的文章数量来判断方向
 # ==============================================================================
 """Topic radar for tracking and analyzing topics over time."""
 from __future__ import annotations
 import logging
+import re
 from datetime import datetime, timedelta, timezone
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from apps.crawler.models.article import Article
+from core.bulk import build_insert_ignore, chunked, get_dialect_name
 from .models import ArticleTopic, Topic, TopicSnapshot
 
 # 初始化模块级日志记录器
 logger = logging.getLogger(__name__)
 
+# --------------------------------------------------------------------------
+# _trie_pattern - 将关键词集合编译为前缀树形式的正则表达式
+# 参数:
+#   - words: 小写关键词集合 (非空)
+# 返回: 正则表达式字符串, 在某一位置上匹配以该位置开头的最长关键词
+# 设计说明:
+#   - 朴素的 "kw1|kw2|..." 交替在每个位置逐个尝试所有关键词, 成本与关键词数成正比;
+#     前缀树形式 (如 "gpt(?:\-4)?|llama") 每层只按首字符分派一个分支,
+#     扫描成本基本与关键词数量无关
+#   - 可选后缀使用贪婪的 "(?:...)?", 因此总是先尝试更长的关键词
+# --------------------------------------------------------------------------
+def _trie_pattern(words: set[str]) -> str:
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # 结束标记
+
+    def render(node: dict) -> str:
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # 当前节点本身是关键词结尾时, 后续部分可选
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+# --------------------------------------------------------------------------
+# TopicMatcher - 批量话题匹配器
+# 职责: 一次性编译所有活跃话题的关键词, 对每篇文章只扫描一遍文本
+# 匹配语义: 与逐个执行 "kw.lower() in text" 完全一致 (大小写不敏感的子串匹配)
+# 实现说明:
+#   1. 所有话题的关键词去重后编译为一个前缀树正则, 包在零宽前瞻 (?=(...)) 中,
+#      finditer 在文本的每个位置报告以该位置开头的最长关键词
+#   2. 若关键词 S 出现在文本中, 则在 S 的起始位置报告的最长关键词 L 必以 S 为前缀;
+#      因此预先为每个关键词记录 "是其前缀的所有关键词" (前缀闭包),
+#      即可由扫描结果还原出全部出现过的关键词, 包括相互重叠、互为子串的关键词
+#   3. 每个关键词反查其所属的 (话题, 关键词序号), 只对命中的话题计算相关度
+# --------------------------------------------------------------------------
+class TopicMatcher:
+    """Compiled multi-keyword matcher over a fixed set of topics."""
+
+    def __init__(self, topics: list[Topic]):
+        self.topics = topics
+        # 小写关键词 -> [(话题下标, 关键词序号)]
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        for t_idx, topic in enumerate(topics):
+            # 确保 keywords 是列表格式
+            keywords = topic.keywords if isinstance(topic.keywords, list) else []
+            for k_idx, kw in enumerate(keywords):
+                self._postings.setdefault(str(kw).lower(), []).append((t_idx, k_idx))
+        # 空关键词与原实现一致: 视为总是命中
+        self._always = self._postings.get("", [])
+        words = {w for w in self._postings if w}
+        # 前缀闭包: 关键词 -> 所有是其前缀的关键词 (包括自身)
+        self._prefixes = {
+            w: [w[:i] for i in range(1, len(w) + 1) if w[:i] in words] for w in words
+        }
+        self._pattern = re.compile(f"(?=({_trie_pattern(words)}))") if words else None
+
+    def __len__(self) -> int:
+        return len(self.topics)
+
+    def found_keywords(self, text: str) -> set[str]:
+        """Return every lowercase keyword occurring in ``text`` (already lowercased)."""
+        if self._pattern is None:
+            return set()
+        longest = {m.group(1) for m in self._pattern.finditer(text)}
+        found: set[str] = set()
+        for word in longest:
+            found.update(self._prefixes[word])
+        return found
+
+    def match(self, text: str) -> list[dict]:
+        """Score all topics against lowercased ``text``.
+
+        评分规则与逐篇匹配一致:
+          - 权重 = max(0.3, 1.0 - 关键词索引 * 0.05)
+          - 相关度 = 总分 / 关键词总数, 上限 1.0; 命中 3 个及以上关键词时 * 1.2
+          - 相关度 > 0.3 才算有效匹配
+        """
+        hits: dict[int, list[int]] = {}
+        for t_idx, k_idx in self._always:
+            hits.setdefault(t_idx, []).append(k_idx)
+        for word in self.found_keywords(text):
+            for t_idx, k_idx in self._postings[word]:
+                hits.setdefault(t_idx, []).append(k_idx)
+
+        matches = []
+        # 按话题加载顺序输出, 与逐个遍历话题的结果顺序一致
+        for t_idx in sorted(hits):
+            topic = self.topics[t_idx]
+            keywords = topic.keywords
+            # 命中关键词按列表顺序排列
+            indices = sorted(hits[t_idx])
+            score = sum(max(0.3, 1.0 - i * 0.05) for i in indices)
+            relevance = min(1.0, score / len(keywords))
+            if len(indices) >= 3:
+                relevance = min(1.0, relevance * 1.2)
+            if relevance > 0.3:
+                matches.append({
+                    "topic_id": topic.id,
+                    "topic_name": topic.name,
+                    "relevance": round(relevance, 3),
+                    "matched_keywords": [keywords[i] for i in indices],
+                })
+        return matches
+
+
+def article_match_text(article: Article) -> str:
+    """Build the lowercased text used for topic matching."""
+    # 将文章标题、摘要和正文拼接为待匹配文本, 转小写以实现大小写不敏感匹配
+    return f"{article.title} {article.ai_summary or article.summary or ''} {article.content or ''}".lower()
+
+
+async def load_topic_matcher(db: AsyncSession) -> TopicMatcher:
+    """Load all active topics and compile them into a matcher."""
+    topics_result = await db.execute(select(Topic).where(Topic.is_active.is_(True)).order_by(Topic.id))
+    return TopicMatcher(list(topics_result.scalars().all()))
+
+
+# --------------------------------------------------------------------------
+# match_articles_to_topics - 批量将文章匹配到活跃话题
+# 参数:
+#   - articles: 待匹配的文章对象列表
+#   - db: 异步数据库会话
+#   - matcher: 预编译的匹配器, 为空时从数据库加载活跃话题
+# 返回: {文章 ID: 匹配结果列表}, 每条包含 topic_id, topic_name, relevance, matched_keywords
+# 副作用: 以 "插入或忽略" 语义批量写入 ArticleTopic 关联记录,
+#         已存在的文章-话题对保持不变 (依赖 uq_article_topic 唯一约束),
+#         不再对每个匹配对单独 SELECT
+# --------------------------------------------------------------------------
+async def match_articles_to_topics(
+    articles: list[Article],
+    db: AsyncSession,
+    matcher: TopicMatcher | None = None,
+) -> dict[int, list[dict]]:
+    """Match a batch of articles to topics and bulk-insert associations."""
+    if matcher is None:
+        matcher = await load_topic_matcher(db)
+    results: dict[int, list[dict]] = {}
+    rows = []
+    now = datetime.now(timezone.utc)
+    for article in articles:
+        matches = matcher.match(article_match_text(article))
+        results[article.id] = matches
+        for m in matches:
+            rows.append({
+                "article_id": article.id,
+                "topic_id": m["topic_id"],
+                "match_score": m["relevance"],
+                "matched_keywords": m["matched_keywords"],
+                "created_at": now,
+                "updated_at": now,
+            })
+
+    if rows:
+        dialect_name = get_dialect_name(db)
+        for chunk in chunked(rows):
+            await db.execute(build_insert_ignore(
+                dialect_name, ArticleTopic.__table__, list(chunk),
+                conflict_columns=("article_id", "topic_id"),
+            ))
+    return results
+
+
 # --------------------------------------------------------------------------
 # match_article_to_topics - 将指定文章匹配到所有活跃话题
 # 参数:
@@ -30,62 +203,24 @@ logger = logging.getLogger(__name__)
 #
 # 匹配算法详解:
 #   1. 获取文章的完整文本 (标题 + AI摘要/原始摘要 + 正文)
-#   2. 遍历所有活跃话题, 检查其关键词是否出现在文章文本中
+#   2. 检查所有活跃话题的关键词是否出现在文章文本中 (见 TopicMatcher)
 #   3. 每个命中的关键词贡献一个权重分数:
 #      - 权重 = max(0.3, 1.0 - 关键词索引 * 0.05)
 #      - 即列表中越靠前的关键词权重越高 (第一个权重 1.0, 逐步递减, 最低 0.3)
 #   4. 相关度 = 总分 / 关键词总数, 上限 1.0
 #   5. 如果命中 3 个及以上关键词, 相关度额外提升 20% (奖励多维度匹配)
 #   6. 相关度阈值 > 0.3 才算有效匹配
+# 批量场景 (定时任务) 请使用 match_articles_to_topics, 话题只加载、编译一次
 # --------------------------------------------------------------------------
 async def match_article_to_topics(article_id: int, db: AsyncSession) -> list[dict]:
     """Match an article to relevant topics."""
-    from apps.crawler.models.article import Article
     # 查询目标文章
     art_result = await db.execute(select(Article).where(Article.id == article_id))
     article = art_result.scalar_one_or_none()
     if not article:
         return []
-    # 查询所有活跃话题
-    topics_result = await db.execute(select(Topic).where(Topic.is_active.is_(True)))
-    topics = list(topics_result.scalars().all())
-    # 将文章标题、摘要和正文拼接为待匹配文本, 转小写以实现大小写不敏感匹配
-    text = f"{article.title} {article.ai_summary or article.summary or ''} {article.content or ''}".lower()
-    matches = []
-    for topic in topics:
-        # 确保 keywords 是列表格式
-        keywords = topic.keywords if isinstance(topic.keywords, list) else []
-        if not keywords:
-            continue
-        matched = []  # 命中的关键词列表
-        score = 0.0  # 累计匹配分数
-        for i, kw in enumerate(keywords):
-            if kw.lower() in text:
-                # 关键词权重递减: 第一个关键词权重最高 (1.0), 之后每个递减 0.05, 最低 0.3
-                # 这样设计是因为关键词列表通常按重要性排序, 靠前的更能代表话题核心
-                weight = max(0.3, 1.0 - i * 0.05)
-                score += weight
-                matched.append(kw)
-        if not matched:
-            continue
-        # 计算相关度: 累计分数 / 关键词总数, 归一化到 [0, 1]
-        relevance = min(1.0, score / len(keywords))
-        # 如果命中 3 个及以上关键词, 给予 1.2 倍加成奖励 (多维度匹配更可靠)
-        if len(matched) >= 3:
-            relevance = min(1.0, relevance * 1.2)
-        # 相关度阈值判断: 仅保留相关度 > 0.3 的匹配
-        if relevance > 0.3:
-            # Check if association exists
-            # 检查该文章-话题的关联关系是否已存在, 避免重复创建
-            existing = await db.execute(
-                select(ArticleTopic).where(and_(ArticleTopic.article_id == article_id, ArticleTopic.topic_id == topic.id))
-            )
-            if not existing.scalar_one_or_none():
-                # 创建新的文章-话题关联记录
-                assoc = ArticleTopic(article_id=article_id, topic_id=topic.id, match_score=round(relevance, 3), matched_keywords=matched)
-                db.add(assoc)
-            matches.append({"topic_id": topic.id, "topic_name": topic.name, "relevance": round(relevance, 3), "matched_keywords": matched})
-    return matches
+    results = await match_articles_to_topics([article], db)
+    return results[article.id]
 
 # --------------------------------------------------------------------------
 # detect_trend - 检测话题的热度变化趋势
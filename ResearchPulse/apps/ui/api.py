@@ -41,6 +41,8 @@
 
 from __future__ import annotations
 
+import base64
+import json
 import logging
 from datetime import datetime, timezone
 from typing import Annotated, Any, Dict, List, Optional
@@ -52,8 +54,12 @@ from pydantic import BaseModel, HttpUrl
 from sqlalchemy import desc, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from common.feature_config import feature_config
+from core.bulk import chunked
+from core.cache import MemoryCache
 from core.database import get_session
 from core.dependencies import CurrentUser, OptionalUserId, get_current_user
+from core.response_cache import cached_response, invalidate_on_write
 from apps.crawler.models import (
     Article,
     ArxivCategory,
@@ -67,6 +73,7 @@ from apps.crawler.models import (
     WeiboHotSearch,
 )
 from apps.embedding.models import ArticleEmbedding
+from apps.search.index import search_article_ids
 from apps.event.models import EventCluster, EventMember
 from apps.topic.models import ArticleTopic, Topic
 
@@ -79,6 +86,29 @@ router = APIRouter(tags=["ui"])
 # 使用模块级变量延迟初始化，避免模块导入时就需要确定模板目录
 _templates: Jinja2Templates | None = None
 
+# 接口响应缓存的失效标签：写入这些表的事务提交后，依赖对应标签的缓存条目失效
+invalidate_on_write("articles", Article.__tablename__)
+invalidate_on_write(
+    "sources",
+    ArxivCategory.__tablename__,
+    RssFeed.__tablename__,
+    WechatAccount.__tablename__,
+    WeiboHotSearch.__tablename__,
+    HackerNewsSource.__tablename__,
+    RedditSource.__tablename__,
+    TwitterSource.__tablename__,
+)
+
+
+def _response_ttl() -> int:
+    """TTL (seconds) of cached source/category responses."""
+    return feature_config.get_int("cache.api_response_ttl", 300)
+
+
+def _articles_ttl() -> int:
+    """TTL (seconds) of cached anonymous article list responses."""
+    return feature_config.get_int("cache.api_articles_ttl", 60)
+
 
 def init_templates(template_dir: str) -> None:
     """Initialize Jinja2 templates.
@@ -276,15 +306,20 @@ class ArticleListResponse(BaseModel):
 
     Attributes:
         articles: List of article dictionaries.
-        total: Total matched count.
+        total: Total matched count (None when not requested).
+        total_estimated: Whether ``total`` may be a cached approximation or an
+            estimate from the search candidate window.
         page: Current page number.
         page_size: Page size.
+        next_cursor: Cursor of the next page (keyset pagination), None on the last page.
     """
 
-    articles: List[Dict[str, Any]]  # 文章字典列表
-    total: int                      # 符合筛选条件的文章总数
-    page: int                       # 当前页码
-    page_size: int                  # 每页条数
+    articles: List[Dict[str, Any]]      # 文章字典列表
+    total: Optional[int] = None         # 符合筛选条件的文章总数（count=none 时为空）
+    total_estimated: bool = False       # total 是否为近似值（缓存或搜索候选窗口外推）
+    page: int                           # 当前页码
+    page_size: int                      # 每页条数
+    next_cursor: Optional[str] = None   # 下一页游标（游标分页），最后一页为空
 
 
 # 文章详情响应模型：包含单篇文章数据和可选的用户阅读状态
@@ -303,6 +338,13 @@ class ArticleDetailResponse(BaseModel):
 
 
 @router.get("/api/articles", response_model=ArticleListResponse)
+@cached_response(
+    "articles",
+    tags=("articles", "sources"),
+    ttl=_articles_ttl,
+    # 登录用户的列表包含已读/收藏状态，仅缓存匿名请求
+    cache_if=lambda kwargs: kwargs.get("user_id") is None,
+)
 async def list_articles(
     source_type: Optional[str] = None,    # 筛选条件：数据源类型（如 "arxiv"、"rss"、"wechat"）
     category: Optional[str] = None,       # 筛选条件：分类（支持分类代码和名称的模糊匹配）
@@ -311,9 +353,11 @@ async def list_articles(
     starred: Optional[bool] = None,       # 筛选条件：仅显示收藏文章（需要登录）
     unread: Optional[bool] = None,        # 筛选条件：仅显示未读文章（需要登录）
     archived: Optional[bool] = None,      # 筛选条件：是否显示已归档文章
-    sort: str = Query("publish_time", pattern="^(publish_time|crawl_time|title)$"),  # 排序字段
+    sort: str = Query("publish_time", pattern="^(publish_time|crawl_time|title|relevance)$"),  # 排序字段
     page: int = Query(1, ge=1),           # 当前页码，最小为 1
     page_size: int = Query(20, ge=1, le=100),  # 每页条数，1-100
+    cursor: Optional[str] = None,         # 游标分页：上一页响应中的 next_cursor，传入后忽略 page
+    count: str = Query("estimate", pattern="^(exact|estimate|none)$"),  # 总数模式
     user_id: OptionalUserId = None,       # 可选的用户 ID，用于个性化筛选
     session: AsyncSession = Depends(get_session),
 ) -> ArticleListResponse:
@@ -321,6 +365,14 @@ async def list_articles(
 
     获取文章列表，支持多条件筛选与分页。
 
+    两种分页方式：``page`` 为 OFFSET 分页；``cursor`` 为游标分页，按
+    ``(排序时间, id)`` 定位下一页，深翻页与首页代价相同（不支持 ``sort=title`` / ``relevance``）。
+    关键词搜索使用全文检索索引（BM25），只在相关度最高的 ``search.max_hits`` 条候选中
+    筛选排序，``sort=relevance`` 按相关度排序；
+    索引未就绪时退回 LIKE 模糊匹配。
+    总数默认取按筛选条件缓存的近似值（``count=estimate``），
+    ``count=exact`` 强制精确计数，``count=none`` 跳过计数。
+
     Args:
         source_type: Source type filter.
         category: Category filter.
@@ -330,14 +382,21 @@ async def list_articles(
         unread: Filter unread articles (login required).
         archived: Whether to include archived articles.
         sort: Sort field.
-        page: Page number.
+        page: Page number (offset pagination).
         page_size: Items per page.
+        cursor: Keyset cursor from a previous ``next_cursor``.
+        count: Total mode: exact, estimate or none.
         user_id: Optional user ID for personalization.
         session: Async database session.
 
     Returns:
         ArticleListResponse: Paginated article list.
+
+    Raises:
+        HTTPException: If the cursor is invalid or does not match ``sort``.
     """
+    position = _decode_article_cursor(cursor, sort) if cursor else None
+
     query = select(Article)
 
     # ---- 通用筛选条件 ----
@@ -371,14 +430,25 @@ async def list_articles(
                 )
             )
 
-    # 按关键词搜索：在标题和摘要中进行不区分大小写的模糊匹配
-    # 转义 LIKE 通配符 % 和 _，防止用户输入被解释为通配符
+    # 按关键词搜索：优先使用全文检索索引（标题、译文标题、摘要、AI 摘要、标签），
+    # 取 BM25 相关度最高的 search.max_hits 条作为候选，其余筛选条件组装完成后再分批过滤（见下方）；
+    # 索引不可用时退回标题和摘要的模糊匹配
+    search_hits = None
+    search_truncated = False
     if keyword:
-        safe_keyword = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
-        pattern = f"%{safe_keyword}%"
-        query = query.where(
-            or_(Article.title.ilike(pattern), Article.summary.ilike(pattern))
-        )
+        max_hits = max(1, feature_config.get_int("search.max_hits", 1000))
+        # 多取一条用于判断候选窗口是否截断
+        search_hits = await search_article_ids(keyword, limit=max_hits + 1)
+        if search_hits is not None and len(search_hits) > max_hits:
+            search_hits = search_hits[:max_hits]
+            search_truncated = True
+        if search_hits is None:
+            # 转义 LIKE 通配符 % 和 _，防止用户输入被解释为通配符
+            safe_keyword = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{safe_keyword}%"
+            query = query.where(
+                or_(Article.title.ilike(pattern), Article.summary.ilike(pattern))
+            )
 
     # 按发布日期筛选：只返回指定日期之后的文章
     if from_date:
@@ -414,23 +484,63 @@ async def list_articles(
                 or_(UserArticleState.is_read == False, UserArticleState.is_read == None)
             )
 
-    # 统计符合筛选条件的文章总数（用于前端分页计算）
-    # 使用子查询方式计数，确保筛选条件生效
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await session.execute(count_query)).scalar() or 0
-
-    # ---- 排序和分页 ----
-    if sort == "title":
-        query = query.order_by(Article.title)            # 按标题字母顺序排序
-    elif sort == "crawl_time":
-        query = query.order_by(desc(Article.crawl_time)) # 按爬取时间倒序（最新爬取的在前）
+    if search_hits is not None:
+        # 候选窗口按批交给业务数据库过滤后在内存中排序分页；按相关度排序且不要求精确计数时，
+        # 过滤出当前页（多一条用于判断下一页）即停止扫描，总数按已扫描的比例外推。
+        # 候选窗口被截断或提前停止时 total 为近似值
+        offset = (page - 1) * page_size if cursor is None else 0
+        stop_after = offset + page_size + 1 if sort == "relevance" and count != "exact" else None
+        ranked, scanned = await _filter_search_hits(session, query, search_hits, sort, stop_after)
+        total = None
+        if count != "none":
+            total = len(ranked)
+            if scanned < len(search_hits):
+                total = round(len(ranked) * len(search_hits) / scanned)
+        total_estimated = search_truncated or scanned < len(search_hits)
+        articles, next_cursor = await _page_search_hits(
+            session, ranked, sort, position, offset, page_size,
+        )
     else:
-        query = query.order_by(desc(Article.publish_time))  # 默认：按发布时间倒序
+        # 统计符合筛选条件的文章总数（用于前端分页计算）
+        # 精确计数需要扫描全部匹配行，默认复用按筛选条件缓存的结果
+        total = None
+        total_estimated = False
+        if count != "none":
+            signature = {
+                "source_type": source_type, "category": category, "keyword": keyword,
+                "from_date": from_date, "starred": starred, "unread": unread,
+                "archived": archived, "user_id": user_id,
+            }
+            total, total_estimated = await _count_articles(
+                session, query, signature, exact=(count == "exact")
+            )
 
-    # 分页处理：offset + limit
-    query = query.offset((page - 1) * page_size).limit(page_size)
-    result = await session.execute(query)
-    articles = result.scalars().all()
+        # ---- 排序和分页 ----
+        # 时间排序以 id 作为次序键，保证相同时间的文章顺序稳定，
+        # InnoDB 二级索引隐含主键，(publish_time) / (crawl_time) 索引即可覆盖 (时间, id) 顺序
+        if sort == "title":
+            query = query.order_by(Article.title, Article.id)     # 按标题字母顺序排序
+        else:
+            # 按时间倒序（最新的在前）；无关键词时 relevance 等同 publish_time
+            column = Article.crawl_time if sort == "crawl_time" else Article.publish_time
+            query = query.order_by(desc(column), desc(Article.id))
+
+        if cursor is not None:
+            # 游标分页：从上一页最后一条之后继续读取，多取一条判断是否还有下一页
+            if position is not None:
+                query = query.where(_after_article_cursor(sort, *position))
+            query = query.limit(page_size + 1)
+        else:
+            # 分页处理：offset + limit
+            query = query.offset((page - 1) * page_size).limit(page_size + 1)
+        result = await session.execute(query)
+        articles = list(result.scalars().all())
+
+        next_cursor = None
+        if len(articles) > page_size:
+            articles = articles[:page_size]
+            if sort in _CURSOR_SORTS:
+                next_cursor = _encode_article_cursor(sort, articles[-1])
 
     # ---- 批量获取用户阅读状态 ----
     # 如果用户已登录，批量查询当前页所有文章的阅读/收藏状态
@@ -482,11 +592,187 @@ async def list_articles(
     return ArticleListResponse(
         articles=article_list,
         total=total,
+        total_estimated=total_estimated,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
+    )
+
+
+# ---- 文章列表游标分页与总数缓存 ----
+
+# 按筛选条件缓存的文章总数（进程内）
+_article_counts = MemoryCache(maxsize=2048)
+
+# 支持游标分页的排序字段
+_CURSOR_SORTS = ("publish_time", "crawl_time")
+
+
+def _encode_article_cursor(sort: str, article: Article) -> str:
+    """Encode the keyset position after ``article`` as an opaque cursor."""
+    value = getattr(article, sort)
+    payload = {"s": sort, "t": value.isoformat() if value else None, "id": article.id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _decode_article_cursor(cursor: str, sort: str) -> Optional[tuple]:
+    """Decode a cursor into ``(time, id)``; empty string means the first page.
+
+    Raises:
+        HTTPException: If the cursor is malformed or made for another sort.
+    """
+    if cursor == "":
+        return None
+    if sort not in _CURSOR_SORTS:
+        raise HTTPException(status_code=400, detail=f"Cursor pagination does not support sort={sort}")
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        value = datetime.fromisoformat(payload["t"]) if payload["t"] else None
+        position = (value, int(payload["id"]))
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if payload.get("s") != sort:
+        raise HTTPException(status_code=400, detail="Cursor does not match sort order")
+    return position
+
+
+def _after_article_cursor(sort: str, value: Optional[datetime], article_id: int):
+    """WHERE clause selecting rows after ``(value, id)`` in ``(time DESC, id DESC)`` order.
+
+    时间为空的文章排在最后（MySQL / SQLite 倒序时 NULL 在末尾）。
+    """
+    column = Article.crawl_time if sort == "crawl_time" else Article.publish_time
+    if value is None:
+        return (column.is_(None)) & (Article.id < article_id)
+    return or_(
+        column < value,
+        (column == value) & (Article.id < article_id),
+        column.is_(None),
     )
 
 
+async def _filter_search_hits(
+    session: AsyncSession,
+    query,
+    search_hits: List[int],
+    sort: str,
+    stop_after: Optional[int] = None,
+) -> tuple[List[tuple], int]:
+    """Filter full-text hits through the list filters, batch by batch.
+
+    全文检索索引与业务数据库分离，无法在一条 SQL 中联合查询：按 BM25 名次分批
+    带入已组装好的筛选条件，只取文章 ID 与排序字段；过滤结果达到 ``stop_after``
+    条后不再查询后续批次。
+
+    Args:
+        session: Async database session.
+        query: Filtered article query (before ordering/pagination).
+        search_hits: Article IDs from the index, best match first.
+        sort: Sort field.
+        stop_after: Stop once this many hits passed the filters; None scans all.
+
+    Returns:
+        tuple: ``(id, sort value)`` of matching articles in BM25 order, and the
+        number of hits scanned.
+    """
+    column = {"title": Article.title, "crawl_time": Article.crawl_time}.get(sort, Article.publish_time)
+    ranked: List[tuple] = []
+    scanned = 0
+    for chunk in chunked(search_hits):
+        if stop_after is not None and len(ranked) >= stop_after:
+            break
+        result = await session.execute(
+            query.with_only_columns(Article.id, column).where(Article.id.in_(list(chunk)))
+        )
+        found = dict(result.all())
+        ranked.extend((article_id, found[article_id]) for article_id in chunk if article_id in found)
+        scanned += len(chunk)
+    return ranked, scanned
+
+
+async def _page_search_hits(
+    session: AsyncSession,
+    ranked: List[tuple],
+    sort: str,
+    position: Optional[tuple],
+    offset: int,
+    page_size: int,
+) -> tuple[List[Article], Optional[str]]:
+    """Sort filtered search hits and load one page of articles.
+
+    排序规则与 SQL 分页一致：relevance 按 BM25 名次；title 升序（空值在前）；
+    时间倒序（空值在后），均以 id 作为次序键。
+
+    Args:
+        session: Async database session.
+        ranked: Output of :func:`_filter_search_hits`.
+        sort: Sort field.
+        position: Decoded cursor ``(time, id)``, or None.
+        offset: Rows to skip (offset pagination).
+        page_size: Items per page.
+
+    Returns:
+        tuple: (articles of the page, next cursor or None).
+    """
+    if sort == "title":
+        rows = sorted(ranked, key=lambda r: (r[1] is not None, r[1] or "", r[0]))
+    elif sort == "relevance":
+        rows = ranked
+    else:
+        def time_key(row):
+            return (row[1] is not None, row[1], row[0])
+
+        rows = sorted(ranked, key=time_key, reverse=True)
+        if position is not None:
+            value, article_id = position
+            after = time_key((article_id, value))
+            rows = [row for row in rows if time_key(row) < after]
+
+    page_ids = [row[0] for row in rows[offset:offset + page_size + 1]]
+    articles: List[Article] = []
+    if page_ids:
+        result = await session.execute(select(Article).where(Article.id.in_(page_ids)))
+        by_id = {article.id: article for article in result.scalars().all()}
+        articles = [by_id[article_id] for article_id in page_ids if article_id in by_id]
+
+    next_cursor = None
+    if len(articles) > page_size:
+        articles = articles[:page_size]
+        if sort in _CURSOR_SORTS:
+            next_cursor = _encode_article_cursor(sort, articles[-1])
+    return articles, next_cursor
+
+
+async def _count_articles(
+    session: AsyncSession,
+    query,
+    signature: Dict[str, Any],
+    exact: bool = False,
+) -> tuple[int, bool]:
+    """Count articles matching ``query``, reusing a cached count when allowed.
+
+    Args:
+        session: Async database session.
+        query: Filtered article query (before ordering/pagination).
+        signature: Filter parameters identifying the query.
+        exact: Always run the count and refresh the cache.
+
+    Returns:
+        tuple[int, bool]: Count and whether it came from the cache.
+    """
+    key = json.dumps(signature, sort_keys=True, default=str)
+    if not exact:
+        cached = _article_counts.get(key)
+        if cached is not None:
+            return cached, True
+
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    total = (await session.execute(count_query)).scalar() or 0
+    _article_counts.set(key, total, feature_config.get_int("cache.article_count_ttl", 120))
+    return total, False
+
+
 @router.get("/api/articles/{article_id}", response_model=ArticleDetailResponse)
 async def get_article(
     article_id: int,                # 路径参数：文章 ID
@@ -631,6 +917,7 @@ async def toggle_article_star(
 # 数据源相关 API —— 提供分类和数据源的列表查询，供前端筛选组件使用
 
 @router.get("/api/categories")
+@cached_response("categories", tags=("sources",), ttl=_response_ttl)
 async def list_categories(
     source_type: str = None,  # 数据源类型："arxiv"、"rss"、"weibo"、"hackernews"、"reddit"、"twitter" 或 None
     session: AsyncSession = Depends(get_session),
@@ -781,6 +1068,7 @@ async def list_categories(
 
 
 @router.get("/api/sources")
+@cached_response("sources", tags=("sources",), ttl=_response_ttl)
 async def list_all_sources(
     session: AsyncSession = Depends(get_session),
 ) -> Dict[str, Any]:
@@ -877,6 +1165,7 @@ async def list_all_sources(
 
 
 @router.get("/api/feeds")
+@cached_response("feeds", tags=("sources",), ttl=_response_ttl)
 async def list_feeds(
     session: AsyncSession = Depends(get_session),
 ) -> Dict[str, Any]:
@@ -1166,6 +1455,7 @@ async def search_sources(
 
 
 @router.get("/api/weibo/boards")
+@cached_response("weibo_boards", tags=("sources",), ttl=_response_ttl)
 async def list_weibo_boards(
     session: AsyncSession = Depends(get_session),
 ) -> Dict[str, Any]:
@@ -1199,6 +1489,7 @@ async def list_weibo_boards(
 
 
 @router.get("/api/hackernews/sources")
+@cached_response("hackernews_sources", tags=("sources",), ttl=_response_ttl)
 async def list_hackernews_sources(
     session: AsyncSession = Depends(get_session),
 ) -> Dict[str, Any]:
@@ -1232,6 +1523,7 @@ async def list_hackernews_sources(
 
 
 @router.get("/api/reddit/sources")
+@cached_response("reddit_sources", tags=("sources",), ttl=_response_ttl)
 async def list_reddit_sources(
     session: AsyncSession = Depends(get_session),
 ) -> Dict[str, Any]:
@@ -1266,6 +1558,7 @@ async def list_reddit_sources(
 
 
 @router.get("/api/twitter/sources")
+@cached_response("twitter_sources", tags=("sources",), ttl=_response_ttl)
 async def list_twitter_sources(
     session: AsyncSession = Depends(get_session),
 ) -> Dict[str, Any]:
@@ -1887,33 +2180,37 @@ async def validate_rss_feed(feed_url: str) -> RssFeedValidationResult:
     Returns:
         RssFeedValidationResult: Validation result and metadata.
     """
-    import feedparser
     from urllib.parse import urlparse
 
+    from apps.crawler.parsing import parse_executor, parse_feed
+    from common.http import get_text_async
+
     try:
-        # 解析 RSS 源
-        feed = feedparser.parse(feed_url)
+        # 先异步下载 RSS 内容，再把解析交给解析执行器（与爬虫路径一致），
+        # 避免 feedparser 在 CPU 解析池里同步下载占用 worker
+        feed_text = await get_text_async(feed_url, timeout=15.0, retries=1)
+        feed = await parse_executor.run(parse_feed, feed_text)
 
         # 检查解析是否成功
-        if feed.bozo and not feed.entries:
+        if feed["bozo"] and not feed["entries"]:
             # bozo 表示解析过程中遇到问题，如果没有条目则认为无效
-            error_msg = str(feed.bozo_exception) if hasattr(feed, 'bozo_exception') else "Invalid feed format"
+            error_msg = feed["bozo_exception"] or "Invalid feed format"
             return RssFeedValidationResult(
                 valid=False,
                 error=f"RSS 解析失败: {error_msg}"
             )
 
         # 检查是否有条目
-        if not feed.entries:
+        if not feed["entries"]:
             return RssFeedValidationResult(
                 valid=False,
                 error="RSS 源中没有找到任何文章"
             )
 
         # 提取元数据
-        feed_info = feed.feed
+        feed_info = feed["feed"]
         title = feed_info.get('title', '')
-        description = feed_info.get('description', '')
+        description = feed_info.get('description', '') or feed_info.get('subtitle', '')
         site_url = feed_info.get('link', '')
 
         # 如果没有标题，尝试从 URL 提取
@@ -2112,8 +2409,6 @@ async def get_feature_status() -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Feature status mapping.
     """
-    from common.feature_config import feature_config
-
     return {
         "event_clustering": feature_config.get_bool("feature.event_clustering", False),
         "topic_radar": feature_config.get_bool("feature.topic_radar", False),
@@ -0,0 +1,444 @@
+# =============================================================================
+# 模块: common/archive.py
+# 功能: 流式归档文件格式——按大小轮转的压缩 NDJSON 分段文件 + 清单（manifest）
+# 架构角色: 通用基础设施，被备份任务（backup_job，写入）和备份恢复接口（读取）使用。
+#   一个归档是一个目录：
+#     manifest.json             清单：状态、游标、各分段的编码/条数/ID 范围/字节数
+#     segment-00001.ndjson.zst  每行一条 JSON 记录（zstd 压缩；未安装 zstandard 时为 .gz）
+#     segment-00002.ndjson.zst  ...
+# 设计决策:
+#   - 逐条写入、按批 flush：每批结束时对压缩流做块刷新（zstd FLUSH_BLOCK / gzip
+#     Z_SYNC_FLUSH）并 fsync，已 flush 的记录即使进程随后崩溃也可完整读出
+#   - 清单以"临时文件 + fsync + os.replace"原子替换，任何时刻磁盘上都是一份完整清单
+#   - 清单中的 pending 记录"已落盘但调用方尚未确认"的一批 ID（例如尚未从数据库删除），
+#     中断后重新打开归档即可补做
+#   - 读取时以清单中的条数为准，容忍未正常结束的分段（截断的尾部被忽略）
+#   - zstandard 为可选依赖，按需导入；不可用时退回标准库 gzip
+#   - 兼容旧版单文件 JSON 备份（{"articles": [...]}），恢复接口可统一读取
+# =============================================================================
+
+"""Streaming, compressed, size-rotated NDJSON archives with a manifest."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import logging
+import os
+import tarfile
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+CODEC_ZSTD = "zstd"
+CODEC_GZIP = "gzip"
+
+_SUFFIXES = {
+    CODEC_ZSTD: ".ndjson.zst",
+    CODEC_GZIP: ".ndjson.gz",
+}
+_DEFAULT_LEVELS = {
+    CODEC_ZSTD: 3,
+    CODEC_GZIP: 6,
+}
+
+# 清单状态
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+
+
+def _zstandard():
+    """Return the ``zstandard`` module, or None when it is not installed."""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def resolve_codec(preferred: str = "auto") -> str:
+    """Pick the compression codec.
+
+    ``auto`` 与 ``zstd`` 在安装了 zstandard 时使用 zstd，否则退回 gzip。
+    """
+    preferred = (preferred or "auto").strip().lower()
+    if preferred == CODEC_GZIP:
+        return CODEC_GZIP
+    if _zstandard() is not None:
+        return CODEC_ZSTD
+    if preferred == CODEC_ZSTD:
+        logger.warning("zstandard is not installed, falling back to gzip archives")
+    return CODEC_GZIP
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    """Serialize one record as a compact NDJSON line."""
+    line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=_json_default)
+    return (line + "\n").encode("utf-8")
+
+
+# =============================================================================
+# 清单
+# =============================================================================
+@dataclass
+class ArchiveSegment:
+    """One segment file of an archive."""
+
+    file: str
+    codec: str
+    count: int = 0
+    first_id: Optional[Any] = None
+    last_id: Optional[Any] = None
+    bytes: int = 0
+    # 分段是否已正常结束（压缩流已写入结尾）
+    closed: bool = False
+
+
+@dataclass
+class ArchiveManifest:
+    """Archive manifest, persisted atomically as ``manifest.json``."""
+
+    path: Path
+    kind: str = "records"
+    codec: str = CODEC_GZIP
+    status: str = STATUS_RUNNING
+    created_at: str = ""
+    updated_at: str = ""
+    total_count: int = 0
+    # 最后一条已落盘记录的 ID
+    cursor: Optional[Any] = None
+    # 已落盘、尚未由调用方确认的 ID
+    pending: List[Any] = field(default_factory=list)
+    segments: List[ArchiveSegment] = field(default_factory=list)
+
+    @property
+    def directory(self) -> Path:
+        return self.path.parent
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(segment.bytes for segment in self.segments)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": MANIFEST_VERSION,
+            "kind": self.kind,
+            "codec": self.codec,
+            "status": self.status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "total_count": self.total_count,
+            "cursor": self.cursor,
+            "pending": list(self.pending),
+            "segments": [asdict(segment) for segment in self.segments],
+        }
+
+    @classmethod
+    def load(cls, path: Path) -> "ArchiveManifest":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            path=Path(path),
+            kind=data.get("kind", "records"),
+            codec=data.get("codec", CODEC_GZIP),
+            status=data.get("status", STATUS_RUNNING),
+            created_at=data.get("created_at", ""),
+            updated_at=data.get("updated_at", ""),
+            total_count=data.get("total_count", 0),
+            cursor=data.get("cursor"),
+            pending=list(data.get("pending") or []),
+            segments=[ArchiveSegment(**segment) for segment in data.get("segments", [])],
+        )
+
+    def save(self) -> None:
+        """Write the manifest atomically (tmp file + fsync + rename)."""
+        self.updated_at = datetime.now(timezone.utc).isoformat()
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def is_archive(path: Path) -> bool:
+    """Whether *path* is an archive directory or its manifest."""
+    path = Path(path)
+    if path.is_dir():
+        return (path / MANIFEST_NAME).exists()
+    return path.name == MANIFEST_NAME
+
+
+def manifest_path(path: Path) -> Path:
+    """Return the manifest path of an archive given its directory or manifest."""
+    path = Path(path)
+    return path / MANIFEST_NAME if path.is_dir() else path
+
+
+# =============================================================================
+# 写入
+# =============================================================================
+class _SegmentFile:
+    """A compressed segment file that can be made durable mid-stream."""
+
+    def __init__(self, path: Path, codec: str, level: int):
+        self.codec = codec
+        self._raw = open(path, "wb")
+        if codec == CODEC_ZSTD:
+            zstandard = _zstandard()
+            compressor = zstandard.ZstdCompressor(level=level)
+            self._stream = compressor.stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=level)
+
+    @property
+    def size(self) -> int:
+        """Compressed bytes written to disk so far."""
+        return self._raw.tell()
+
+    def write(self, data: bytes) -> None:
+        self._stream.write(data)
+
+    def sync(self) -> None:
+        """Flush the compressor and fsync, so everything written so far is readable."""
+        if self.codec == CODEC_ZSTD:
+            self._stream.flush(_zstandard().FLUSH_BLOCK)
+        else:
+            self._stream.flush(zlib.Z_SYNC_FLUSH)
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+
+    def close(self) -> None:
+        """Terminate the compressed stream and fsync the file."""
+        self._stream.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+
+
+class ArchiveWriter:
+    """Append records to an archive directory.
+
+    用法：逐条 ``write()``，每批结束调用 ``flush()``（落盘并记入清单的 pending），
+    调用方处理完这批（例如删除源数据并提交）后调用 ``commit()`` 清空 pending；
+    全部结束后 ``close()`` 将清单标记为 completed。
+    """
+
+    def __init__(
+        self,
+        manifest: ArchiveManifest,
+        codec: str,
+        segment_bytes: int,
+        level: Optional[int] = None,
+        key: str = "id",
+    ):
+        self._manifest = manifest
+        self._codec = codec
+        self._segment_bytes = max(1, segment_bytes)
+        self._level = level if level is not None else _DEFAULT_LEVELS[codec]
+        self._key = key
+        self._file: Optional[_SegmentFile] = None
+        self._batch_ids: List[Any] = []
+
+    @classmethod
+    def open(
+        cls,
+        directory: Path,
+        kind: str = "records",
+        codec: str = "auto",
+        segment_bytes: int = 64 * 1024 * 1024,
+        level: Optional[int] = None,
+        key: str = "id",
+    ) -> "ArchiveWriter":
+        """Create an archive, or reopen an unfinished one to append to it.
+
+        重新打开时，上次未正常结束的分段被视为已关闭（读取时按清单条数截断），
+        新记录写入新分段；清单中的 pending 保留，由调用方补做后 ``commit()``。
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / MANIFEST_NAME
+        codec = resolve_codec(codec)
+        if path.exists():
+            manifest = ArchiveManifest.load(path)
+            for segment in manifest.segments:
+                segment.closed = True
+            manifest.status = STATUS_RUNNING
+        else:
+            manifest = ArchiveManifest(
+                path=path,
+                kind=kind,
+                codec=codec,
+                created_at=datetime.now(timezone.utc).isoformat(),
+            )
+        manifest.save()
+        return cls(manifest, codec, segment_bytes, level=level, key=key)
+
+    @property
+    def manifest(self) -> ArchiveManifest:
+        return self._manifest
+
+    @property
+    def pending(self) -> List[Any]:
+        return list(self._manifest.pending)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append one record to the current segment (buffered until ``flush``)."""
+        if self._file is None:
+            self._open_segment()
+        self._file.write(encode_record(record))
+        self._batch_ids.append(record.get(self._key))
+
+    def flush(self) -> List[Any]:
+        """Make the current batch durable and record it in the manifest.
+
+        Returns:
+            List[Any]: IDs of the records written since the previous flush.
+        """
+        batch_ids, self._batch_ids = self._batch_ids, []
+        if self._file is None:
+            return batch_ids
+        self._file.sync()
+        segment = self._manifest.segments[-1]
+        segment.bytes = self._file.size
+        if batch_ids:
+            # 条数与 ID 范围只在落盘后计入清单，未 flush 的记录读取时会被忽略
+            segment.count += len(batch_ids)
+            if segment.first_id is None:
+                segment.first_id = batch_ids[0]
+            segment.last_id = batch_ids[-1]
+            self._manifest.total_count += len(batch_ids)
+            self._manifest.cursor = batch_ids[-1]
+            self._manifest.pending = self._manifest.pending + batch_ids
+        if self._file.size >= self._segment_bytes:
+            self._close_segment()
+        self._manifest.save()
+        return batch_ids
+
+    def commit(self) -> None:
+        """Acknowledge the pending IDs (the caller finished processing them)."""
+        if self._manifest.pending:
+            self._manifest.pending = []
+            self._manifest.save()
+
+    def close(self, status: str = STATUS_COMPLETED) -> ArchiveManifest:
+        """Flush, close the open segment and store the final status."""
+        if self._batch_ids:
+            self.flush()
+        if self._file is not None:
+            self._close_segment()
+        self._manifest.status = status
+        self._manifest.save()
+        return self._manifest
+
+    def abort(self) -> None:
+        """Close the open segment without completing the archive (it stays resumable)."""
+        self._batch_ids = []
+        if self._file is not None:
+            try:
+                self._close_segment()
+            except OSError as e:
+                logger.warning(f"Failed to close archive segment: {e}")
+        self._manifest.save()
+
+    def _open_segment(self) -> None:
+        index = len(self._manifest.segments) + 1
+        name = f"segment-{index:05d}{_SUFFIXES[self._codec]}"
+        self._file = _SegmentFile(self._manifest.directory / name, self._codec, self._level)
+        self._manifest.segments.append(ArchiveSegment(file=name, codec=self._codec))
+
+    def _close_segment(self) -> None:
+        self._file.close()
+        self._file = None
+        segment = self._manifest.segments[-1]
+        segment.bytes = (self._manifest.directory / segment.file).stat().st_size
+        segment.closed = True
+
+
+# =============================================================================
+# 读取
+# =============================================================================
+def _truncation_errors() -> tuple:
+    errors: tuple = (EOFError, zlib.error, gzip.BadGzipFile, UnicodeDecodeError)
+    zstandard = _zstandard()
+    if zstandard is not None:
+        errors += (zstandard.ZstdError,)
+    return errors
+
+
+def _open_text(path: Path, codec: str):
+    if codec == CODEC_ZSTD:
+        zstandard = _zstandard()
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return gzip.open(path, "rt", encoding="utf-8")
+
+
+def iter_segment(path: Path, codec: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Yield records of one segment, stopping at *limit* or a truncated tail."""
+    count = 0
+    if limit is not None and limit <= 0:
+        return
+    try:
+        with _open_text(Path(path), codec) as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                yield json.loads(line)
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+    except _truncation_errors() as e:
+        logger.warning(f"Archive segment {path} ends early after {count} records: {e}")
+
+
+def iter_archive(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield every record of an archive (directory or manifest path)."""
+    manifest = ArchiveManifest.load(manifest_path(path))
+    for segment in manifest.segments:
+        # 已正常结束的分段也按清单条数截断，保证只返回确认落盘的记录
+        yield from iter_segment(manifest.directory / segment.file, segment.codec, limit=segment.count)
+
+
+def iter_backup_records(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield records of a backup: a streaming archive or a legacy JSON file."""
+    path = Path(path)
+    if is_archive(path):
+        yield from iter_archive(path)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    yield from data.get("articles", [])
+
+
+def pack_archive(path: Path) -> Path:
+    """Bundle an archive directory into one ``.tar`` file (for download).
+
+    分段已压缩，tar 不再二次压缩；已打包且清单未变时直接复用。
+    """
+    directory = manifest_path(path).parent
+    tar_path = directory.with_name(directory.name + ".tar")
+    manifest_mtime = (directory / MANIFEST_NAME).stat().st_mtime
+    if tar_path.exists() and tar_path.stat().st_mtime >= manifest_mtime:
+        return tar_path
+    tmp_path = tar_path.with_name(tar_path.name + ".tmp")
+    with tarfile.open(tmp_path, "w") as tar:
+        tar.add(directory, arcname=directory.name)
+    os.replace(tmp_path, tar_path)
+    return tar_path
@@ -1,44 +1,268 @@
 # =============================================================================
 # 模块: common/cache.py
-# 功能: 简单的内存级 HTTP 响应缓存，带 TTL（存活时间）支持
+# 功能: HTTP 响应缓存：内存 LRU + TTL，可选的进程间共享磁盘层
 # 架构角色: 作为 HTTP 请求层（common/http.py）的缓存基础设施。
 #   当爬虫在短时间内重复请求相同 URL 时（如重试、去重检查），
 #   通过缓存避免不必要的网络请求，降低被目标网站封禁的风险。
 #
 # 设计决策:
-#   - 使用纯内存字典存储（dict[str, tuple[str, float]]），简单高效
+#   - 内存层使用 OrderedDict 维护访问顺序，命中、写入、淘汰均为 O(1)
+#   - 容量按字节数（而非条目数）限制，单个超大响应不会挤占整个缓存
 #   - 缓存键使用 URL + 参数的 MD5 哈希，节省内存且避免特殊字符问题
-#   - 每条缓存条目独立计算 TTL（按条目创建时间 + 查询时传入的 TTL 判断）
-#   - 过期条目在查询时惰性删除（Lazy Eviction），不需要后台清理线程
-#   - 使用模块级单例实例（_cache），并提供模块级便捷函数
-#   - 不使用 Redis 等外部存储，因为缓存的主要目的是短时间内的请求去重
+#   - 每条缓存条目独立计算 TTL（按条目写入时间 + 查询时传入的 TTL 判断），
+#     过期条目在查询时惰性删除（Lazy Eviction），不需要后台清理线程
+#   - 可选的磁盘层使用标准库 sqlite3（WAL 模式）存放在 data_dir 下：
+#     服务重启后仍可命中，Web 服务与调度器/爬虫脚本等同机进程共享；
+#     磁盘层不可用时自动退化为仅内存缓存
+#   - 所有操作由同一把线程锁保护，同步请求路径与线程池中的调用都是安全的
+#   - 维护命中、未命中、淘汰等计数器，便于评估缓存效果
 # =============================================================================
-"""Simple in-memory HTTP response cache with TTL."""
+"""HTTP response cache with O(1) LRU eviction, TTL and an optional disk tier."""
 
 from __future__ import annotations
 
 import hashlib
+import logging
+import sqlite3
+import sys
+import threading
 import time
-from typing import Optional
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 内存层默认容量（字节）
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# 磁盘层默认容量（字节）
+DEFAULT_DISK_MAX_BYTES = 256 * 1024 * 1024
+# 磁盘层文件名（位于 settings.data_dir 下）
+DISK_CACHE_FILENAME = "http_response_cache.sqlite3"
+# 每写入多少次检查一次磁盘层容量（避免每次写入都做 SUM 聚合）
+DISK_PRUNE_INTERVAL = 64
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness.
+
+    缓存统计信息。
+
+    Attributes:
+        hits: Lookups served from the memory tier.
+        disk_hits: Lookups served from the disk tier (memory miss).
+        misses: Lookups that found nothing fresh.
+        evictions: Entries dropped from memory to stay under capacity.
+        expirations: Entries dropped because their TTL had passed.
+        disk_evictions: Entries pruned from the disk tier.
+        entries: Current number of in-memory entries.
+        bytes: Current in-memory size in bytes.
+        max_bytes: Memory tier capacity in bytes.
+    """
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    disk_evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from either tier."""
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary (includes ``hit_rate``)."""
+        data = asdict(self)
+        data["hit_rate"] = round(self.hit_rate, 4)
+        return data
+
+
+class _DiskTier:
+    """SQLite-backed second cache tier shared by processes on the same host.
+
+    磁盘缓存层：按最近访问时间淘汰，容量按字节数限制。
+
+    Args:
+        path: SQLite file path.
+        max_bytes: Disk tier capacity in bytes.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_DISK_MAX_BYTES):
+        self._path = path
+        self.max_bytes = max(0, max_bytes)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._opened = False
+        self._writes = 0
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite file lazily (None when unavailable)."""
+        if self._opened:
+            return self._conn
+        self._opened = True
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._path), timeout=5.0, check_same_thread=False)
+            # WAL 模式允许多个进程并发读，写入互不阻塞读取
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_response_cache ("
+                " key TEXT PRIMARY KEY,"
+                " body TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_http_response_cache_accessed"
+                " ON http_response_cache (accessed_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Disk response cache unavailable at {self._path}, using memory only: {e}")
+            self._conn = None
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return ``(body, stored_at)`` for ``key`` and bump its access time."""
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT body, stored_at FROM http_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE http_response_cache SET accessed_at = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Disk cache lookup failed for {key}: {e}")
+            return None
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, body: str, size: int, stored_at: float) -> int:
+        """Store an entry; returns the number of entries pruned."""
+        conn = self._connect()
+        if conn is None or size > self.max_bytes:
+            return 0
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO http_response_cache"
+                " (key, body, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, body, size, stored_at, stored_at),
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to persist cached response for {key}: {e}")
+            return 0
+        self._writes += 1
+        if self._writes % DISK_PRUNE_INTERVAL == 0:
+            return self.prune()
+        return 0
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from the disk tier."""
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            conn.execute("DELETE FROM http_response_cache WHERE key = ?", (key,))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to delete cached response for {key}: {e}")
+
+    def prune(self) -> int:
+        """Delete least-recently-accessed entries until under capacity.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        conn = self._connect()
+        if conn is None:
+            return 0
+        try:
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM http_response_cache"
+            ).fetchone()[0]
+            excess = total - self.max_bytes
+            if excess <= 0:
+                return 0
+            victims = []
+            for key, size in conn.execute(
+                "SELECT key, size FROM http_response_cache ORDER BY accessed_at"
+            ):
+                victims.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM http_response_cache WHERE key = ?", victims)
+            conn.commit()
+            return len(victims)
+        except sqlite3.Error as e:
+            logger.debug(f"Disk cache prune failed: {e}")
+            return 0
+
+    def clear(self) -> None:
+        """Remove every entry from the disk tier."""
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            conn.execute("DELETE FROM http_response_cache")
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Disk cache clear failed: {e}")
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+        self._opened = False
 
 
 # =============================================================================
 # ResponseCache 类
-# 职责: 管理 URL 响应的内存缓存
+# 职责: 管理 URL 响应的两级缓存
 # 设计决策:
-#   - 缓存结构：{md5_hash: (响应文本, 创建时间戳)}
+#   - 内存层结构：OrderedDict{md5_hash: (响应文本, 写入时间戳, 字节数)}，
+#     末尾为最近使用，淘汰时从头部弹出
 #   - TTL 在读取时传入而非写入时指定，这样同一缓存条目可以被不同 TTL 的调用者使用
-#   - 惰性过期：过期条目只在被查询时才删除，简化了实现
+#   - 写入时间使用墙上时钟（time.time），磁盘层条目跨进程、跨重启仍可比较
 # =============================================================================
 class ResponseCache:
-    """Simple dict-based response cache with per-entry TTL."""
+    """Byte-bounded LRU response cache with per-lookup TTL and an optional disk tier.
 
-    # 最大缓存条目数，防止无限制的内存增长
-    MAX_ENTRIES = 500
+    Args:
+        max_bytes: Memory tier capacity in bytes.
+        disk_path: SQLite file for the shared disk tier; ``None`` disables it.
+        disk_max_bytes: Disk tier capacity in bytes.
+    """
 
-    def __init__(self):
-        # 缓存存储：键为 URL+参数的 MD5 哈希，值为 (响应文本, 写入时间戳) 元组
-        self._cache: dict[str, tuple[str, float]] = {}
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        disk_path: Optional[Path] = None,
+        disk_max_bytes: int = DEFAULT_DISK_MAX_BYTES,
+    ):
+        self.max_bytes = max(0, max_bytes)
+        # 缓存存储：键为 URL+参数的 MD5 哈希，值为 (响应文本, 写入时间戳, 字节数)
+        self._cache: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._disk = _DiskTier(disk_path, disk_max_bytes) if disk_path is not None else None
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
 
     def _cache_key(self, url: str, params: Optional[dict] = None) -> str:
         """Generate cache key from URL and params.
@@ -62,10 +286,36 @@ class ResponseCache:
             key_str = f"{url}?{sorted_params}"
         return hashlib.md5(key_str.encode()).hexdigest()
 
+    @staticmethod
+    def _entry_size(key: str, response: str) -> int:
+        """Approximate memory footprint of an entry in bytes."""
+        return sys.getsizeof(response) + len(key)
+
+    def _remove(self, key: str) -> None:
+        """Drop ``key`` from the memory tier (caller holds the lock)."""
+        _, _, size = self._cache.pop(key)
+        self._bytes -= size
+
+    def _insert(self, key: str, response: str, timestamp: float) -> None:
+        """Insert into the memory tier and evict LRU entries (caller holds the lock)."""
+        size = self._entry_size(key, response)
+        if key in self._cache:
+            self._remove(key)
+        if size > self.max_bytes:
+            # 单条超过内存容量的响应不进入内存层
+            return
+        self._cache[key] = (response, timestamp, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._cache))
+            self._remove(oldest_key)
+            self._stats.evictions += 1
+
     def get(self, url: str, params: Optional[dict] = None, ttl: int = 3600) -> Optional[str]:
         """Get cached response if not expired.
 
-        获取缓存的响应内容（如果未过期）。过期条目会被惰性删除。
+        获取缓存的响应内容（如果未过期）。内存层未命中时查询磁盘层，
+        磁盘层命中后回填内存层。过期条目会被惰性删除。
 
         Args:
             url: Request URL.
@@ -76,15 +326,32 @@ class ResponseCache:
             Optional[str]: Cached response text if available.
         """
         key = self._cache_key(url, params)
-        if key not in self._cache:
-            return None
-        response, timestamp = self._cache[key]
-        # 检查是否过期
-        if time.time() - timestamp > ttl:
-            # 惰性删除过期条目
-            del self._cache[key]
+        now = time.time()
+        with self._lock:
+            item = self._cache.get(key)
+            if item is not None:
+                response, timestamp, _ = item
+                if now - timestamp <= ttl:
+                    self._cache.move_to_end(key)
+                    self._stats.hits += 1
+                    return response
+                # 惰性删除过期条目
+                self._remove(key)
+                self._stats.expirations += 1
+
+            if self._disk is not None:
+                stored = self._disk.get(key)
+                if stored is not None:
+                    response, timestamp = stored
+                    if now - timestamp <= ttl:
+                        self._insert(key, response, timestamp)
+                        self._stats.disk_hits += 1
+                        return response
+                    self._disk.delete(key)
+                    self._stats.expirations += 1
+
+            self._stats.misses += 1
             return None
-        return response
 
     def set(self, url: str, response: str, params: Optional[dict] = None) -> None:
         """Cache a response.
@@ -97,37 +364,76 @@ class ResponseCache:
             params: Optional query parameters.
 
         Side Effects:
-            - Writes/overwrites cache entry.
-            - May evict the oldest entry when capacity is exceeded.
+            - Writes/overwrites the memory entry (and the disk entry when enabled).
+            - May evict least-recently-used entries when capacity is exceeded.
         """
         key = self._cache_key(url, params)
-        self._cache[key] = (response, time.time())
-        # 淘汰最旧的条目以维持大小限制
-        if len(self._cache) > self.MAX_ENTRIES:
-            oldest_key = min(self._cache, key=lambda k: self._cache[k][1])
-            del self._cache[oldest_key]
+        now = time.time()
+        with self._lock:
+            self._insert(key, response, now)
+            if self._disk is not None:
+                self._stats.disk_evictions += self._disk.set(
+                    key, response, self._entry_size(key, response), now
+                )
 
     def clear(self) -> None:
         """Clear all cached responses.
 
-        清空所有缓存条目。
+        清空内存层与磁盘层的所有缓存条目。
         """
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+            if self._disk is not None:
+                self._disk.clear()
 
     def size(self) -> int:
-        """Return number of cached entries.
+        """Return number of in-memory entries.
 
-        返回当前缓存中的条目数量（包括可能已过期但尚未被惰性删除的条目）。
+        返回当前内存层的条目数量（包括可能已过期但尚未被惰性删除的条目）。
 
         Returns:
             int: Number of cached entries.
         """
         return len(self._cache)
 
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters.
+
+        Returns:
+            CacheStats: Counters plus current size and capacity.
+        """
+        with self._lock:
+            snapshot = CacheStats(**asdict(self._stats))
+            snapshot.entries = len(self._cache)
+            snapshot.bytes = self._bytes
+            snapshot.max_bytes = self.max_bytes
+            return snapshot
+
+    def close(self) -> None:
+        """Close the disk tier connection (reopened lazily on next use)."""
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+
+
+def _create_response_cache() -> ResponseCache:
+    """Build the shared cache from settings."""
+    from settings import settings
+
+    disk_path = None
+    if settings.crawler_http_cache_disk:
+        disk_path = Path(settings.data_dir) / DISK_CACHE_FILENAME
+    return ResponseCache(
+        max_bytes=settings.crawler_http_cache_max_bytes,
+        disk_path=disk_path,
+        disk_max_bytes=settings.crawler_http_cache_disk_max_bytes,
+    )
+
 
 # 全局缓存单例实例
 # 被 http.py 模块通过下方的便捷函数调用
-_cache = ResponseCache()
+_cache = _create_response_cache()
 
 
 def get_cached_response(
@@ -180,3 +486,14 @@ def cache_size() -> int:
         int: Cache entry count.
     """
     return _cache.size()
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Get cache counters.
+
+    获取全局缓存的命中、未命中、淘汰等统计信息。
+
+    Returns:
+        Dict[str, Any]: Output of :meth:`CacheStats.to_dict`.
+    """
+    return _cache.stats().to_dict()
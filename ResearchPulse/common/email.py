@@ -9,6 +9,8 @@
 #   3. 多后端自动降级（Fallback）：一个后端失败自动尝试下一个
 #   4. 指数退避重试机制
 #   5. 支持纯文本和 HTML 邮件
+#   6. 批量发送（EmailDelivery）：邮件配置只加载一次，SMTP 会话认证后在多封邮件间复用，
+#      API 后端共享 keep-alive 的 HTTP 客户端
 #
 # 设计决策:
 #   - 每个后端封装为独立的私有函数（_send_via_*），便于维护和扩展
@@ -16,6 +18,8 @@
 #   - send_email_with_fallback 提供多后端降级策略
 #   - send_notification_email 是异步包装器，在线程池中执行同步发送
 #   - API 密钥优先从参数获取，其次从环境变量，保持灵活性
+#   - 连接复用只在显式传入连接池/HTTP 客户端时生效（EmailDelivery），
+#     单封邮件（验证码、管理员报告等）仍使用一次性连接，不在进程中常驻空闲连接
 # =============================================================================
 """Email sending module for ResearchPulse v2.
 
@@ -29,18 +33,21 @@ Features:
 - Multi-backend fallback
 - Retry with backoff
 - HTML email support
+- Batched delivery with pooled SMTP sessions and HTTP keep-alive
 """
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import smtplib
+import threading
 import time
 import traceback
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple
 
 import httpx
 
@@ -48,8 +55,130 @@ logger = logging.getLogger(__name__)
 
 
 # ======================
-# 1. SMTP 发送（支持多端口重试）
+# 1. SMTP 发送（支持多端口重试与连接复用）
 # ======================
+def _smtp_connect(
+    host: str,
+    port: int,
+    *,
+    use_ssl: bool,
+    use_tls: bool,
+    user: str,
+    password: str,
+    timeout: float,
+) -> smtplib.SMTP:
+    """Open an SMTP session: connect, EHLO, optional STARTTLS and AUTH.
+
+    建立 SMTP 会话（连接、EHLO、可选 STARTTLS 与登录），失败时关闭连接后抛出异常。
+    """
+    # 根据是否 SSL 选择不同的 SMTP 类
+    server = (
+        smtplib.SMTP_SSL(host, port, timeout=timeout)
+        if use_ssl
+        else smtplib.SMTP(host, port, timeout=timeout)
+    )
+    try:
+        server.ehlo()  # 向服务器发送 EHLO 命令标识自己
+        # 非 SSL 端口且非 localhost 时启用 STARTTLS 加密
+        if use_tls and host.lower() != "localhost":
+            server.starttls()
+            server.ehlo()  # TLS 升级后需要重新 EHLO
+        # 有认证信息时执行登录
+        if user:
+            server.login(user, password)
+    except Exception:
+        _smtp_close(server)
+        raise
+    return server
+
+
+def _smtp_close(server: smtplib.SMTP) -> None:
+    """Close an SMTP session, ignoring errors."""
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+class SMTPConnectionPool:
+    """Reusable authenticated SMTP sessions keyed by server and account.
+
+    SMTP 连接池：连接、TLS 握手与 AUTH 只在建立会话时执行一次，之后在多封邮件间复用。
+    线程安全，一个连接同一时间只被一个线程使用（取出后从空闲列表移除）。
+
+    Args:
+        max_idle: Max idle sessions kept per server/account.
+        max_messages: Messages sent on one session before it is recycled
+            (many providers cap messages per connection).
+        idle_timeout: Idle seconds after which a session is closed instead of
+            reused (servers drop idle clients).
+    """
+
+    def __init__(self, max_idle: int = 5, max_messages: int = 100, idle_timeout: float = 30.0):
+        self.max_idle = max(max_idle, 1)
+        self.max_messages = max(max_messages, 1)
+        self.idle_timeout = idle_timeout
+        # key -> [(server, last_used, sent_count)]
+        self._idle: Dict[Tuple, List[Tuple[smtplib.SMTP, float, int]]] = {}
+        self._lock = threading.Lock()
+        # 累计建立的会话数（统计用）
+        self.opened = 0
+
+    def acquire(
+        self, key: Tuple, connect: Callable[[], smtplib.SMTP], reuse: bool = True
+    ) -> Tuple[smtplib.SMTP, int, bool]:
+        """Take an idle session for ``key`` or open a new one.
+
+        Args:
+            key: Server/account key.
+            connect: Factory opening an authenticated session.
+            reuse: False forces a new session.
+
+        Returns:
+            Tuple[smtplib.SMTP, int, bool]: (session, messages already sent, reused).
+        """
+        stale = []
+        found = None
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while reuse and idle:
+                server, last_used, sent = idle.pop()
+                if time.monotonic() - last_used > self.idle_timeout:
+                    stale.append(server)
+                    continue
+                found = (server, sent, True)
+                break
+        for server in stale:
+            _smtp_close(server)
+        if found is not None:
+            return found
+        server = connect()
+        with self._lock:
+            self.opened += 1
+        return server, 0, False
+
+    def release(self, key: Tuple, server: smtplib.SMTP, sent: int) -> None:
+        """Return a healthy session after sending ``sent`` messages in total."""
+        if sent < self.max_messages:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle:
+                    idle.append((server, time.monotonic(), sent))
+                    return
+        _smtp_close(server)
+
+    def close(self) -> None:
+        """Close every idle session."""
+        with self._lock:
+            sessions = [server for idle in self._idle.values() for server, _, _ in idle]
+            self._idle.clear()
+        for server in sessions:
+            _smtp_close(server)
+
+
 def _send_via_smtp(
     subject: str,
     body: str,
@@ -67,12 +196,14 @@ def _send_via_smtp(
     retry_backoff: float = 10.0,
     use_tls: bool = True,
     use_ssl: bool = False,
+    pool: Optional[SMTPConnectionPool] = None,
 ) -> Tuple[bool, str]:
     """Send email via SMTP with multi-port retry support.
 
     通过 SMTP 协议发送邮件，支持多端口重试策略。
     当某个端口连接失败时，自动尝试 smtp_ports 列表中的下一个端口。
     每个端口内部还有独立的重试次数（retries）。
+    传入 pool 时复用已认证的会话，不再每封邮件重新连接、握手与登录。
 
     参数:
         subject: 邮件主题
@@ -91,6 +222,7 @@ def _send_via_smtp(
         retry_backoff: 重试间隔退避时间（秒）
         use_tls: 是否启用 STARTTLS
         use_ssl: 是否使用 SSL 直连
+        pool: 可选的 SMTP 连接池
 
     返回值:
         Tuple[bool, str]: (是否成功, 错误信息)
@@ -116,6 +248,7 @@ def _send_via_smtp(
     msg["Subject"] = subject
     msg["From"] = from_addr
     msg["To"] = ", ".join(to_addrs)
+    message = msg.as_string()
 
     # 端口去重并合并：默认端口 + 额外端口 + SSL 端口
     # dict.fromkeys 保持顺序的同时去重
@@ -134,22 +267,35 @@ def _send_via_smtp(
                 use_ssl_port = port in ssl_ports_set or use_ssl
                 # STARTTLS 和 SSL 互斥
                 use_tls_port = use_tls and not use_ssl_port
-                # 根据是否 SSL 选择不同的 SMTP 类
-                server = (
-                    smtplib.SMTP_SSL(smtp_host, port, timeout=timeout)
-                    if use_ssl_port
-                    else smtplib.SMTP(smtp_host, port, timeout=timeout)
+                connect = functools.partial(
+                    _smtp_connect,
+                    smtp_host,
+                    port,
+                    use_ssl=use_ssl_port,
+                    use_tls=use_tls_port,
+                    user=smtp_user,
+                    password=smtp_password,
+                    timeout=timeout,
                 )
-                server.ehlo()  # 向服务器发送 EHLO 命令标识自己
-                # 非 SSL 端口且非 localhost 时启用 STARTTLS 加密
-                if use_tls_port and smtp_host.lower() != "localhost":
-                    server.starttls()
-                    server.ehlo()  # TLS 升级后需要重新 EHLO
-                # 有认证信息时执行登录
-                if smtp_user:
-                    server.login(smtp_user, smtp_password)
-                # 发送邮件
-                server.sendmail(from_addr, to_addrs, msg.as_string())
+                if pool is None:
+                    server = connect()
+                    server.sendmail(from_addr, to_addrs, message)
+                    _smtp_close(server)
+                    server = None
+                else:
+                    key = (smtp_host, port, use_ssl_port, use_tls_port, smtp_user)
+                    server, sent, reused = pool.acquire(key, connect)
+                    try:
+                        server.sendmail(from_addr, to_addrs, message)
+                    except smtplib.SMTPServerDisconnected:
+                        if not reused:
+                            raise
+                        # 复用的会话已被服务器断开：重新建连后立即重发，不计入重试次数
+                        _smtp_close(server)
+                        server, sent, _ = pool.acquire(key, connect, reuse=False)
+                        server.sendmail(from_addr, to_addrs, message)
+                    pool.release(key, server, sent + 1)
+                    server = None
                 logger.info(f"✓ Email sent via SMTP (port {port})")
                 return True, ""
             except Exception:
@@ -162,12 +308,9 @@ def _send_via_smtp(
                         retries,
                         last_tb,
                     )
-                # 确保关闭 SMTP 连接
+                # 确保关闭 SMTP 连接（出错的池化会话不放回连接池）
                 if server:
-                    try:
-                        server.quit()
-                    except Exception:
-                        pass
+                    _smtp_close(server)
                 # 非最后一次重试时等待退避时间
                 if attempt < retries - 1:
                     time.sleep(retry_backoff)
@@ -188,6 +331,7 @@ def _send_via_sendgrid(
     api_key: Optional[str] = None,
     retries: int = 1,
     retry_backoff: float = 10.0,
+    client: Optional[httpx.Client] = None,
 ) -> Tuple[bool, str]:
     """Send email via SendGrid API.
 
@@ -203,6 +347,7 @@ def _send_via_sendgrid(
         api_key: SendGrid API 密钥，为空时从环境变量获取
         retries: 重试次数
         retry_backoff: 重试退避时间（秒）
+        client: 可选的共享 HTTP 客户端（keep-alive 复用连接）
 
     返回值:
         Tuple[bool, str]: (是否成功, 错误信息)
@@ -227,7 +372,8 @@ def _send_via_sendgrid(
             if html_body:
                 content.append({"type": "text/html", "value": html_body})
 
-            resp = httpx.post(
+            post = client.post if client is not None else httpx.post
+            resp = post(
                 "https://api.sendgrid.com/v3/mail/send",
                 json={
                     "personalizations": [{"to": [{"email": e} for e in to_addrs]}],
@@ -266,6 +412,7 @@ def _send_via_mailgun(
     domain: Optional[str] = None,
     retries: int = 1,
     retry_backoff: float = 10.0,
+    client: Optional[httpx.Client] = None,
 ) -> Tuple[bool, str]:
     """Send email via Mailgun API.
 
@@ -282,6 +429,7 @@ def _send_via_mailgun(
         domain: Mailgun 发送域名
         retries: 重试次数
         retry_backoff: 重试退避时间（秒）
+        client: 可选的共享 HTTP 客户端（keep-alive 复用连接）
 
     返回值:
         Tuple[bool, str]: (是否成功, 错误信息)
@@ -305,7 +453,8 @@ def _send_via_mailgun(
             data = {"from": from_addr, "to": to_addrs, "subject": subject, "text": body}
             if html_body:
                 data["html"] = html_body
-            resp = httpx.post(
+            post = client.post if client is not None else httpx.post
+            resp = post(
                 f"https://api.mailgun.net/v3/{domain}/messages",
                 auth=("api", api_key),  # Mailgun 使用 HTTP Basic Auth
                 data=data,
@@ -338,6 +487,7 @@ def _send_via_brevo(
     from_name: str = "ResearchPulse",
     retries: int = 1,
     retry_backoff: float = 10.0,
+    client: Optional[httpx.Client] = None,
 ) -> Tuple[bool, str]:
     """Send email via Brevo (formerly Sendinblue) API.
 
@@ -354,6 +504,7 @@ def _send_via_brevo(
         from_name: 发件人显示名称
         retries: 重试次数
         retry_backoff: 重试退避时间（秒）
+        client: 可选的共享 HTTP 客户端（keep-alive 复用连接）
 
     返回值:
         Tuple[bool, str]: (是否成功, 错误信息)
@@ -382,7 +533,8 @@ def _send_via_brevo(
             if html_body:
                 payload["htmlContent"] = html_body
 
-            resp = httpx.post(
+            post = client.post if client is not None else httpx.post
+            resp = post(
                 "https://api.brevo.com/v3/smtp/email",
                 json=payload,
                 headers={"api-key": api_key, "Content-Type": "application/json"},
@@ -437,7 +589,8 @@ def send_email(
         from_addr: Sender email address
             发件人地址
         **kwargs: Backend-specific parameters
-            各后端特有的参数（如 smtp_host, api_key 等）
+            各后端特有的参数（如 smtp_host, api_key 等）；
+            smtp_pool（SMTPConnectionPool）/ http_client（httpx.Client）用于连接复用
 
     Returns:
         Tuple[bool, str]: (success, error_message)
@@ -525,6 +678,7 @@ def send_email(
                 retry_backoff=float(_cfg("smtp_retry_backoff", "SMTP_RETRY_BACKOFF", 10.0)),
                 use_tls=bool(_cfg("smtp_tls", "SMTP_TLS", True)),
                 use_ssl=bool(_cfg("smtp_ssl", "SMTP_SSL", False)),
+                pool=kwargs.get("smtp_pool"),
             )
         if backend == "sendgrid":
             return _send_via_sendgrid(
@@ -536,6 +690,7 @@ def send_email(
                 api_key=kwargs.get("api_key", os.getenv("SENDGRID_API_KEY")),
                 retries=int(kwargs.get("retries", 3)),
                 retry_backoff=float(kwargs.get("retry_backoff", 10.0)),
+                client=kwargs.get("http_client"),
             )
         if backend == "mailgun":
             return _send_via_mailgun(
@@ -548,6 +703,7 @@ def send_email(
                 domain=kwargs.get("domain", os.getenv("MAILGUN_DOMAIN")),
                 retries=int(kwargs.get("retries", 3)),
                 retry_backoff=float(kwargs.get("retry_backoff", 10.0)),
+                client=kwargs.get("http_client"),
             )
         if backend == "brevo":
             return _send_via_brevo(
@@ -560,6 +716,7 @@ def send_email(
                 from_name=kwargs.get("from_name", os.getenv("BREVO_FROM_NAME", "ResearchPulse")),
                 retries=int(kwargs.get("retries", 3)),
                 retry_backoff=float(kwargs.get("retry_backoff", 10.0)),
+                client=kwargs.get("http_client"),
             )
         # 不支持的后端
         msg = f"Unsupported email backend: {backend}"
@@ -721,6 +878,15 @@ async def send_email_with_priority(
         Tuple[bool, str]: (success, error_message)
             (是否成功, 错误信息)
     """
+    configs = await _load_email_configs(session, backend_type)
+    return await _send_with_configs(configs, to_addrs, subject, body, html_body=html_body)
+
+
+async def _load_email_configs(session: Any, backend_type: Optional[str] = None) -> List[Any]:
+    """Load active email configs ordered by priority.
+
+    查询所有活跃的邮件配置，按优先级升序排列。
+    """
     from sqlalchemy import select
     from apps.crawler.models.config import EmailConfig
 
@@ -733,8 +899,21 @@ async def send_email_with_priority(
     query = query.order_by(EmailConfig.priority.asc())
 
     result = await session.execute(query)
-    configs = result.scalars().all()
+    return list(result.scalars().all())
 
+
+async def _send_with_configs(
+    configs: List[Any],
+    to_addrs: List[str],
+    subject: str,
+    body: str,
+    html_body: Optional[str] = None,
+    **send_kwargs: Any,
+) -> Tuple[bool, str]:
+    """Try email configs in order until one succeeds.
+
+    按给定顺序依次尝试邮件配置，直到发送成功或全部失败。
+    """
     if not configs:
         msg = "No active email configuration found in database"
         logger.error(msg)
@@ -751,6 +930,7 @@ async def send_email_with_priority(
             body=body,
             config=config,
             html_body=html_body,
+            **send_kwargs,
         )
 
         if ok:
@@ -772,13 +952,22 @@ async def _send_with_config(
     body: str,
     config: Any,  # EmailConfig
     html_body: Optional[str] = None,
+    smtp_pool: Optional[SMTPConnectionPool] = None,
+    http_client: Optional[httpx.Client] = None,
 ) -> Tuple[bool, str]:
     """Send email using a specific EmailConfig.
 
-    使用指定的邮件配置发送邮件。
+    使用指定的邮件配置发送邮件。smtp_pool / http_client 用于批量发送时复用连接。
     """
     import asyncio
 
+    # 仅在提供时传递连接复用参数
+    reuse = {
+        key: value
+        for key, value in (("smtp_pool", smtp_pool), ("http_client", http_client))
+        if value is not None
+    }
+
     def _send():
         from_addr = config.sender_email or ""
 
@@ -795,6 +984,7 @@ async def _send_with_config(
                 smtp_user=config.smtp_user,
                 smtp_password=config.smtp_password,
                 use_tls=config.smtp_use_tls,
+                **reuse,
             )
         elif config.backend_type == "sendgrid":
             return send_email(
@@ -805,6 +995,7 @@ async def _send_with_config(
                 backend="sendgrid",
                 from_addr=from_addr,
                 api_key=config.sendgrid_api_key,
+                **reuse,
             )
         elif config.backend_type == "mailgun":
             return send_email(
@@ -816,6 +1007,7 @@ async def _send_with_config(
                 from_addr=from_addr,
                 api_key=config.mailgun_api_key,
                 domain=config.mailgun_domain,
+                **reuse,
             )
         elif config.backend_type == "brevo":
             return send_email(
@@ -827,9 +1019,99 @@ async def _send_with_config(
                 from_addr=from_addr,
                 api_key=config.brevo_api_key,
                 from_name=config.brevo_from_name,
+                **reuse,
             )
         else:
             return False, f"Unknown backend type: {config.backend_type}"
 
     # 在线程池中执行同步发送
     return await asyncio.to_thread(_send)
+
+
+# ======================
+# 9. 批量发送（连接复用）
+# 订阅摘要等批量场景：配置只加载一次，SMTP 会话与 HTTP 连接在多封邮件间复用
+# ======================
+class EmailDelivery:
+    """Batch email sender reusing configs, SMTP sessions and HTTP keep-alive.
+
+    批量邮件发送器：数据库邮件配置只查询一次；SMTP 会话认证后在多封邮件间复用；
+    SendGrid / Mailgun / Brevo 共享一个 keep-alive 的 HTTP 客户端。
+    可在多个协程中并发调用 ``send``（发送在线程池中执行，连接池线程安全）。
+
+    Usage:
+        async with await EmailDelivery.create(session) as delivery:
+            ok, err = await delivery.send(["user@example.com"], "Subject", "Body")
+
+    Args:
+        configs: Active ``EmailConfig`` rows in priority order.
+        pool_size: Max idle SMTP sessions / HTTP keep-alive connections.
+        max_messages: Messages per SMTP session before it is recycled.
+        idle_timeout: Idle seconds after which a session is not reused.
+    """
+
+    def __init__(
+        self,
+        configs: Iterable[Any] = (),
+        pool_size: int = 5,
+        max_messages: int = 100,
+        idle_timeout: float = 30.0,
+    ):
+        self.configs = list(configs)
+        self.smtp_pool = SMTPConnectionPool(
+            max_idle=pool_size, max_messages=max_messages, idle_timeout=idle_timeout
+        )
+        self.http_client = httpx.Client(
+            timeout=30,
+            limits=httpx.Limits(
+                max_connections=max(pool_size, 1),
+                max_keepalive_connections=max(pool_size, 1),
+            ),
+        )
+
+    @classmethod
+    async def create(cls, session: Any = None, **kwargs: Any) -> "EmailDelivery":
+        """Build a delivery engine, loading active email configs from ``session``.
+
+        Args:
+            session: Optional async session; without it only ``send_kwargs``
+                based sends (``send_email``) are available.
+            **kwargs: Pool options passed to the constructor.
+
+        Returns:
+            EmailDelivery: Delivery engine (close it when done).
+        """
+        configs = await _load_email_configs(session) if session is not None else []
+        return cls(configs, **kwargs)
+
+    @property
+    def send_kwargs(self) -> Dict[str, Any]:
+        """Connection reuse kwargs for direct ``send_email`` calls."""
+        return {"smtp_pool": self.smtp_pool, "http_client": self.http_client}
+
+    async def send(
+        self,
+        to_addrs: List[str],
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+    ) -> Tuple[bool, str]:
+        """Send one email through the configs in priority order.
+
+        Returns:
+            Tuple[bool, str]: (success, error_message)
+        """
+        return await _send_with_configs(
+            self.configs, to_addrs, subject, body, html_body=html_body, **self.send_kwargs
+        )
+
+    def close(self) -> None:
+        """Close pooled SMTP sessions and the HTTP client."""
+        self.smtp_pool.close()
+        self.http_client.close()
+
+    async def __aenter__(self) -> "EmailDelivery":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -4,7 +4,8 @@
 # 架构角色: 作为运行时配置的核心服务层，位于 settings.py（静态配置）之上，
 #   提供动态、可热更新的配置能力。主要特点：
 #   1. 数据库持久化：配置存储在 system_config 表中
-#   2. 内存缓存：60 秒 TTL 的缓存层，减少数据库查询
+#   2. 内存缓存：60 秒 TTL 的缓存层，减少数据库查询；过期后在后台异步刷新
+#      （stale-while-revalidate），读取方永远不会阻塞在数据库查询上
 #   3. 默认值种子：首次启动时从 DEFAULT_CONFIGS 字典写入数据库
 #   4. 管理员可通过 API 动态修改配置，无需重启服务
 #   5. 功能开关（Feature Toggle）：控制各模块的启用/禁用状态
@@ -13,6 +14,9 @@
 #   - YAML defaults.yaml 仅作为首次运行的种子数据源
 #   - 运行时所有读取都通过内存缓存 -> 数据库的链路
 #   - 管理员通过 API 修改的值会直接更新数据库和缓存
+#   - 刷新先查询版本戳（行数 + 最大 updated_at），未变化时不加载数据，
+#     变化时只加载 updated_at 不早于上次版本的行
+#   - 调用方可通过 subscribe 订阅键变化，不必在热点循环中反复 get_*
 #   - 使用模块级单例模式（feature_config），全局共享同一实例
 # =============================================================================
 """Feature configuration service for ResearchPulse v2.
@@ -22,15 +26,20 @@ caching.  The ``SystemConfig`` table acts as the dynamic configuration hub:
 
 - YAML ``defaults.yaml`` serves only as the initial seed (first-run).
 - At runtime every read goes through an in-memory cache (TTL 60 s) backed
-  by the database.
+  by the database.  Inside an event loop an expired cache keeps serving the
+  old values while a background task revalidates it.
+- Refreshes compare a version stamp first and reload only changed rows.
 - Admin APIs can update values; changes take effect within the cache TTL.
+- ``subscribe()`` registers callbacks fired when keys change.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from fastapi import Depends, HTTPException
 
@@ -89,6 +98,7 @@ DEFAULT_CONFIGS: Dict[str, tuple[str, str]] = {
     "ai.claude_timeout": ("60", "Claude request timeout in seconds"),
     "ai.cache_enabled": ("true", "Enable AI result caching"),
     "ai.cache_ttl": ("86400", "AI cache TTL in seconds"),
+    "ai.cache_max_entries": ("50000", "Max AI result cache entries (LRU eviction)"),
     "ai.max_content_length": ("1500", "Max content length for AI processing"),
     "ai.max_title_length": ("200", "Max title length for AI processing"),
     "ai.thinking_enabled": ("false", "Enable thinking mode"),
@@ -101,7 +111,16 @@ DEFAULT_CONFIGS: Dict[str, tuple[str, str]] = {
     "ai.max_retries": ("3", "Max retry attempts for AI API calls"),
     "ai.retry_base_delay": ("1.0", "Retry base delay seconds (exponential backoff)"),
     "ai.batch_concurrency": ("1", "Batch concurrency (1=serial)"),
+    "ai.adaptive_concurrency": ("true", "Adapt provider concurrency to latency and overload feedback"),
+    "ai.adaptive_initial_concurrency": ("4", "Initial adaptive concurrency limit per AI backend"),
+    "ai.adaptive_min_concurrency": ("1", "Min adaptive concurrency limit per AI backend"),
+    "ai.adaptive_max_concurrency": ("16", "Max adaptive concurrency limit per AI backend"),
+    "ai.adaptive_latency_tolerance": ("1.5", "Max p50 latency ratio to baseline before reducing concurrency"),
+    "ai.stream_enabled": ("true", "Stream content analysis responses and stop once the result JSON is complete"),
     "ai.translate_max_tokens": ("4096", "Max output tokens for translation"),
+    "ai.translate_pack_enabled": ("true", "Pack multiple texts into one translation request"),
+    "ai.translate_pack_token_budget": ("1500", "Max estimated input tokens per packed translation request"),
+    "ai.translate_pack_max_items": ("20", "Max texts per packed translation request"),
     "ai.fallback_provider": ("", "Fallback AI provider"),
     # ---- 向量嵌入参数 ----
     "embedding.provider": ("sentence-transformers", "Embedding provider"),
@@ -111,23 +130,64 @@ DEFAULT_CONFIGS: Dict[str, tuple[str, str]] = {
     "embedding.milvus_host": ("localhost", "Milvus server host"),
     "embedding.milvus_port": ("19530", "Milvus server port"),
     "embedding.milvus_collection": ("article_embeddings", "Milvus collection name"),
+    "embedding.vector_store": ("milvus", "Vector store backend: milvus, local (in-process) or auto (local when Milvus is unreachable)"),
+    "embedding.local_dtype": ("float32", "Storage precision of a new local vector store: float32 or float16"),
+    "embedding.local_hnsw_threshold": ("50000", "Rows above which the local vector store searches an HNSW graph (needs hnswlib)"),
     # ---- 事件聚类参数 ----
     "event.rule_weight": ("0.4", "Rule-based weight for clustering"),
     "event.semantic_weight": ("0.6", "Semantic weight for clustering"),
     "event.min_similarity": ("0.7", "Minimum similarity threshold"),
+    "event.clustering_mode": ("lexical", "Event clustering mode: lexical or vector"),
+    "event.vector_min_similarity": ("0.75", "Minimum centroid cosine similarity in vector mode"),
+    "event.vector_tie_margin": ("0.02", "Cosine margin within which the lexical score breaks ties"),
+    "event.max_active_clusters": ("100", "Max active clusters matched per clustering run"),
     # ---- 流水线批处理参数 ----
     "pipeline.ai_batch_limit": ("200", "AI processing batch limit per run"),
     "pipeline.embedding_batch_limit": ("500", "Embedding computation batch limit per run"),
     "pipeline.event_batch_limit": ("500", "Event clustering batch limit per run"),
     "pipeline.action_batch_limit": ("200", "Action extraction batch limit per run"),
     "pipeline.worker_interval_minutes": ("10", "Pipeline worker polling interval in minutes"),
+    "pipeline.worker_concurrency": ("4", "Max concurrent stage runs per pipeline worker"),
+    "pipeline.claim_batch_size": ("50", "Pending pipeline tasks claimed per query"),
+    "pipeline.task_timeout_minutes": ("60", "Minutes before a running pipeline task is reclaimed (0 disables)"),
+    "pipeline.ai_concurrency": ("1", "Max concurrent AI stage runs"),
+    "pipeline.embedding_concurrency": ("2", "Max concurrent embedding stage runs"),
+    "pipeline.event_concurrency": ("1", "Max concurrent event clustering stage runs"),
+    "pipeline.action_concurrency": ("1", "Max concurrent action extraction stage runs"),
+    "pipeline.topic_concurrency": ("2", "Max concurrent topic match stage runs"),
     # ---- 数据保留参数 ----
     "retention.active_days": ("7", "Article active retention days"),
     "retention.archive_days": ("30", "Archive retention days"),
     "retention.backup_enabled": ("true", "Enable automatic backup"),
+    "backup.batch_size": ("1000", "Articles archived and deleted per backup batch (one short transaction each)"),
+    "backup.segment_max_mb": ("64", "Rotate to a new compressed backup segment after this many MB"),
+    "backup.compression": ("auto", "Backup segment codec: auto (zstd if installed, else gzip), zstd or gzip"),
+    "backup.restore_chunk_size": ("500", "Backup records checked and bulk-inserted per restore chunk"),
+    # ---- 去重参数 ----
+    "dedup.batch_size": ("1000", "New articles keyed and checked per dedup batch (one transaction each)"),
+    "dedup.delete_batch_size": ("200", "Max duplicate IDs per DELETE statement"),
+    "dedup.max_rows_per_run": ("50000", "Max new articles scanned by one dedup run (the rest waits for the next run)"),
+    "dedup.watermark_lag_seconds": ("600", "Dedup watermark does not pass articles crawled within this many seconds (0 disables)"),
+    "dedup.near_dup_enabled": ("true", "Detect cross-source near-duplicate articles (SimHash) when crawlers save"),
+    "dedup.near_dup_max_distance": ("6", "Max SimHash Hamming distance (of 64 bits) for a near-duplicate (0-15)"),
+    "dedup.near_dup_window_hours": ("72", "Rolling window of recent articles kept in the near-duplicate index"),
+    "dedup.near_dup_persist_seconds": ("300", "Min seconds between writes of the near-duplicate index to data_dir"),
     # ---- 缓存参数 ----
     "cache.enabled": ("false", "Enable caching"),
     "cache.default_ttl": ("300", "Default cache TTL in seconds"),
+    "cache.api_response_ttl": ("300", "TTL in seconds of cached source/category API responses"),
+    "cache.api_articles_ttl": ("60", "TTL in seconds of cached anonymous article list responses"),
+    "cache.article_count_ttl": ("120", "TTL in seconds of cached article list totals per filter"),
+    # ---- 全文检索参数 ----
+    "search.fts_enabled": ("true", "Use the full-text index (BM25) for article keyword search"),
+    "search.max_hits": ("1000", "Top BM25 hits filtered per keyword search; totals beyond it are estimated"),
+    # ---- 邮件投递参数 ----
+    "email.delivery_concurrency": ("5", "Concurrent digest sends (also the SMTP session / HTTP keep-alive pool size)"),
+    "email.smtp_max_messages_per_connection": ("100", "Messages sent on one pooled SMTP session before reconnecting"),
+    "email.notification_max_users": ("5000", "Max users processed by one notification run"),
+    "email.digest_candidate_limit": ("20000", "Max candidate articles loaded when matching digests to subscriptions"),
+    # ---- 认证参数 ----
+    "auth.principal_cache_ttl": ("30", "TTL in seconds of cached user flags and permissions per auth version (0 disables)"),
     # ---- JWT 参数 ----
     "jwt.access_token_expire_minutes": ("1440", "Access token expiration in minutes (default: 1 day)"),
     "jwt.refresh_token_expire_days": ("7", "Refresh token expiration in days"),
@@ -137,6 +197,17 @@ DEFAULT_CONFIGS: Dict[str, tuple[str, str]] = {
 # 60 秒的 TTL 意味着管理员修改配置后最多 60 秒内生效
 _CACHE_TTL = 60
 
+# 每隔多少次刷新做一次全量加载（兜底：同一秒内的多次修改、删除后又插入等
+# 版本戳无法区分的情况）
+_FULL_RELOAD_EVERY = 10
+
+# 版本戳查询：行数 + 最大更新时间，两者不变即视为配置未变化
+_VERSION_SQL = "SELECT COUNT(*), MAX(updated_at) FROM system_config"
+_SELECT_SQL = "SELECT config_key, config_value FROM system_config"
+
+# 订阅回调：callback(key, new_value)，键被删除时 new_value 为 None
+ConfigListener = Callable[[str, Optional[str]], Any]
+
 
 # =============================================================================
 # FeatureConfigService 类
@@ -145,7 +216,8 @@ _CACHE_TTL = 60
 #   - 使用字典作为内存缓存，简单高效
 #   - 缓存使用时间戳判断过期，而非每个键单独计时
 #   - 同时提供同步和异步接口，适应不同调用场景
-#   - 在异步事件循环已运行时，通过线程池执行同步数据库操作
+#   - 在异步事件循环已运行时，过期缓存由后台任务刷新，读取方直接返回旧值；
+#     仅在没有事件循环（脚本）或缓存为空（冷启动）时同步加载
 # =============================================================================
 class FeatureConfigService:
     """Database-backed configuration service with in-memory cache.
@@ -162,6 +234,16 @@ class FeatureConfigService:
         self._cache_ts: float = 0.0
         # 冻结标志：为 True 时跳过缓存刷新，适用于长时间批处理场景
         self._frozen: bool = False
+        # 上次加载时的版本戳 (行数, 最大 updated_at)
+        self._version: Optional[Tuple[Any, Any]] = None
+        # 刷新次数，用于周期性全量加载
+        self._refresh_count: int = 0
+        # 后台刷新任务（同一时刻最多一个）
+        self._refresh_task: Optional[asyncio.Task] = None
+        # 周期性刷新任务（start_watcher 启动）
+        self._watcher_task: Optional[asyncio.Task] = None
+        # 订阅者列表：(键或前缀, 是否前缀匹配, 回调)
+        self._listeners: List[Tuple[str, bool, ConfigListener]] = []
 
     # ------------------------------------------------------------------
     # 公开读取方法
@@ -280,7 +362,7 @@ class FeatureConfigService:
             asyncio.run(self._async_set(key, value, description, updated_by))
 
         # 写入数据库成功后，立即更新内存缓存以保证一致性
-        self._cache[key] = value
+        self.update_cached(key, value)
 
     async def async_set(
         self,
@@ -301,7 +383,62 @@ class FeatureConfigService:
         """
         await self._async_set(key, value, description, updated_by)
         # 写入成功后立即更新缓存
+        self.update_cached(key, value)
+
+    def update_cached(self, key: str, value: str) -> None:
+        """Update the in-memory value after a database write and notify listeners.
+
+        数据库写入成功后更新内存缓存（例如管理后台通过 ORM 直接修改配置后调用），
+        值发生变化时通知订阅者。
+
+        Args:
+            key: Configuration key.
+            value: New configuration value.
+        """
+        old = self._cache.get(key)
         self._cache[key] = value
+        if old != value:
+            self._notify({key: value})
+
+    # ------------------------------------------------------------------
+    # 变更订阅
+    # ------------------------------------------------------------------
+
+    def subscribe(self, key: str, callback: ConfigListener) -> Callable[[], None]:
+        """Register ``callback`` for changes of ``key``.
+
+        订阅配置变化：``key`` 以 ``.`` 或 ``*`` 结尾时按前缀匹配
+        （如 ``"event."``），否则精确匹配。回调在缓存更新后同步调用，
+        签名为 ``callback(key, new_value)``，应尽量轻量（通常只是更新本地变量）。
+
+        Args:
+            key: Exact key or prefix ending with ``.`` / ``*``.
+            callback: Listener invoked as ``callback(key, new_value)``.
+
+        Returns:
+            Callable[[], None]: Function that removes the subscription.
+        """
+        is_prefix = key.endswith((".", "*"))
+        entry = (key.rstrip("*"), is_prefix, callback)
+        self._listeners.append(entry)
+
+        def _unsubscribe() -> None:
+            if entry in self._listeners:
+                self._listeners.remove(entry)
+
+        return _unsubscribe
+
+    def _notify(self, changes: Dict[str, Optional[str]]) -> None:
+        """Invoke listeners for changed keys (listener errors are logged)."""
+        if not changes or not self._listeners:
+            return
+        for key, value in changes.items():
+            for pattern, is_prefix, callback in list(self._listeners):
+                if (key.startswith(pattern) if is_prefix else key == pattern):
+                    try:
+                        callback(key, value)
+                    except Exception as e:
+                        logger.warning("Config listener for %s failed: %s", key, e)
 
     # ------------------------------------------------------------------
     # 批量操作方法
@@ -326,11 +463,14 @@ class FeatureConfigService:
     def reload(self) -> None:
         """Force-refresh the cache from the database.
 
-        强制刷新缓存：将缓存时间戳重置为 0，触发下次读取时从数据库重新加载。
+        强制刷新缓存：同步从数据库全量重新加载。
         同步版本。
         """
-        self._cache_ts = 0.0
-        self._maybe_refresh_cache()
+        try:
+            self._sync_refresh_cache(full=True)
+        except Exception:
+            self._cache_ts = 0.0
+            self._maybe_refresh_cache()
 
     async def async_reload(self) -> None:
         """Async force-refresh.
@@ -338,7 +478,43 @@ class FeatureConfigService:
         异步版本的强制刷新缓存方法。
         """
         self._cache_ts = 0.0
-        await self._async_refresh_cache()
+        await self._async_refresh_cache(full=True)
+
+    def start_watcher(self, interval: float = _CACHE_TTL) -> None:
+        """Start a background task that revalidates the cache periodically.
+
+        启动周期性刷新任务：即使没有读取，配置变化也会在 ``interval`` 秒内
+        进入缓存并通知订阅者。需在事件循环中调用，重复调用无副作用。
+
+        Args:
+            interval: Seconds between revalidations.
+        """
+        if self._watcher_task is not None and not self._watcher_task.done():
+            return
+        self._watcher_task = asyncio.get_running_loop().create_task(
+            self._watch(max(1.0, interval))
+        )
+
+    async def stop_watcher(self) -> None:
+        """Cancel the periodic revalidation task."""
+        task, self._watcher_task = self._watcher_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _watch(self, interval: float) -> None:
+        """Periodic revalidation loop used by :meth:`start_watcher`."""
+        while True:
+            await asyncio.sleep(interval)
+            if self._frozen:
+                continue
+            try:
+                await self._async_refresh_cache()
+            except Exception as e:
+                logger.debug("Feature config revalidation failed: %s", e)
 
     def freeze(self) -> None:
         """Freeze the cache, preventing automatic refreshes.
@@ -403,16 +579,19 @@ class FeatureConfigService:
                     )
                     if not result.scalar():
                         # 键不存在，插入默认值
+                        now = datetime.now(timezone.utc)
                         await session.execute(
                             sa_text(
-                                "INSERT INTO system_config (config_key, config_value, description, is_sensitive) "
-                                "VALUES (:key, :value, :description, :sensitive)"
+                                "INSERT INTO system_config (config_key, config_value, description, is_sensitive, "
+                                "created_at, updated_at) "
+                                "VALUES (:key, :value, :description, :sensitive, :now, :now)"
                             ),
                             {
                                 "key": key,
                                 "value": value,
                                 "description": description,
                                 "sensitive": False,
+                                "now": now,
                             },
                         )
                         inserted += 1
@@ -436,13 +615,15 @@ class FeatureConfigService:
     # ------------------------------------------------------------------
 
     def _maybe_refresh_cache(self) -> None:
-        """Refresh cache if stale (sync path).
+        """Refresh cache if stale without blocking a running event loop.
 
-        检查缓存是否过期，过期则通过同步引擎从数据库重新加载。
-        使用独立的同步引擎避免在 async 上下文中创建第二个事件循环。
+        检查缓存是否过期：
+            - 事件循环中且缓存非空：立即返回旧值，并调度一个后台刷新任务
+              （stale-while-revalidate）
+            - 没有事件循环（脚本）或缓存为空（冷启动）：通过同步引擎加载
 
         Side Effects:
-            - Loads latest data when stale.
+            - Schedules a background refresh or loads latest data when stale.
             - Falls back to defaults if DB is unavailable.
         """
         # 冻结模式下跳过刷新
@@ -453,6 +634,15 @@ class FeatureConfigService:
         if time.monotonic() - self._cache_ts < _CACHE_TTL and self._cache:
             return
 
+        if self._cache:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                self._schedule_refresh(loop)
+                return
+
         try:
             self._sync_refresh_cache()
         except Exception:
@@ -463,14 +653,95 @@ class FeatureConfigService:
                 self._cache = {k: v for k, (v, _) in DEFAULT_CONFIGS.items()}
                 self._cache_ts = time.monotonic()
 
-    def _sync_refresh_cache(self) -> None:
-        """Load all config rows from DB using the sync engine.
+    def _schedule_refresh(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start a background refresh task unless one is already running."""
+        task = self._refresh_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._refresh_task = loop.create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        """Refresh in the background; on failure keep serving the old values."""
+        try:
+            await self._async_refresh_cache()
+        except Exception as e:
+            # 数据库暂时不可用：继续使用旧值，一个 TTL 后再试
+            logger.debug("Background feature config refresh failed: %s", e)
+            self._cache_ts = time.monotonic()
+
+    def _plan_refresh(
+        self, version: Tuple[Any, Any], full: bool
+    ) -> Optional[Tuple[str, Dict[str, Any], bool]]:
+        """Decide which rows to load for a version stamp.
+
+        根据版本戳决定加载范围：版本未变化返回 None；行数减少、首次加载、
+        周期性兜底或强制刷新时全量加载；否则只加载 updated_at 不早于上次
+        版本的行（含边界，避免同一时间戳内的后续修改被遗漏）。
+
+        Args:
+            version: ``(row_count, max_updated_at)`` from the database.
+            full: Force a full reload.
+
+        Returns:
+            Optional[Tuple[str, Dict[str, Any], bool]]: SQL, parameters and
+            whether the load is a full reload; None when unchanged.
+        """
+        self._refresh_count += 1
+        periodic = self._refresh_count % _FULL_RELOAD_EVERY == 0
+        if not full and not periodic and self._cache and version == self._version:
+            return None
+        previous = self._version
+        if (
+            full
+            or periodic
+            or not self._cache
+            or previous is None
+            or previous[1] is None
+            or version[0] < previous[0]
+        ):
+            return _SELECT_SQL, {}, True
+        return f"{_SELECT_SQL} WHERE updated_at >= :since", {"since": previous[1]}, False
+
+    def _apply_rows(
+        self,
+        rows: List[Tuple[str, str]],
+        version: Tuple[Any, Any],
+        full: bool,
+    ) -> Dict[str, Optional[str]]:
+        """Merge loaded rows into the cache and notify listeners.
+
+        全量加载时替换整个缓存，增量加载时只覆盖返回的键；
+        计算出实际变化的键并通知订阅者。
+
+        Returns:
+            Dict[str, Optional[str]]: Changed keys and their new values.
+        """
+        loaded = {row[0]: row[1] for row in rows}
+        new_cache = loaded if full else {**self._cache, **loaded}
+        changes = {
+            key: new_cache.get(key)
+            for key in set(self._cache) | set(new_cache)
+            if self._cache.get(key) != new_cache.get(key)
+        }
+        self._cache = new_cache
+        self._version = version
+        self._cache_ts = time.monotonic()
+        if changes:
+            logger.debug("Feature config changed: %s", sorted(changes))
+        self._notify(changes)
+        return changes
+
+    def _sync_refresh_cache(self, full: bool = False) -> None:
+        """Load changed config rows from DB using the sync engine.
 
         通过同步引擎直接读取 system_config 表，不涉及 asyncio 事件循环，
         从而避免跨事件循环污染连接池的问题。
 
+        Args:
+            full: Force a full reload instead of a version-stamped one.
+
         Side Effects:
-            - Replaces the cache dictionary.
+            - Updates the cache dictionary and version stamp.
             - Updates cache timestamp.
         """
         from sqlalchemy import text as sa_text
@@ -479,22 +750,28 @@ class FeatureConfigService:
 
         engine = get_sync_engine()
         with engine.connect() as conn:
-            result = conn.execute(
-                sa_text("SELECT config_key, config_value FROM system_config")
-            )
-            rows = result.all()
+            version = tuple(conn.execute(sa_text(_VERSION_SQL)).one())
+            plan = self._plan_refresh(version, full)
+            if plan is None:
+                self._cache_ts = time.monotonic()
+                return
+            sql, params, is_full = plan
+            rows = conn.execute(sa_text(sql), params).all()
 
-        self._cache = {row[0]: row[1] for row in rows}
-        self._cache_ts = time.monotonic()
+        self._apply_rows(rows, version, full=is_full)
+
+    async def _async_refresh_cache(self, full: bool = False) -> None:
+        """Load changed config rows from DB into the in-memory cache.
 
-    async def _async_refresh_cache(self) -> None:
-        """Load all config rows from DB into the in-memory cache.
+        从数据库的 system_config 表加载配置到内存缓存。
+        先查询版本戳，未变化时只更新时间戳；变化时按 _plan_refresh
+        加载全部或仅变化的行。
 
-        从数据库的 system_config 表加载所有配置到内存缓存。
-        全量加载策略：每次刷新都加载所有配置行，简单且保证一致性。
+        Args:
+            full: Force a full reload instead of a version-stamped one.
 
         Side Effects:
-            - Replaces the cache dictionary.
+            - Updates the cache dictionary and version stamp.
             - Updates cache timestamp.
         """
         from sqlalchemy import text as sa_text
@@ -503,15 +780,16 @@ class FeatureConfigService:
 
         session_factory = get_session_factory()
         async with session_factory() as session:
-            result = await session.execute(
-                sa_text("SELECT config_key, config_value FROM system_config")
-            )
-            rows = result.all()
+            version = tuple((await session.execute(sa_text(_VERSION_SQL))).one())
+            plan = self._plan_refresh(version, full)
+            if plan is None:
+                # 版本未变化：仅记录刷新时间戳，用于后续 TTL 判断
+                self._cache_ts = time.monotonic()
+                return
+            sql, params, is_full = plan
+            rows = (await session.execute(sa_text(sql), params)).all()
 
-        # 用数据库查询结果完全替换缓存
-        self._cache = {row[0]: row[1] for row in rows}
-        # 记录刷新时间戳，用于后续 TTL 判断
-        self._cache_ts = time.monotonic()
+        self._apply_rows(rows, version, full=is_full)
 
     async def _async_set(
         self,
@@ -551,8 +829,10 @@ class FeatureConfigService:
                 if result.scalar():
                     # 键已存在，执行 UPDATE
                     # 动态构建 SET 子句，只更新非 None 的字段
-                    params: dict[str, Any] = {"key": key, "value": value}
-                    set_parts = ["config_value = :value"]
+                    params: dict[str, Any] = {
+                        "key": key, "value": value, "now": datetime.now(timezone.utc),
+                    }
+                    set_parts = ["config_value = :value", "updated_at = :now"]
                     if description is not None:
                         set_parts.append("description = :description")
                         params["description"] = description
@@ -570,8 +850,9 @@ class FeatureConfigService:
                     # 键不存在，执行 INSERT
                     await session.execute(
                         sa_text(
-                            "INSERT INTO system_config (config_key, config_value, description, is_sensitive, updated_by) "
-                            "VALUES (:key, :value, :description, :sensitive, :updated_by)"
+                            "INSERT INTO system_config (config_key, config_value, description, is_sensitive, "
+                            "updated_by, created_at, updated_at) "
+                            "VALUES (:key, :value, :description, :sensitive, :updated_by, :now, :now)"
                         ),
                         {
                             "key": key,
@@ -579,6 +860,7 @@ class FeatureConfigService:
                             "description": description or "",
                             "sensitive": False,
                             "updated_by": updated_by,
+                            "now": datetime.now(timezone.utc),
                         },
                     )
                 await session.commit()
@@ -616,8 +898,10 @@ class FeatureConfigService:
                 {"key": key},
             )
             if result.scalar():
-                params: dict[str, Any] = {"key": key, "value": value}
-                set_parts = ["config_value = :value"]
+                params: dict[str, Any] = {
+                    "key": key, "value": value, "now": datetime.now(timezone.utc),
+                }
+                set_parts = ["config_value = :value", "updated_at = :now"]
                 if description is not None:
                     set_parts.append("description = :description")
                     params["description"] = description
@@ -634,8 +918,9 @@ class FeatureConfigService:
             else:
                 conn.execute(
                     sa_text(
-                        "INSERT INTO system_config (config_key, config_value, description, is_sensitive, updated_by) "
-                        "VALUES (:key, :value, :description, :sensitive, :updated_by)"
+                        "INSERT INTO system_config (config_key, config_value, description, is_sensitive, "
+                        "updated_by, created_at, updated_at) "
+                        "VALUES (:key, :value, :description, :sensitive, :updated_by, :now, :now)"
                     ),
                     {
                         "key": key,
@@ -643,6 +928,7 @@ class FeatureConfigService:
                         "description": description or "",
                         "sensitive": False,
                         "updated_by": updated_by,
+                        "now": datetime.now(timezone.utc),
                     },
                 )
 
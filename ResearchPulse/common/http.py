@@ -9,6 +9,8 @@
 #   4. HTTP 客户端自动回收：每 N 次请求或连续错误后重建连接池
 #   5. 可选的响应缓存（委托给 cache 模块）
 #   6. 请求频率控制（delay + jitter 防止被封禁）
+#   7. 可选的条件请求（ETag / Last-Modified / 内容哈希，委托给 http_validators 模块），
+#      内容未变化时返回 NOT_MODIFIED，调用方可跳过解析与入库
 #
 # 设计决策:
 #   - 使用 httpx.Client（同步），而非 httpx.AsyncClient，因为爬虫任务在线程池中执行
@@ -23,16 +25,32 @@ import random
 import time
 import hashlib
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import httpx
 
 # 导入缓存模块的读写函数
 from common.cache import cache_response, get_cached_response
+from common.http_validators import Validators, content_hash, validator_key, validator_store
 
 logger = logging.getLogger(__name__)
 
+
+class NotModified:
+    """Sentinel type returned by conditional requests for unchanged content.
+
+    条件请求的"未修改"结果：服务器返回 304，或响应内容哈希与上次一致。
+    调用方应使用 ``result is NOT_MODIFIED`` 判断。
+    """
+
+    def __repr__(self) -> str:
+        return "NOT_MODIFIED"
+
+
+# 条件请求"未修改"结果的单例
+NOT_MODIFIED = NotModified()
+
 # 全局共享的 httpx 客户端实例（惰性创建）
 _client: Optional[httpx.Client] = None
 # 当前客户端已处理的请求计数
@@ -223,7 +241,9 @@ def get_text(
     jitter: float = 0.0,
     cache_ttl: int = 0,
     referer: Optional[str] = None,
-) -> str:
+    conditional: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> Union[str, NotModified]:
     """Fetch text from a URL with retries, rate limiting, and caching.
 
     Improvements:
@@ -245,9 +265,13 @@ def get_text(
         jitter: Random jitter (+-) added to delay.
         cache_ttl: Cache TTL in seconds (0 disables caching).
         referer: Optional Referer header to include.
+        conditional: Send stored ETag / Last-Modified validators and return
+            ``NOT_MODIFIED`` on 304 or an unchanged body. New validators are
+            staged; call ``commit_validators`` once the body was processed.
+        headers: Extra headers overriding the generated browser headers.
 
     Returns:
-        str: Response text body.
+        Union[str, NotModified]: Response text body, or ``NOT_MODIFIED``.
 
     Raises:
         RuntimeError: If all retries are exhausted.
@@ -264,6 +288,10 @@ def get_text(
     last_error: Optional[Exception] = None
     client = get_client(timeout=timeout)
 
+    # 条件请求：读取上次的校验信息
+    vkey = validator_key(url, params) if conditional else ""
+    previous, conditional_headers = _conditional_headers(vkey)
+
     # 为每个请求构建独立的超时配置
     # connect 和 pool 超时有上限保护，防止过大的 timeout 导致连接阶段等待过久
     req_timeout = httpx.Timeout(
@@ -293,6 +321,9 @@ def get_text(
             # 对 API/Feed 类端点使用 XML Accept 头
             if "api/query" in url or "/rss/" in url:
                 req_headers["Accept"] = _ACCEPT_XML
+            req_headers.update(conditional_headers)
+            if headers:
+                req_headers.update(headers)
 
             response = client.get(
                 url, params=params, timeout=req_timeout, headers=req_headers
@@ -319,6 +350,11 @@ def get_text(
                 client = get_client(timeout=timeout)
                 continue
 
+            # 304：内容未变化（仅条件请求会收到）
+            if vkey and response.status_code == 304:
+                _consecutive_errors = 0
+                return NOT_MODIFIED
+
             # 其他非 2xx 状态码将抛出 HTTPStatusError
             response.raise_for_status()
 
@@ -334,7 +370,7 @@ def get_text(
             if _request_count >= _SESSION_ROTATE_EVERY:
                 rotate_client()
 
-            return response.text
+            return _conditional_result(vkey, previous, response)
 
         except httpx.HTTPStatusError as exc:
             last_error = exc
@@ -416,6 +452,77 @@ def _parse_retry_after(value: Optional[str]) -> float:
         return 5.0
 
 
+def _conditional_headers(vkey: str) -> Tuple[Optional[Validators], Dict[str, str]]:
+    """Load stored validators and build conditional request headers.
+
+    读取 URL 上次的校验信息，构造 If-None-Match / If-Modified-Since 请求头。
+
+    Args:
+        vkey: Validator key ("" when the request is not conditional).
+
+    Returns:
+        Tuple of (stored validators or None, extra request headers).
+    """
+    if not vkey:
+        return None, {}
+    previous = validator_store.get(vkey)
+    return previous, (previous.request_headers() if previous else {})
+
+
+def _conditional_result(
+    vkey: str,
+    previous: Optional[Validators],
+    response: httpx.Response,
+) -> Union[str, NotModified]:
+    """Stage new validators and detect unchanged content for a 2xx response.
+
+    暂存本次响应的校验信息（由调用方在处理成功后 commit_validators 提交），
+    响应内容哈希与上次一致时返回 NOT_MODIFIED。
+
+    Args:
+        vkey: Validator key ("" when the request is not conditional).
+        previous: Validators stored before this request.
+        response: Successful response.
+
+    Returns:
+        Union[str, NotModified]: Response text, or NOT_MODIFIED.
+    """
+    text = response.text
+    if not vkey:
+        return text
+    digest = content_hash(text)
+    validator_store.stage(vkey, Validators(
+        etag=response.headers.get("ETag", ""),
+        last_modified=response.headers.get("Last-Modified", ""),
+        content_hash=digest,
+    ))
+    if previous is not None and previous.content_hash == digest:
+        return NOT_MODIFIED
+    return text
+
+
+def commit_validators(url: str, params: Optional[Dict[str, Any]] = None) -> None:
+    """Persist validators staged by a conditional request.
+
+    在抓取结果处理（解析、入库）成功后调用，使下次请求可以使用条件请求头。
+
+    Args:
+        url: Request URL.
+        params: Query parameters used for the request.
+    """
+    validator_store.commit(validator_key(url, params))
+
+
+def discard_validators(url: str, params: Optional[Dict[str, Any]] = None) -> None:
+    """Drop validators staged by a conditional request (processing failed).
+
+    Args:
+        url: Request URL.
+        params: Query parameters used for the request.
+    """
+    validator_store.discard(validator_key(url, params))
+
+
 # =============================================================================
 # 异步 HTTP 客户端
 # 用于爬虫模块的异步 HTTP 请求，避免阻塞事件循环
@@ -538,7 +645,9 @@ async def get_text_async(
     jitter: float = 0.0,
     cache_ttl: int = 0,
     referer: Optional[str] = None,
-) -> str:
+    conditional: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> Union[str, NotModified]:
     """Fetch text from a URL asynchronously with retries and rate limiting.
 
     异步获取 URL 文本内容，具备完善的重试、频率控制和缓存机制。
@@ -554,9 +663,13 @@ async def get_text_async(
         jitter: Random jitter (+-) added to delay.
         cache_ttl: Cache TTL in seconds (0 disables caching).
         referer: Optional Referer header to include.
+        conditional: Send stored ETag / Last-Modified validators and return
+            ``NOT_MODIFIED`` on 304 or an unchanged body. New validators are
+            staged; call ``commit_validators`` once the body was processed.
+        headers: Extra headers overriding the generated browser headers.
 
     Returns:
-        str: Response text body.
+        Union[str, NotModified]: Response text body, or ``NOT_MODIFIED``.
 
     Raises:
         RuntimeError: If all retries are exhausted.
@@ -573,6 +686,10 @@ async def get_text_async(
     last_error: Optional[Exception] = None
     client = get_async_client(timeout=timeout)
 
+    # 条件请求：读取上次的校验信息
+    vkey = validator_key(url, params) if conditional else ""
+    previous, conditional_headers = _conditional_headers(vkey)
+
     # 为每个请求构建独立的超时配置
     req_timeout = httpx.Timeout(
         connect=min(timeout, 10.0),
@@ -600,6 +717,9 @@ async def get_text_async(
             # 对 API/Feed 类端点使用 XML Accept 头
             if "api/query" in url or "/rss/" in url:
                 req_headers["Accept"] = _ACCEPT_XML
+            req_headers.update(conditional_headers)
+            if headers:
+                req_headers.update(headers)
 
             response = await client.get(
                 url, params=params, timeout=req_timeout, headers=req_headers
@@ -622,6 +742,11 @@ async def get_text_async(
                 client = get_async_client(timeout=timeout)
                 continue
 
+            # 304：内容未变化（仅条件请求会收到）
+            if vkey and response.status_code == 304:
+                _consecutive_errors = 0
+                return NOT_MODIFIED
+
             response.raise_for_status()
 
             # 请求成功，缓存响应
@@ -636,7 +761,7 @@ async def get_text_async(
             if _async_request_count >= _SESSION_ROTATE_EVERY:
                 await rotate_async_client()
 
-            return response.text
+            return _conditional_result(vkey, previous, response)
 
         except httpx.HTTPStatusError as exc:
             last_error = exc
@@ -684,7 +809,7 @@ async def get_text_async(
                         if cache_ttl > 0:
                             cache_response(url, relaxed_resp.text, params)
                         _consecutive_errors = 0
-                        return relaxed_resp.text
+                        return _conditional_result(vkey, previous, relaxed_resp)
                 except Exception as ssl_retry_exc:
                     logger.debug(
                         "Relaxed SSL retry also failed for %s: %s", url, ssl_retry_exc
@@ -711,7 +836,7 @@ async def get_text_async(
                             if cache_ttl > 0:
                                 cache_response(url, plain_resp.text, params)
                             _consecutive_errors = 0
-                            return plain_resp.text
+                            return _conditional_result(vkey, previous, plain_resp)
                     except Exception as http_retry_exc:
                         logger.debug(
                             "HTTP fallback also failed for %s: %s", http_url, http_retry_exc
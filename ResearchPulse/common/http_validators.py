@@ -0,0 +1,209 @@
+# =============================================================================
+# 模块: common/http_validators.py
+# 功能: HTTP 条件请求（Conditional GET）的校验信息持久化存储
+# 架构角色: 作为 common/http.py 的配套模块，按 URL 保存上次成功抓取的
+#   ETag、Last-Modified 与响应内容哈希，供下一次请求附带
+#   If-None-Match / If-Modified-Since 请求头，并判断内容是否变化。
+#
+# 设计决策:
+#   - 使用标准库 sqlite3 存储在 data_dir 下，不依赖业务数据库：
+#     同步与异步请求路径都能直接读写，多进程（Web 服务 + 爬虫脚本）共享
+#   - 两阶段写入：请求成功后先暂存（stage），由调用方在数据落库成功后提交（commit）；
+#     若解析或保存失败则丢弃（discard），避免"校验信息已更新但数据没存下来"
+#     导致后续请求一直返回未修改
+#   - 数据目录不可写时自动退化为仅内存存储，不影响抓取功能
+# =============================================================================
+
+"""Persistent ETag / Last-Modified / content-hash storage for conditional GETs."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+# 存储文件名（位于 settings.data_dir 下）
+VALIDATOR_DB_FILENAME = "http_validators.sqlite3"
+
+
+@dataclass
+class Validators:
+    """Validators recorded for a URL.
+
+    某个 URL 上次成功抓取时的校验信息。
+
+    Attributes:
+        etag: ``ETag`` response header.
+        last_modified: ``Last-Modified`` response header.
+        content_hash: SHA-256 of the response body.
+    """
+    etag: str = ""
+    last_modified: str = ""
+    content_hash: str = ""
+
+    def request_headers(self) -> Dict[str, str]:
+        """Return the conditional request headers for these validators."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def validator_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Build the storage key for a URL and its query parameters.
+
+    Args:
+        url: Request URL.
+        params: Optional query parameters.
+
+    Returns:
+        str: Storage key.
+    """
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()), doseq=True)}"
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of a response body."""
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+class ValidatorStore:
+    """SQLite-backed validator storage with staged writes.
+
+    条件请求校验信息存储：已提交的记录持久化到 SQLite，暂存记录保存在内存。
+
+    Args:
+        path: SQLite file path; ``None`` keeps everything in memory.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._opened = False
+        self._memory: Dict[str, Validators] = {}
+        self._pending: Dict[str, Validators] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite file lazily (None when unavailable)."""
+        if self._opened:
+            return self._conn
+        self._opened = True
+        if self._path is None:
+            return None
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._path), timeout=5.0, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_validators ("
+                " key TEXT PRIMARY KEY,"
+                " etag TEXT NOT NULL DEFAULT '',"
+                " last_modified TEXT NOT NULL DEFAULT '',"
+                " content_hash TEXT NOT NULL DEFAULT '',"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Validator store unavailable at {self._path}, using memory only: {e}")
+            self._conn = None
+        return self._conn
+
+    def get(self, key: str) -> Optional[Validators]:
+        """Return committed validators for ``key``.
+
+        Args:
+            key: Key from :func:`validator_key`.
+
+        Returns:
+            Optional[Validators]: Stored validators, or None.
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return self._memory.get(key)
+            try:
+                row = conn.execute(
+                    "SELECT etag, last_modified, content_hash FROM http_validators WHERE key = ?",
+                    (key,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug(f"Validator lookup failed for {key}: {e}")
+                return None
+            return Validators(*row) if row else None
+
+    def stage(self, key: str, validators: Validators) -> None:
+        """Hold new validators until the caller commits them."""
+        with self._lock:
+            self._pending[key] = validators
+
+    def commit(self, key: str) -> None:
+        """Persist staged validators for ``key`` (no-op when nothing staged)."""
+        with self._lock:
+            validators = self._pending.pop(key, None)
+            if validators is None:
+                return
+            conn = self._connect()
+            if conn is None:
+                self._memory[key] = validators
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO http_validators"
+                    " (key, etag, last_modified, content_hash, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, validators.etag, validators.last_modified,
+                     validators.content_hash, time.time()),
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to persist validators for {key}: {e}")
+
+    def discard(self, key: str) -> None:
+        """Drop staged validators for ``key``."""
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def forget(self, key: str) -> None:
+        """Remove committed and staged validators (forces a full fetch)."""
+        with self._lock:
+            self._pending.pop(key, None)
+            self._memory.pop(key, None)
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    conn.execute("DELETE FROM http_validators WHERE key = ?", (key,))
+                    conn.commit()
+                except sqlite3.Error as e:
+                    logger.debug(f"Failed to forget validators for {key}: {e}")
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._opened = False
+
+
+def _create_validator_store() -> ValidatorStore:
+    """Build the shared store under ``settings.data_dir``."""
+    from settings import settings
+
+    return ValidatorStore(Path(settings.data_dir) / VALIDATOR_DB_FILENAME)
+
+
+# 模块级单例，所有条件请求共享
+validator_store = _create_validator_store()
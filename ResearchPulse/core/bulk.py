@@ -0,0 +1,137 @@
+# =============================================================================
+# 模块: core/bulk.py
+# 功能: 方言感知的批量写入语句构造工具
+# 架构角色: 数据访问基础层的补充。生产环境使用 MySQL，测试使用 SQLite，
+#   两者的 "插入或更新" / "插入或忽略" 语法不同：
+#     - MySQL:  INSERT ... ON DUPLICATE KEY UPDATE / INSERT IGNORE
+#     - SQLite / PostgreSQL: INSERT ... ON CONFLICT (...) DO UPDATE / DO NOTHING
+#   本模块根据会话绑定的方言构造对应语句，调用方无需关心差异。
+#
+# 设计决策:
+#   - 只负责构造语句，不负责执行，事务边界仍由调用方控制
+#   - 多行 VALUES 一次写入，使批量写入的数据库往返次数与批次大小无关
+#   - 支持 RETURNING 的方言（SQLite / PostgreSQL）直接返回主键，
+#     MySQL 需调用方按唯一键回查
+# =============================================================================
+
+"""Dialect-aware bulk insert helpers."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import Insert
+
+# 单条多行 INSERT 的最大行数，避免超出 MySQL max_allowed_packet
+BULK_CHUNK_SIZE = 500
+
+
+def get_dialect_name(session: AsyncSession) -> str:
+    """Return the dialect name bound to a session.
+
+    获取会话绑定的数据库方言名称（mysql / sqlite / postgresql）。
+
+    Args:
+        session: Async database session.
+
+    Returns:
+        str: Dialect name.
+    """
+    return session.get_bind().dialect.name
+
+
+def supports_returning(dialect_name: str) -> bool:
+    """Return whether ``INSERT ... RETURNING`` is usable for upserts.
+
+    Args:
+        dialect_name: Dialect name from :func:`get_dialect_name`.
+
+    Returns:
+        bool: True for SQLite and PostgreSQL.
+    """
+    return dialect_name in ("sqlite", "postgresql")
+
+
+def chunked(rows: Sequence[Any], size: int = BULK_CHUNK_SIZE) -> Iterable[Sequence[Any]]:
+    """Yield ``rows`` in fixed-size chunks.
+
+    Args:
+        rows: Sequence to split.
+        size: Chunk size.
+
+    Yields:
+        Sequence[Any]: Consecutive slices of ``rows``.
+    """
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _dialect_insert(dialect_name: str, table: Table):
+    """Return the dialect-specific ``insert()`` construct for ``table``."""
+    if dialect_name == "mysql":
+        return mysql.insert(table)
+    if dialect_name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def build_upsert(
+    dialect_name: str,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> Insert:
+    """Build a multi-row ``INSERT ... ON DUPLICATE KEY UPDATE / ON CONFLICT``.
+
+    构造多行插入或更新语句：冲突时用新值覆盖 update_columns 中的列。
+
+    Args:
+        dialect_name: Target dialect name.
+        table: Target table.
+        rows: Row dictionaries (all with the same keys).
+        conflict_columns: Columns of the unique index used for conflicts.
+        update_columns: Columns overwritten when the row already exists.
+
+    Returns:
+        Insert: Executable insert statement.
+    """
+    stmt = _dialect_insert(dialect_name, table).values(rows)
+    if dialect_name == "mysql":
+        return stmt.on_duplicate_key_update(
+            {col: stmt.inserted[col] for col in update_columns}
+        )
+    return stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={col: stmt.excluded[col] for col in update_columns},
+    )
+
+
+def build_insert_ignore(
+    dialect_name: str,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    conflict_columns: Sequence[str] | None = None,
+) -> Insert:
+    """Build a multi-row insert that silently skips duplicates.
+
+    构造多行插入语句，唯一键冲突的行被忽略（INSERT IGNORE / DO NOTHING）。
+
+    Args:
+        dialect_name: Target dialect name.
+        table: Target table.
+        rows: Row dictionaries (all with the same keys).
+        conflict_columns: Optional unique columns (any conflict when omitted).
+
+    Returns:
+        Insert: Executable insert statement.
+    """
+    stmt = _dialect_insert(dialect_name, table).values(rows)
+    if dialect_name == "mysql":
+        return stmt.prefix_with("IGNORE")
+    if conflict_columns:
+        return stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+    return stmt.on_conflict_do_nothing()
@@ -46,6 +46,11 @@ from typing import Any, Optional
 logger = logging.getLogger(__name__)
 
 
+def _counter_seed() -> int:
+    """Initial value for a missing counter (milliseconds since the epoch)."""
+    return int(time.time() * 1000)
+
+
 class CacheBackend:
     """Abstract cache backend interface.
 
@@ -107,6 +112,21 @@ class CacheBackend:
         # 返回值：True 表示存在，False 表示不存在
         raise NotImplementedError
 
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer counter without expiry.
+
+        Missing counters start from a time-based value, so a counter that was
+        evicted or lost never repeats a value it had before.
+
+        Args:
+            key: Counter key.
+
+        Returns:
+            int: Counter value after the increment.
+        """
+        # 原子递增计数器（用于缓存标签的版本号），计数器不过期
+        raise NotImplementedError
+
     def clear(self) -> None:
         """Clear all cached values.
 
@@ -199,6 +219,19 @@ class MemoryCache(CacheBackend):
                 return False
             return True
 
+    def incr(self, key: str) -> int:
+        # 递增计数器：不存在时从毫秒时间戳起算，计数器不设过期时间
+        with self._lock:
+            if key in self._store and not self._is_expired(key):
+                self._store.move_to_end(key)
+                value = int(self._store[key]) + 1
+            else:
+                self._evict(key)
+                self._evict_lru()
+                value = _counter_seed()
+            self._store[key] = value
+            return value
+
     def clear(self) -> None:
         # 清空所有缓存数据
         with self._lock:
@@ -232,6 +265,10 @@ class NoCache(CacheBackend):
         # 始终返回 False，表示键不存在
         return False
 
+    def incr(self, key: str) -> int:
+        # 不保存计数器，始终返回 0
+        return 0
+
     def clear(self) -> None:
         # 不执行任何操作
         pass
@@ -320,6 +357,15 @@ class RedisCache(CacheBackend):
             logger.warning(f"Redis exists error for key {key}: {e}")
             return False
 
+    def incr(self, key: str) -> int:
+        # 计数器不存在时先以时间戳初始化（NX 保证并发下只初始化一次），再原子递增
+        try:
+            self.client.set(key, _counter_seed() - 1, nx=True)
+            return int(self.client.incr(key))
+        except Exception as e:
+            logger.warning(f"Redis incr error for key {key}: {e}")
+            return 0
+
     def clear(self) -> None:
         # 清空当前 Redis 数据库中的所有数据
         # 注意：flushdb 只清空当前数据库，不影响其他数据库编号的数据
@@ -457,6 +503,18 @@ class CacheProxy:
         # 代理 exists 操作到实际的缓存后端
         return self._cache.exists(key)
 
+    def incr(self, key: str) -> int:
+        """Proxy incr operation.
+
+        Args:
+            key: Counter key.
+
+        Returns:
+            int: Counter value after the increment.
+        """
+        # 代理 incr 操作到实际的缓存后端
+        return self._cache.incr(key)
+
     def clear(self) -> None:
         """Proxy clear operation."""
         # 代理 clear 操作到实际的缓存后端
@@ -20,6 +20,9 @@
 #     → get_current_active_user（必须活跃） → get_superuser（必须超管）
 #   - 使用 Annotated 类型别名简化路由函数的类型标注
 #   - require_permissions 使用高阶函数（闭包）模式，动态生成权限检查依赖
+#   - 认证主体缓存：用户字段、角色与解析后的权限集合按"用户 ID + 认证版本号"缓存（短 TTL），
+#     命中时不查询数据库，用户对象通过 session.merge(load=False) 挂到当前会话；
+#     修改用户、角色或权限时调用 invalidate_principal 递增版本号使缓存失效
 # =============================================================================
 
 """FastAPI dependencies for ResearchPulse v2.
@@ -29,16 +32,28 @@ Provides authentication and authorization dependencies.
 
 from __future__ import annotations
 
-from typing import Annotated
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Annotated, Any, Dict, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 
+from common.feature_config import feature_config
+from core.cache import MemoryCache, cache
 from core.database import get_session
 from core.security import decode_token
 
+if TYPE_CHECKING:
+    # 仅用于类型注解；运行时在函数内延迟导入，避免循环依赖
+    from core.models.user import User
+
+logger = logging.getLogger(__name__)
+
 # HTTP Bearer 令牌方案配置
 # auto_error=False：当请求中没有携带 Bearer 令牌时不自动抛出 401 错误，
 # 而是返回 None，这样可以在依赖函数中自行决定是否强制要求认证
@@ -106,9 +121,6 @@ async def get_current_user(
         HTTPException: If the request is unauthenticated, token is invalid,
             token type is not ``access``, or the user does not exist/is disabled.
     """
-    # 延迟导入 User 模型，避免循环依赖
-    from core.models.user import User
-
     # ---- 第一步：验证是否携带了认证凭证 ----
     if not credentials:
         raise HTTPException(
@@ -156,12 +168,11 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # ---- 第五步：从数据库中查询用户记录 ----
-    result = await session.execute(select(User).where(User.id == user_id_int))
-    user = result.scalar_one_or_none()
+    # ---- 第五步：解析认证主体（优先读缓存，未命中时查询数据库） ----
+    principal = await get_principal(session, user_id_int)
 
     # 用户可能已被删除（令牌仍有效但用户记录不存在）
-    if not user:
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
@@ -170,13 +181,15 @@ async def get_current_user(
 
     # ---- 第六步：检查用户是否处于活跃状态 ----
     # 被禁用的用户即使持有有效令牌也不能访问系统
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is disabled",
         )
 
-    return user
+    # 将缓存的用户快照挂到当前会话（不查询数据库）；
+    # 缓存未命中时用户已在会话中，merge 直接返回已加载的对象
+    return await session.merge(principal.to_user(), load=False)
 
 
 async def get_current_active_user(
@@ -255,20 +268,12 @@ def require_permissions(*required_permissions: str):
         if user.is_superuser:
             return user
 
-        # ---- 查询用户通过角色关联获得的所有权限 ----
+        # ---- 获取用户通过角色关联获得的所有权限 ----
         # Get user's permissions through roles
-        from core.models.permission import RolePermission, Permission
-        from core.models.user import UserRole
-
-        # 通过关联表链 user_roles -> role_permissions -> permissions
-        # 查询当前用户拥有的所有权限名称
-        result = await session.execute(
-            select(Permission.name)
-            .join(RolePermission, RolePermission.permission_id == Permission.id)
-            .join(UserRole, UserRole.role_id == RolePermission.role_id)
-            .where(UserRole.user_id == user.id)
-        )
-        user_permissions = {row[0] for row in result.all()}
+        # 权限集合随认证主体一起缓存（user_roles -> role_permissions -> permissions），
+        # 与 get_current_user 使用同一缓存条目，通常不再查询数据库
+        principal = await get_principal(session, user.id)
+        user_permissions = principal.permissions if principal else frozenset()
 
         # ---- 检查是否缺少必需的权限 ----
         # 使用集合差集运算找出用户缺少的权限
@@ -286,6 +291,171 @@ def require_permissions(*required_permissions: str):
     return permission_checker
 
 
+# =============================================================================
+# 认证主体缓存
+# =============================================================================
+# 缓存键包含全局与用户级两个认证版本号，各自同时记录在进程内计数器与共享缓存（Redis）中：
+#   - invalidate_principal(user_id)：用户字段或角色变更，只影响该用户
+#   - invalidate_principal()：角色或权限定义变更，影响所有用户
+# 传入 session 时事务提交后再递增一次，避免提交前并发请求把旧数据以新版本号写入缓存。
+# 缓存条目保存在进程内（用户对象快照无需序列化），TTL 兜底其他进程的修改。
+
+_PRINCIPAL_VERSION_KEY = "auth:ver"
+_SESSION_INVALIDATIONS_KEY = "principal_invalidations"
+# 全局失效标记（角色/权限定义变更）
+_ALL_USERS = 0
+
+_principal_cache = MemoryCache(maxsize=4096)
+
+
+def _column_state(obj: Any) -> Dict[str, Any]:
+    """Return the column attribute values of an ORM instance."""
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+
+
+def _detached(model: type, state: Dict[str, Any]) -> Any:
+    """Build a detached instance whose attributes count as loaded from the DB."""
+    obj = model(**state)
+    make_transient_to_detached(obj)
+    return obj
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Cached authentication state of a user.
+
+    Attributes:
+        user_id: User ID.
+        is_active: Whether the account is active.
+        is_superuser: Whether the user is a superuser.
+        permissions: Permission names granted through the user's roles.
+        user_state: Column values of the user row.
+        roles: ``(role_state, (permission_state, ...))`` per role.
+    """
+
+    user_id: int
+    is_active: bool
+    is_superuser: bool
+    permissions: frozenset
+    user_state: Dict[str, Any]
+    roles: Tuple[Tuple[Dict[str, Any], Tuple[Dict[str, Any], ...]], ...]
+
+    @classmethod
+    def from_user(cls, user: "User") -> "Principal":
+        """Snapshot a loaded user (roles and permissions are eager-loaded)."""
+        roles = tuple(
+            (_column_state(role), tuple(_column_state(p) for p in role.permissions))
+            for role in user.roles
+        )
+        return cls(
+            user_id=user.id,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            permissions=frozenset(p.name for role in user.roles for p in role.permissions),
+            user_state=_column_state(user),
+            roles=roles,
+        )
+
+    def to_user(self) -> "User":
+        """Rebuild a detached ``User`` (with roles and permissions) from the snapshot."""
+        from core.models.permission import Permission, Role
+        from core.models.user import User
+
+        user = _detached(User, self.user_state)
+        roles = []
+        for role_state, permission_states in self.roles:
+            role = _detached(Role, role_state)
+            set_committed_value(
+                role, "permissions", [_detached(Permission, p) for p in permission_states]
+            )
+            roles.append(role)
+        set_committed_value(user, "roles", roles)
+        return user
+
+
+def _principal_key(user_id: int) -> str:
+    """Cache key of a user's principal at the current auth versions."""
+    keys = (_PRINCIPAL_VERSION_KEY, f"{_PRINCIPAL_VERSION_KEY}:{user_id}")
+    versions = [_principal_cache.get(k) for k in keys] + [cache.get(k) for k in keys]
+    return f"principal:{user_id}:" + ":".join(str(v or 0) for v in versions)
+
+
+async def get_principal(session: AsyncSession, user_id: int) -> Optional[Principal]:
+    """Resolve a user's principal, from cache when possible.
+
+    缓存未命中时查询用户（角色与权限随 selectin 预加载），用户对象留在当前会话中。
+
+    Args:
+        session: Async database session.
+        user_id: User ID.
+
+    Returns:
+        Optional[Principal]: Principal, or None if the user does not exist.
+    """
+    from core.models.user import User
+
+    ttl = feature_config.get_int("auth.principal_cache_ttl", 30)
+    key = _principal_key(user_id) if ttl > 0 else None
+    if key is not None:
+        principal = _principal_cache.get(key)
+        if principal is not None:
+            return principal
+
+    result = await session.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    if key is not None:
+        _principal_cache.set(key, principal, ttl)
+    return principal
+
+
+def _bump_versions(user_ids: set) -> None:
+    """Increment auth versions (``_ALL_USERS`` means the global version)."""
+    for user_id in user_ids:
+        key = _PRINCIPAL_VERSION_KEY if user_id == _ALL_USERS else f"{_PRINCIPAL_VERSION_KEY}:{user_id}"
+        _principal_cache.incr(key)
+        try:
+            cache.incr(key)
+        except Exception as e:
+            logger.warning(f"Failed to bump shared auth version {key}: {e}")
+
+
+def invalidate_principal(
+    user_id: Optional[int] = None, session: Optional[AsyncSession] = None
+) -> None:
+    """Invalidate cached principals after user, role or permission changes.
+
+    Args:
+        user_id: User whose flags or roles changed; None invalidates every
+            user (role or permission definitions changed).
+        session: Session carrying the change; the versions are bumped again
+            after it commits.
+    """
+    target = {_ALL_USERS if user_id is None else user_id}
+    _bump_versions(target)
+    if session is not None:
+        session.sync_session.info.setdefault(_SESSION_INVALIDATIONS_KEY, set()).update(target)
+
+
+def clear_principal_cache() -> None:
+    """Drop all cached principals in this process."""
+    _principal_cache.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    pending = session.info.pop(_SESSION_INVALIDATIONS_KEY, None)
+    if pending:
+        _bump_versions(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_SESSION_INVALIDATIONS_KEY, None)
+
+
 # =============================================================================
 # 类型别名定义
 # =============================================================================
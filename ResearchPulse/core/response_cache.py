@@ -0,0 +1,268 @@
+# =============================================================================
+# 接口响应缓存模块
+# =============================================================================
+# 本模块在 core.cache（Redis / 内存 / 无缓存）之上提供声明式的接口响应缓存，
+# 供读多写少的 UI 接口（分类、数据源、订阅源、匿名文章列表等）使用。
+#
+# 主要职责：
+#   1. cached_response 装饰器：按"命名空间 + 规范化查询参数（含用户范围）"生成缓存键
+#   2. 标签失效：每个标签对应一个版本号计数器，缓存键包含所依赖标签的当前版本号，
+#      写操作递增版本号即可让旧条目全部失效（旧条目随 TTL 自然过期，无需逐个删除）
+#   3. 单飞（single-flight）：同一进程内同一缓存键同时只有一个请求回源计算，
+#      其余并发请求等待该结果，避免缓存失效瞬间的回源风暴
+#   4. 写入自动失效：监听 SQLAlchemy Session 的写操作，事务提交后递增
+#      受影响表所关联标签的版本号（包括 ORM 对象修改与 insert/update/delete 语句）
+#
+# 设计决策：
+#   - 版本号在事务提交之后递增，避免"先失效、后提交"期间读到旧数据并以新版本号缓存
+#   - 缓存值为 jsonable_encoder 编码后的 JSON 结构，命中与未命中返回同样的数据形态
+#   - cache.enabled 关闭时（NoCache）仍保留单飞合并，只是不跨请求保存结果
+# =============================================================================
+
+"""Declarative response caching for read-heavy API endpoints.
+
+Usage:
+    invalidate_on_write("sources", "rss_feeds", "arxiv_categories")
+
+    @router.get("/api/feeds")
+    @cached_response("feeds", tags=("sources",), ttl=300)
+    async def list_feeds(session: AsyncSession = Depends(get_session)):
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Union
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# 缓存键前缀
+_KEY_PREFIX = "resp:"
+_GEN_PREFIX = "resp:gen:"
+
+# 表名 -> 写入时需要失效的标签
+_table_tags: Dict[str, Set[str]] = {}
+
+# 进程内正在回源计算的缓存键 -> Future（单飞）
+_inflight: Dict[str, asyncio.Future] = {}
+
+_SCALAR_TYPES = (str, int, float, bool)
+
+
+class _LeaderCancelled(Exception):
+    """Set on a single-flight future whose computing request was cancelled."""
+
+
+def invalidate_on_write(tag: str, *tables: str) -> None:
+    """Invalidate ``tag`` whenever a transaction writing any of ``tables`` commits.
+
+    Args:
+        tag: Cache tag (e.g. ``"sources"``).
+        *tables: Table names whose writes affect responses with this tag.
+    """
+    for table in tables:
+        _table_tags.setdefault(table, set()).add(tag)
+
+
+def bump_tags(*tags: str) -> None:
+    """Invalidate every cached response that depends on ``tags``.
+
+    递增标签版本号；依赖这些标签的缓存键随之变化，旧条目不再被读取。
+    """
+    for tag in tags:
+        cache.incr(_GEN_PREFIX + tag)
+
+
+def _generation(tag: str) -> Any:
+    """Current generation of a tag (seeded on first use)."""
+    value = cache.get(_GEN_PREFIX + tag)
+    if value is None:
+        value = cache.incr(_GEN_PREFIX + tag)
+    return value
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize a parameter value for the cache key; None if not key material."""
+    if isinstance(value, _SCALAR_TYPES):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [v for v in value if isinstance(v, _SCALAR_TYPES)]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    return None
+
+
+def build_cache_key(namespace: str, params: Dict[str, Any], tags: Iterable[str]) -> str:
+    """Build a cache key from normalized parameters and tag generations.
+
+    参数按名称排序，值为 None 的参数与非标量依赖（如数据库会话）不参与缓存键，
+    因此 ``?a=1&b=2`` 与 ``?b=2&a=1`` 以及省略默认 None 参数的请求共享同一条目。
+
+    Args:
+        namespace: Endpoint namespace.
+        params: Endpoint keyword arguments (query params, user scope, ...).
+        tags: Tags the response depends on.
+
+    Returns:
+        str: Cache key.
+    """
+    material = {
+        name: normalized
+        for name, value in sorted(params.items())
+        if (normalized := _normalize(value)) is not None
+    }
+    generations = {tag: _generation(tag) for tag in sorted(tags)}
+    digest = hashlib.sha1(
+        json.dumps([material, generations], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{_KEY_PREFIX}{namespace}:{digest}"
+
+
+async def get_or_compute(
+    key: str, compute: Callable[[], Awaitable[Any]], ttl: int
+) -> Any:
+    """Return the cached value for ``key`` or compute it once (single-flight).
+
+    回源请求被取消时，等待者不会收到 CancelledError，而是重新检查缓存并由其中一个接替回源。
+
+    Args:
+        key: Cache key from ``build_cache_key``.
+        compute: Coroutine factory producing the response.
+        ttl: Time-to-live in seconds.
+
+    Returns:
+        Any: JSON-compatible response payload.
+    """
+    while True:
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["v"]
+
+        pending = _inflight.get(key)
+        if pending is None:
+            break
+        try:
+            return await asyncio.shield(pending)
+        except _LeaderCancelled:
+            # 回源请求被取消（如客户端断开）：重新检查缓存，由一个等待者接替回源
+            continue
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value = jsonable_encoder(await compute())
+        cache.set(key, {"v": value}, ttl)
+        future.set_result(value)
+        return value
+    except asyncio.CancelledError:
+        # 取消只属于回源请求自身，不能作为结果传给等待者
+        future.set_exception(_LeaderCancelled())
+        future.exception()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        # 没有等待者时取回异常，避免 "exception was never retrieved" 警告
+        future.exception()
+        raise
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def cached_response(
+    namespace: str,
+    tags: Iterable[str] = (),
+    ttl: Union[int, Callable[[], int]] = 300,
+    cache_if: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Callable:
+    """Cache an endpoint's response keyed on its parameters.
+
+    装饰 FastAPI 接口函数（位于 ``@router.get`` 之下）。缓存键由命名空间、
+    规范化的标量参数（查询参数、用户 ID 等）与所依赖标签的版本号组成。
+
+    Args:
+        namespace: Key namespace, unique per endpoint.
+        tags: Invalidation tags the response depends on.
+        ttl: TTL in seconds, or a callable returning it (read per request).
+        cache_if: Optional predicate on the call kwargs; when it returns False
+            the request bypasses the cache (e.g. personalised requests).
+
+    Returns:
+        Callable: Decorator.
+    """
+    tags = tuple(tags)
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if args or (cache_if is not None and not cache_if(kwargs)):
+                return await func(*args, **kwargs)
+            key = build_cache_key(namespace, kwargs, tags)
+            seconds = ttl() if callable(ttl) else ttl
+            return await get_or_compute(key, lambda: func(**kwargs), seconds)
+
+        return wrapper
+
+    return decorator
+
+
+# -----------------------------------------------------------------------------
+# 写入自动失效
+# 收集事务中写入的表，提交后递增对应标签的版本号；回滚则丢弃。
+# -----------------------------------------------------------------------------
+_SESSION_TAGS_KEY = "response_cache_tags"
+
+
+def _collect(session: Session, table_names: Iterable[str]) -> None:
+    tags: Set[str] = set()
+    for name in table_names:
+        tags.update(_table_tags.get(name, ()))
+    if tags:
+        session.info.setdefault(_SESSION_TAGS_KEY, set()).update(tags)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    if not _table_tags:
+        return
+    objects = list(session.new) + list(session.dirty) + list(session.deleted)
+    _collect(session, {
+        getattr(obj, "__tablename__", None) for obj in objects
+    } - {None})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_execute(orm_execute_state: Any) -> None:
+    if not _table_tags:
+        return
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    name = getattr(table, "name", None)
+    if name:
+        _collect(orm_execute_state.session, [name])
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    tags = session.info.pop(_SESSION_TAGS_KEY, None)
+    if tags:
+        try:
+            bump_tags(*tags)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate response cache tags {sorted(tags)}: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_TAGS_KEY, None)
@@ -13,6 +13,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -176,6 +177,8 @@ async def lifespan(app: FastAPI):
     from common.feature_config import feature_config
     await feature_config.seed_defaults()
     logger.info("Feature config defaults seeded")
+    # 后台周期性刷新配置缓存，配置变化及时通知订阅者
+    feature_config.start_watcher()
 
     # 第五步：初始化 Jinja2 模板引擎
     # 模板目录位于 apps/ui/templates/
@@ -192,6 +195,10 @@ async def lifespan(app: FastAPI):
     await resume_background_tasks()
     logger.info("Background tasks resumed")
 
+    # 第八步：首次启用全文检索时在后台构建索引（构建完成前关键词搜索使用 LIKE）
+    from apps.search.index import ensure_search_index
+    search_index_task = asyncio.create_task(ensure_search_index())
+
     logger.info("ResearchPulse v2 started successfully")
 
     # yield 之前是启动逻辑，yield 之后是关闭逻辑
@@ -201,6 +208,13 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down ResearchPulse v2...")
     # 停止调度器，确保正在执行的任务能够优雅完成
     await stop_scheduler()
+    # 取消尚未完成的全文检索索引构建（下次启动重新构建）
+    search_index_task.cancel()
+    # 停止配置缓存的后台刷新任务
+    await feature_config.stop_watcher()
+    # 释放爬虫解析执行器（进程池）
+    from apps.crawler.parsing import parse_executor
+    parse_executor.shutdown(wait=False)
     # 关闭数据库连接池，释放所有连接资源
     await close_db()
     logger.info("ResearchPulse v2 shutdown complete")
@@ -67,6 +67,7 @@ def main():
         extra: 额外参数，如 arxiv 分类代码
         --dry-run: 模拟运行，不写入数据库
         --verbose, -v: 显示详细输出
+        --workers, -w: 全量爬取的并发爬虫数
 
     返回：
         int: 退出码，0 表示成功，1 表示有错误
@@ -108,10 +109,22 @@ def main():
         help="显示详细输出"
     )
 
+    # 选项：并发爬虫数（默认读取 CRAWLER_MAX_WORKERS 配置）
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=None,
+        help="全量爬取的并发爬虫数 (默认使用配置 crawler.max_workers)"
+    )
+
     args = parser.parse_args()
 
     # 创建爬虫运行器实例
-    runner = CrawlerRunner(dry_run=args.dry_run, verbose=args.verbose)
+    runner = CrawlerRunner(
+        dry_run=args.dry_run,
+        verbose=args.verbose,
+        max_workers=args.workers,
+    )
 
     # 记录开始时间
     start_time = datetime.now(timezone.utc)
@@ -278,6 +278,56 @@ class Settings(BaseSettings):
         validation_alias="ARXIV_RSS_FORMAT",
     )
 
+    # 全量爬取的并发爬虫数上限（1 表示逐个爬取）
+    # 同一目标主机之间仍按源类型延迟串行，不同主机之间并行
+    crawler_max_workers: int = Field(
+        default=_crawler_config.get("max_workers", 8),
+        validation_alias="CRAWLER_MAX_WORKERS",
+    )
+
+    # 解析执行器：process（进程池，多核并行解析）或 thread（线程池）
+    # 进程池不可用时自动降级为线程池
+    crawler_parse_executor: str = Field(
+        default=_crawler_config.get("parse_executor", "process"),
+        validation_alias="CRAWLER_PARSE_EXECUTOR",
+    )
+    # 解析执行器的工作进程/线程数（0 表示自动：min(CPU 核数, 4)）
+    crawler_parse_workers: int = Field(
+        default=_crawler_config.get("parse_workers", 0),
+        validation_alias="CRAWLER_PARSE_WORKERS",
+    )
+
+    # 原文正文抓取：全局并发上限、单域名并发上限、结果缓存时间（秒）
+    # 同一 URL（规范化后）在缓存时间内只下载、提取一次，跨爬虫共享
+    crawler_content_fetch_concurrency: int = Field(
+        default=_crawler_config.get("content_fetch_concurrency", 8),
+        validation_alias="CRAWLER_CONTENT_FETCH_CONCURRENCY",
+    )
+    crawler_content_fetch_per_domain: int = Field(
+        default=_crawler_config.get("content_fetch_per_domain", 2),
+        validation_alias="CRAWLER_CONTENT_FETCH_PER_DOMAIN",
+    )
+    crawler_content_cache_ttl: int = Field(
+        default=_crawler_config.get("content_cache_ttl", 3600),
+        validation_alias="CRAWLER_CONTENT_CACHE_TTL",
+    )
+
+    # HTTP 响应缓存：内存层容量（字节），按最近使用淘汰
+    crawler_http_cache_max_bytes: int = Field(
+        default=_crawler_config.get("http_cache_max_bytes", 32 * 1024 * 1024),
+        validation_alias="CRAWLER_HTTP_CACHE_MAX_BYTES",
+    )
+    # 是否启用磁盘缓存层（data_dir/http_response_cache.sqlite3），重启后保留、同机多进程共享
+    crawler_http_cache_disk: bool = Field(
+        default=_crawler_config.get("http_cache_disk", False),
+        validation_alias="CRAWLER_HTTP_CACHE_DISK",
+    )
+    # 磁盘缓存层容量（字节）
+    crawler_http_cache_disk_max_bytes: int = Field(
+        default=_crawler_config.get("http_cache_disk_max_bytes", 256 * 1024 * 1024),
+        validation_alias="CRAWLER_HTTP_CACHE_DISK_MAX_BYTES",
+    )
+
     # ======================== 微博热搜爬虫配置 ========================
     # 微博爬取请求超时时间（秒）
     weibo_timeout: int = Field(
@@ -572,6 +622,11 @@ class Settings(BaseSettings):
         default=_ai_config.get("cache", {}).get("ttl", 86400),
         validation_alias="AI_CACHE_TTL",
     )
+    # AI 结果缓存最大条目数，超出后按最近使用时间淘汰
+    ai_cache_max_entries: int = Field(
+        default=_ai_config.get("cache", {}).get("max_entries", 50000),
+        validation_alias="AI_CACHE_MAX_ENTRIES",
+    )
     # 送入 AI 处理的最大内容长度（字符数），超出部分会被截断
     ai_max_content_length: int = Field(
         default=_ai_config.get("max_content_length", 1500),
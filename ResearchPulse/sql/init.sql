@@ -121,6 +121,8 @@ CREATE TABLE `articles` (
   `crawl_time` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '爬取时间',
   `is_archived` TINYINT(1) NOT NULL DEFAULT 0 COMMENT '是否归档',
   `archived_at` DATETIME DEFAULT NULL COMMENT '归档时间',
+  `dedup_key` VARCHAR(64) DEFAULT NULL COMMENT '规范化去重键',
+  `duplicate_of` BIGINT DEFAULT NULL COMMENT '近似重复文章对应的规范文章ID',
   -- arXiv 专用字段
   `arxiv_id` VARCHAR(50) DEFAULT NULL COMMENT 'arXiv ID',
   `arxiv_primary_category` VARCHAR(200) DEFAULT NULL COMMENT 'arXiv 主分类',
@@ -158,7 +160,12 @@ CREATE TABLE `articles` (
   KEY `ix_articles_category` (`category`),
   -- 复合索引：优化 AI 处理和 Embedding 任务的未处理文章查询
   -- 覆盖 WHERE ai_processed_at IS NULL AND is_archived = FALSE ORDER BY crawl_time DESC
-  KEY `ix_articles_ai_unprocessed` (`ai_processed_at`, `is_archived`, `crawl_time`)
+  KEY `ix_articles_ai_unprocessed` (`ai_processed_at`, `is_archived`, `crawl_time`),
+  -- 去重键索引：去重任务按键查找最早的同键文章
+  KEY `ix_articles_dedup_key` (`dedup_key`),
+  -- 近似重复索引：按规范文章查找其转载
+  KEY `ix_articles_duplicate_of` (`duplicate_of`),
+  CONSTRAINT `fk_articles_duplicate_of` FOREIGN KEY (`duplicate_of`) REFERENCES `articles` (`id`) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='文章表';
 
 -- -----------------------------------------------------------------------------
@@ -223,12 +230,38 @@ CREATE TABLE `ai_processing_logs` (
   `success` TINYINT(1) NOT NULL DEFAULT 1 COMMENT '是否成功',
   `error_message` TEXT DEFAULT NULL COMMENT '错误信息',
   `cached` TINYINT(1) NOT NULL DEFAULT 0 COMMENT '是否缓存命中',
+  `ttft_ms` INT DEFAULT NULL COMMENT '首token耗时(毫秒,流式)',
+  `tokens_per_sec` FLOAT DEFAULT NULL COMMENT '生成速度(token/秒,流式)',
   `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
   `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
   KEY `ix_ai_processing_logs_article_id` (`article_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='AI处理日志表';
 
+-- -----------------------------------------------------------------------------
+-- ai_result_cache 表 - 按内容哈希寻址的AI分析结果缓存
+-- -----------------------------------------------------------------------------
+DROP TABLE IF EXISTS `ai_result_cache`;
+CREATE TABLE `ai_result_cache` (
+  `id` BIGINT NOT NULL AUTO_INCREMENT,
+  `content_hash` VARCHAR(64) NOT NULL COMMENT '内容哈希(标题+正文)',
+  `task_type` VARCHAR(50) NOT NULL COMMENT '任务类型',
+  `model` VARCHAR(100) NOT NULL COMMENT '模型名称',
+  `provider` VARCHAR(50) NOT NULL DEFAULT '' COMMENT 'AI提供商',
+  `result` JSON NOT NULL COMMENT '结构化分析结果',
+  `input_chars` INT NOT NULL DEFAULT 0 COMMENT '原始调用输入字符数',
+  `output_chars` INT NOT NULL DEFAULT 0 COMMENT '原始调用输出字符数',
+  `duration_ms` INT NOT NULL DEFAULT 0 COMMENT '原始调用耗时(毫秒)',
+  `hit_count` INT NOT NULL DEFAULT 0 COMMENT '命中次数',
+  `last_used_at` DATETIME NOT NULL COMMENT '最近写入或命中时间(LRU淘汰)',
+  `stored_at` DATETIME NOT NULL COMMENT '结果写入时间(TTL起点)',
+  `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  UNIQUE KEY `uq_ai_result_cache_key` (`content_hash`, `task_type`, `model`),
+  KEY `ix_ai_result_cache_last_used_at` (`last_used_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='AI分析结果缓存表';
+
 -- -----------------------------------------------------------------------------
 -- article_embeddings 表 - 文章嵌入向量元数据
 -- -----------------------------------------------------------------------------
@@ -322,6 +355,8 @@ CREATE TABLE `event_clusters` (
   `last_updated_at` DATETIME NOT NULL COMMENT '最后更新时间',
   `is_active` TINYINT(1) NOT NULL DEFAULT 1 COMMENT '是否活跃',
   `article_count` INT NOT NULL DEFAULT 0 COMMENT '文章数量',
+  `centroid` BLOB DEFAULT NULL COMMENT '成员向量均值（float32）',
+  `centroid_count` INT NOT NULL DEFAULT 0 COMMENT '参与质心计算的向量数',
   `created_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
   `updated_at` DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
@@ -388,6 +388,23 @@ class TestAdminBackupManagement:
             status.HTTP_403_FORBIDDEN,
         ]
 
+    def test_restore_task_status_requires_auth(self, client: TestClient):
+        """Verify restore task status requires authentication.
+
+        验证查询备份恢复任务需要认证。
+
+        Args:
+            client: FastAPI test client.
+
+        Returns:
+            None: This test does not return a value.
+        """
+        response = client.get("/api/v1/admin/backups/restore-tasks/abc")
+        assert response.status_code in [
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_403_FORBIDDEN,
+        ]
+
 
 class TestAdminSchedulerManagement:
     """Test admin scheduler management endpoints.
@@ -0,0 +1,123 @@
+"""Tests for apps/ai_processor/providers/limiter.py.
+
+验证自适应并发限流器：
+1. 在途请求数不超过当前上限
+2. 延迟平稳且并发用满时加性增长，过载时减半且同一次拥塞只退避一次
+3. 延迟明显上升时降低上限
+4. 状态快照包含上限、在途数与延迟分位数
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from apps.ai_processor.providers.limiter import AdaptiveLimiter, is_overload_error
+
+
+def _status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://backend/api/generate")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(code, request=request))
+
+
+class TestAdaptiveLimiter:
+    """Test AIMD behaviour.
+
+    验证限流与上限调整。
+    """
+
+    async def test_caps_in_flight_requests(self):
+        limiter = AdaptiveLimiter("test", initial_limit=2, adaptive=False, max_limit=2)
+        peak = 0
+
+        async def work():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(work() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+        assert limiter.snapshot()["successes"] == 6
+
+    async def test_grows_when_saturated_with_flat_latency(self):
+        limiter = AdaptiveLimiter("test", initial_limit=2, max_limit=8)
+        limiter._peak_in_flight = 2
+        for _ in range(8):
+            limiter.record_success(0.1)
+        limiter._peak_in_flight = 2
+        for _ in range(8):
+            limiter.record_success(0.1)
+
+        assert limiter.limit == 3
+
+    async def test_does_not_grow_when_underused(self):
+        limiter = AdaptiveLimiter("test", initial_limit=4, max_limit=8)
+        for _ in range(16):
+            limiter.record_success(0.1)
+
+        assert limiter.limit == 4
+
+    async def test_latency_rise_reduces_limit(self):
+        limiter = AdaptiveLimiter("test", initial_limit=8, max_limit=8, latency_tolerance=1.5)
+        for _ in range(8):
+            limiter.record_success(0.1)
+        for _ in range(8):
+            limiter.record_success(0.5)
+
+        assert limiter.limit == 7
+
+    async def test_overload_halves_once_per_congestion(self):
+        limiter = AdaptiveLimiter("test", initial_limit=8, max_limit=16)
+
+        async def failing():
+            async with limiter.slot():
+                await asyncio.sleep(0.01)
+                raise _status_error(503)
+
+        results = await asyncio.gather(*(failing() for _ in range(4)), return_exceptions=True)
+
+        assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+        # 四个并发请求同时失败只退避一次
+        assert limiter.limit == 4
+        assert limiter.snapshot()["overloads"] == 4
+
+    async def test_non_overload_errors_do_not_back_off(self):
+        limiter = AdaptiveLimiter("test", initial_limit=4)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            async with limiter.slot():
+                raise _status_error(400)
+
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+
+    async def test_snapshot_reports_percentiles(self):
+        limiter = AdaptiveLimiter("ollama:http://backend", initial_limit=4)
+        for ms in range(1, 101):
+            limiter.record_success(ms / 1000)
+
+        snapshot = limiter.snapshot()
+        assert snapshot["name"] == "ollama:http://backend"
+        assert snapshot["p50_ms"] == 50.0
+        assert snapshot["p90_ms"] == 90.0
+        assert snapshot["p99_ms"] == 99.0
+        assert snapshot["in_flight"] == 0
+
+
+class TestIsOverloadError:
+    """Test overload classification.
+
+    验证过载信号判断。
+    """
+
+    def test_classification(self):
+        assert is_overload_error(httpx.ReadTimeout("timeout"))
+        assert is_overload_error(_status_error(429))
+        assert is_overload_error(_status_error(503))
+        assert not is_overload_error(_status_error(500))
+        assert not is_overload_error(ValueError("bad json"))
@@ -0,0 +1,119 @@
+"""Tests for packed batch translation in apps/ai_processor/providers/base.py.
+
+验证打包翻译：
+1. 编号响应的拆分与校验（越界、重复、续行）
+2. 按 token 预算分组
+3. translate_batch 用一次请求翻译一组文本，解析失败的条目回退为逐条翻译
+"""
+
+from __future__ import annotations
+
+import re
+
+from apps.ai_processor.providers.base import (
+    BaseAIProvider,
+    pack_texts,
+    split_numbered_translations,
+)
+
+_ITEM_RE = re.compile(r"^\[(\d+)\] (.*)$", re.MULTILINE)
+
+
+class _PackingProvider(BaseAIProvider):
+    """Provider that answers numbered prompts, optionally dropping items."""
+
+    def __init__(self, drop: set[int] | None = None):
+        self.drop = drop or set()
+        self.generate_calls = 0
+        self.translate_calls = 0
+
+    async def _generate_text(self, prompt, max_tokens):
+        self.generate_calls += 1
+        items = prompt.split("待翻译内容：", 1)[1]
+        lines = [
+            f"[{num}] 译：{text}"
+            for num, text in _ITEM_RE.findall(items)
+            if int(num) not in self.drop
+        ]
+        return "\n".join(lines)
+
+    async def translate(self, text):
+        self.translate_calls += 1
+        return f"单译：{text}"
+
+    async def process_content(self, title, content, task_type="content_high"):
+        return {}
+
+    async def is_available(self):
+        return True
+
+
+class TestSplitNumberedTranslations:
+    """Test parsing of numbered batch responses.
+
+    验证编号响应的解析。
+    """
+
+    def test_splits_items_and_joins_continuations(self):
+        response = "[1] 第一段\n[2] 第二段\n续行\n【3】第三段"
+        assert split_numbered_translations(response, 3) == ["第一段", "第二段 续行", "第三段"]
+
+    def test_missing_out_of_range_and_duplicates_are_none(self):
+        response = "说明文字\n[1] 甲\n[1] 甲again\n[3] 丙\n[9] 多余"
+        assert split_numbered_translations(response, 3) == [None, None, "丙"]
+
+
+class TestPackTexts:
+    """Test token-budget grouping.
+
+    验证按 token 预算分组。
+    """
+
+    def test_respects_budget_and_item_limit(self):
+        texts = ["a" * 40] * 5  # 每条约 11 token
+        assert pack_texts(texts, token_budget=25, max_items=10) == [[0, 1], [2, 3], [4]]
+        assert pack_texts(texts, token_budget=1000, max_items=2) == [[0, 1], [2, 3], [4]]
+
+    def test_oversized_text_gets_own_pack(self):
+        texts = ["short", "x" * 400, "short"]
+        assert pack_texts(texts, token_budget=20, max_items=10) == [[0], [1], [2]]
+
+
+class TestTranslateBatch:
+    """Test packed translate_batch.
+
+    验证打包翻译及回退。
+    """
+
+    async def test_one_call_per_pack(self):
+        provider = _PackingProvider()
+        texts = [f"Title number {i}" for i in range(10)]
+
+        results = await provider.translate_batch(texts)
+
+        assert provider.generate_calls == 1
+        assert provider.translate_calls == 0
+        assert results == [f"译：Title number {i}" for i in range(10)]
+
+    async def test_unparsed_items_fall_back_to_single_calls(self):
+        provider = _PackingProvider(drop={3})
+        texts = ["First title", "Second\ntitle", "Third title", ""]
+
+        results = await provider.translate_batch(texts)
+
+        # 多行原文在打包时折叠为一行
+        assert results[:2] == ["译：First title", "译：Second title"]
+        assert results[2] == "单译：Third title"
+        assert results[3] is None
+        assert provider.translate_calls == 1
+
+    async def test_provider_without_generation_translates_singly(self):
+        class _SingleProvider(_PackingProvider):
+            async def _generate_text(self, prompt, max_tokens):
+                return None
+
+        provider = _SingleProvider()
+        results = await provider.translate_batch(["One", "Two"])
+
+        assert results == ["单译：One", "单译：Two"]
+        assert provider.translate_calls == 2
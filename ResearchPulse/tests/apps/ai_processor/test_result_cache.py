@@ -0,0 +1,181 @@
+"""Tests for apps/ai_processor/result_cache.py and its use in process_article.
+
+验证内容寻址的 AI 结果缓存：
+1. 内容相同的第二篇文章复用结果，不再调用模型，processing_method 记为 cached
+2. 处理日志记录缓存命中及节省的耗时
+3. 超过 TTL 的条目视为未命中；force 跳过缓存
+4. 条目数超限时按最近使用时间淘汰
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from apps.ai_processor.models import AIProcessingLog, AIResultCacheEntry
+from apps.ai_processor.providers.base import BaseAIProvider
+from apps.ai_processor.result_cache import lookup_result, prune_results, store_result
+from apps.ai_processor.service import AIProcessorService
+from apps.crawler.models import Article
+
+CONTENT = "全新的开源大模型发布，在多项基准测试中超越同类模型。" * 10
+
+
+class _CountingProvider(BaseAIProvider):
+    """Provider that returns a fixed analysis and counts calls."""
+
+    def __init__(self, model: str = "test-model"):
+        self._model = model
+        self.calls = 0
+
+    async def process_content(self, title, content, task_type="content_high"):
+        self.calls += 1
+        return {
+            "summary": "新模型发布",
+            "category": "AI",
+            "importance_score": 8,
+            "one_liner": "开源模型",
+            "key_points": ["基准领先"],
+            "provider": "test",
+            "model": self._model,
+            "input_chars": len(content),
+            "output_chars": 42,
+            "duration_ms": 1500,
+            "success": True,
+        }
+
+    async def is_available(self):
+        return True
+
+
+async def _add_article(session, external_id: str, source_type: str = "rss") -> Article:
+    article = Article(
+        source_type=source_type,
+        source_id="feed",
+        external_id=external_id,
+        title="开源模型发布",
+        content=CONTENT,
+        crawl_time=datetime.now(timezone.utc),
+    )
+    session.add(article)
+    await session.flush()
+    return article
+
+
+class TestProcessArticleCache:
+    """Test cache lookups in AIProcessorService.process_article.
+
+    验证文章处理流程中的缓存命中与写入。
+    """
+
+    async def test_duplicate_content_skips_provider(self, db_session):
+        provider = _CountingProvider()
+        service = AIProcessorService(provider)
+        first = await _add_article(db_session, "a1")
+        second = await _add_article(db_session, "a2", source_type="hackernews")
+
+        first_result = await service.process_article(first.id, db_session)
+        second_result = await service.process_article(second.id, db_session)
+        await db_session.commit()
+
+        assert provider.calls == 1
+        assert first_result["processing_method"] == "ai"
+        assert second_result["processing_method"] == "cached"
+        assert second_result["summary"] == "新模型发布"
+
+        second_id = second.id
+        db_session.expire_all()
+        stored = await db_session.get(Article, second_id)
+        assert stored.processing_method == "cached"
+        assert stored.ai_category == "AI"
+        assert stored.importance_score == 8
+
+        logs = (await db_session.execute(
+            select(AIProcessingLog).order_by(AIProcessingLog.id)
+        )).scalars().all()
+        assert [log.cached for log in logs] == [False, True]
+        # 命中记录保存原始耗时（节省的推理时间），不计输入/输出字符
+        assert logs[1].duration_ms == 1500
+        assert logs[1].input_chars == 0
+        entry = (await db_session.execute(select(AIResultCacheEntry))).scalar_one()
+        assert entry.hit_count == 1
+
+    async def test_force_and_other_model_bypass_cache(self, db_session):
+        article = await _add_article(db_session, "a1")
+        await AIProcessorService(_CountingProvider()).process_article(article.id, db_session)
+
+        forced = _CountingProvider()
+        await AIProcessorService(forced).process_article(article.id, db_session, force=True)
+        other_model = _CountingProvider(model="other-model")
+        await AIProcessorService(other_model).process_article(article.id, db_session, force=False)
+
+        assert forced.calls == 1
+        # 文章已处理：返回已处理结果，不查询内容缓存也不调用模型
+        assert other_model.calls == 0
+
+
+class TestResultStore:
+    """Test the cache store directly.
+
+    验证缓存存储的过期与淘汰。
+    """
+
+    async def test_expired_entry_is_a_miss(self, db_session):
+        await store_result(db_session, "h1", "content_high", "m", {"summary": "s", "provider": "p"})
+        assert (await lookup_result(db_session, "h1", "content_high", "m"))["summary"] == "s"
+
+        await db_session.execute(
+            update(AIResultCacheEntry).values(
+                stored_at=datetime.now(timezone.utc) - timedelta(days=30)
+            )
+        )
+        assert await lookup_result(db_session, "h1", "content_high", "m") is None
+
+    async def test_hits_do_not_extend_ttl(self, db_session, monkeypatch):
+        from common.feature_config import feature_config
+
+        original_get_int = feature_config.get_int
+        monkeypatch.setattr(feature_config, "get_int", lambda key, default=0: (
+            3600 if key == "ai.cache_ttl" else original_get_int(key, default)
+        ))
+        await store_result(db_session, "h1", "content_high", "m", {"summary": "s"})
+        await db_session.execute(
+            update(AIResultCacheEntry).values(
+                stored_at=datetime.now(timezone.utc) - timedelta(minutes=59)
+            )
+        )
+        # 持续命中只刷新 last_used_at / updated_at，不影响写入时间
+        assert await lookup_result(db_session, "h1", "content_high", "m") is not None
+        assert await lookup_result(db_session, "h1", "content_high", "m") is not None
+        await db_session.execute(
+            update(AIResultCacheEntry).values(
+                stored_at=datetime.now(timezone.utc) - timedelta(minutes=61)
+            )
+        )
+        assert await lookup_result(db_session, "h1", "content_high", "m") is None
+
+        # 重新写入后有效期从头计算
+        await store_result(db_session, "h1", "content_high", "m", {"summary": "s2"})
+        assert (await lookup_result(db_session, "h1", "content_high", "m"))["summary"] == "s2"
+
+    async def test_prune_evicts_least_recently_used(self, db_session):
+        for i in range(4):
+            await store_result(db_session, f"h{i}", "content_low", "m", {"summary": str(i)})
+        base = datetime.now(timezone.utc) - timedelta(hours=1)
+        for i in range(4):
+            await db_session.execute(
+                update(AIResultCacheEntry)
+                .where(AIResultCacheEntry.content_hash == f"h{i}")
+                .values(last_used_at=base + timedelta(minutes=i))
+            )
+        # 命中 h0 使其成为最近使用
+        assert await lookup_result(db_session, "h0", "content_low", "m") is not None
+
+        assert await prune_results(db_session, max_entries=2) == 2
+
+        remaining = set((await db_session.execute(
+            select(AIResultCacheEntry.content_hash)
+        )).scalars().all())
+        assert remaining == {"h0", "h3"}
+        assert await prune_results(db_session, max_entries=2) == 0
@@ -0,0 +1,160 @@
+"""Tests for apps/ai_processor/providers/streaming.py and provider streaming.
+
+验证流式解析：
+1. 思维链在到达时丢弃（含跨分块的标签）
+2. 拼出完整且合法的 JSON 对象即结束，字符串中的括号不影响判断
+3. Provider 流式调用在 JSON 完整后停止读取，并返回首 token 耗时与生成速度
+4. 首 token 耗时从拿到限流名额后开始计算，不含排队时间
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import httpx
+
+from apps.ai_processor.providers.ollama_provider import OllamaProvider
+from apps.ai_processor.providers.openai_provider import OpenAIProvider
+from apps.ai_processor.providers.streaming import StreamingJSONCollector
+
+_RESULT = {"summary": "摘要 {含括号}", "category": "AI", "importance": 8}
+
+
+def _feed_all(collector: StreamingJSONCollector, fragments: list[str]) -> int:
+    """Feed fragments until done; return how many were consumed."""
+    for i, fragment in enumerate(fragments, 1):
+        if collector.feed(fragment):
+            return i
+    return len(fragments)
+
+
+class TestStreamingJSONCollector:
+    """Test incremental think stripping and JSON completion.
+
+    验证增量解析。
+    """
+
+    def test_completes_on_first_valid_object(self):
+        text = json.dumps(_RESULT, ensure_ascii=False)
+        fragments = ["```json\n"] + [text[i:i + 5] for i in range(0, len(text), 5)] + ["\n```", "多余文字"]
+        collector = StreamingJSONCollector()
+
+        consumed = _feed_all(collector, fragments)
+
+        assert collector.result == _RESULT
+        assert consumed == len(fragments) - 2
+
+    def test_think_blocks_split_across_fragments_are_dropped(self):
+        fragments = ["<thi", "nk>先想一想 {\"summary\": \"错\"", "}</th", "ink>\n", '{"summary": "对"}']
+        collector = StreamingJSONCollector()
+
+        _feed_all(collector, fragments)
+
+        assert collector.result == {"summary": "对"}
+        assert "先想一想" not in collector.text
+
+    def test_invalid_object_is_skipped(self):
+        collector = StreamingJSONCollector()
+
+        assert not collector.feed("{bad} ")
+        assert collector.feed('{"category": "AI"}')
+        assert collector.result == {"category": "AI"}
+
+    def test_stats(self):
+        collector = StreamingJSONCollector(started_at=0.0)
+        assert collector.stats() == {"ttft_ms": None, "output_tokens": 0, "tokens_per_sec": None}
+
+        collector.feed("{")
+        collector.first_token_at = 0.5
+        collector.feed('"a": 1')
+        collector.last_token_at = 1.0
+        stats = collector.stats()
+
+        assert stats["ttft_ms"] == 500
+        assert stats["output_tokens"] == 2
+        assert stats["tokens_per_sec"] == 2.0
+
+
+class _ChunkStream(httpx.AsyncByteStream):
+    """Byte stream that records how many chunks were read."""
+
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+        self.sent = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.sent += 1
+            yield chunk
+
+
+def _client_for(stream: _ChunkStream, requests: list[dict]) -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, stream=stream)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestProviderStreaming:
+    """Test early-closing streaming calls.
+
+    验证 Provider 流式调用提前结束。
+    """
+
+    async def test_ollama_stops_after_complete_json(self):
+        text = json.dumps(_RESULT, ensure_ascii=False)
+        tokens = ["<think>", "推理", "</think>"] + [text[i:i + 4] for i in range(0, len(text), 4)]
+        lines = [json.dumps({"response": t, "done": False}, ensure_ascii=False) + "\n" for t in tokens]
+        lines += [json.dumps({"response": " 之后的废话", "done": False}) + "\n"] * 20
+        stream = _ChunkStream([line.encode() for line in lines])
+        requests: list[dict] = []
+        provider = OllamaProvider(base_url="http://backend", model="m")
+        provider._client = _client_for(stream, requests)
+
+        collector = await provider._stream_api({"model": "m", "prompt": "p", "stream": False})
+
+        assert requests[0]["stream"] is True
+        assert collector.result == _RESULT
+        assert stream.sent == len(tokens)
+        assert collector.stats()["ttft_ms"] is not None
+        await provider.close()
+
+    async def test_openai_parses_sse_deltas(self):
+        text = json.dumps(_RESULT, ensure_ascii=False)
+        events = [
+            "data: " + json.dumps({"choices": [{"delta": {"content": text[i:i + 6]}}]}, ensure_ascii=False) + "\n\n"
+            for i in range(0, len(text), 6)
+        ]
+        events.append("data: [DONE]\n\n")
+        stream = _ChunkStream([e.encode() for e in events])
+        requests: list[dict] = []
+        provider = OpenAIProvider(api_key="k", model="m", base_url="http://backend/v1")
+        provider._client = _client_for(stream, requests)
+
+        collector = await provider._stream_api({}, {"model": "m", "messages": []})
+
+        assert requests[0]["stream"] is True
+        assert collector.result == _RESULT
+        assert collector.tokens == len(events) - 1
+        await provider.close()
+
+    async def test_ttft_excludes_limiter_wait(self):
+        class _SlowLimiter:
+            @asynccontextmanager
+            async def slot(self):
+                await asyncio.sleep(0.3)
+                yield
+
+        text = json.dumps(_RESULT, ensure_ascii=False)
+        stream = _ChunkStream([(json.dumps({"response": text, "done": True}) + "\n").encode()])
+        provider = OllamaProvider(base_url="http://backend", model="m")
+        provider._client = _client_for(stream, [])
+        provider._limiter = _SlowLimiter()
+
+        collector = await provider._stream_api({"model": "m", "prompt": "p"})
+
+        assert collector.stats()["ttft_ms"] < 300
+        await provider.close()
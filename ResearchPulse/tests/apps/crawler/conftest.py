@@ -0,0 +1,29 @@
+"""Shared fixtures for crawler tests."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _clear_content_cache():
+    """Isolate tests from the cross-crawl full-content cache.
+
+    原文正文缓存是进程级单例，每个测试前后清空，避免相同 URL 互相影响。
+    """
+    from apps.crawler.content_fetcher import content_fetcher
+
+    content_fetcher.clear()
+    yield
+    content_fetcher.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_near_dup_index(tmp_path, monkeypatch):
+    """Give each test an empty near-duplicate index under a temporary directory.
+
+    近似重复索引是进程级单例并会写入 data_dir，每个测试使用独立的空索引。
+    """
+    import apps.crawler.near_dup as near_dup
+
+    monkeypatch.setattr(near_dup, "_index", near_dup.NearDupIndex(tmp_path / near_dup.NEAR_DUP_INDEX_FILENAME))
@@ -0,0 +1,221 @@
+"""Tests for apps/crawler/base.py — batched BaseCrawler.save() and run().
+
+验证批量保存逻辑：
+1. 新文章一次写入并返回 ID
+2. 已存在文章按合并规则更新（长字符串优先、版本敏感字段）
+3. 批内重复条目合并
+4. ArXiv 跨分类全局去重
+5. Feed 未修改时 run() 跳过解析与入库
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from apps.crawler.base import BaseCrawler
+from apps.crawler.models import Article
+
+
+class _DummyCrawler(BaseCrawler):
+    """Concrete crawler for exercising save()."""
+
+    def __init__(self, source_type: str, source_id: str):
+        self.source_type = source_type
+        super().__init__(source_id)
+
+    async def fetch(self):
+        return None
+
+    async def parse(self, raw_data):
+        return []
+
+
+async def _count(session) -> int:
+    return (await session.execute(select(func.count(Article.id)))).scalar()
+
+
+class TestMergeArticleFields:
+    """Test the pure field merge rules.
+
+    验证字段合并规则。
+    """
+
+    def test_longer_string_wins(self):
+        changes = BaseCrawler.merge_article_fields(
+            {"title": "short", "summary": "a long existing summary"},
+            {"title": "a longer title", "summary": "tiny"},
+        )
+        assert changes == {"title": "a longer title"}
+
+    def test_non_string_only_fills_missing(self):
+        changes = BaseCrawler.merge_article_fields(
+            {"publish_time": None, "is_archived": False},
+            {"publish_time": datetime(2026, 1, 1, tzinfo=timezone.utc), "is_archived": True},
+        )
+        assert "publish_time" in changes
+        assert "is_archived" not in changes
+
+    def test_version_sensitive_fields_need_newer_version(self):
+        old = datetime(2026, 1, 1)  # 数据库读回的无时区时间
+        new = datetime(2026, 1, 2, tzinfo=timezone.utc)
+        existing = {"url": "https://arxiv.org/abs/1v1", "arxiv_updated_time": old}
+
+        stale = BaseCrawler.merge_article_fields(
+            existing, {"url": "https://arxiv.org/abs/1v0-long", "arxiv_updated_time": old}
+        )
+        fresh = BaseCrawler.merge_article_fields(
+            existing, {"url": "https://arxiv.org/abs/1v2", "arxiv_updated_time": new}
+        )
+        assert "url" not in stale
+        assert fresh["url"] == "https://arxiv.org/abs/1v2"
+
+    def test_key_columns_are_immutable(self):
+        changes = BaseCrawler.merge_article_fields(
+            {"external_id": "a"}, {"external_id": "a-longer", "source_id": "other"}
+        )
+        assert changes == {}
+
+
+class TestBulkSave:
+    """Test BaseCrawler.save() against the database.
+
+    验证批量保存的插入、更新与去重行为。
+    """
+
+    async def test_inserts_new_articles(self, db_session):
+        crawler = _DummyCrawler("rss", "feed-1")
+        articles = [
+            {"external_id": f"e{i}", "title": f"Title {i}", "url": f"https://x.com/{i}"}
+            for i in range(3)
+        ]
+
+        saved_count, saved_ids = await crawler.save(articles, db_session)
+
+        assert saved_count == 3
+        assert len(saved_ids) == 3
+        rows = (await db_session.execute(select(Article).order_by(Article.id))).scalars().all()
+        assert [r.id for r in rows] == saved_ids
+        assert all(r.crawl_time is not None for r in rows)
+        assert rows[0].is_archived is False
+
+    async def test_updates_existing_with_richer_data(self, db_session):
+        crawler = _DummyCrawler("rss", "feed-1")
+        _, first_ids = await crawler.save(
+            [{"external_id": "e1", "title": "T", "summary": "long original summary"}],
+            db_session,
+        )
+
+        saved_count, saved_ids = await crawler.save(
+            [
+                {"external_id": "e1", "title": "Longer title", "summary": "short"},
+                {"external_id": "e2", "title": "New"},
+            ],
+            db_session,
+        )
+
+        assert saved_count == 1
+        assert saved_ids[0] == first_ids[0]
+        assert await _count(db_session) == 2
+        db_session.expire_all()
+        article = await db_session.get(Article, first_ids[0])
+        assert article.title == "Longer title"
+        assert article.summary == "long original summary"
+
+    async def test_update_keeps_fields_written_after_load(self, db_session, monkeypatch):
+        crawler = _DummyCrawler("rss", "feed-1")
+        _, ids = await crawler.save([{"external_id": "e1", "title": "T"}], db_session)
+        real_load = crawler._load_existing
+
+        async def load_then_concurrent_write(keys, session):
+            stored = await real_load(keys, session)
+            # 加载之后、写入之前，AI 处理提交了结果
+            await session.execute(
+                update(Article).where(Article.id == ids[0]).values(ai_summary="fresh summary")
+            )
+            return stored
+
+        monkeypatch.setattr(crawler, "_load_existing", load_then_concurrent_write)
+        await crawler.save([{"external_id": "e1", "title": "Longer title"}], db_session)
+
+        db_session.expire_all()
+        article = await db_session.get(Article, ids[0])
+        assert article.title == "Longer title"
+        assert article.ai_summary == "fresh summary"
+
+    async def test_duplicates_within_batch_are_merged(self, db_session):
+        crawler = _DummyCrawler("rss", "feed-1")
+        saved_count, saved_ids = await crawler.save(
+            [
+                {"external_id": "dup", "title": "A"},
+                {"external_id": "dup", "title": "A longer one"},
+            ],
+            db_session,
+        )
+
+        assert saved_count == 1
+        assert len(saved_ids) == 1
+        article = await db_session.get(Article, saved_ids[0])
+        assert article.title == "A longer one"
+
+    async def test_arxiv_dedups_across_categories(self, db_session):
+        now = datetime.now(timezone.utc)
+        _, ids_lg = await _DummyCrawler("arxiv", "cs.LG").save(
+            [{"external_id": "2601.00001", "title": "Paper", "arxiv_updated_time": now}],
+            db_session,
+        )
+
+        saved_count, ids_cv = await _DummyCrawler("arxiv", "cs.CV").save(
+            [{
+                "external_id": "2601.00001",
+                "title": "Paper",
+                "url": "https://arxiv.org/abs/2601.00001v2",
+                "arxiv_updated_time": now + timedelta(days=1),
+            }],
+            db_session,
+        )
+
+        assert saved_count == 0
+        assert ids_cv == ids_lg
+        assert await _count(db_session) == 1
+        db_session.expire_all()
+        article = await db_session.get(Article, ids_lg[0])
+        assert article.source_id == "cs.LG"
+        assert article.url.endswith("v2")
+
+    async def test_empty_list_is_noop(self, db_session):
+        assert await _DummyCrawler("rss", "feed-1").save([], db_session) == (0, [])
+
+    async def test_ignores_non_model_fields(self, db_session):
+        saved_count, _ = await _DummyCrawler("rss", "feed-1").save(
+            [{"external_id": "e1", "title": "T", "not_a_column": 1}],
+            db_session,
+        )
+        assert saved_count == 1
+
+
+class TestRunNotModified:
+    """Test that run() skips parse/save when the feed is unchanged.
+
+    验证条件请求返回未修改时跳过解析与入库。
+    """
+
+    async def test_not_modified_skips_parse_and_save(self):
+        from common.http import NOT_MODIFIED
+
+        class _UnchangedCrawler(_DummyCrawler):
+            async def fetch(self):
+                assert self.conditional_fetch is True
+                return NOT_MODIFIED
+
+            async def parse(self, raw_data):
+                raise AssertionError("parse must not run")
+
+        crawler = _UnchangedCrawler("rss", "feed-1")
+        result = await crawler.run()
+
+        assert result["status"] == "success"
+        assert result["not_modified"] is True
+        assert result["saved_count"] == 0
+        assert crawler.conditional_fetch is False
@@ -0,0 +1,108 @@
+"""Tests for apps/crawler/content_fetcher.py — concurrent full-content fetching.
+
+验证原文正文抓取调度：
+1. 规范化 URL 缓存，TTL 内只下载一次
+2. 同一 URL 的并发请求共享同一次下载
+3. 不同域名并行，同一域名受并发上限约束
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from apps.crawler.content_fetcher import ContentFetcher
+
+
+class _Loader:
+    """Loader double that counts calls and tracks per-host concurrency."""
+
+    def __init__(self, delay: float = 0.0, result: str = "body"):
+        self.delay = delay
+        self.result = result
+        self.calls: list = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, url: str) -> str:
+        self.calls.append(url)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return self.result
+
+
+class TestContentFetcherCache:
+    """Test result caching keyed by normalized URL."""
+
+    async def test_tracking_params_share_cache_entry(self):
+        fetcher = ContentFetcher()
+        loader = _Loader()
+
+        first = await fetcher.fetch("https://example.com/post?utm_source=hn", loader)
+        second = await fetcher.fetch("https://example.com/post", loader)
+
+        assert first == second == "body"
+        assert len(loader.calls) == 1
+
+    async def test_expired_entry_is_refetched(self):
+        fetcher = ContentFetcher(cache_ttl=0.01)
+        loader = _Loader()
+
+        await fetcher.fetch("https://example.com/a", loader)
+        await asyncio.sleep(0.02)
+        await fetcher.fetch("https://example.com/a", loader)
+
+        assert len(loader.calls) == 2
+
+    async def test_exceptions_are_not_cached(self):
+        fetcher = ContentFetcher()
+
+        async def failing(url):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await fetcher.fetch("https://example.com/a", failing)
+        assert fetcher.cache_size() == 0
+
+
+class TestContentFetcherConcurrency:
+    """Test single-flight and concurrency caps.
+
+    验证单飞与并发上限。
+    """
+
+    async def test_concurrent_same_url_downloads_once(self):
+        fetcher = ContentFetcher()
+        loader = _Loader(delay=0.05)
+
+        results = await asyncio.gather(
+            *(fetcher.fetch("https://example.com/a", loader) for _ in range(5))
+        )
+
+        assert results == ["body"] * 5
+        assert len(loader.calls) == 1
+
+    async def test_per_domain_cap(self):
+        fetcher = ContentFetcher(max_concurrency=10, per_domain=2)
+        loader = _Loader(delay=0.03)
+
+        await asyncio.gather(
+            *(fetcher.fetch(f"https://same.com/{i}", loader) for i in range(6))
+        )
+
+        assert loader.max_active == 2
+
+    async def test_distinct_domains_run_in_parallel(self):
+        fetcher = ContentFetcher(max_concurrency=10, per_domain=1)
+        loader = _Loader(delay=0.1)
+
+        started = time.monotonic()
+        await asyncio.gather(
+            *(fetcher.fetch(f"https://host{i}.com/a", loader) for i in range(5))
+        )
+
+        assert time.monotonic() - started < 0.4
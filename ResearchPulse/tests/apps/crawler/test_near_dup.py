@@ -0,0 +1,272 @@
+"""Tests for apps/crawler/near_dup.py — cross-source near-duplicate detection.
+
+验证近似重复检测：
+1. SimHash 对轻微改动稳定、对不同内容区分
+2. LSH 分段索引按汉明距离与时间窗口查找，持久化后可重新加载，多进程保存时合并条目
+3. 爬虫保存时转载链接到最早的规范文章，AI 处理查询跳过转载
+4. 并发会话只在提交后共享条目，不会链接或丢弃其他会话未提交的文章
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from sqlalchemy import select
+
+from apps.crawler.models import Article
+from apps.crawler.near_dup import NearDupIndex, hamming_distance, simhash
+
+_STORY = (
+    "OpenAI releases a new open weight reasoning model that matches frontier systems "
+    "on math and coding benchmarks while running on a single consumer GPU. "
+    "The company also publishes the full training recipe together with evaluation scripts, "
+    "a detailed model card describing known limitations, and safety test results from "
+    "external red teams. Researchers said the release could make it far cheaper for "
+    "universities and startups to study reasoning behaviour, although the licence still "
+    "restricts some commercial uses and the largest checkpoint needs more memory than most laptops offer."
+)
+_OTHER = (
+    "The European Parliament approved new rules for battery recycling that require "
+    "manufacturers to recover lithium cobalt and nickel from used electric vehicle packs"
+)
+
+
+class TestSimHash:
+    """Test fingerprint stability.
+
+    验证指纹对轻微改动稳定。
+    """
+
+    def test_small_edit_is_near(self):
+        edited = _STORY.replace("a single consumer GPU", "one consumer GPU")
+
+        assert hamming_distance(simhash(_STORY), simhash(edited)) <= 6
+        assert hamming_distance(simhash(_STORY), simhash(_OTHER)) > 10
+
+    def test_short_text_has_no_fingerprint(self):
+        assert simhash("Update") is None
+        assert simhash("<p>Hello world</p>") is None
+
+
+class TestNearDupIndex:
+    """Test LSH lookups, expiry and persistence.
+
+    验证分段查找、过期与持久化。
+    """
+
+    def test_find_respects_distance_window_and_order(self):
+        index = NearDupIndex(max_distance=3)
+        now = time.time()
+        index.add(1, 0b1111, now, 1)
+        index.add(2, 0xFFFF << 48, now - 3600 * 100, 2)
+
+        # 差异位落在不同分段：其余分段仍相同，能找到候选
+        assert index.find(0b1111 ^ (1 << 20) ^ (1 << 40)) == 1
+        assert index.find(0b1111 ^ (1 << 20) ^ (1 << 40), before_id=1) is None
+        assert index.find(0xFFFF << 48, since=now - 3600) is None
+        assert index.expire(now - 3600) == 1
+        assert 2 not in index
+
+    def test_changing_threshold_rebuckets_entries(self):
+        index = NearDupIndex(max_distance=3)
+        index.add(1, 0, time.time(), 1)
+        far = (1 << 0) | (1 << 16) | (1 << 32) | (1 << 48) | (1 << 60)
+
+        assert index.find(far) is None
+        index.set_max_distance(6)
+        assert index.find(far) == 1
+
+    def test_shared_index_follows_threshold_config(self, tmp_path, monkeypatch):
+        from apps.crawler import near_dup
+        from common.feature_config import feature_config
+        from settings import settings
+
+        monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+        monkeypatch.setattr(near_dup, "_index", None)
+        monkeypatch.setattr(feature_config, "_listeners", [])
+        monkeypatch.setattr(feature_config, "_cache", {"dedup.near_dup_max_distance": "3"})
+
+        index = near_dup.get_near_dup_index()
+        assert index.max_distance == 3
+
+        feature_config.update_cached("dedup.near_dup_max_distance", "6")
+        assert index.max_distance == 6
+        feature_config.update_cached("dedup.near_dup_max_distance", "oops")
+        assert index.max_distance == 6
+
+    async def test_save_and_load(self, tmp_path):
+        index = NearDupIndex(tmp_path / "index.json")
+        index.add(5, simhash(_STORY), time.time(), 3)
+        assert await index.maybe_save(0) is True
+        assert await index.maybe_save(0) is False
+
+        loaded = NearDupIndex(tmp_path / "index.json")
+        loaded.load()
+
+        assert 5 in loaded
+        assert loaded.find(simhash(_STORY)) == 3
+
+    async def test_maybe_save_writes_snapshot_off_the_event_loop(self, tmp_path):
+        import threading
+
+        index = NearDupIndex(tmp_path / "index.json")
+        index.add(1, 0b1, time.time(), 1)
+        threads = []
+        write = index._write_merged
+
+        def recording_write(entries, removed, horizon):
+            threads.append((threading.get_ident(), sorted(entries)))
+            return write(entries, removed, horizon)
+
+        index._write_merged = recording_write
+        saving = asyncio.ensure_future(index.maybe_save(0))
+        await asyncio.sleep(0)
+        index.add(2, 0b10, time.time(), 2)
+        assert await saving is True
+
+        # 写入在线程中执行；写入期间事件循环中的新增不在快照内，留待下次保存
+        assert threads == [(threads[0][0], [1])]
+        assert threads[0][0] != threading.get_ident()
+        assert await index.maybe_save(0) is True
+        loaded = NearDupIndex(tmp_path / "index.json")
+        loaded.load()
+        assert 1 in loaded and 2 in loaded
+
+    def test_save_merges_entries_written_by_other_processes(self, tmp_path):
+        path = tmp_path / "index.json"
+        now = time.time()
+        first = NearDupIndex(path)
+        first.add(1, 0b1, now, 1)
+        first.add(2, 0b10, now, 2)
+        first.save()
+
+        # 另一进程在此之后加载并写入新条目，同时移除了条目 2
+        second = NearDupIndex(path)
+        second.load()
+        second.add(3, 0b100, now, 3)
+        second.discard([2])
+        second.save()
+
+        first.add(4, 0b1000, now, 4)
+        first.discard([1])
+        first.save()
+
+        merged = NearDupIndex(path)
+        merged.load()
+        # first 仍持有条目 2（它不知道 second 的移除），second 的条目 3 被保留
+        assert [i in merged for i in (1, 2, 3, 4)] == [False, True, True, True]
+        assert 3 in first
+
+
+class TestDetectOnSave:
+    """Test linking reposts when crawlers save articles.
+
+    验证爬虫保存时转载链接到规范文章。
+    """
+
+    async def test_reposts_link_to_canonical_and_skip_ai(self, db_session, monkeypatch):
+        from apps.ai_processor.service import AIProcessorService
+        from apps.crawler.base import BaseCrawler
+
+        class _Crawler(BaseCrawler):
+            def __init__(self, source_type: str, source_id: str):
+                self.source_type = source_type
+                super().__init__(source_id)
+
+            async def fetch(self):
+                return None
+
+            async def parse(self, raw_data):
+                return []
+
+        await _Crawler("rss", "feed").save(
+            [{"external_id": "a", "title": "New open model", "content": _STORY}], db_session,
+        )
+        await _Crawler("hackernews", "top").save([
+            {"external_id": "b", "title": "New open model!", "content": _STORY + " (hn)"},
+            {"external_id": "c", "title": "Battery rules", "content": _OTHER},
+        ], db_session)
+        await _Crawler("reddit", "ml").save(
+            [{"external_id": "d", "title": "new open model", "content": _STORY}], db_session,
+        )
+        await db_session.commit()
+
+        rows = dict((await db_session.execute(
+            select(Article.external_id, Article.duplicate_of)
+        )).all())
+        ids = dict((await db_session.execute(select(Article.external_id, Article.id))).all())
+        assert rows == {"a": None, "b": ids["a"], "c": None, "d": ids["a"]}
+
+        captured = {}
+
+        async def fake_batch(self, article_ids, progress_callback=None):
+            captured["ids"] = article_ids
+            return {}
+
+        monkeypatch.setattr(AIProcessorService, "batch_process", fake_batch)
+        await AIProcessorService.__new__(AIProcessorService).process_unprocessed(db_session, limit=10)
+        assert sorted(captured["ids"]) == sorted([ids["a"], ids["c"]])
+
+    async def test_fingerprints_run_in_parse_executor(self, db_session, monkeypatch):
+        import apps.crawler.near_dup as near_dup
+
+        calls = []
+
+        class _Executor:
+            async def run(self, func, *args):
+                calls.append(len(args[0]))
+                return func(*args)
+
+        monkeypatch.setattr(near_dup, "parse_executor", _Executor())
+        monkeypatch.setattr(near_dup, "_index", NearDupIndex())
+        db_session.add_all([
+            Article(source_type="rss", source_id="feed", external_id=str(i), title="t", content=_STORY)
+            for i in range(3)
+        ])
+        await db_session.flush()
+        ids = (await db_session.execute(select(Article.id))).scalars().all()
+
+        assert await near_dup.detect_near_duplicates(db_session, ids) == 2
+        assert calls == [3]
+
+    async def test_concurrent_sessions_share_entries_only_after_commit(self, tmp_path, monkeypatch):
+        import apps.crawler.near_dup as near_dup
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        from core.models.base import Base
+
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'crawl.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        index = NearDupIndex()
+        monkeypatch.setattr(near_dup, "_index", index)
+
+        def story(external_id: str, article_id: int) -> Article:
+            return Article(id=article_id, source_type="rss", source_id=external_id,
+                           external_id=external_id, title="t", content=_STORY)
+
+        async with factory() as first, factory() as second:
+            second.add(story("b", 10))
+            await second.commit()
+
+            # 第一个爬虫写入更早的 ID，检测后尚未提交
+            first.add(story("a", 5))
+            await first.flush()
+            assert await near_dup.detect_near_duplicates(first, [5]) == 0
+            assert 5 not in index
+
+            # 第二个爬虫看不到未提交的文章：既不链接，也不影响其条目
+            assert await near_dup.detect_near_duplicates(second, [10]) == 0
+            await first.commit()
+            await second.commit()
+
+        assert 5 in index and 10 in index
+        async with factory() as third:
+            third.add(story("c", 20))
+            await third.flush()
+            assert await near_dup.detect_near_duplicates(third, [20]) == 1
+            await third.commit()
+            assert (await third.get(Article, 20)).duplicate_of == 5
+        await engine.dispose()
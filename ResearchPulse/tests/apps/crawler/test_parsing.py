@@ -0,0 +1,107 @@
+"""Tests for apps/crawler/parsing.py — off-loop feed and HTML parsing.
+
+验证解析执行器：
+1. parse_feed 返回可 pickle 的普通字典
+2. extract_main_text 的多重正文提取策略
+3. 进程池与线程池两种模式均可运行，进程池损坏时降级为线程池
+"""
+
+from __future__ import annotations
+
+import pickle
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from apps.crawler.parsing import ParseExecutor, extract_main_text, parse_feed
+
+RSS_XML = """<?xml version="1.0"?>
+<rss version="2.0"><channel>
+<title>Example</title><description>Example feed</description>
+<item>
+  <title>First</title><link>https://example.com/1</link>
+  <guid>id-1</guid><pubDate>Mon, 02 Mar 2026 10:00:00 GMT</pubDate>
+  <category>ai</category>
+</item>
+</channel></rss>"""
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+class TestParseFeed:
+    """Test parse_feed output shape.
+
+    验证 parse_feed 返回普通字典而非 FeedParserDict。
+    """
+
+    def test_returns_plain_picklable_dicts(self):
+        feed = parse_feed(RSS_XML)
+
+        assert feed["bozo"] is False
+        assert type(feed["entries"][0]) is dict
+        entry = feed["entries"][0]
+        assert entry["title"] == "First"
+        assert entry["id"] == "id-1"
+        assert tuple(entry["published_parsed"][:3]) == (2026, 3, 2)
+        assert entry["tags"][0]["term"] == "ai"
+        assert feed["feed"]["title"] == "Example"
+        assert pickle.loads(pickle.dumps(feed)) == feed
+
+    def test_invalid_xml_sets_bozo(self):
+        feed = parse_feed("not xml at all <<<")
+        assert feed["bozo"] is True
+        assert feed["entries"] == []
+
+
+class TestExtractMainText:
+    """Test extract_main_text strategies."""
+
+    def test_prefers_article_tag(self):
+        html = f"<html><body><nav>menu</nav><article>{'x' * 120}</article></body></html>"
+        assert extract_main_text(html) == "x" * 120
+
+    def test_extended_selectors_only_when_requested(self):
+        html = f"<html><body><div id='main-content'>{'y' * 120}</div></body></html>"
+        assert extract_main_text(html, extended=True) == "y" * 120
+        assert extract_main_text(html, extended=False) == ""
+
+    def test_empty_html(self):
+        assert extract_main_text("") == ""
+
+
+class TestParseExecutor:
+    """Test ParseExecutor modes and fallback.
+
+    验证进程池 / 线程池执行与损坏降级。
+    """
+
+    @pytest.mark.parametrize("mode", ["process", "thread"])
+    async def test_runs_function(self, mode):
+        executor = ParseExecutor(mode=mode, max_workers=1)
+        try:
+            assert await executor.run(_square, 7) == 49
+            feed = await executor.run(parse_feed, RSS_XML)
+            assert feed["entries"][0]["link"] == "https://example.com/1"
+        finally:
+            executor.shutdown()
+
+    async def test_broken_process_pool_falls_back_to_threads(self):
+        executor = ParseExecutor(mode="process", max_workers=1)
+        calls = {"n": 0}
+
+        class _BrokenPool:
+            def submit(self, *args, **kwargs):
+                raise BrokenProcessPool("worker died")
+
+            def shutdown(self, *args, **kwargs):
+                calls["n"] += 1
+
+        executor._executor = _BrokenPool()
+        try:
+            assert await executor.run(_square, 3) == 9
+            assert executor.mode == "thread"
+            assert calls["n"] == 1
+        finally:
+            executor.shutdown()
@@ -0,0 +1,180 @@
+"""Tests for apps/crawler/runner.py — concurrent run_all with per-host budgets.
+
+验证全量爬取的并发调度：
+1. 不同主机的源并行抓取
+2. 同一主机的源串行执行并保持间隔；以源类型为预算键的爬虫按类型并发上限并行
+3. CrawlSummary 按主机记录排队与抓取耗时
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from apps.crawler.rate_limit import HostRateLimiter
+from apps.crawler.runner import CrawlerRunner, CrawlSummary
+
+
+class _FakeCrawler:
+    """Minimal crawler double that records when it ran."""
+
+    def __init__(self, source_type: str, source_id: str, host: str, duration: float, log: list):
+        self.source_type = source_type
+        self.source_id = source_id
+        self.target_host = host
+        self._duration = duration
+        self._log = log
+
+    async def run(self):
+        start = time.monotonic()
+        await asyncio.sleep(self._duration)
+        self._log.append((self.target_host, start, time.monotonic()))
+        return {
+            "source_id": self.source_id,
+            "fetched_count": 1,
+            "saved_count": 1,
+            "saved_ids": [],
+            "status": "success",
+        }
+
+
+class _FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        return None
+
+
+def _patch_sources(items):
+    """Patch the factory/session so run_all iterates over ``items``."""
+
+    async def fake_sources(source_types=None, session=None):
+        for item in items:
+            yield item
+
+    return (
+        patch("apps.crawler.runner.get_session_factory", return_value=lambda: _FakeSession()),
+        patch(
+            "apps.crawler.runner.CrawlerFactory.create_for_active_sources",
+            side_effect=fake_sources,
+        ),
+    )
+
+
+class TestHostRateLimiter:
+    """Test HostRateLimiter spacing and isolation.
+
+    验证按键限速：同键保持间隔，不同键互不阻塞。
+    """
+
+    async def test_same_key_is_spaced(self):
+        limiter = HostRateLimiter()
+        starts = []
+
+        async def task():
+            async with limiter.slot("example.com", interval=0.1):
+                starts.append(time.monotonic())
+
+        await asyncio.gather(task(), task())
+        assert starts[1] - starts[0] >= 0.09
+
+    async def test_different_keys_do_not_block(self):
+        limiter = HostRateLimiter()
+        started = time.monotonic()
+
+        async def task(key):
+            async with limiter.slot(key, interval=1.0):
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(task("a.com"), task("b.com"), task("c.com"))
+        assert time.monotonic() - started < 0.5
+
+
+class TestRunAllConcurrent:
+    """Test CrawlerRunner.run_all worker pool.
+
+    验证 run_all 的并发池行为与主机耗时统计。
+    """
+
+    async def test_distinct_hosts_run_in_parallel(self):
+        log: list = []
+        items = [
+            (_FakeCrawler("rss", str(i), f"host{i}.com", 0.1, log), SimpleNamespace())
+            for i in range(5)
+        ]
+        runner = CrawlerRunner(max_workers=5)
+        p1, p2 = _patch_sources(items)
+        with p1, p2:
+            started = time.monotonic()
+            summary = await runner.run_all(source_types=["rss"])
+            elapsed = time.monotonic() - started
+
+        assert summary.total_articles == 5
+        assert elapsed < 0.4
+        assert set(summary.hosts) == {f"host{i}.com" for i in range(5)}
+
+    async def test_same_host_is_serialized_with_delay(self):
+        log: list = []
+        items = [
+            (_FakeCrawler("rss", str(i), "same.com", 0.02, log), SimpleNamespace())
+            for i in range(3)
+        ]
+        runner = CrawlerRunner(max_workers=8, delays={"rss": 0.05})
+        p1, p2 = _patch_sources(items)
+        with p1, p2:
+            summary = await runner.run_all(source_types=["rss"])
+
+        spans = sorted((start, end) for _, start, end in log)
+        for (_, prev_end), (next_start, _) in zip(spans, spans[1:]):
+            assert next_start - prev_end >= 0.04
+
+        timing = summary.hosts["same.com"]
+        assert timing.sources == 3
+        assert timing.max_queue_wait_seconds > 0
+        assert timing.fetch_seconds > 0
+
+    async def test_type_keyed_budget_uses_source_concurrency(self):
+        log: list = []
+        items = [
+            (_FakeCrawler("hackernews", str(i), "hackernews", 0.1, log), SimpleNamespace())
+            for i in range(2)
+        ]
+        runner = CrawlerRunner(max_workers=8, delays={"hackernews": 0.01})
+        p1, p2 = _patch_sources(items)
+        with p1, p2:
+            await runner.run_all(source_types=["hackernews"])
+
+        (_, first_start, first_end), (_, second_start, _) = sorted(log, key=lambda e: e[1])
+        assert second_start < first_end
+
+    async def test_last_fetched_at_updated_on_success(self):
+        log: list = []
+        source = SimpleNamespace(last_fetched_at=None)
+        items = [(_FakeCrawler("rss", "1", "a.com", 0, log), source)]
+        runner = CrawlerRunner(max_workers=2)
+        p1, p2 = _patch_sources(items)
+        with p1, p2:
+            await runner.run_all(source_types=["rss"])
+
+        assert source.last_fetched_at is not None
+
+
+class TestCrawlSummaryHosts:
+    """Test host timing aggregation in CrawlSummary.to_dict()."""
+
+    def test_to_dict_includes_hosts(self):
+        summary = CrawlSummary()
+        summary.add_host_timing("a.com", 1.0, 2.0)
+        summary.add_host_timing("a.com", 3.0, 1.0)
+
+        hosts = summary.to_dict()["hosts"]
+        assert hosts["a.com"]["sources"] == 2
+        assert hosts["a.com"]["queue_wait_seconds"] == 4.0
+        assert hosts["a.com"]["max_queue_wait_seconds"] == 3.0
+        assert hosts["a.com"]["max_fetch_seconds"] == 2.0
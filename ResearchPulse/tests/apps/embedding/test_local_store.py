@@ -0,0 +1,174 @@
+"""Tests for apps/embedding/local_store.py — in-process vector store.
+
+验证本地向量存储：
+1. 写入、余弦检索（排除自身）、按文章 ID 读取
+2. 同一文章重复写入替换旧向量，删除后不再命中
+3. 重新打开后从磁盘加载，压缩（rebuild_index）保留有效向量
+4. 后端选择：auto 模式下 Milvus 不可达时使用本地存储
+5. 多个进程写入同一存储时加锁并重新加载，不会互相覆盖
+
+Run with: pytest tests/apps/embedding/test_local_store.py -v
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from apps.embedding.local_store import LocalVectorStore
+
+
+def _vec(*values: float) -> list[float]:
+    return list(values)
+
+
+class TestLocalVectorStore:
+    """Test storage and brute-force search.
+
+    验证存储与暴力检索。
+    """
+
+    def test_insert_search_and_fetch(self, tmp_path):
+        store = LocalVectorStore(tmp_path / "vs")
+        assert store.connect()
+
+        rows = store.insert_vectors([1, 2, 3], [_vec(1, 0, 0), _vec(0.9, 0.1, 0), _vec(0, 0, 1)])
+
+        assert rows == [0, 1, 2]
+        matches = store.search_similar(_vec(1, 0, 0), top_k=2, exclude_article_id=1)
+        assert [aid for aid, _ in matches] == [2, 3]
+        assert matches[0][1] == pytest.approx(0.9 / np.hypot(0.9, 0.1), rel=1e-5)
+        assert store.get_vectors([3, 99]) == {3: [0.0, 0.0, 1.0]}
+        assert store.get_collection_stats()["num_entities"] == 3
+
+    def test_reinsert_replaces_and_delete_hides(self, tmp_path):
+        store = LocalVectorStore(tmp_path / "vs")
+        store.insert_vectors([1, 2], [_vec(1, 0), _vec(0, 1)])
+
+        store.insert_vectors([1], [_vec(0, 1)])
+        store.delete_by_article_ids([2])
+
+        assert store.search_similar(_vec(0, 1), top_k=5) == [(1, pytest.approx(1.0))]
+        assert store.get_collection_stats()["num_entities"] == 1
+
+    def test_dimension_mismatch_is_rejected(self, tmp_path):
+        store = LocalVectorStore(tmp_path / "vs")
+        store.insert_vectors([1], [_vec(1, 0)])
+
+        with pytest.raises(ValueError):
+            store.insert_vectors([2], [_vec(1, 0, 0)])
+
+    def test_persists_grows_and_compacts(self, tmp_path):
+        store = LocalVectorStore(tmp_path / "vs", dtype="float16")
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(1500, 8)).astype(np.float32)
+        store.insert_vectors(list(range(1, 1501)), vectors.tolist())
+        store.delete_by_article_ids(list(range(1, 1001)))
+        store.disconnect()
+
+        reopened = LocalVectorStore(tmp_path / "vs")
+        assert reopened.get_collection_stats()["num_entities"] == 500
+        assert reopened.rebuild_index()
+        assert reopened.get_collection_stats()["num_entities"] == 500
+        top = reopened.search_similar(vectors[1200].tolist(), top_k=1)
+        assert top[0][0] == 1201
+        assert top[0][1] == pytest.approx(1.0, abs=1e-2)
+
+    def test_hnsw_search_above_threshold(self, tmp_path, monkeypatch):
+        pytest.importorskip("hnswlib")
+        from common.feature_config import feature_config
+
+        original_get_int = feature_config.get_int
+        monkeypatch.setattr(feature_config, "get_int", lambda key, default=0: (
+            10 if key == "embedding.local_hnsw_threshold" else original_get_int(key, default)
+        ))
+        store = LocalVectorStore(tmp_path / "vs")
+        vectors = np.random.default_rng(1).normal(size=(200, 16)).astype(np.float32)
+        store.insert_vectors(list(range(1, 201)), vectors.tolist())
+        store.delete_by_article_ids([50])
+        store.disconnect()
+
+        reopened = LocalVectorStore(tmp_path / "vs")
+        reopened.insert_vectors([500], [vectors[0].tolist()])
+
+        assert {aid for aid, _ in reopened.search_similar(vectors[0].tolist(), top_k=2)} == {1, 500}
+        assert 50 not in [aid for aid, _ in reopened.search_similar(vectors[49].tolist(), top_k=5)]
+        assert (tmp_path / "vs" / "hnsw.bin").exists()
+
+
+def _insert_range(path, first: int, count: int) -> None:
+    """Insert ``count`` one-hot vectors starting at article ``first`` (child process)."""
+    store = LocalVectorStore(path)
+    for aid in range(first, first + count):
+        vector = [0.0] * 4
+        vector[aid % 4] = 1.0
+        store.insert_vectors([aid], [vector])
+    store.disconnect()
+
+
+class TestMultiProcessWriters:
+    """Test stores opened by several processes on the same directory.
+
+    验证多个进程共享同一存储目录。
+    """
+
+    def test_writer_reloads_changes_from_other_instance(self, tmp_path):
+        first = LocalVectorStore(tmp_path / "vs")
+        second = LocalVectorStore(tmp_path / "vs")
+        first.insert_vectors([1], [_vec(1, 0)])
+        assert second.connect()
+
+        first.insert_vectors([2], [_vec(0, 1)])
+        second.insert_vectors([3], [_vec(1, 1)])
+        first.delete_by_article_ids([1])
+
+        reopened = LocalVectorStore(tmp_path / "vs")
+        assert reopened.get_collection_stats()["num_entities"] == 2
+        assert reopened.get_vectors([2]) == {2: [0.0, 1.0]}
+        assert second.search_similar(_vec(1, 0), top_k=5)[0][0] == 3
+        assert second.get_vectors([1, 2]) == {2: [0.0, 1.0]}
+
+    def test_concurrent_processes_keep_every_vector(self, tmp_path):
+        import multiprocessing
+
+        if "fork" not in multiprocessing.get_all_start_methods():
+            pytest.skip("fork start method unavailable")
+        ctx = multiprocessing.get_context("fork")
+        workers = [
+            ctx.Process(target=_insert_range, args=(tmp_path / "vs", first, 30))
+            for first in (1, 101, 201)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+        assert [worker.exitcode for worker in workers] == [0, 0, 0]
+
+        store = LocalVectorStore(tmp_path / "vs")
+        expected = [aid for first in (1, 101, 201) for aid in range(first, first + 30)]
+        vectors = store.get_vectors(expected)
+        assert sorted(vectors) == expected
+        assert all(vectors[aid][aid % 4] == 1.0 for aid in expected)
+
+
+class TestVectorStoreSelection:
+    """Test backend selection by ``embedding.vector_store``.
+
+    验证向量库后端选择。
+    """
+
+    def test_auto_falls_back_to_local(self, tmp_path, monkeypatch):
+        import apps.embedding.service as service
+        from common.feature_config import feature_config
+
+        local = LocalVectorStore(tmp_path / "vs")
+        monkeypatch.setattr(service, "get_local_vector_store", lambda: local)
+        monkeypatch.setattr(service.MilvusClient, "connect", lambda self: False)
+        backend = {"value": "auto"}
+        monkeypatch.setattr(feature_config, "get", lambda key, default=None: (
+            backend["value"] if key == "embedding.vector_store" else default
+        ))
+
+        assert service.get_vector_store() is local
+        backend["value"] = "milvus"
+        assert service.get_vector_store() is None
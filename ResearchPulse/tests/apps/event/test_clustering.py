@@ -0,0 +1,258 @@
+"""Tests for apps/event/clustering.py and EventService.cluster_articles.
+
+验证事件聚类的倒排索引候选检索：
+1. 预计算特征的打分与 compute_cluster_score 一致
+2. 倒排索引只返回共享特征词的聚类，并保持加入顺序
+3. cluster_articles 将文章归入匹配的聚类，新建的聚类可被后续文章匹配
+4. 质心矩阵的批量余弦相似度与增量更新，向量模式的匹配、决胜与回退
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from apps.crawler.models import Article
+from apps.event.clustering import (
+    CentroidIndex,
+    ClusterIndex,
+    build_features,
+    compute_cluster_score,
+    decode_vector,
+    encode_vector,
+    score_features,
+)
+from apps.event.models import EventCluster, EventMember
+from apps.event.service import EventService
+
+
+class TestScoreFeatures:
+    """Test that precomputed scoring matches the pairwise scorer.
+
+    验证预计算特征的打分结果。
+    """
+
+    # 期望值取自逐对打分实现（引入预计算特征之前）的输出
+    @pytest.mark.parametrize(
+        "item_title, cluster_title, expected",
+        [
+            ("OpenAI releases GPT-5 with new reasoning", "GPT-5 launch by OpenAI", (1.0766666666666667, "model")),
+            ("Ask HN: Claude 4 vs Gemini 2.5", "Claude 4 and Gemini 2.5 compared", (1.18, "model")),
+            ("百度 发布 新模型", "百度 发布 文心大模型", (0.5816666666666667, "entity")),
+            ("Unrelated gardening tips", "Nvidia earnings beat expectations", (0.05, "keyword")),
+        ],
+    )
+    def test_matches_pairwise_scores(self, item_title, cluster_title, expected):
+        content = "Some body text about Microsoft"
+        item = build_features(item_title, content, "AI")
+        cluster = build_features(cluster_title, None, "AI")
+        score, method = score_features(item, cluster)
+        assert (score, method) == pytest.approx(expected)
+        assert compute_cluster_score(item_title, content, cluster_title, "AI", "AI") == (score, method)
+
+    def test_identical_titles_score_full_title_similarity(self):
+        score, method = score_features(build_features("Hello World", ""), build_features("hello   world"))
+        assert score == pytest.approx(0.35 + 0.10 * 2 / 5)
+        assert method == "title"
+
+
+class TestClusterIndex:
+    """Test inverted-index candidate retrieval.
+
+    验证倒排索引的候选聚类检索。
+    """
+
+    def test_only_clusters_sharing_tokens_are_candidates(self):
+        index: ClusterIndex[str] = ClusterIndex()
+        index.add("gpt", "OpenAI ships GPT-5")
+        index.add("garden", "Spring gardening tips")
+        index.add("gpt-again", "GPT-5 benchmarks")
+
+        candidates = [c for c, _ in index.candidates(build_features("GPT-5 is here", ""))]
+        assert candidates == ["gpt", "gpt-again"]
+
+    def test_no_shared_tokens_returns_nothing(self):
+        index: ClusterIndex[str] = ClusterIndex()
+        index.add("gpt", "OpenAI ships GPT-5")
+        assert index.score(build_features("Spring gardening tips", "")) == []
+
+
+class TestCentroidIndex:
+    """Test running centroids and batched cosine similarity.
+
+    验证质心矩阵的批量相似度计算与增量更新。
+    """
+
+    @staticmethod
+    def _cosine(a, b) -> float:
+        a, b = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
+        return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+    def test_batch_matches_direct_cosine(self):
+        rng = np.random.default_rng(0)
+        centroids = rng.normal(size=(5, 8)).astype(np.float32)
+        queries = rng.normal(size=(3, 8)).astype(np.float32)
+        index: CentroidIndex[int] = CentroidIndex(8, capacity=2)
+        for i, c in enumerate(centroids):
+            index.add(i, c)
+
+        index.begin_batch(queries)
+
+        for row, query in enumerate(queries):
+            expected = [self._cosine(query, c) for c in centroids]
+            assert index.similarities(row) == pytest.approx(expected, abs=1e-5)
+
+    def test_updates_within_batch_are_visible(self):
+        index: CentroidIndex[str] = CentroidIndex(2)
+        index.add("a", np.array([1.0, 0.0]))
+        index.begin_batch(np.array([[0.0, 1.0]]))
+        assert index.similarities(0) == pytest.approx([0.0])
+
+        index.update("a", np.array([0.0, 1.0]))
+        index.update("b", np.array([0.0, 2.0]))
+
+        mean, count = index.centroid("a")
+        assert count == 2
+        assert mean == pytest.approx([0.5, 0.5])
+        assert index.similarities(0) == pytest.approx([np.sqrt(0.5), 1.0], abs=1e-6)
+
+    def test_dimension_mismatch_raises_value_error(self):
+        index: CentroidIndex[str] = CentroidIndex(3)
+        index.add("a", np.array([1.0, 0.0, 0.0]))
+
+        with pytest.raises(ValueError, match="dimension"):
+            index.add("b", np.array([1.0, 0.0]))
+        with pytest.raises(ValueError, match="dimension"):
+            index.update("a", np.array([1.0, 0.0, 0.0, 0.0]))
+        with pytest.raises(ValueError, match="dimension"):
+            index.begin_batch(np.zeros((2, 4)))
+        assert len(index) == 1
+        assert index.centroid("a")[1] == 1
+
+    def test_vector_roundtrip(self):
+        vector = np.array([0.25, -1.5, 3.0], dtype=np.float32)
+        assert decode_vector(encode_vector(vector)) == pytest.approx(vector)
+        assert decode_vector(None) is None
+
+
+class _FakeEmbeddingService:
+    """Returns fixed vectors by article ID."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    async def get_vectors(self, article_ids):
+        return {aid: self.vectors[aid] for aid in article_ids if aid in self.vectors}
+
+
+class TestClusterArticles:
+    """Test EventService.cluster_articles against the database.
+
+    验证文章聚类的端到端行为。
+    """
+
+    async def _add_article(self, session, external_id: str, title: str, importance: int = 7) -> Article:
+        article = Article(
+            source_type="rss",
+            source_id="feed",
+            external_id=external_id,
+            title=title,
+            content="",
+            ai_category="AI",
+            importance_score=importance,
+            ai_processed_at=datetime.now(timezone.utc),
+            crawl_time=datetime.now(timezone.utc),
+        )
+        session.add(article)
+        await session.flush()
+        return article
+
+    async def test_clusters_into_matching_and_new_events(self, db_session):
+        db_session.add(EventCluster(title="OpenAI launches GPT-5", category="AI", article_count=1))
+        db_session.add(EventCluster(title="Nvidia quarterly earnings", category="AI", article_count=1))
+        await db_session.flush()
+        gpt = await self._add_article(db_session, "a1", "GPT-5 released by OpenAI today")
+        llama = await self._add_article(db_session, "a2", "Meta open-sources Llama 4")
+        await db_session.commit()
+
+        result = await EventService().cluster_articles(db_session, limit=10)
+
+        assert result == {"total_processed": 2, "clustered": 2, "new_clusters": 1}
+        members = {
+            m.article_id: m
+            for m in (await db_session.execute(select(EventMember))).scalars().all()
+        }
+        gpt_cluster = await db_session.get(EventCluster, members[gpt.id].event_id)
+        assert gpt_cluster.title == "OpenAI launches GPT-5"
+        assert members[gpt.id].detection_method == "model"
+        assert members[llama.id].detection_method == "initial"
+
+    async def test_vector_mode_matches_by_centroid(self, db_session):
+        near = EventCluster(
+            title="Quarterly chip results", category="AI", article_count=1,
+            centroid=encode_vector(np.array([1.0, 0.0, 0.0])), centroid_count=1,
+        )
+        # 与 near 的余弦相似度几乎相同，标题与文章共享模型名，词法决胜
+        lexical = EventCluster(
+            title="GPT-5 launch recap", category="AI", article_count=1,
+            centroid=encode_vector(np.array([0.999, 0.04, 0.0])), centroid_count=1,
+        )
+        db_session.add_all([near, lexical])
+        await db_session.flush()
+        gpt = await self._add_article(db_session, "a1", "OpenAI ships GPT-5")
+        other = await self._add_article(db_session, "a2", "Unrelated gardening tips", importance=5)
+        await db_session.commit()
+
+        service = EventService(_FakeEmbeddingService({
+            gpt.id: [1.0, 0.02, 0.0],
+            other.id: [0.0, 0.0, 1.0],
+        }))
+        result = await service.cluster_articles(db_session, limit=10, mode="vector")
+
+        assert result == {"total_processed": 2, "clustered": 1, "new_clusters": 0}
+        member = (await db_session.execute(select(EventMember))).scalar_one()
+        assert member.article_id == gpt.id
+        assert member.event_id == lexical.id
+        assert member.detection_method == "semantic"
+        assert member.similarity_score > 0.99
+        await db_session.refresh(lexical)
+        assert lexical.centroid_count == 2
+        assert decode_vector(lexical.centroid) == pytest.approx([0.9995, 0.03, 0.0], abs=1e-6)
+
+    async def test_vector_mode_falls_back_to_lexical(self, db_session):
+        db_session.add(EventCluster(title="OpenAI launches GPT-5", category="AI", article_count=1))
+        await db_session.flush()
+        await self._add_article(db_session, "a1", "GPT-5 released by OpenAI today")
+        await db_session.commit()
+
+        service = EventService(_FakeEmbeddingService({}))
+        result = await service.cluster_articles(db_session, limit=10, mode="vector")
+
+        assert result["clustered"] == 1
+        member = (await db_session.execute(select(EventMember))).scalar_one()
+        assert member.detection_method == "model"
+
+    async def test_vector_mode_skips_mismatched_dimension(self, db_session):
+        db_session.add(EventCluster(
+            title="OpenAI launches GPT-5", category="AI", article_count=1,
+            centroid=encode_vector(np.array([1.0, 0.0, 0.0])), centroid_count=1,
+        ))
+        await db_session.flush()
+        first = await self._add_article(db_session, "a1", "Quarterly chip results", importance=5)
+        stale = await self._add_article(db_session, "a2", "GPT-5 released by OpenAI today")
+        await db_session.commit()
+
+        service = EventService(_FakeEmbeddingService({
+            first.id: [0.0, 0.0, 1.0],
+            stale.id: [1.0, 0.0],
+        }))
+        result = await service.cluster_articles(db_session, limit=10, mode="vector")
+
+        # 维度不符的向量被跳过，该文章按词法匹配
+        assert result["clustered"] == 1
+        member = (await db_session.execute(select(EventMember))).scalar_one()
+        assert member.article_id == stale.id
+        assert member.detection_method == "model"
@@ -0,0 +1,4 @@
+"""Tests for apps/pipeline module.
+
+流水线任务队列测试。
+"""
@@ -0,0 +1,227 @@
+"""Tests for apps/pipeline/worker.py.
+
+验证流水线任务调度：
+1. 同一阶段的多个任务合并为一次运行，范围取 article_ids 并集
+2. 任一任务未限定范围时按全表运行
+3. 运行中入队的下游任务在同一轮内被认领执行
+4. 不同阶段并行执行
+5. 失败任务重试，超过次数后标记失败
+6. 完成状态写入失败时任务重新入队；卡在 running 的任务被回收
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from apps.pipeline import worker
+from apps.pipeline.models import PipelineTask
+from apps.pipeline.triggers import enqueue_task
+
+
+@pytest_asyncio.fixture
+async def session_factory(monkeypatch):
+    """Per-test engine: the worker opens concurrent sessions, which must not
+    share a connection bound to another test's event loop."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(PipelineTask.__table__.create)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(worker, "get_session_factory", lambda: factory)
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture
+def stage_calls(monkeypatch):
+    """Replace stage execution with a recorder; returns the call list."""
+    calls: list[tuple[str, list[int] | None]] = []
+
+    async def fake_execute(stage, article_ids=None):
+        calls.append((stage, article_ids))
+        await asyncio.sleep(0)
+        return {"stage": stage}
+
+    monkeypatch.setattr(worker, "_execute_stage", fake_execute)
+    return calls
+
+
+async def _tasks(factory) -> list[PipelineTask]:
+    async with factory() as session:
+        result = await session.execute(select(PipelineTask).order_by(PipelineTask.id))
+        return list(result.scalars().all())
+
+
+class TestMergeArticleIds:
+    """Test payload scope merging.
+
+    验证任务范围合并。
+    """
+
+    def test_union_sorted(self):
+        payloads = [{"article_ids": [3, 1]}, {"article_ids": [2, 3]}]
+        assert worker._merge_article_ids(payloads) == [1, 2, 3]
+
+    def test_unscoped_payload_means_full_run(self):
+        assert worker._merge_article_ids([{"article_ids": [1]}, {"trigger_source": "x"}]) is None
+        assert worker._merge_article_ids([None]) is None
+
+
+class TestRunPipelineWorker:
+    """Test the batch-claiming dispatcher.
+
+    验证批量认领、合并执行与重试。
+    """
+
+    async def test_coalesces_same_stage_tasks(self, session_factory, stage_calls):
+        async with session_factory() as session:
+            await enqueue_task(session, "embedding", payload={"article_ids": [1, 2]})
+            await enqueue_task(session, "embedding", payload={"article_ids": [2, 5]})
+            await enqueue_task(session, "action", payload={"article_ids": [7]})
+            await session.commit()
+
+        result = await worker.run_pipeline_worker()
+
+        assert result == {"completed": 3, "failed": 0, "total": 3, "runs": 2}
+        assert sorted(stage_calls) == [("action", [7]), ("embedding", [1, 2, 5])]
+        tasks = await _tasks(session_factory)
+        assert all(t.status == "completed" for t in tasks)
+        assert tasks[0].result == {"stage": "embedding", "coalesced_tasks": 2}
+
+    async def test_unscoped_task_runs_full_stage(self, session_factory, stage_calls):
+        async with session_factory() as session:
+            await enqueue_task(session, "event", payload={"article_ids": [1]})
+            await enqueue_task(session, "event", payload={"trigger_source": "manual"})
+            await session.commit()
+
+        await worker.run_pipeline_worker()
+
+        assert stage_calls == [("event", None)]
+
+    async def test_downstream_tasks_run_in_same_pass(self, session_factory, monkeypatch):
+        calls = []
+
+        async def fake_execute(stage, article_ids=None):
+            calls.append((stage, article_ids))
+            if stage == "ai":
+                async with session_factory() as session:
+                    await enqueue_task(session, "embedding", payload={"article_ids": [4]})
+                    await session.commit()
+            return {}
+
+        monkeypatch.setattr(worker, "_execute_stage", fake_execute)
+        async with session_factory() as session:
+            await enqueue_task(session, "ai", payload={"article_ids": [4]})
+            await session.commit()
+
+        result = await worker.run_pipeline_worker()
+
+        assert calls == [("ai", [4]), ("embedding", [4])]
+        assert result["completed"] == 2
+
+    async def test_stages_run_concurrently(self, session_factory, monkeypatch):
+        in_flight = 0
+        peak = 0
+
+        async def fake_execute(stage, article_ids=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {}
+
+        monkeypatch.setattr(worker, "_execute_stage", fake_execute)
+        async with session_factory() as session:
+            for stage in ("embedding", "action", "topic"):
+                await enqueue_task(session, stage, payload={"article_ids": [1]})
+            await session.commit()
+
+        await worker.run_pipeline_worker()
+
+        assert peak == 3
+
+    async def test_failed_tasks_are_retried_then_failed(self, session_factory, monkeypatch):
+        attempts = 0
+
+        async def failing(stage, article_ids=None):
+            nonlocal attempts
+            attempts += 1
+            raise RuntimeError("backend down")
+
+        monkeypatch.setattr(worker, "_execute_stage", failing)
+        async with session_factory() as session:
+            await enqueue_task(session, "ai", payload={"article_ids": [1]})
+            await session.commit()
+
+        result = await worker.run_pipeline_worker()
+
+        (task,) = await _tasks(session_factory)
+        assert attempts == task.max_retries
+        assert task.status == "failed"
+        assert task.retry_count == task.max_retries
+        assert task.error_message == "backend down"
+        assert result["failed"] == task.max_retries
+
+    async def test_failed_completion_write_requeues_tasks(self, session_factory, stage_calls, monkeypatch):
+        original = worker._mark_completed
+        failures = {"left": 1}
+
+        async def flaky_mark_completed(factory, task_ids, result):
+            if failures["left"]:
+                failures["left"] -= 1
+                raise RuntimeError("database unavailable")
+            await original(factory, task_ids, result)
+
+        monkeypatch.setattr(worker, "_mark_completed", flaky_mark_completed)
+        async with session_factory() as session:
+            await enqueue_task(session, "topic", payload={"article_ids": [1]})
+            await session.commit()
+
+        result = await worker.run_pipeline_worker()
+
+        (task,) = await _tasks(session_factory)
+        assert stage_calls == [("topic", [1]), ("topic", [1])]
+        assert result == {"completed": 1, "failed": 1, "total": 2, "runs": 2}
+        assert task.status == "completed"
+        assert task.retry_count == 1
+
+    async def test_stale_running_tasks_are_reclaimed(self, session_factory, stage_calls):
+        async with session_factory() as session:
+            stale = await enqueue_task(session, "topic", payload={"article_ids": [1]})
+            exhausted = await enqueue_task(session, "action", payload={"article_ids": [2]})
+            fresh = await enqueue_task(session, "embedding", payload={"article_ids": [3]})
+            await session.commit()
+            ids = (stale.id, exhausted.id, fresh.id)
+            long_ago = datetime.now(timezone.utc) - timedelta(hours=3)
+            await session.execute(
+                update(PipelineTask).values(status="running", started_at=long_ago)
+            )
+            await session.execute(
+                update(PipelineTask).where(PipelineTask.id == ids[1]).values(retry_count=2)
+            )
+            await session.execute(
+                update(PipelineTask)
+                .where(PipelineTask.id == ids[2])
+                .values(started_at=datetime.now(timezone.utc))
+            )
+            await session.commit()
+
+        await worker.run_pipeline_worker()
+
+        tasks = {t.id: t for t in await _tasks(session_factory)}
+        assert stage_calls == [("topic", [1])]
+        assert tasks[ids[0]].status == "completed"
+        assert tasks[ids[0]].retry_count == 1
+        assert tasks[ids[1]].status == "failed"
+        assert tasks[ids[2]].status == "running"
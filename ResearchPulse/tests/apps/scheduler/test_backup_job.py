@@ -0,0 +1,210 @@
+"""Tests for apps/scheduler/jobs/backup_job.py — streaming archive backup and restore.
+
+验证备份任务分批流式归档过期文章、逐批删除，并可在中断后续写；
+以及从归档或旧版 JSON 备份批量恢复。
+
+Run with: pytest tests/apps/scheduler/test_backup_job.py -v
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+
+@pytest.fixture
+def backup_env(db_session, tmp_path, monkeypatch):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    import apps.scheduler.jobs.backup_job as backup_job
+    from common.feature_config import feature_config
+
+    monkeypatch.setattr(backup_job.settings, "backup_enabled", True)
+    monkeypatch.setattr(backup_job.settings, "backup_dir", tmp_path / "backups")
+    monkeypatch.setattr(backup_job.settings, "data_archive_days", 30)
+    monkeypatch.setattr(
+        backup_job, "get_session_factory",
+        lambda: async_sessionmaker(db_session.bind, expire_on_commit=False),
+    )
+    overrides = {"backup.batch_size": 2, "backup.segment_max_mb": 64}
+    original_get_int = feature_config.get_int
+    monkeypatch.setattr(
+        feature_config, "get_int",
+        lambda key, default=0: overrides.get(key, original_get_int(key, default)),
+    )
+    monkeypatch.setattr(feature_config, "get_bool", lambda key, default=False: (
+        False if key == "search.fts_enabled" else default
+    ))
+    return backup_job
+
+
+async def _seed(session, expired: int, fresh: int) -> None:
+    from apps.crawler.models import Article
+
+    now = datetime.now(timezone.utc)
+    for i in range(expired):
+        session.add(Article(
+            source_type="rss", source_id="1", external_id=f"old-{i}", title=f"Old {i}",
+            crawl_time=now - timedelta(days=60),
+        ))
+    for i in range(fresh):
+        session.add(Article(
+            source_type="rss", source_id="1", external_id=f"new-{i}", title=f"New {i}",
+            crawl_time=now,
+        ))
+    await session.commit()
+
+
+async def _article_count(session) -> int:
+    from apps.crawler.models import Article
+
+    return await session.scalar(select(func.count()).select_from(Article))
+
+
+class TestStreamingBackup:
+    """Test batched archive-then-delete backups.
+
+    验证分批归档后删除，以及中断后的续写。
+    """
+
+    async def test_archives_and_deletes_in_batches(self, db_session, backup_env):
+        from apps.crawler.models import BackupRecord
+        from common.archive import iter_backup_records
+
+        await _seed(db_session, expired=5, fresh=2)
+
+        summary = await backup_env.run_backup_job()
+
+        assert summary["articles_backed_up"] == 5
+        assert summary["articles_deleted"] == 5
+        assert await _article_count(db_session) == 2
+        records = list(iter_backup_records(Path(summary["backup_file"])))
+        assert sorted(r["external_id"] for r in records) == [f"old-{i}" for i in range(5)]
+
+        backup = (await db_session.execute(select(BackupRecord))).scalar_one()
+        await db_session.refresh(backup)
+        assert backup.status == "completed"
+        assert backup.article_count == 5
+        assert backup.backup_size == summary["backup_size_bytes"] > 0
+
+    async def test_nothing_expired(self, db_session, backup_env):
+        await _seed(db_session, expired=0, fresh=2)
+
+        summary = await backup_env.run_backup_job()
+
+        assert summary == {"status": "completed", "backed_up": 0, "deleted": 0}
+
+    async def test_resumes_after_interruption(self, db_session, backup_env, monkeypatch):
+        from apps.crawler.models import BackupRecord
+        from common.archive import iter_backup_records
+
+        await _seed(db_session, expired=5, fresh=1)
+        real_delete = backup_env._delete_articles
+        calls = {"n": 0}
+
+        async def flaky_delete(session, ids):
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise RuntimeError("connection lost")
+            return await real_delete(session, ids)
+
+        monkeypatch.setattr(backup_env, "_delete_articles", flaky_delete)
+        with pytest.raises(RuntimeError):
+            await backup_env.run_backup_job()
+        # 第一批已删除；第二批已落盘但未删除
+        assert await _article_count(db_session) == 4
+
+        monkeypatch.setattr(backup_env, "_delete_articles", real_delete)
+        summary = await backup_env.run_backup_job()
+
+        assert summary["resumed"] is True
+        assert summary["articles_in_archive"] == 5
+        assert await _article_count(db_session) == 1
+        records = list(iter_backup_records(Path(summary["backup_file"])))
+        assert sorted(r["external_id"] for r in records) == [f"old-{i}" for i in range(5)]
+        backups = (await db_session.execute(select(BackupRecord))).scalars().all()
+        assert len(backups) == 1
+        await db_session.refresh(backups[0])
+        assert backups[0].status == "completed"
+
+
+class TestBulkRestore:
+    """Test chunked restore with bulk existence checks.
+
+    验证分块恢复：批量判断已存在、批量写入并汇报进度。
+    """
+
+    async def test_restores_archive_and_skips_existing(self, db_session, backup_env):
+        from apps.crawler.models import Article
+
+        await _seed(db_session, expired=5, fresh=0)
+        summary = await backup_env.run_backup_job()
+        assert await _article_count(db_session) == 0
+        # 其中一篇文章在恢复前已被重新抓取
+        db_session.add(Article(
+            source_type="rss", source_id="1", external_id="old-3", title="Recrawled",
+        ))
+        await db_session.commit()
+        progress = []
+
+        async def on_progress(percent, message):
+            progress.append(percent)
+
+        result = await backup_env.restore_backup_file(
+            Path(summary["backup_file"]), progress_callback=on_progress, chunk_size=2,
+        )
+
+        assert result["restored_count"] == 4
+        assert result["skipped_count"] == 1
+        assert result["total_in_backup"] == 5
+        assert progress == [40, 80, 99]
+        titles = (await db_session.execute(select(Article.title))).scalars().all()
+        assert sorted(titles) == ["Old 0", "Old 1", "Old 2", "Old 4", "Recrawled"]
+        crawl_time = await db_session.scalar(select(Article.crawl_time).where(Article.external_id == "old-0"))
+        assert crawl_time.replace(tzinfo=timezone.utc) < datetime.now(timezone.utc) - timedelta(days=59)
+
+    async def test_restores_legacy_json_backup(self, db_session, backup_env, tmp_path):
+        path = tmp_path / "articles_20240101_000000.json"
+        path.write_text(json.dumps({
+            "article_count": 2,
+            "articles": [
+                {"id": 1, "source_type": "arxiv", "source_id": "cs.AI", "external_id": "2401.1",
+                 "title": "A", "url": "", "tags": ["x"], "crawl_time": "2024-01-01T00:00:00+00:00"},
+                {"id": 2, "source_type": "arxiv", "source_id": "cs.AI", "external_id": "2401.1",
+                 "title": "A duplicate", "crawl_time": None},
+            ],
+        }))
+
+        result = await backup_env.restore_backup_file(path)
+
+        assert (result["restored_count"], result["skipped_count"]) == (1, 1)
+        assert await _article_count(db_session) == 1
+
+    async def test_arxiv_matches_on_external_id_only(self, db_session, backup_env, tmp_path):
+        from apps.crawler.models import Article
+
+        # 论文已以另一分类抓取；同 ID 的 RSS 文章属于不同来源，照常恢复
+        db_session.add(Article(
+            source_type="arxiv", source_id="cs.LG", external_id="2401.1", title="Crawled",
+        ))
+        await db_session.commit()
+        path = tmp_path / "articles_20240101_000000.json"
+        path.write_text(json.dumps({
+            "article_count": 3,
+            "articles": [
+                {"source_type": "arxiv", "source_id": "cs.AI", "external_id": "2401.1", "title": "A"},
+                {"source_type": "arxiv", "source_id": "cs.CL", "external_id": "2401.2", "title": "B"},
+                {"source_type": "arxiv", "source_id": "cs.AI", "external_id": "2401.2", "title": "B again"},
+                {"source_type": "rss", "source_id": "7", "external_id": "2401.1", "title": "Feed"},
+            ],
+        }))
+
+        result = await backup_env.restore_backup_file(path)
+
+        assert (result["restored_count"], result["skipped_count"]) == (2, 2)
+        titles = (await db_session.execute(select(Article.title))).scalars().all()
+        assert sorted(titles) == ["B", "Crawled", "Feed"]
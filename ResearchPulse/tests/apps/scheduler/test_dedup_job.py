@@ -0,0 +1,157 @@
+"""Tests for apps/scheduler/jobs/dedup_job.py — incremental deduplication.
+
+验证去重任务只处理水位线之后的新文章，按规范化去重键删除重复项；
+水位线不越过安全窗口内的文章，迟到提交的更小 ID 不会被跳过。
+
+Run with: pytest tests/apps/scheduler/test_dedup_job.py -v
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+
+@pytest.fixture(autouse=True)
+def no_search_index(monkeypatch):
+    from common.feature_config import feature_config
+
+    monkeypatch.setattr(feature_config, "get_bool", lambda key, default=False: (
+        False if key == "search.fts_enabled" else default
+    ))
+
+
+def _article(source_type, source_id, external_id, title, arxiv_id=None):
+    from apps.crawler.models import Article
+
+    return Article(
+        source_type=source_type, source_id=source_id, external_id=external_id,
+        title=title, arxiv_id=arxiv_id,
+    )
+
+
+async def _remaining(session):
+    from apps.crawler.models import Article
+
+    return (await session.execute(select(Article.external_id).order_by(Article.id))).scalars().all()
+
+
+class TestDedupKey:
+    """Test normalized dedup keys.
+
+    验证去重键的规范化规则。
+    """
+
+    def test_rss_titles_are_normalized_per_source(self):
+        from apps.scheduler.jobs.dedup_job import compute_dedup_key
+
+        key = compute_dedup_key("rss", "7", None, "Breaking  News about LLMs")
+        assert key == compute_dedup_key("rss", "7", None, " breaking news ABOUT llms ")
+        assert key != compute_dedup_key("rss", "8", None, "Breaking News about LLMs")
+        assert len(key) <= 64
+
+    def test_unkeyed_articles(self):
+        from apps.scheduler.jobs.dedup_job import compute_dedup_key
+
+        assert compute_dedup_key("rss", "7", None, "Short one") is None
+        assert compute_dedup_key("arxiv", "cs.AI", None, "Title") is None
+        assert compute_dedup_key("hackernews", "1", None, "A long enough title") is None
+        assert compute_dedup_key("arxiv", "cs.AI", "2401.00001", "x") == "arxiv:2401.00001"
+
+
+class TestIncrementalDedup:
+    """Test watermark-based incremental deduplication.
+
+    验证水位线增量去重。
+    """
+
+    async def test_removes_later_duplicates_and_advances_watermark(self, db_session):
+        from apps.scheduler.jobs.dedup_job import deduplicate_new_articles
+
+        db_session.add_all([
+            _article("arxiv", "cs.AI", "a1", "Paper", arxiv_id="2401.00001"),
+            _article("arxiv", "cs.LG", "a2", "Paper", arxiv_id="2401.00001"),
+            _article("rss", "7", "r1", "Same headline here"),
+            _article("rss", "7", "r2", "same  HEADLINE here"),
+            _article("rss", "8", "r3", "Same headline here"),
+            _article("rss", "7", "r4", "Short"),
+            _article("rss", "7", "r5", "Short"),
+        ])
+        await db_session.commit()
+
+        outcome = await deduplicate_new_articles(db_session, batch_size=3, delete_batch_size=1)
+
+        assert outcome["deleted"] == {"arxiv": 1, "rss": 1}
+        assert outcome["scanned"] == 7
+        assert await _remaining(db_session) == ["a1", "r1", "r3", "r4", "r5"]
+
+    async def test_next_run_only_scans_new_articles(self, db_session):
+        from apps.scheduler.jobs.dedup_job import deduplicate_new_articles
+
+        db_session.add_all([
+            _article("arxiv", "cs.AI", "a1", "Paper", arxiv_id="2401.00001"),
+            _article("arxiv", "cs.AI", "a2", "Other", arxiv_id="2401.00002"),
+        ])
+        await db_session.commit()
+        first = await deduplicate_new_articles(db_session)
+
+        db_session.add(_article("arxiv", "cs.CV", "a3", "Paper", arxiv_id="2401.00001"))
+        await db_session.commit()
+        second = await deduplicate_new_articles(db_session)
+
+        assert first["scanned"] == 2
+        assert second["scanned"] == 1
+        assert second["deleted"] == {"arxiv": 1}
+        assert second["watermark"] > first["watermark"]
+        assert await _remaining(db_session) == ["a1", "a2"]
+
+    async def test_max_rows_caps_a_run(self, db_session):
+        from apps.scheduler.jobs.dedup_job import deduplicate_new_articles
+
+        db_session.add_all([
+            _article("rss", "7", f"r{i}", f"Distinct headline number {i}") for i in range(5)
+        ])
+        await db_session.commit()
+
+        first = await deduplicate_new_articles(db_session, batch_size=2, max_rows=3)
+        second = await deduplicate_new_articles(db_session, batch_size=2, max_rows=3)
+
+        assert (first["scanned"], second["scanned"]) == (3, 2)
+
+    async def test_watermark_holds_back_for_late_commits(self, db_session):
+        from sqlalchemy import update
+
+        from apps.crawler.models import Article
+        from apps.scheduler.jobs.dedup_job import deduplicate_new_articles
+
+        old = datetime.now(timezone.utc) - timedelta(hours=1)
+        first = _article("arxiv", "cs.AI", "a1", "Paper", arxiv_id="2401.00001")
+        first.crawl_time = old
+        recent = _article("arxiv", "cs.LG", "a3", "Other", arxiv_id="2401.00002")
+        recent.id = 3
+        db_session.add_all([first, recent])
+        await db_session.commit()
+
+        outcome = await deduplicate_new_articles(db_session, lag_seconds=600)
+        # 水位线停在安全窗口内的第一篇文章之前的最后一篇已扫描文章
+        assert (outcome["scanned"], outcome["watermark"]) == (2, first.id)
+
+        # 分配到更小 ID 的并发事务在水位线推进后才提交
+        late = _article("arxiv", "cs.CV", "a2", "Other", arxiv_id="2401.00002")
+        late.id = 2
+        db_session.add(late)
+        await db_session.commit()
+
+        outcome = await deduplicate_new_articles(db_session, lag_seconds=600)
+        assert outcome["scanned"] == 2
+        assert outcome["deleted"] == {"arxiv": 1}
+        assert await _remaining(db_session) == ["a1", "a2"]
+
+        # 文章移出安全窗口后水位线越过它们
+        await db_session.execute(update(Article).values(crawl_time=old))
+        await db_session.commit()
+        outcome = await deduplicate_new_articles(db_session, lag_seconds=600)
+        assert outcome["watermark"] == 2
+        assert (await deduplicate_new_articles(db_session, lag_seconds=600))["scanned"] == 0
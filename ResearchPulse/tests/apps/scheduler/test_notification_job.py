@@ -375,19 +375,21 @@ class TestConcurrentNotificationSending:
         assert "asyncio.gather" in source
 
     def test_semaphore_limits_concurrency(self):
-        """Verify semaphore limits concurrent sends to 5.
+        """Verify semaphore limits concurrent sends (default 5).
 
-        验证信号量限制并发数为 5。
+        验证信号量并发数取自 email.delivery_concurrency，默认为 5。
 
         Returns:
             None: This test does not return a value.
         """
         import inspect
         from apps.scheduler.jobs.notification_job import send_all_user_notifications
+        from common.feature_config import DEFAULT_CONFIGS
 
         source = inspect.getsource(send_all_user_notifications)
-        # Should create semaphore with limit of 5
-        assert "Semaphore(5)" in source
+        assert "Semaphore(concurrency)" in source
+        assert "email.delivery_concurrency" in source
+        assert DEFAULT_CONFIGS["email.delivery_concurrency"][0] == "5"
 
 
 class TestRunNotificationJob:
@@ -515,3 +517,102 @@ class TestTemplateEngineToggle:
             # html_body should contain <style> (legacy inline)
             call_kwargs = mock_send.call_args[1]
             assert "<style>" in call_kwargs["html_body"]
+
+
+class TestBulkDigestDelivery:
+    """Test bulk prefetch and pooled delivery of subscription digests.
+
+    验证批量预取订阅文章，以及通过本地 SMTP 接收端复用连接发送摘要。
+    """
+
+    @staticmethod
+    async def _seed(session, user_count: int):
+        from apps.crawler.models import Article, UserSubscription
+        from apps.crawler.models.source import ArxivCategory
+        from core.models.user import User
+
+        category = ArxivCategory(code="cs.AI", name="Artificial Intelligence")
+        session.add(category)
+        users = []
+        for i in range(user_count):
+            user = User(username=f"reader{i}", email=f"reader{i}@example.com")
+            user.set_password("password123")
+            users.append(user)
+        session.add_all(users)
+        await session.flush()
+
+        now = datetime.now(timezone.utc)
+        for user in users:
+            session.add(UserSubscription(
+                user_id=user.id, source_type="arxiv_category", source_id=category.id,
+            ))
+        # 第一个用户额外订阅 RSS 源 7
+        session.add(UserSubscription(user_id=users[0].id, source_type="rss_feed", source_id=7))
+        for i in range(3):
+            session.add(Article(
+                source_type="arxiv", source_id="cs.AI", external_id=f"ai-{i}",
+                title=f"AI paper {i}", arxiv_primary_category="cs.AI",
+                crawl_time=now - timedelta(minutes=i),
+            ))
+        session.add(Article(
+            source_type="rss", source_id="7", external_id="rss-1", title="Feed post",
+            crawl_time=now - timedelta(seconds=30),
+        ))
+        session.add(Article(
+            source_type="arxiv", source_id="cs.CV", external_id="cv-1", title="Vision paper",
+            arxiv_primary_category="cs.CV", crawl_time=now,
+        ))
+        await session.commit()
+        return users
+
+    async def test_prefetch_matches_each_user(self, db_session):
+        from apps.scheduler.jobs.notification_job import prefetch_subscribed_articles
+
+        users = await self._seed(db_session, 3)
+        since = datetime.now(timezone.utc) - timedelta(hours=1)
+
+        matched = await prefetch_subscribed_articles(
+            db_session, [u.id for u in users], since=since, limit=3,
+        )
+
+        assert [a["title"] for a in matched[users[0].id]] == [
+            "AI paper 0", "Feed post", "AI paper 1",
+        ]
+        assert [a["title"] for a in matched[users[1].id]] == [
+            "AI paper 0", "AI paper 1", "AI paper 2",
+        ]
+
+    async def test_digests_share_pooled_smtp_sessions(self, db_session, smtp_sink, monkeypatch):
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        import apps.scheduler.jobs.notification_job as notification_job
+        from apps.crawler.parsing import ParseExecutor
+
+        users = await self._seed(db_session, 8)
+        for key, value in {
+            "email_enabled": True,
+            "email_backend": "smtp",
+            "email_from": "digest@example.com",
+            "smtp_host": smtp_sink.host,
+            "smtp_port": smtp_sink.port,
+            "smtp_user": "",
+            "smtp_tls": False,
+            "smtp_retries": 1,
+            "email_template_engine": "jinja2",
+        }.items():
+            monkeypatch.setattr(notification_job.settings, key, value)
+        monkeypatch.setattr(
+            notification_job, "get_session_factory",
+            lambda: async_sessionmaker(db_session.bind, expire_on_commit=False),
+        )
+        monkeypatch.setattr(notification_job, "parse_executor", ParseExecutor(mode="thread"))
+
+        results = await notification_job.send_all_user_notifications(
+            since=datetime.now(timezone.utc) - timedelta(hours=1),
+        )
+
+        assert results["sent"] == len(users)
+        assert results["failed"] == 0
+        assert len(smtp_sink.messages) == len(users)
+        # 8 封摘要最多使用并发数（默认 5）个 SMTP 会话
+        assert smtp_sink.connections <= 5
@@ -0,0 +1,4 @@
+"""Tests for apps/search module.
+
+全文检索测试。
+"""
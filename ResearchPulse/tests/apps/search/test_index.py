@@ -0,0 +1,254 @@
+"""Tests for apps/search/index.py.
+
+验证全文检索：
+1. 中日韩文字按二元组切分，拉丁文字按词切分
+2. 检索按 BM25 排序，标题命中优先于正文命中
+3. 爬虫保存与重建时写入索引，关键词搜索走索引、索引未就绪时退回 LIKE
+4. 关键词搜索的筛选、排序、分页与总数覆盖全部命中；多线程并发读写索引
+5. 候选窗口受 search.max_hits 限制，按相关度分页时过滤出当前页即停止，总数为近似值
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import apps.search.index as search_index
+from apps.crawler.models import Article
+from apps.search.index import (
+    ArticleSearchIndex,
+    build_match_query,
+    rebuild_search_index,
+    search_article_ids,
+    tokenize,
+)
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    idx = ArticleSearchIndex(tmp_path / "search.sqlite3")
+    monkeypatch.setattr(search_index, "_index", idx)
+    yield idx
+    idx.close()
+
+
+class TestTokenize:
+    """Test tokenization and query building.
+
+    验证分词与查询表达式。
+    """
+
+    def test_cjk_bigrams_and_words(self):
+        assert tokenize("大模型Agent框架, GPT-5") == ["大模", "模型", "agent", "框架", "gpt", "5"]
+        assert tokenize("强") == ["强"]
+        assert tokenize(None) == []
+
+    def test_match_query(self):
+        assert build_match_query("机器学习 LLM") == '"机器" "器学" "学习" "llm"*'
+        assert build_match_query("强") == '"强"*'
+        assert build_match_query("!!") is None
+
+
+class TestArticleSearchIndex:
+    """Test the FTS5 index.
+
+    验证索引写入、检索与排序。
+    """
+
+    def test_bm25_prefers_title_matches(self, index):
+        index.upsert([
+            (1, "天气 预报", "大模 模型 训练 技巧"),
+            (2, "大模 模型 发布", "新闻"),
+            (3, "体育", "足球"),
+        ])
+
+        assert index.search("大模型", 10) == [2, 1]
+        assert index.search("训练", 10) == [1]
+        assert index.search("篮球", 10) == []
+
+    def test_upsert_replaces_document(self, index):
+        index.upsert([(1, "old title", "")])
+        index.upsert([(1, "new title", "")])
+
+        assert index.search("old", 10) == []
+        assert index.search("new", 10) == [1]
+
+    def test_ready_flag(self, index):
+        assert not index.ready
+        index.set_ready(True)
+        assert index.ready
+        index.clear()
+        assert not index.ready
+
+    def test_search_returns_every_hit_and_threads_share_index(self, index):
+        index.upsert([(i, f"agent {i}", "") for i in range(1, 1501)])
+
+        def write_and_search(offset: int) -> int:
+            index.upsert([(5000 + offset, "agent extra", "")])
+            return len(index.search("agent"))
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            counts = list(pool.map(write_and_search, range(8)))
+
+        assert all(count >= 1501 for count in counts)
+        assert len(index.search("agent")) == 1508
+        assert index.search("agent", 10) == index.search("agent")[:10]
+
+
+class TestSearchIntegration:
+    """Test indexing from the database and keyword search.
+
+    验证从数据库建索引与文章列表关键词搜索。
+    """
+
+    async def _add(self, session, external_id: str, title: str, summary: str = "", **kwargs) -> Article:
+        article = Article(
+            source_type="rss",
+            source_id="feed",
+            external_id=external_id,
+            title=title,
+            summary=summary,
+            crawl_time=datetime.now(timezone.utc),
+            **kwargs,
+        )
+        session.add(article)
+        await session.flush()
+        return article
+
+    async def test_not_ready_falls_back(self, db_session, index):
+        assert await search_article_ids("模型") is None
+
+    async def test_rebuild_and_search(self, db_session, index):
+        a = await self._add(db_session, "a", "OpenAI 发布新模型", ai_summary="多模态大模型")
+        b = await self._add(db_session, "b", "Weather report", tags=["大模型"])
+        await db_session.commit()
+
+        def factory():
+            return _SessionContext(db_session)
+
+        assert await rebuild_search_index(factory) == 2
+        assert index.ready
+        assert await search_article_ids("大模型") == [a.id, b.id]
+        assert await search_article_ids("openai") == [a.id]
+
+    async def test_list_articles_uses_index(self, db_session, index):
+        from apps.ui.api import list_articles
+
+        index.set_ready(True)
+        first = await self._add(db_session, "a", "Agent survey", summary="agents everywhere")
+        second = await self._add(db_session, "b", "Weekly news", summary="an agent framework")
+        await db_session.commit()
+        await search_index.index_articles(db_session, [first.id, second.id])
+
+        params = dict(
+            source_type=None, category=None, from_date=None, starred=None, unread=None,
+            archived=None, page=1, page_size=20, cursor=None, count="exact", user_id=None,
+        )
+        data = await list_articles(keyword="agent", sort="relevance", session=db_session, **params)
+        assert [a["id"] for a in data["articles"]] == [first.id, second.id]
+        assert data["total"] == 2
+
+        # 摘要中的子串 "agents" 由前缀匹配命中；不存在的词无结果
+        data = await list_articles(keyword="nothing", sort="relevance", session=db_session, **params)
+        assert data["articles"] == []
+
+    async def test_keyword_filters_sorts_and_counts_all_hits(self, db_session, index, monkeypatch):
+        import apps.ui.api as ui_api
+        from apps.ui.api import list_articles
+        from core.bulk import chunked
+
+        # 缩小分批大小，让命中跨越多个批次
+        monkeypatch.setattr(ui_api, "chunked", lambda rows: chunked(rows, 3))
+        index.set_ready(True)
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        ids = []
+        for i in range(10):
+            article = await self._add(
+                db_session, f"a{i}", f"agent news {i}",
+                publish_time=base + timedelta(days=i), is_archived=(i % 3 == 0),
+            )
+            ids.append(article.id)
+        await db_session.commit()
+        await search_index.index_articles(db_session, ids)
+        visible = [aid for i, aid in enumerate(ids) if i % 3 != 0]
+
+        params = dict(
+            source_type=None, category=None, from_date=None, starred=None, unread=None,
+            archived=None, count="exact", user_id=None,
+        )
+        data = await list_articles(
+            keyword="agent", sort="publish_time", page=2, page_size=2, cursor=None,
+            session=db_session, **params,
+        )
+        assert data["total"] == len(visible)
+        assert [a["id"] for a in data["articles"]] == list(reversed(visible))[2:4]
+
+        seen = []
+        cursor = ""
+        while cursor is not None:
+            data = await list_articles(
+                keyword="agent", sort="publish_time", page=1, page_size=4, cursor=cursor,
+                session=db_session, **params,
+            )
+            seen.extend(a["id"] for a in data["articles"])
+            cursor = data["next_cursor"]
+        assert seen == list(reversed(visible))
+
+    async def test_candidate_window_is_bounded(self, db_session, index, monkeypatch):
+        import apps.ui.api as ui_api
+        from apps.ui.api import list_articles
+        from common.feature_config import feature_config
+        from core.bulk import chunked
+
+        monkeypatch.setattr(ui_api, "chunked", lambda rows: chunked(rows, 2))
+        monkeypatch.setattr(feature_config, "get_int", lambda key, default=0: (
+            8 if key == "search.max_hits" else default
+        ))
+        index.set_ready(True)
+        ids = [(await self._add(db_session, f"a{i}", f"agent news {i}")).id for i in range(10)]
+        await db_session.commit()
+        await search_index.index_articles(db_session, ids)
+
+        batches = []
+        original = ui_api._filter_search_hits
+
+        async def spy(session, query, search_hits, sort, stop_after=None):
+            ranked, scanned = await original(session, query, search_hits, sort, stop_after)
+            batches.append((len(search_hits), scanned))
+            return ranked, scanned
+
+        monkeypatch.setattr(ui_api, "_filter_search_hits", spy)
+        params = dict(
+            source_type=None, category=None, from_date=None, starred=None, unread=None,
+            archived=None, cursor=None, user_id=None,
+        )
+        data = await list_articles(
+            keyword="agent", sort="relevance", page=1, page_size=2, count="estimate",
+            session=db_session, **params,
+        )
+        # 候选窗口为 8 条；第一页（加判断下一页的一条）只需扫描前两批
+        assert batches[-1] == (8, 4)
+        assert len(data["articles"]) == 2
+        assert (data["total"], data["total_estimated"]) == (8, True)
+
+        data = await list_articles(
+            keyword="agent", sort="publish_time", page=1, page_size=2, count="exact",
+            session=db_session, **params,
+        )
+        assert batches[-1] == (8, 8)
+        assert (data["total"], data["total_estimated"]) == (8, True)
+
+
+class _SessionContext:
+    """Async context manager yielding an existing session (factory stand-in)."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        return self.session
+
+    async def __aexit__(self, *exc):
+        return False
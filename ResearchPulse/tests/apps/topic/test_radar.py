@@ -0,0 +1,109 @@
+"""Tests for apps/topic/radar.py — batched topic matching.
+
+验证批量话题匹配：
+1. 编译后的多模式匹配与逐个子串匹配结果一致（含重叠、互为子串的关键词）
+2. 相关度评分规则保持不变
+3. 关联记录批量写入，已存在的关联被忽略
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from apps.crawler.models import Article
+from apps.topic.models import ArticleTopic, Topic
+from apps.topic.radar import TopicMatcher, match_article_to_topics, match_articles_to_topics
+
+
+def _topic(topic_id: int, keywords: list[str]) -> Topic:
+    return Topic(id=topic_id, name=f"topic-{topic_id}", keywords=keywords, is_active=True)
+
+
+class TestTopicMatcher:
+    """Test the compiled matcher against plain substring checks.
+
+    验证预编译匹配器与 ``kw.lower() in text`` 语义一致。
+    """
+
+    def test_overlapping_and_nested_keywords(self):
+        matcher = TopicMatcher([
+            _topic(1, ["GPT", "gpt-4", "pt-4o"]),
+            _topic(2, ["4o mini", "o m"]),
+        ])
+        found = matcher.found_keywords("release of gpt-4o mini today")
+        assert found == {"gpt", "gpt-4", "pt-4o", "4o mini", "o m"}
+
+    def test_found_keywords_match_substring_semantics(self):
+        rng = random.Random(7)
+        alphabet = "abc-"
+        keywords = sorted({"".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(40)})
+        matcher = TopicMatcher([_topic(1, keywords)])
+        for _ in range(50):
+            text = "".join(rng.choices(alphabet + " ", k=30))
+            assert matcher.found_keywords(text) == {kw for kw in keywords if kw in text}
+
+    def test_scoring_rules(self):
+        matcher = TopicMatcher([
+            _topic(1, ["llm", "agent", "rag", "tool", "eval"]),
+            _topic(2, ["diffusion", "image", "video", "audio"]),
+            _topic(3, []),
+        ])
+        matches = matcher.match("an llm agent with rag and image output")
+
+        # 话题 1：命中 3 个关键词 (1.0 + 0.95 + 0.9) / 5 * 1.2
+        # 话题 2：只命中 "image" 0.95 / 4，低于阈值
+        assert matches == [{
+            "topic_id": 1,
+            "topic_name": "topic-1",
+            "relevance": round((1.0 + 0.95 + 0.9) / 5 * 1.2, 3),
+            "matched_keywords": ["llm", "agent", "rag"],
+        }]
+
+    def test_no_topics(self):
+        assert TopicMatcher([]).match("anything") == []
+
+
+class TestMatchArticles:
+    """Test bulk association writes.
+
+    验证关联记录的批量写入。
+    """
+
+    async def _add_article(self, session, external_id: str, title: str) -> Article:
+        article = Article(
+            source_type="rss",
+            source_id="feed",
+            external_id=external_id,
+            title=title,
+            content="",
+            crawl_time=datetime.now(timezone.utc),
+        )
+        session.add(article)
+        await session.flush()
+        return article
+
+    async def test_bulk_insert_ignores_existing(self, db_session):
+        db_session.add_all([
+            Topic(name="Agents", keywords=["agent", "tool use"], is_active=True),
+            Topic(name="Retired", keywords=["agent"], is_active=False),
+        ])
+        await db_session.flush()
+        first = await self._add_article(db_session, "a1", "Agent benchmarks for tool use")
+        second = await self._add_article(db_session, "a2", "Gardening tips")
+
+        assert [m["topic_name"] for m in await match_article_to_topics(first.id, db_session)] == ["Agents"]
+        results = await match_articles_to_topics([first, second], db_session)
+        await db_session.commit()
+
+        assert results[first.id][0]["matched_keywords"] == ["agent", "tool use"]
+        assert results[second.id] == []
+        count = (await db_session.execute(select(func.count(ArticleTopic.id)))).scalar()
+        assert count == 1
+        assoc = (await db_session.execute(select(ArticleTopic))).scalar_one()
+        assert assoc.article_id == first.id
+        assert assoc.match_score == pytest.approx(0.975)
+        assert assoc.matched_keywords == ["agent", "tool use"]
@@ -218,3 +218,127 @@ class TestExportAuth:
         )
         # Should not be 401/403 -- permission passed
         assert response.status_code not in [401, 403]
+
+
+class TestListArticlesPagination:
+    """Test keyset pagination and cached totals of /api/articles.
+
+    验证文章列表的游标分页与总数缓存。
+    """
+
+    @pytest.fixture(autouse=True)
+    def fresh_counts(self, monkeypatch):
+        from apps.ui import api
+        from core.cache import MemoryCache
+
+        monkeypatch.setattr(api, "_article_counts", MemoryCache())
+
+    async def _seed(self, session, n: int = 5):
+        from apps.crawler.models import Article
+
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        for i in range(n):
+            session.add(Article(
+                source_type="rss",
+                source_id="feed",
+                external_id=f"a{i}",
+                title=f"Article {i}",
+                # 两两相同的发布时间，验证 id 作为次序键
+                publish_time=base.replace(day=1 + i // 2),
+                crawl_time=base,
+            ))
+        session.add(Article(source_type="rss", source_id="feed", external_id="undated",
+                            title="Undated", crawl_time=base))
+        await session.commit()
+
+    async def _list(self, session, **overrides):
+        from apps.ui.api import list_articles
+
+        params = dict(
+            source_type=None, category=None, keyword=None, from_date=None,
+            starred=None, unread=None, archived=None, sort="publish_time",
+            page=1, page_size=2, cursor=None, count="estimate", user_id=None,
+        )
+        params.update(overrides)
+        return await list_articles(session=session, **params)
+
+    async def test_cursor_walks_all_rows_in_offset_order(self, db_session):
+        await self._seed(db_session)
+
+        offset_titles = []
+        for page in range(1, 4):
+            data = await self._list(db_session, page=page, count="none")
+            offset_titles += [a["title"] for a in data["articles"]]
+
+        cursor_titles = []
+        cursor = ""
+        while cursor is not None:
+            data = await self._list(db_session, cursor=cursor, count="none")
+            cursor_titles += [a["title"] for a in data["articles"]]
+            cursor = data["next_cursor"]
+
+        assert len(cursor_titles) == 6
+        assert cursor_titles == offset_titles
+        assert cursor_titles[-1] == "Undated"
+
+    async def test_count_modes(self, db_session):
+        from apps.crawler.models import Article
+
+        await self._seed(db_session)
+
+        first = await self._list(db_session)
+        assert (first["total"], first["total_estimated"]) == (6, False)
+
+        db_session.add(Article(source_type="rss", source_id="feed", external_id="new", title="New"))
+        await db_session.commit()
+
+        cached = await self._list(db_session, page=2)
+        assert (cached["total"], cached["total_estimated"]) == (6, True)
+        exact = await self._list(db_session, count="exact")
+        assert (exact["total"], exact["total_estimated"]) == (7, False)
+        assert (await self._list(db_session, count="none"))["total"] is None
+
+    async def test_invalid_cursor_rejected(self, db_session):
+        from fastapi import HTTPException
+
+        with pytest.raises(HTTPException) as exc:
+            await self._list(db_session, cursor="not-a-cursor")
+        assert exc.value.status_code == 400
+
+        await self._seed(db_session)
+        data = await self._list(db_session, cursor="")
+        with pytest.raises(HTTPException):
+            await self._list(db_session, cursor=data["next_cursor"], sort="crawl_time")
+
+
+class TestValidateRssFeed:
+    """Test RSS feed validation fetches before parsing.
+
+    验证 RSS 源校验先异步下载，再把文本交给解析执行器。
+    """
+
+    async def test_parses_fetched_text(self, monkeypatch):
+        import common.http
+        from apps.crawler import parsing
+        from apps.crawler.parsing import ParseExecutor
+        from apps.ui.api import validate_rss_feed
+
+        fetched = []
+
+        async def fake_get_text_async(url, **kwargs):
+            fetched.append(url)
+            return (
+                "<?xml version='1.0'?><rss version='2.0'><channel>"
+                "<title>Example</title><link>https://example.com</link>"
+                "<item><title>Post</title><link>https://example.com/p</link></item>"
+                "</channel></rss>"
+            )
+
+        monkeypatch.setattr(common.http, "get_text_async", fake_get_text_async)
+        monkeypatch.setattr(parsing, "parse_executor", ParseExecutor(mode="thread"))
+
+        result = await validate_rss_feed("https://example.com/feed.xml")
+
+        assert fetched == ["https://example.com/feed.xml"]
+        assert result.valid
+        assert result.title == "Example"
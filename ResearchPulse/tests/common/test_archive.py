@@ -0,0 +1,116 @@
+"""Tests for common/archive.py — streaming compressed NDJSON archives.
+
+验证流式归档：
+1. 按大小轮转分段，清单记录条数与 ID 范围
+2. 未正常结束（进程中断）的分段按清单条数读取
+3. 重新打开未完成的归档继续追加，pending 批次保留
+4. 兼容旧版单文件 JSON 备份
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+from common.archive import (
+    CODEC_GZIP,
+    STATUS_COMPLETED,
+    STATUS_RUNNING,
+    ArchiveManifest,
+    ArchiveWriter,
+    iter_archive,
+    iter_backup_records,
+    resolve_codec,
+)
+
+
+def _records(start: int, stop: int):
+    return [{"id": i, "title": f"文章 {i}", "body": "x" * 200} for i in range(start, stop)]
+
+
+class TestArchiveWriter:
+    """Test writing, rotation and reading.
+
+    验证写入、分段轮转与读取。
+    """
+
+    def test_round_trip_with_rotation(self, tmp_path):
+        writer = ArchiveWriter.open(tmp_path / "a", codec=CODEC_GZIP, segment_bytes=1)
+        for batch in (_records(1, 4), _records(4, 6)):
+            for record in batch:
+                writer.write(record)
+            writer.flush()
+            writer.commit()
+        manifest = writer.close()
+
+        assert manifest.status == STATUS_COMPLETED
+        assert manifest.total_count == 5
+        assert [(s.count, s.first_id, s.last_id) for s in manifest.segments] == [(3, 1, 3), (2, 4, 5)]
+        assert all(s.file.endswith(".ndjson.gz") and s.closed for s in manifest.segments)
+        assert [r["id"] for r in iter_archive(tmp_path / "a")] == [1, 2, 3, 4, 5]
+
+    def test_serializes_datetimes(self, tmp_path):
+        now = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        writer = ArchiveWriter.open(tmp_path / "a", codec=CODEC_GZIP)
+        writer.write({"id": 1, "crawl_time": now})
+        writer.close()
+
+        assert list(iter_archive(tmp_path / "a")) == [{"id": 1, "crawl_time": now.isoformat()}]
+
+    def test_reads_flushed_records_of_interrupted_segment(self, tmp_path):
+        writer = ArchiveWriter.open(tmp_path / "a", codec=CODEC_GZIP)
+        for record in _records(1, 4):
+            writer.write(record)
+        assert writer.flush() == [1, 2, 3]
+        # 未 flush 的记录不计入清单；模拟进程在此中断（分段未正常结束）
+        writer.write({"id": 4})
+
+        manifest = ArchiveManifest.load(tmp_path / "a" / "manifest.json")
+        assert manifest.status == STATUS_RUNNING
+        assert manifest.pending == [1, 2, 3]
+        assert [r["id"] for r in iter_archive(tmp_path / "a")] == [1, 2, 3]
+
+    def test_reopen_appends_new_segment(self, tmp_path):
+        writer = ArchiveWriter.open(tmp_path / "a", codec=CODEC_GZIP)
+        for record in _records(1, 3):
+            writer.write(record)
+        writer.flush()
+
+        resumed = ArchiveWriter.open(tmp_path / "a", codec=CODEC_GZIP)
+        assert resumed.pending == [1, 2]
+        resumed.commit()
+        for record in _records(3, 5):
+            resumed.write(record)
+        manifest = resumed.close()
+
+        assert len(manifest.segments) == 2
+        # close() 落盘剩余记录，但确认（commit）仍由调用方完成
+        assert manifest.pending == [3, 4]
+        assert [r["id"] for r in iter_archive(tmp_path / "a")] == [1, 2, 3, 4]
+
+    def test_zstd_request_falls_back_without_zstandard(self, monkeypatch):
+        import common.archive as archive
+
+        monkeypatch.setattr(archive, "_zstandard", lambda: None)
+        assert resolve_codec("zstd") == CODEC_GZIP
+        assert resolve_codec("auto") == CODEC_GZIP
+
+
+class TestBackupRecords:
+    """Test the reader shared by the restore endpoint.
+
+    验证恢复接口使用的统一读取入口。
+    """
+
+    def test_reads_legacy_json_backup(self, tmp_path):
+        path = tmp_path / "articles_20240101_000000.json"
+        path.write_text(json.dumps({"article_count": 2, "articles": [{"id": 1}, {"id": 2}]}))
+
+        assert [r["id"] for r in iter_backup_records(path)] == [1, 2]
+
+    def test_reads_archive_by_manifest_path(self, tmp_path):
+        writer = ArchiveWriter.open(tmp_path / "a", codec=CODEC_GZIP)
+        writer.write({"id": 7})
+        manifest = writer.close()
+
+        assert list(iter_backup_records(manifest.path)) == [{"id": 7}]
@@ -0,0 +1,135 @@
+"""Tests for common/cache.py — LRU + TTL response cache with a disk tier.
+
+验证 HTTP 响应缓存：
+1. 按字节容量淘汰最久未使用的条目
+2. 查询时按 TTL 惰性过期
+3. 磁盘层跨实例（模拟跨进程/重启）共享
+4. 命中、未命中、淘汰计数
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from common.cache import ResponseCache
+
+
+@pytest.fixture
+def disk_path(tmp_path):
+    return tmp_path / "http_response_cache.sqlite3"
+
+
+class TestMemoryTier:
+    """Test the in-memory LRU tier.
+
+    验证内存层的 LRU 与 TTL 行为。
+    """
+
+    def test_hit_and_miss(self):
+        cache = ResponseCache()
+        cache.set("https://a.com", "body", {"b": 2, "a": 1})
+
+        assert cache.get("https://a.com", {"a": 1, "b": 2}) == "body"
+        assert cache.get("https://a.com") is None
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        entry = ResponseCache._entry_size("0" * 32, "x" * 1000)
+        cache = ResponseCache(max_bytes=entry * 2)
+        cache.set("https://a.com", "x" * 1000)
+        cache.set("https://b.com", "y" * 1000)
+        # 访问 a 使 b 成为最久未使用
+        assert cache.get("https://a.com") is not None
+        cache.set("https://c.com", "z" * 1000)
+
+        assert cache.get("https://b.com") is None
+        assert cache.get("https://a.com") is not None
+        assert cache.get("https://c.com") is not None
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.bytes <= stats.max_bytes
+
+    def test_oversized_entry_not_kept_in_memory(self):
+        cache = ResponseCache(max_bytes=100)
+        cache.set("https://a.com", "x" * 1000)
+        assert cache.size() == 0
+        assert cache.stats().bytes == 0
+
+    def test_overwrite_updates_size(self):
+        cache = ResponseCache()
+        cache.set("https://a.com", "x" * 1000)
+        cache.set("https://a.com", "short")
+        assert cache.size() == 1
+        assert cache.stats().bytes == ResponseCache._entry_size("0" * 32, "short")
+
+    def test_expired_entry_removed_on_lookup(self):
+        cache = ResponseCache()
+        with patch("common.cache.time.time", return_value=1000.0):
+            cache.set("https://a.com", "body")
+        with patch("common.cache.time.time", return_value=1100.0):
+            assert cache.get("https://a.com", ttl=60) is None
+        assert cache.size() == 0
+        assert cache.stats().expirations == 1
+
+
+class TestDiskTier:
+    """Test the shared SQLite tier.
+
+    验证磁盘层的持久化、回填与淘汰。
+    """
+
+    def test_shared_between_instances(self, disk_path):
+        writer = ResponseCache(disk_path=disk_path)
+        writer.set("https://a.com", "body")
+
+        reader = ResponseCache(disk_path=disk_path)
+        assert reader.get("https://a.com") == "body"
+        assert reader.stats().disk_hits == 1
+        # 回填内存层后再次命中不再访问磁盘
+        assert reader.get("https://a.com") == "body"
+        assert reader.stats().hits == 1
+        writer.close()
+        reader.close()
+
+    def test_disk_entry_respects_ttl(self, disk_path):
+        writer = ResponseCache(disk_path=disk_path)
+        with patch("common.cache.time.time", return_value=1000.0):
+            writer.set("https://a.com", "body")
+
+        reader = ResponseCache(disk_path=disk_path)
+        with patch("common.cache.time.time", return_value=5000.0):
+            assert reader.get("https://a.com", ttl=60) is None
+        assert ResponseCache(disk_path=disk_path).get("https://a.com") is None
+        writer.close()
+        reader.close()
+
+    def test_prune_keeps_disk_under_capacity(self, disk_path):
+        size = ResponseCache._entry_size("0" * 32, "x" * 1000)
+        cache = ResponseCache(disk_path=disk_path, disk_max_bytes=size * 3)
+        for i in range(5):
+            cache.set(f"https://a.com/{i}", "x" * 1000)
+
+        assert cache._disk.prune() == 2
+        fresh = ResponseCache(disk_path=disk_path)
+        assert fresh.get("https://a.com/0") is None
+        assert fresh.get("https://a.com/4") is not None
+        cache.close()
+        fresh.close()
+
+    def test_clear_removes_disk_entries(self, disk_path):
+        cache = ResponseCache(disk_path=disk_path)
+        cache.set("https://a.com", "body")
+        cache.clear()
+        assert ResponseCache(disk_path=disk_path).get("https://a.com") is None
+        cache.close()
+
+    def test_unavailable_disk_falls_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        cache = ResponseCache(disk_path=blocker / "cache.sqlite3")
+        cache.set("https://a.com", "body")
+        assert cache.get("https://a.com") == "body"
@@ -782,3 +782,93 @@ class TestFallbackErrorPreservation:
         assert "Last error" in err
         # Should include the specific error from the last attempted backend
         assert len(err) > len("✗ All email backends failed. Last error: ")
+
+
+class TestSMTPConnectionPool:
+    """Test pooled SMTP sessions against a local SMTP sink.
+
+    验证 SMTP 会话复用：多封邮件共享连接、按消息数回收、断开后自动重连。
+    """
+
+    @staticmethod
+    def _send(sink, pool, index):
+        from common.email import send_email
+
+        return send_email(
+            subject=f"Digest {index}",
+            body="Hello",
+            to_addrs=[f"user{index}@example.com"],
+            backend="smtp",
+            from_addr="sender@example.com",
+            smtp_host=sink.host,
+            smtp_port=sink.port,
+            smtp_user="",
+            smtp_password="",
+            smtp_tls=False,
+            smtp_retries=1,
+            smtp_pool=pool,
+        )
+
+    def test_messages_share_one_session(self, smtp_sink):
+        from common.email import SMTPConnectionPool
+
+        pool = SMTPConnectionPool()
+        try:
+            results = [self._send(smtp_sink, pool, i) for i in range(5)]
+        finally:
+            pool.close()
+
+        assert all(ok for ok, _ in results)
+        assert len(smtp_sink.messages) == 5
+        assert smtp_sink.connections == 1
+        assert pool.opened == 1
+
+    def test_session_recycled_after_max_messages(self, smtp_sink):
+        from common.email import SMTPConnectionPool
+
+        pool = SMTPConnectionPool(max_messages=2)
+        try:
+            for i in range(5):
+                assert self._send(smtp_sink, pool, i)[0]
+        finally:
+            pool.close()
+
+        assert smtp_sink.connections == 3
+
+    def test_reconnects_when_server_drops_session(self, smtp_sink):
+        from common.email import SMTPConnectionPool
+
+        smtp_sink.drop_after = 2
+        pool = SMTPConnectionPool()
+        try:
+            results = [self._send(smtp_sink, pool, i) for i in range(4)]
+        finally:
+            pool.close()
+
+        assert all(ok for ok, _ in results)
+        assert len(smtp_sink.messages) == 4
+        assert smtp_sink.connections == 2
+
+    def test_without_pool_each_message_connects(self, smtp_sink):
+        for i in range(3):
+            assert self._send(smtp_sink, None, i)[0]
+
+        assert smtp_sink.connections == 3
+
+    @patch("httpx.post")
+    def test_delivery_reuses_http_client(self, mock_post):
+        from common.email import EmailDelivery, send_email
+
+        delivery = EmailDelivery()
+        with patch.object(delivery.http_client, "post") as client_post:
+            client_post.return_value = MagicMock(status_code=202)
+            ok, _ = send_email(
+                "Test", "Hello", ["user@example.com"],
+                backend="sendgrid", from_addr="sender@example.com",
+                api_key="SG.test_key", **delivery.send_kwargs,
+            )
+        delivery.close()
+
+        assert ok is True
+        client_post.assert_called_once()
+        mock_post.assert_not_called()
@@ -7,6 +7,9 @@ from __future__ import annotations
 
 import pytest
 
+# 注册 system_config 表，保证 db_session 建表时包含它
+from apps.crawler.models.config import SystemConfig  # noqa: F401
+
 
 class TestFeatureConfigDefaults:
     """Verify DEFAULT_CONFIGS constants.
@@ -306,3 +309,129 @@ class TestFeatureConfigServiceInMemory:
         svc = self._make_service()
         svc._cache["feature.ai_processor"] = "true"
         assert svc.get_bool("feature.ai_processor") is True
+
+
+class TestFeatureConfigRefresh:
+    """Test non-blocking refresh, version stamps and change subscriptions.
+
+    验证后台刷新、版本戳增量加载与变更订阅。
+    """
+
+    @pytest.fixture
+    def session_factory(self, db_session):
+        """Point the service at the test database.
+
+        让配置服务使用测试数据库。
+        """
+        from unittest.mock import patch
+
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+        factory = async_sessionmaker(db_session.bind, class_=AsyncSession, expire_on_commit=False)
+        with patch("core.database.get_session_factory", return_value=factory):
+            yield factory
+
+    async def test_stale_cache_served_while_refreshing(self):
+        """Verify an expired cache returns immediately and refreshes in the background.
+
+        验证缓存过期时立即返回旧值，并在后台刷新。
+        """
+        import asyncio
+        from unittest.mock import patch
+
+        from common.feature_config import FeatureConfigService
+
+        svc = FeatureConfigService()
+        svc._cache = {"event.min_similarity": "0.7"}
+        svc._cache_ts = 0.0
+        refreshed = asyncio.Event()
+
+        async def _fake_refresh(full=False):
+            svc._apply_rows([("event.min_similarity", "0.8")], (1, "t1"), full=True)
+            refreshed.set()
+
+        with patch.object(svc, "_async_refresh_cache", _fake_refresh), \
+                patch.object(svc, "_sync_refresh_cache", side_effect=AssertionError("blocking")):
+            assert svc.get_float("event.min_similarity") == 0.7
+            assert svc.get_float("event.min_similarity") == 0.7
+            await asyncio.wait_for(refreshed.wait(), 1)
+
+        assert svc.get_float("event.min_similarity") == 0.8
+
+    async def test_failed_background_refresh_keeps_old_values(self):
+        """Verify a failing refresh keeps serving cached values.
+
+        验证后台刷新失败时继续使用旧值。
+        """
+        from unittest.mock import AsyncMock, patch
+
+        from common.feature_config import FeatureConfigService
+
+        svc = FeatureConfigService()
+        svc._cache = {"feature.crawler": "true"}
+        with patch.object(svc, "_async_refresh_cache", AsyncMock(side_effect=RuntimeError("db down"))):
+            assert svc.get_bool("feature.crawler") is True
+            await svc._refresh_task
+        assert svc.get_bool("feature.crawler") is True
+        assert svc._cache_ts > 0
+
+    def test_subscribe_exact_and_prefix(self):
+        """Verify listeners fire only for matching keys and can unsubscribe.
+
+        验证订阅按键或前缀匹配，且可取消订阅。
+        """
+        from common.feature_config import FeatureConfigService
+
+        svc = FeatureConfigService()
+        exact, prefix = [], []
+        unsubscribe = svc.subscribe("event.min_similarity", lambda k, v: exact.append((k, v)))
+        svc.subscribe("event.", lambda k, v: prefix.append(k))
+
+        svc.update_cached("event.min_similarity", "0.5")
+        svc.update_cached("event.min_similarity", "0.5")  # 值未变化不通知
+        svc.update_cached("event.rule_weight", "0.6")
+        svc.update_cached("ai.provider", "openai")
+        unsubscribe()
+        svc.update_cached("event.min_similarity", "0.9")
+
+        assert exact == [("event.min_similarity", "0.5")]
+        assert prefix == ["event.min_similarity", "event.rule_weight", "event.min_similarity"]
+
+    def test_listener_errors_are_isolated(self):
+        """Verify a failing listener does not break the cache update.
+
+        验证订阅回调异常不影响缓存更新与其他订阅者。
+        """
+        from common.feature_config import FeatureConfigService
+
+        svc = FeatureConfigService()
+        seen = []
+        svc.subscribe("ai.", lambda k, v: 1 / 0)
+        svc.subscribe("ai.", lambda k, v: seen.append(v))
+        svc.update_cached("ai.provider", "openai")
+        assert svc.get("ai.provider") == "openai"
+        assert seen == ["openai"]
+
+    async def test_refresh_loads_only_changed_rows(self, session_factory):
+        """Verify version-stamped refresh reloads only changed keys.
+
+        验证版本戳刷新：未变化时不加载，变化时只通知变化的键。
+        """
+        from common.feature_config import FeatureConfigService
+
+        writer = FeatureConfigService()
+        await writer.seed_defaults({"a.one": ("1", ""), "a.two": ("2", "")})
+
+        svc = FeatureConfigService()
+        await svc.async_reload()
+        assert svc.get_all("a.") == {"a.one": "1", "a.two": "2"}
+
+        changes = []
+        svc.subscribe("a.", lambda k, v: changes.append((k, v)))
+        await svc._async_refresh_cache()
+        assert changes == []
+
+        await writer.async_set("a.two", "22")
+        await svc._async_refresh_cache()
+        assert changes == [("a.two", "22")]
+        assert svc.get("a.one") == "1"
@@ -0,0 +1,113 @@
+"""Tests for conditional GET support in common/http.py and common/http_validators.py.
+
+验证条件请求：
+1. 校验信息两阶段写入（stage / commit / discard）并持久化
+2. 再次请求时附带 If-None-Match / If-Modified-Since
+3. 304 与内容哈希一致都返回 NOT_MODIFIED
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+import common.http as http
+from common.http import NOT_MODIFIED, commit_validators, get_text_async
+from common.http_validators import ValidatorStore, Validators, validator_key
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Isolated on-disk validator store."""
+    store = ValidatorStore(tmp_path / "validators.sqlite3")
+    with patch.object(http, "validator_store", store):
+        yield store
+    store.close()
+
+
+@pytest.fixture
+def server():
+    """Mock feed server recording request headers."""
+    state = {"body": "<rss>v1</rss>", "etag": '"v1"', "requests": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append(dict(request.headers))
+        if request.headers.get("If-None-Match") == state["etag"]:
+            return httpx.Response(304)
+        return httpx.Response(200, text=state["body"], headers={"ETag": state["etag"]})
+
+    old_client = http._async_client
+    http._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    yield state
+    http._async_client = old_client
+
+
+class TestValidatorStore:
+    """Test staged writes and persistence."""
+
+    def test_commit_persists_across_instances(self, tmp_path):
+        path = tmp_path / "v.sqlite3"
+        store = ValidatorStore(path)
+        store.stage("k", Validators(etag='"a"', content_hash="h"))
+        assert store.get("k") is None
+        store.commit("k")
+        store.close()
+
+        reopened = ValidatorStore(path)
+        assert reopened.get("k") == Validators(etag='"a"', last_modified="", content_hash="h")
+        reopened.close()
+
+    def test_discard_drops_staged(self):
+        store = ValidatorStore(None)
+        store.stage("k", Validators(etag='"a"'))
+        store.discard("k")
+        store.commit("k")
+        assert store.get("k") is None
+
+    def test_key_includes_sorted_params(self):
+        assert validator_key("https://x.com/f", {"b": 2, "a": 1}) == "https://x.com/f?a=1&b=2"
+
+
+class TestConditionalGet:
+    """Test get_text_async(conditional=True).
+
+    验证条件请求头的附带与未修改结果。
+    """
+
+    async def test_304_returns_not_modified(self, store, server):
+        url = "https://feeds.example.com/rss"
+
+        assert await get_text_async(url, conditional=True) == "<rss>v1</rss>"
+        commit_validators(url)
+
+        assert await get_text_async(url, conditional=True) is NOT_MODIFIED
+        assert server["requests"][1]["if-none-match"] == '"v1"'
+
+    async def test_uncommitted_validators_are_not_sent(self, store, server):
+        url = "https://feeds.example.com/rss"
+
+        await get_text_async(url, conditional=True)
+        result = await get_text_async(url, conditional=True)
+
+        assert result == "<rss>v1</rss>"
+        assert "if-none-match" not in server["requests"][1]
+
+    async def test_unchanged_hash_returns_not_modified(self, store, server):
+        url = "https://feeds.example.com/rss"
+        server["etag"] = ""
+
+        await get_text_async(url, conditional=True)
+        commit_validators(url)
+
+        assert await get_text_async(url, conditional=True) is NOT_MODIFIED
+        server["body"] = "<rss>v2</rss>"
+        assert await get_text_async(url, conditional=True) == "<rss>v2</rss>"
+
+    async def test_plain_requests_unaffected(self, store, server):
+        url = "https://feeds.example.com/rss"
+        await get_text_async(url, conditional=True)
+        commit_validators(url)
+
+        assert await get_text_async(url) == "<rss>v1</rss>"
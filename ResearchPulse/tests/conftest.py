@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import os
+import socketserver
 import sys
+import threading
 import time
 from typing import AsyncGenerator, Generator
 
@@ -56,6 +58,36 @@ def event_loop_policy():
     return asyncio.DefaultEventLoopPolicy()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def search_index_path(tmp_path_factory):
+    """Keep the full-text search index out of the real data directory.
+
+    将全文检索索引文件放到临时目录，避免测试写入 data_dir。
+
+    Returns:
+        Generator[Path, None, None]: Index file path used by the test session.
+    """
+    import apps.search.index as search_index
+
+    path = tmp_path_factory.mktemp("search") / search_index.SEARCH_INDEX_FILENAME
+    search_index._index = search_index.ArticleSearchIndex(path)
+    yield path
+    search_index._index.close()
+
+
+@pytest.fixture(autouse=True)
+def principal_cache():
+    """Drop cached principals between tests.
+
+    每个测试重建数据库后用户 ID 会被复用，清空进程内的认证主体缓存。
+    """
+    from core.dependencies import clear_principal_cache
+
+    clear_principal_cache()
+    yield
+    clear_principal_cache()
+
+
 @pytest.fixture(scope="session")
 def test_engine():
     """Create an async test database engine.
@@ -94,6 +126,9 @@ async def setup_test_db(test_engine):
         sqlalchemy.ext.asyncio.AsyncEngine: Engine with initialized schema.
     """
     from core.models.base import Base
+    # 注册用户与权限表：单独运行只导入文章模型的测试文件时，外键才能解析
+    import core.models.permission  # noqa: F401
+    import core.models.user  # noqa: F401
 
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -236,6 +271,7 @@ def client(test_user_data: dict) -> Generator[TestClient, None, None]:
     from fastapi import Depends, FastAPI
     from main import app
     from core.database import get_session
+    from core.dependencies import invalidate_principal
     from core.models.base import Base
     from core.models.permission import DEFAULT_PERMISSIONS, DEFAULT_ROLES
 
@@ -356,6 +392,8 @@ def client(test_user_data: dict) -> Generator[TestClient, None, None]:
                 {"username": username},
             )
 
+        # 直接改表绕过了管理接口，需手动使缓存的认证主体失效
+        invalidate_principal(session=session)
         await session.commit()
         return {"ok": True}
 
@@ -612,3 +650,91 @@ def superuser_headers(client: TestClient) -> dict:
     })
 
     return {"Authorization": f"Bearer {token}"}
+
+
+# ---------------------------------------------------------------------------
+# Local SMTP sink (email delivery testing)
+# ---------------------------------------------------------------------------
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: EHLO/MAIL/RCPT/DATA/RSET/NOOP/QUIT, no TLS/AUTH."""
+
+    def handle(self):
+        sink = self.server.sink
+        with sink.lock:
+            sink.connections += 1
+        self.wfile.write(b"220 sink ESMTP\r\n")
+        in_data, lines, rcpts, sent = False, [], [], 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if in_data:
+                if line.rstrip(b"\r\n") == b".":
+                    with sink.lock:
+                        sink.messages.append({"rcpts": rcpts, "data": b"".join(lines)})
+                    in_data, lines, rcpts = False, [], []
+                    sent += 1
+                    self.wfile.write(b"250 OK\r\n")
+                    if sink.drop_after and sent >= sink.drop_after:
+                        # 模拟服务器主动断开空闲/超额连接
+                        return
+                else:
+                    lines.append(line)
+                continue
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.wfile.write(b"250-sink\r\n250 8BITMIME\r\n")
+            elif command == b"RCPT":
+                rcpts.append(line[8:].strip().decode())
+                self.wfile.write(b"250 OK\r\n")
+            elif command == b"DATA":
+                in_data = True
+                self.wfile.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+            elif command == b"QUIT":
+                self.wfile.write(b"221 Bye\r\n")
+                return
+            elif command in (b"HELO", b"MAIL", b"RSET", b"NOOP"):
+                self.wfile.write(b"250 OK\r\n")
+            else:
+                self.wfile.write(b"502 Not implemented\r\n")
+
+
+class SMTPSink:
+    """Threaded local SMTP server recording connections and messages.
+
+    Attributes:
+        host: Bound host.
+        port: Bound port.
+        connections: Number of accepted SMTP connections.
+        messages: Received messages (``{"rcpts": [...], "data": bytes}``).
+        drop_after: Close a connection after this many messages (0 = never).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+        self.drop_after = 0
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPSinkHandler)
+        self._server.daemon_threads = True
+        self._server.sink = self
+        self.host, self.port = self._server.server_address
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def smtp_sink() -> Generator[SMTPSink, None, None]:
+    """Start a local SMTP sink for the test.
+
+    启动本地 SMTP 接收端，记录连接数与收到的邮件，测试结束后关闭。
+    """
+    sink = SMTPSink()
+    yield sink
+    sink.close()
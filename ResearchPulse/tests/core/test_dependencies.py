@@ -137,3 +137,91 @@ class TestTypeAliases:
         assert CurrentActiveUser is not None
         assert Superuser is not None
         assert OptionalUserId is not None
+
+
+class TestPrincipalCache:
+    """Test cached principal resolution.
+
+    验证认证主体缓存：命中时不查询数据库、权限解析与版本号失效。
+    """
+
+    async def test_hit_skips_database(self, db_session, test_user):
+        from sqlalchemy import event
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        from core.dependencies import get_principal
+
+        first = await get_principal(db_session, test_user.id)
+        assert first is not None
+        assert first.is_active and not first.is_superuser
+        assert {"article:read", "article:list"} <= first.permissions
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            async with AsyncSession(db_session.bind, expire_on_commit=False) as session:
+                assert await get_principal(session, test_user.id) is first
+                user = await session.merge(first.to_user(), load=False)
+                assert user.username == test_user.username
+                assert [r.name for r in user.roles] == [r.name for r in test_user.roles]
+                assert user.roles[0].permissions
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert statements == []
+
+    async def test_cached_user_changes_persist(self, db_session, test_user):
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        from core.dependencies import get_principal
+        from core.models.user import User
+
+        principal = await get_principal(db_session, test_user.id)
+        async with AsyncSession(db_session.bind, expire_on_commit=False) as session:
+            user = await session.merge(principal.to_user(), load=False)
+            user.set_password("new-password")
+            await session.commit()
+
+        async with AsyncSession(db_session.bind) as session:
+            stored = await session.get(User, test_user.id)
+            assert stored.check_password("new-password")
+
+    async def test_invalidation_after_commit(self, db_session, test_user):
+        from core.dependencies import get_principal, invalidate_principal
+
+        principal = await get_principal(db_session, test_user.id)
+
+        test_user.is_active = False
+        invalidate_principal(test_user.id, db_session)
+        # 提交前并发读取到旧数据，提交后的再次递增使其不再命中
+        stale = await get_principal(db_session, test_user.id)
+        await db_session.commit()
+
+        refreshed = await get_principal(db_session, test_user.id)
+        assert principal.is_active and stale is not refreshed
+        assert refreshed.is_active is False
+
+    async def test_global_invalidation_and_disabled_ttl(self, db_session, test_user, monkeypatch):
+        from common.feature_config import feature_config
+        from core.dependencies import get_principal, invalidate_principal
+
+        principal = await get_principal(db_session, test_user.id)
+        invalidate_principal()
+        assert await get_principal(db_session, test_user.id) is not principal
+
+        monkeypatch.setattr(
+            feature_config, "get_int",
+            lambda key, default=0: 0 if key == "auth.principal_cache_ttl" else default,
+        )
+        assert await get_principal(db_session, test_user.id) is not await get_principal(
+            db_session, test_user.id
+        )
+
+    async def test_missing_user(self, db_session):
+        from core.dependencies import get_principal
+
+        assert await get_principal(db_session, 999999) is None
@@ -0,0 +1,188 @@
+"""Tests for core/response_cache.py.
+
+验证接口响应缓存：
+1. 缓存键对参数顺序与 None 参数不敏感，按用户范围区分
+2. 命中缓存时不再回源
+3. 写入登记表的事务提交后标签失效，回滚不失效
+4. 同一缓存键的并发请求只回源一次；回源请求被取消时由等待者接替
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import update
+
+import core.response_cache as response_cache
+from apps.crawler.models import RssFeed
+from core.cache import MemoryCache
+from core.response_cache import (
+    build_cache_key,
+    bump_tags,
+    cached_response,
+    invalidate_on_write,
+)
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    cache = MemoryCache()
+    monkeypatch.setattr(response_cache, "cache", cache)
+    monkeypatch.setattr(response_cache, "_table_tags", {})
+    return cache
+
+
+class TestCacheKey:
+    """Test cache key normalization.
+
+    验证缓存键的规范化。
+    """
+
+    def test_ignores_order_none_and_non_scalars(self):
+        key = build_cache_key("ns", {"a": 1, "b": "x", "c": None, "session": object()}, ["t"])
+
+        assert key == build_cache_key("ns", {"b": "x", "a": 1}, ["t"])
+        assert key != build_cache_key("ns", {"a": 2, "b": "x"}, ["t"])
+        assert key != build_cache_key("other", {"a": 1, "b": "x"}, ["t"])
+
+    def test_user_scope_and_tag_generation(self):
+        anonymous = build_cache_key("ns", {"page": 1}, ["t"])
+
+        assert anonymous != build_cache_key("ns", {"page": 1, "user_id": 7}, ["t"])
+        bump_tags("t")
+        assert anonymous != build_cache_key("ns", {"page": 1}, ["t"])
+
+
+class TestCachedResponse:
+    """Test the endpoint decorator.
+
+    验证装饰器的命中、绕过与单飞。
+    """
+
+    async def test_hit_skips_endpoint(self):
+        calls = []
+
+        @cached_response("items", tags=("t",))
+        async def endpoint(page: int = 1, session=None):
+            calls.append(page)
+            return {"page": page}
+
+        assert await endpoint(page=1, session=object()) == {"page": 1}
+        assert await endpoint(page=1, session=object()) == {"page": 1}
+        assert await endpoint(page=2, session=object()) == {"page": 2}
+        assert calls == [1, 2]
+
+        bump_tags("t")
+        await endpoint(page=1, session=object())
+        assert calls == [1, 2, 1]
+
+    async def test_cache_if_bypasses(self):
+        calls = []
+
+        @cached_response("items", cache_if=lambda kwargs: kwargs.get("user_id") is None)
+        async def endpoint(user_id=None):
+            calls.append(user_id)
+            return {"user": user_id}
+
+        await endpoint(user_id=5)
+        await endpoint(user_id=5)
+        await endpoint(user_id=None)
+        await endpoint(user_id=None)
+        assert calls == [5, 5, None]
+
+    async def test_single_flight(self):
+        calls = 0
+
+        @cached_response("slow")
+        async def endpoint(page: int = 1):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return {"page": page}
+
+        results = await asyncio.gather(*(endpoint(page=1) for _ in range(5)))
+
+        assert calls == 1
+        assert results == [{"page": 1}] * 5
+
+    async def test_single_flight_propagates_errors(self):
+        calls = 0
+
+        @cached_response("broken")
+        async def endpoint():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(endpoint() for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert calls == 1
+        # 失败结果不缓存，下次请求重新回源
+        with pytest.raises(ValueError):
+            await endpoint()
+        assert calls == 2
+
+    async def test_cancelled_leader_hands_over_to_waiter(self):
+        calls = 0
+
+        @cached_response("cancel")
+        async def endpoint():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return {"n": calls}
+
+        leader = asyncio.create_task(endpoint())
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(endpoint()) for _ in range(3)]
+        await asyncio.sleep(0.005)
+        leader.cancel()
+
+        results = await asyncio.gather(*waiters)
+
+        assert leader.cancelled()
+        # 一个等待者接替回源，其余等待者共享其结果
+        assert results == [{"n": 2}] * 3
+        assert calls == 2
+        assert response_cache._inflight == {}
+
+
+class TestWriteInvalidation:
+    """Test tag bumps from database writes.
+
+    验证写入登记表后标签失效。
+    """
+
+    async def test_commit_bumps_and_rollback_does_not(self, db_session):
+        invalidate_on_write("sources", RssFeed.__tablename__)
+        key = build_cache_key("feeds", {}, ["sources"])
+
+        db_session.add(RssFeed(title="Feed", feed_url="https://example.com/feed.xml"))
+        await db_session.flush()
+        await db_session.rollback()
+        assert build_cache_key("feeds", {}, ["sources"]) == key
+
+        feed = RssFeed(title="Feed", feed_url="https://example.com/feed.xml")
+        db_session.add(feed)
+        await db_session.commit()
+        bumped = build_cache_key("feeds", {}, ["sources"])
+        assert bumped != key
+
+        # Core update 语句同样触发失效
+        await db_session.execute(
+            update(RssFeed).where(RssFeed.id == feed.id).values(title="Renamed")
+        )
+        await db_session.commit()
+        assert build_cache_key("feeds", {}, ["sources"]) != bumped
+
+    async def test_unregistered_tables_do_not_bump(self, db_session):
+        invalidate_on_write("articles", "articles")
+        key = build_cache_key("feeds", {}, ["sources"])
+
+        db_session.add(RssFeed(title="Feed", feed_url="https://example.com/other.xml"))
+        await db_session.commit()
+
+        assert build_cache_key("feeds", {}, ["sources"]) == key